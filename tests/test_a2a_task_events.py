@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for the A2A task change feed and multiplexed client waits.
+
+The agent server side is exercised through TaskEventLog directly; the
+client runs against an in-memory session that serves /tasks/<id> and
+/tasks/events from the same log, so no HTTP server is needed.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.a2a import agent_client  # noqa: E402
+from tools.a2a.task_events import TaskEventLog  # noqa: E402
+
+
+class TestTaskEventLog:
+    def test_handshake_then_events_after_cursor(self):
+        log = TaskEventLog()
+        log.publish("t1", "working")
+        page = log.since(None)
+        assert page["events"] == [] and page["seq"] == 1 and not page["reset"]
+        log.publish("t2", "working")
+        log.publish("t1", "completed")
+        page = log.since(1)
+        assert [(e["task_id"], e["status"]) for e in page["events"]] == [
+            ("t2", "working"), ("t1", "completed")]
+        assert page["seq"] == 3
+
+    def test_republishing_same_status_is_noop(self):
+        log = TaskEventLog()
+        assert log.publish("t1", "working") == 1
+        assert log.publish("t1", "working") == 1
+        assert log.seq == 1
+        assert log.publish("t1", "completed") == 2
+
+    def test_long_poll_wakes_on_publish(self):
+        log = TaskEventLog()
+        timer = threading.Timer(0.05, log.publish, args=("t1", "completed"))
+        timer.start()
+        start = time.monotonic()
+        page = log.since(0, timeout=5)
+        assert time.monotonic() - start < 2
+        assert page["events"][0]["task_id"] == "t1"
+
+    def test_long_poll_times_out_empty(self):
+        log = TaskEventLog()
+        page = log.since(0, timeout=0.05)
+        assert page["events"] == [] and not page["reset"]
+
+    def test_reset_when_events_dropped_or_stream_changed(self):
+        log = TaskEventLog(capacity=2)
+        for i in range(5):
+            log.publish(f"t{i}", "working")
+        assert log.since(1)["reset"]
+        assert not log.since(3)["reset"]
+        assert log.since(3, stream_id="other-server")["reset"]
+        assert log.since(99)["reset"]
+
+    def test_etag_wait_for_change(self):
+        log = TaskEventLog()
+        log.publish("t1", "working")
+        etag = log.etag("t1")
+        assert log.wait_for_change("t1", etag, 0.05) == etag
+        threading.Timer(0.05, log.publish, args=("t1", "failed")).start()
+        changed = log.wait_for_change("t1", etag, 5)
+        assert changed != etag and changed == log.etag("t1")
+        assert log.etag("unknown") is None
+
+
+class _Response:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _AgentSession:
+    """Serves task status and the event feed from an in-memory agent."""
+
+    def __init__(self, feed=True):
+        self.log = TaskEventLog()
+        self.tasks = {}
+        self.feed = feed
+        self.headers = {}
+        self.lock = threading.Lock()
+        self.status_gets = 0
+        self.event_gets = 0
+        self.open_polls = 0
+        self.peak_polls = 0
+
+    def set_status(self, task_id, status):
+        self.tasks[task_id] = {"id": task_id, "status": status}
+        self.log.publish(task_id, status)
+
+    def get(self, url, params=None, timeout=None):
+        if url.endswith("/tasks/events"):
+            if not self.feed:
+                return _Response(404, {"error": "not found"})
+            with self.lock:
+                self.event_gets += 1
+                self.open_polls += 1
+                self.peak_polls = max(self.peak_polls, self.open_polls)
+            try:
+                since = params.get("since")
+                page = self.log.since(since, params.get("stream"), params.get("wait", 0))
+            finally:
+                with self.lock:
+                    self.open_polls -= 1
+            return _Response(200, page)
+        task_id = url.rsplit("/", 1)[1]
+        with self.lock:
+            self.status_gets += 1
+        return _Response(200, dict(self.tasks[task_id]))
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    session = _AgentSession()
+    monkeypatch.setattr(agent_client, "requests", SimpleNamespace(Session=lambda: session))
+    return session
+
+
+def _client(**kwargs):
+    kwargs.setdefault("event_wait", 0.5)
+    return agent_client.A2AAgentClient(**kwargs)
+
+
+class TestMultiplexedWaits:
+    def test_completion_wakes_waiter_without_polling(self, agent):
+        agent.set_status("t1", "working")
+        client = _client()
+        threading.Timer(0.2, agent.set_status, args=("t1", "completed")).start()
+        start = time.monotonic()
+        result = client.wait_for_completion("http://agent", "t1", timeout=10, poll_interval=30)
+        assert result["status"] == "completed"
+        assert time.monotonic() - start < 5
+        # Initial read, re-read after the handshake, final read
+        assert agent.status_gets <= 3
+
+    def test_many_waits_share_one_long_poll(self, agent):
+        ids = [f"t{i}" for i in range(20)]
+        for task_id in ids:
+            agent.set_status(task_id, "working")
+        client = _client()
+        results = {}
+
+        def wait(task_id):
+            results[task_id] = client.wait_for_completion(
+                "http://agent/", task_id, timeout=10, poll_interval=30)
+
+        threads = [threading.Thread(target=wait, args=(t,)) for t in ids]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        for task_id in ids:
+            agent.set_status(task_id, "failed" if task_id == "t3" else "completed")
+        for t in threads:
+            t.join(timeout=10)
+        assert len(results) == 20
+        assert results["t3"]["status"] == "failed"
+        assert agent.peak_polls == 1
+        assert len(client._watchers) == 1
+
+    def test_already_terminal_returns_immediately(self, agent):
+        agent.set_status("t1", "canceled")
+        client = _client()
+        assert client.wait_for_completion("http://agent", "t1", timeout=1)["status"] == "canceled"
+        assert agent.status_gets == 1
+
+    def test_timeout(self, agent):
+        agent.set_status("t1", "working")
+        client = _client(event_wait=0.05)
+        with pytest.raises(TimeoutError, match="Last status: working"):
+            client.wait_for_completion("http://agent", "t1", timeout=0.3)
+
+    def test_falls_back_to_polling_without_feed(self, agent):
+        agent.feed = False
+        agent.set_status("t1", "working")
+        client = _client()
+        threading.Timer(0.2, agent.set_status, args=("t1", "completed")).start()
+        result = client.wait_for_completion("http://agent", "t1", timeout=10, poll_interval=0.05)
+        assert result["status"] == "completed"
+        assert client._get_watcher("http://agent").supported is False
+
+    def test_polling_when_events_disabled(self, agent):
+        agent.set_status("t1", "working")
+        client = _client(use_task_events=False)
+        threading.Timer(0.1, agent.set_status, args=("t1", "completed")).start()
+        assert client.wait_for_completion("http://agent", "t1", timeout=10,
+                                          poll_interval=0.02)["status"] == "completed"
+        assert agent.event_gets == 0
@@ -322,3 +322,93 @@ class TestLogEventAppendOnly:
         )
         assert entry_id >= 1
         assert nested_db.exists()
+
+
+# ---------------------------------------------------------------------------
+# Group-commit writer
+# ---------------------------------------------------------------------------
+from tools.audit import audit_logger  # noqa: E402
+
+
+def _count_rows(db_path):
+    conn = sqlite3.connect(str(db_path))
+    count = conn.execute("SELECT COUNT(*) FROM audit_trail").fetchone()[0]
+    conn.close()
+    return count
+
+
+@pytest.fixture
+def group_commit():
+    """Enable group commit with a long interval so batching is observable."""
+    writer = audit_logger.enable_group_commit(flush_interval_ms=5000, batch_size=50)
+    yield writer
+    audit_logger.disable_group_commit()
+
+
+class TestGroupCommit:
+    """Queued, batched audit writes keep append-only semantics."""
+
+    def test_events_queued_then_committed_in_batches(self, audit_db, group_commit):
+        for i in range(120):
+            assert log_event("test_executed", "agent", f"run {i}", db_path=audit_db) is None
+        assert audit_logger.flush_audit_log(timeout=10)
+        assert _count_rows(audit_db) == 120
+        metrics = audit_logger.get_writer_metrics()
+        assert metrics["mode"] == "group_commit"
+        assert metrics["written"] == 120
+        assert metrics["batches"] <= 4
+
+    def test_submission_order_preserved(self, audit_db, group_commit):
+        for i in range(30):
+            log_event("test_executed", "agent", f"run {i}", db_path=audit_db)
+        audit_logger.flush_audit_log(timeout=10)
+        conn = sqlite3.connect(str(audit_db))
+        actions = [r[0] for r in conn.execute("SELECT action FROM audit_trail ORDER BY id")]
+        conn.close()
+        assert actions == [f"run {i}" for i in range(30)]
+
+    def test_sync_mode_returns_row_id(self, audit_db, group_commit):
+        log_event("test_executed", "agent", "queued first", db_path=audit_db)
+        entry_id = log_event("project_created", "agent", "needs id", db_path=audit_db, sync=True)
+        assert entry_id == 2
+        assert _count_rows(audit_db) == 2
+
+    def test_critical_event_durable_on_return(self, audit_db, group_commit):
+        entry_id = log_event("vulnerability_found", "scanner", "CVE found", db_path=audit_db)
+        assert isinstance(entry_id, int)
+        assert _count_rows(audit_db) == 1
+        log_event("test_executed", "agent", "x", db_path=audit_db, critical=True)
+        assert _count_rows(audit_db) == 2
+
+    def test_disable_flushes_queue(self, audit_db):
+        audit_logger.enable_group_commit(flush_interval_ms=60000)
+        for i in range(10):
+            log_event("test_executed", "agent", f"run {i}", db_path=audit_db)
+        audit_logger.disable_group_commit()
+        assert _count_rows(audit_db) == 10
+        assert audit_logger.get_writer_metrics() == {"mode": "sync"}
+
+    def test_bad_row_does_not_lose_batch(self, audit_db, tmp_path, group_commit):
+        missing_table = tmp_path / "no_table.db"
+        sqlite3.connect(str(missing_table)).close()
+        log_event("test_executed", "agent", "ok 1", db_path=audit_db)
+        with pytest.raises(sqlite3.OperationalError):
+            log_event("test_executed", "agent", "lost", db_path=missing_table, sync=True)
+        log_event("test_executed", "agent", "ok 2", db_path=audit_db)
+        audit_logger.flush_audit_log(timeout=10)
+        assert _count_rows(audit_db) == 2
+
+    def test_full_queue_applies_backpressure_then_writes_directly(self, audit_db):
+        writer = audit_logger.AuditWriter(max_queue=1, enqueue_timeout_seconds=0.05)
+        writer._thread = type("Alive", (), {"is_alive": lambda self: True})()  # never drains
+        assert writer.submit(audit_db, ("p", "test_executed", "a", "queued", None, None,
+                                        "CUI", None, None)) is None
+        entry_id = writer.submit(audit_db, ("p", "test_executed", "a", "direct", None, None,
+                                            "CUI", None, None))
+        assert entry_id == 1
+        assert writer.metrics["backpressure_waits"] == 1
+        assert writer.metrics["direct_fallbacks"] == 1
+
+    def test_sync_default_without_writer(self, audit_db):
+        assert audit_logger.get_writer_metrics() == {"mode": "sync"}
+        assert log_event("project_created", "agent", "x", db_path=audit_db) == 1
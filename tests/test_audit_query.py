@@ -0,0 +1,176 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.audit.audit_query — keyset pagination and streaming export."""
+
+import csv
+import hashlib
+import io
+import json
+import sqlite3
+
+import pytest
+
+from tools.audit import audit_query
+from tools.audit.audit_query import (
+    export_events,
+    iter_events,
+    query_by_project,
+    query_events,
+    verify_completeness,
+)
+
+
+@pytest.fixture
+def audit_db(tmp_path):
+    """audit_trail with 25 rows across two projects, types and actors."""
+    db = tmp_path / "icdev.db"
+    conn = sqlite3.connect(str(db))
+    conn.executescript("""
+        CREATE TABLE audit_trail (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id TEXT,
+            event_type TEXT NOT NULL,
+            actor TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details TEXT,
+            affected_files TEXT,
+            classification TEXT DEFAULT 'CUI',
+            ip_address TEXT,
+            session_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    for i in range(25):
+        conn.execute(
+            "INSERT INTO audit_trail (project_id, event_type, actor, action, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                "proj-a" if i % 2 == 0 else "proj-b",
+                ("security_scan", "test_executed", "stig_checked")[i % 3],
+                "scanner" if i % 5 else "builder",
+                f"action {i}",
+                # Several rows share a timestamp so the id tie-breaker matters
+                f"2026-01-{1 + i // 3:02d} 12:00:00",
+            ),
+        )
+    conn.commit()
+    conn.close()
+
+    from tools.db.migrations import __path__ as migrations_path  # noqa: F401
+    import importlib.util
+    up_path = Path(migrations_path[0]) / "009_audit_query_indexes" / "up.py"
+    spec = importlib.util.spec_from_file_location("m009", up_path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    conn = sqlite3.connect(str(db))
+    mod.up(conn)
+    conn.close()
+    return db
+
+
+def _all_pages(db, **kwargs):
+    seen, cursor = [], None
+    while True:
+        page = query_events(db_path=db, cursor=cursor, **kwargs)
+        seen.extend(e["id"] for e in page["entries"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+class TestKeysetPagination:
+    def test_pages_cover_every_row_once_in_order(self, audit_db):
+        ids = _all_pages(audit_db, limit=4)
+        assert ids == list(range(25, 0, -1))
+
+    def test_ascending_order(self, audit_db):
+        assert _all_pages(audit_db, limit=7, order="asc") == list(range(1, 26))
+
+    def test_insert_between_pages_does_not_shift_results(self, audit_db):
+        first = query_events(db_path=audit_db, limit=5)
+        conn = sqlite3.connect(str(audit_db))
+        conn.execute("INSERT INTO audit_trail (event_type, actor, action, created_at) "
+                     "VALUES ('security_scan', 'x', 'late', '2027-01-01 00:00:00')")
+        conn.commit()
+        conn.close()
+        second = query_events(db_path=audit_db, limit=5, cursor=first["next_cursor"])
+        assert [e["id"] for e in second["entries"]] == [20, 19, 18, 17, 16]
+
+    def test_invalid_cursor(self, audit_db):
+        with pytest.raises(ValueError, match="Invalid audit cursor"):
+            query_events(db_path=audit_db, cursor="not-a-cursor")
+
+    def test_legacy_helpers_unchanged(self, audit_db):
+        entries = query_by_project("proj-a", limit=3, db_path=audit_db)
+        assert [e["id"] for e in entries] == [25, 23, 21]
+        assert entries[0]["action"] == "action 24"
+
+
+class TestFilters:
+    def test_multi_filter(self, audit_db):
+        page = query_events(project_id="proj-a", event_types=["security_scan", "stig_checked"],
+                            actors="scanner", db_path=audit_db, limit=100)
+        for e in page["entries"]:
+            assert e["project_id"] == "proj-a"
+            assert e["event_type"] in ("security_scan", "stig_checked")
+            assert e["actor"] == "scanner"
+        assert len(page["entries"]) == 7
+
+    def test_time_window_accepts_iso(self, audit_db):
+        page = query_events(since="2026-01-03T00:00:00Z", until="2026-01-04", db_path=audit_db)
+        assert sorted(e["id"] for e in page["entries"]) == [7, 8, 9]
+
+    def test_filtered_pages_use_composite_index(self, audit_db):
+        clauses, params = audit_query._build_where(project_id="p", event_types=["a", "b"])
+        sql, params = audit_query._page_sql(clauses, params, "desc", ("2026-01-01", 5), 50)
+        conn = sqlite3.connect(str(audit_db))
+        plan = " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+        conn.close()
+        assert "idx_audit_project_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_verify_completeness(self, audit_db):
+        result = verify_completeness("proj-a", db_path=audit_db)
+        assert result["events"]["security_scan"]["count"] == 5
+        assert result["events"]["project_created"]["present"] is False
+        assert result["complete"] is False
+
+
+class TestStreamingExport:
+    def test_iter_events_streams_in_batches(self, audit_db):
+        stream = iter_events(batch_size=4, db_path=audit_db, project_id="proj-b")
+        assert next(stream)["id"] == 2
+        assert [e["id"] for e in stream] == list(range(4, 25, 2))
+
+    def test_iter_excludes_rows_added_mid_stream(self, audit_db):
+        stream = iter_events(batch_size=10, db_path=audit_db)
+        next(stream)
+        conn = sqlite3.connect(str(audit_db))
+        conn.execute("INSERT INTO audit_trail (event_type, actor, action, created_at) "
+                     "VALUES ('security_scan', 'x', 'late', '2027-01-01 00:00:00')")
+        conn.commit()
+        conn.close()
+        assert len(list(stream)) == 24
+
+    def test_jsonl_export_with_digest(self, audit_db, tmp_path):
+        out = tmp_path / "evidence.jsonl"
+        result = export_events("jsonl", out, db_path=audit_db, batch_size=3,
+                               event_types="security_scan")
+        lines = out.read_text(encoding="utf-8").splitlines()
+        assert result["count"] == len(lines) == 9
+        assert all(json.loads(line)["event_type"] == "security_scan" for line in lines)
+        assert result["sha256"] == hashlib.sha256(out.read_bytes()).hexdigest()
+
+    def test_csv_export_to_stream(self, audit_db):
+        buf = io.StringIO()
+        result = export_events("csv", buf, db_path=audit_db, batch_size=5)
+        rows = list(csv.DictReader(io.StringIO(buf.getvalue())))
+        assert result["count"] == len(rows) == 25
+        assert rows[0]["id"] == "1" and rows[-1]["action"] == "action 24"
+
+    def test_export_rejects_unknown_format(self, audit_db):
+        with pytest.raises(ValueError):
+            export_events("xml", io.StringIO(), db_path=audit_db)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for the incremental BM25 inverted index (tools/memory/bm25_index.py)."""
+
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from tools.memory import bm25_index  # noqa: E402
+
+
+@pytest.fixture
+def memory_db(tmp_path):
+    db_path = tmp_path / "memory.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE memory_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            type TEXT DEFAULT 'event',
+            importance INTEGER DEFAULT 5,
+            embedding BLOB,
+            created_at TEXT DEFAULT (datetime('now')),
+            updated_at TEXT DEFAULT (datetime('now')),
+            content_hash TEXT,
+            user_id TEXT,
+            tenant_id TEXT,
+            source TEXT DEFAULT 'manual'
+        );
+        CREATE UNIQUE INDEX idx_memory_content_hash_user ON memory_entries(content_hash, user_id);
+    """)
+    for content in (
+        "STIG scan found CAT1 findings",
+        "deploy pipeline green",
+        "stig remediation plan for CAT1 and CAT2",
+        "weekly status meeting",
+    ):
+        conn.execute("INSERT INTO memory_entries (content) VALUES (?)", (content,))
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def conn(memory_db):
+    c = sqlite3.connect(str(memory_db))
+    bm25_index.rebuild(c)
+    yield c
+    c.close()
+
+
+class TestScoring:
+    def test_only_matching_entries_scored(self, conn):
+        scores = bm25_index.score(conn, "stig")
+        assert set(scores) == {1, 3}
+
+    def test_more_matching_terms_rank_higher(self, conn):
+        scores = bm25_index.score(conn, "stig cat1 remediation")
+        assert scores[3] > scores[1]
+
+    def test_matches_okapi_formula(self, conn):
+        docs = [bm25_index.tokenize(r[0]) for r in
+                conn.execute("SELECT content FROM memory_entries ORDER BY id")]
+        avgdl = sum(len(d) for d in docs) / len(docs)
+        df = sum(1 for d in docs if "pipeline" in d)
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        tf, dl = docs[1].count("pipeline"), len(docs[1])
+        expected = idf * tf * (bm25_index.K1 + 1) / (
+            tf + bm25_index.K1 * (1 - bm25_index.B + bm25_index.B * dl / avgdl))
+        assert bm25_index.score(conn, "pipeline")[2] == pytest.approx(expected)
+
+    def test_entry_id_restriction(self, conn):
+        assert set(bm25_index.score(conn, "stig", entry_ids=[3, 4])) == {3}
+
+    def test_empty_query(self, conn):
+        assert bm25_index.score(conn, "   ") == {}
+
+
+class TestMaintenance:
+    def test_sync_noop_when_unchanged(self, conn):
+        assert bm25_index.sync(conn) == {"added": 0, "removed": 0}
+
+    def test_sync_picks_up_inserts_and_deletes(self, conn):
+        conn.execute("INSERT INTO memory_entries (content) VALUES ('new stig baseline')")
+        conn.execute("DELETE FROM memory_entries WHERE id = 1")
+        conn.commit()
+        assert bm25_index.sync(conn) == {"added": 1, "removed": 1}
+        assert set(bm25_index.score(conn, "stig")) == {3, 5}
+
+    def test_reindex_replaces_postings(self, conn):
+        bm25_index.index_entry(conn, 2, "stig pipeline")
+        conn.commit()
+        assert 2 in bm25_index.score(conn, "stig")
+        stats = bm25_index._get_stats(conn)
+        assert stats["doc_count"] == 4
+
+    def test_memory_write_indexes_new_entry(self, memory_db, conn, monkeypatch):
+        from tools.memory import memory_write
+        monkeypatch.setattr(memory_write, "DB_PATH", memory_db)
+        entry_id, _ = memory_write.write_to_db("zero trust architecture", "fact", 5)
+        assert entry_id in bm25_index.score(conn, "zero trust")
+        assert bm25_index.sync(conn) == {"added": 0, "removed": 0}
+
+    def test_consolidation_merge_reindexes(self, memory_db, conn, monkeypatch):
+        from tools.memory import memory_consolidation
+        monkeypatch.setattr(memory_consolidation, "DB_PATH", memory_db)
+        consolidator = memory_consolidation.MemoryConsolidator(use_llm=False)
+        consolidator.execute_consolidation(
+            "MERGE", "x", target_id=4, merged_content="weekly fedramp status meeting",
+        )
+        assert 4 in bm25_index.score(conn, "fedramp")
+
+
+class TestHybridIntegration:
+    def test_bm25_search_uses_index(self, memory_db, monkeypatch):
+        from tools.memory import hybrid_search
+        monkeypatch.setattr(hybrid_search, "DB_PATH", memory_db)
+        entries = hybrid_search.get_all_entries()
+        scores = hybrid_search.bm25_search("remediation plan", entries)
+        assert max(scores) == pytest.approx(1.0)
+        assert scores[2] == pytest.approx(1.0)
+        assert scores[1] == 0.0
@@ -3,18 +3,25 @@
 """Tests for tools.compat.db_utils — centralized DB path resolution."""
 
 import os
+import sqlite3
 import sys
+import threading
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from tools.compat.db_utils import (
+from tools.compat import db_utils  # noqa: E402
+from tools.compat.db_utils import (  # noqa: E402
+    ConnectionPool,
+    get_db_connection,
     get_icdev_db_path,
     get_memory_db_path,
     get_platform_db_path,
+    get_pool_metrics,
     get_project_root,
+    pooled_connection,
 )
 
 
@@ -129,3 +136,108 @@ class TestFallbackChainPriority:
         """None explicit should fall through to env/default."""
         with mock.patch.dict(os.environ, {"ICDEV_DB_PATH": "/env/db.db"}):
             assert get_icdev_db_path(None) == Path("/env/db.db")
+
+
+class TestConnectionPragmas:
+    """Connections get the standard tuned pragmas."""
+
+    def test_get_db_connection_applies_wal_and_pragmas(self, tmp_path):
+        conn = get_db_connection(tmp_path / "t.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+            cfg = db_utils.get_connection_config()
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == cfg["cache_size"]
+        finally:
+            conn.close()
+
+    def test_row_factory_preserved(self, tmp_path):
+        conn = get_db_connection(tmp_path / "t.db")
+        assert conn.row_factory is sqlite3.Row
+        conn.close()
+
+
+class TestConnectionPool:
+    """Pooled connections are reused, bounded and measured."""
+
+    @pytest.fixture(autouse=True)
+    def _isolate_pools(self):
+        db_utils.close_all_pools()
+        yield
+        db_utils.close_all_pools()
+
+    def test_connection_reused_across_checkouts(self, tmp_path):
+        db = tmp_path / "p.db"
+        with pooled_connection(db) as first:
+            first.execute("CREATE TABLE t (x)")
+            first.commit()
+        with pooled_connection(db) as second:
+            assert second is first
+            assert second.row_factory is sqlite3.Row
+        metrics = get_pool_metrics()[str(db.resolve())]
+        assert metrics["opened"] == 1 and metrics["checkouts"] == 2
+        assert metrics["idle"] == 1 and metrics["in_use"] == 0
+
+    def test_uncommitted_work_rolled_back_on_release(self, tmp_path):
+        db = tmp_path / "p.db"
+        with pooled_connection(db) as conn:
+            conn.execute("CREATE TABLE t (x)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pooled_connection(db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_pool_bounded_and_times_out(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "p.db", max_size=1, timeout=0.05)
+        held = pool.acquire()
+        with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+            pool.acquire()
+        assert pool.metrics()["timeouts"] == 1
+        pool.release(held)
+        assert pool.acquire() is held
+        pool.close()
+
+    def test_waiter_gets_released_connection(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "p.db", max_size=1, timeout=5)
+        held = pool.acquire()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+        waiter.start()
+        pool.release(held)
+        waiter.join(timeout=5)
+        assert got == [held]
+        assert pool.metrics()["wait_seconds_max"] > 0
+        pool.close()
+
+    def test_stale_identity_discarded(self, tmp_path):
+        db = tmp_path / "p.db"
+        pool = ConnectionPool(db, max_size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        os.replace(str(tmp_path / "p.db"), str(tmp_path / "moved.db"))
+        sqlite3.connect(str(db)).close()
+        assert pool.acquire() is not conn
+        assert pool.metrics()["closed"] == 1
+        pool.close()
+
+    def test_concurrent_writers(self, tmp_path):
+        db = tmp_path / "p.db"
+        with pooled_connection(db) as conn:
+            conn.execute("CREATE TABLE t (x)")
+            conn.commit()
+
+        def writer(n):
+            for i in range(25):
+                with pooled_connection(db) as c:
+                    c.execute("INSERT INTO t VALUES (?)", (n * 100 + i,))
+                    c.commit()
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with pooled_connection(db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 200
+        assert get_pool_metrics()[str(db.resolve())]["opened"] <= 8
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for the batched, checkpointed embedding backfill (tools/memory/embed_memory.py)."""
+
+import sqlite3
+import struct
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from tools.memory import embed_memory  # noqa: E402
+
+
+@pytest.fixture
+def memory_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "memory.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE memory_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            type TEXT DEFAULT 'event',
+            importance INTEGER DEFAULT 5,
+            embedding BLOB,
+            created_at TEXT DEFAULT (datetime('now')),
+            updated_at TEXT DEFAULT (datetime('now')),
+            user_id TEXT,
+            tenant_id TEXT
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO memory_entries (content, user_id) VALUES (?, ?)",
+        [(f"entry {i}", "alice" if i % 2 else "bob") for i in range(1, 51)],
+    )
+    conn.commit()
+    conn.close()
+    # Keep these tests off the real vector index and retry backoff
+    monkeypatch.setattr(embed_memory, "_update_vector_index", lambda rows, db_path=None: None)
+    monkeypatch.setattr(embed_memory, "load_backfill_config", lambda: {
+        **embed_memory.DEFAULT_CONFIG, "retry_base_delay": 0, "page_size": 7,
+    })
+    return db_path
+
+
+class BatchProvider:
+    """Mock provider exposing the embed_batch interface."""
+
+    provider_name = "openai"
+
+    def __init__(self, fail_on=None, fail_times=0):
+        self.calls = []
+        self.single_calls = 0
+        self.fail_on = fail_on or set()
+        self.fail_times = fail_times
+        self._lock = threading.Lock()
+
+    def embed(self, text):
+        self.single_calls += 1
+        return [1.0, 0.0]
+
+    def embed_batch(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+            if self.fail_on & set(texts):
+                if self.fail_times:
+                    self.fail_times -= 1
+                    raise ConnectionError("transient")
+                if self.fail_times == 0 and "permanent" in self.fail_on:
+                    raise ConnectionError("permanent")
+        return [[float(t.split()[-1]), 1.0] for t in texts]
+
+
+def _embeddings(db_path):
+    conn = sqlite3.connect(str(db_path))
+    rows = conn.execute("SELECT id, embedding FROM memory_entries ORDER BY id").fetchall()
+    conn.close()
+    return {
+        r[0]: (list(struct.unpack(f"{len(r[1]) // 4}f", r[1])) if r[1] else None)
+        for r in rows
+    }
+
+
+class TestBackfill:
+    def test_uses_embed_batch_not_per_text(self, memory_db):
+        provider = BatchProvider()
+        result = embed_memory.backfill(db_path=memory_db, client=provider, batch_size=10)
+        assert result["embedded"] == 50
+        assert provider.single_calls == 0
+        assert max(len(c) for c in provider.calls) == 10
+        embs = _embeddings(memory_db)
+        assert all(embs[i][0] == float(i) for i in embs)
+
+    def test_concurrent_workers_write_every_row(self, memory_db):
+        provider = BatchProvider()
+        result = embed_memory.backfill(db_path=memory_db, client=provider,
+                                       max_workers=4, batch_size=3)
+        assert result["embedded"] == 50 and result["failed"] == 0
+        assert sum(len(c) for c in provider.calls) == 50
+        assert None not in _embeddings(memory_db).values()
+
+    def test_provider_specific_batch_size(self):
+        config = embed_memory.DEFAULT_CONFIG
+        assert embed_memory.batch_size_for(BatchProvider(), config) == 256
+
+        class Titan(BatchProvider):
+            provider_name = "bedrock"
+
+        assert embed_memory.batch_size_for(Titan(), config) == 16
+
+    def test_transient_failure_retried(self, memory_db):
+        provider = BatchProvider(fail_on={"entry 5"}, fail_times=2)
+        result = embed_memory.backfill(db_path=memory_db, client=provider, batch_size=10)
+        assert result["embedded"] == 50
+        assert result["errors"] == 0
+
+    def test_failed_batch_recorded_and_run_continues(self, memory_db):
+        provider = BatchProvider(fail_on={"entry 5", "permanent"})
+        result = embed_memory.backfill(db_path=memory_db, client=provider, batch_size=10)
+        assert result["errors"] == 1
+        assert result["embedded"] == 40
+        checkpoint = embed_memory.get_checkpoint(memory_db, result["run_id"])
+        assert checkpoint["status"] == "completed"
+        assert checkpoint["failed_ids"] == list(range(1, 11))
+        assert checkpoint["last_id"] == 50
+
+    def test_none_vectors_count_as_failed(self, memory_db):
+        class Partial(BatchProvider):
+            def embed_batch(self, texts):
+                return [None if t == "entry 3" else [1.0, 1.0] for t in texts]
+
+        result = embed_memory.backfill(db_path=memory_db, client=Partial(), batch_size=10)
+        assert result["failed"] == 1
+        assert _embeddings(memory_db)[3] is None
+
+    def test_user_scope(self, memory_db):
+        result = embed_memory.backfill(db_path=memory_db, client=BatchProvider(), user_id="alice")
+        assert result["embedded"] == 25
+        embs = _embeddings(memory_db)
+        assert embs[2] is None and embs[1] is not None
+
+
+class TestResume:
+    def test_resume_skips_committed_work(self, memory_db):
+        provider = BatchProvider()
+        calls = {"n": 0}
+
+        def interrupt(embedded, failed):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            embed_memory.backfill(db_path=memory_db, client=provider, max_workers=1,
+                                  batch_size=10, progress=interrupt)
+        checkpoint = embed_memory.get_checkpoint(memory_db)
+        assert checkpoint["status"] == "interrupted"
+        assert checkpoint["last_id"] == 20 and checkpoint["embedded"] == 20
+
+        resumed = BatchProvider()
+        result = embed_memory.backfill(db_path=memory_db, client=resumed, batch_size=10, resume=True)
+        assert result["run_id"] == checkpoint["run_id"]
+        assert result["embedded"] == 50
+        assert min(int(t.split()[-1]) for c in resumed.calls for t in c) == 21
+        assert embed_memory.get_checkpoint(memory_db)["status"] == "completed"
+
+    def test_resume_does_not_retry_failed_rows(self, memory_db):
+        embed_memory.backfill(db_path=memory_db, client=BatchProvider(fail_on={"entry 5", "permanent"}),
+                              batch_size=10)
+        # Simulate an unfinished run so --resume picks it up
+        conn = sqlite3.connect(str(memory_db))
+        conn.execute("UPDATE memory_embed_checkpoints SET status = 'failed'")
+        conn.commit()
+        conn.close()
+        resumed = BatchProvider()
+        result = embed_memory.backfill(db_path=memory_db, client=resumed, resume=True)
+        assert resumed.calls == []
+        assert result["total_unembedded"] == 0
+
+        fresh = BatchProvider()
+        embed_memory.backfill(db_path=memory_db, client=fresh)
+        assert sorted(int(t.split()[-1]) for c in fresh.calls for t in c) == list(range(1, 11))
+
+
+class TestMaintenanceCron:
+    def test_embed_unembedded_delegates(self, memory_db, monkeypatch):
+        from tools.memory import maintenance_cron
+        provider = BatchProvider()
+        monkeypatch.setattr("tools.llm.get_embedding_provider", lambda: provider)
+        result = maintenance_cron.embed_unembedded(db_path=memory_db)
+        assert result["embedded"] == 50
+        assert result["total_unembedded"] == 50
+        assert result["provider"] == "llm_provider"
+        assert provider.single_calls == 0
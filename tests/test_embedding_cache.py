@@ -0,0 +1,172 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for the content-hash embedding cache (tools/llm/embedding_cache.py)."""
+
+import pytest
+
+from tools.llm import embedding_cache
+from tools.llm.embedding_cache import CachedEmbeddingProvider, EmbeddingCache
+from tools.llm.provider import EmbeddingProvider
+
+
+class CountingProvider(EmbeddingProvider):
+    """Deterministic provider that counts texts sent to the 'API'."""
+
+    def __init__(self, model_id="test-embed", dims=3):
+        self._model_id = model_id
+        self._dims = dims
+        self.embedded = []
+
+    @property
+    def provider_name(self):
+        return "openai"
+
+    @property
+    def dimensions(self):
+        return self._dims
+
+    def embed(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 1.0, 0.5]
+
+    def embed_batch(self, texts):
+        self.embedded.extend(texts)
+        return [None if t == "bad" else [float(len(t)), 1.0, 0.5] for t in texts]
+
+    def check_availability(self):
+        return True
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = EmbeddingCache(db_path=tmp_path / "embedding_cache.db", max_memory_entries=100)
+    yield c
+    c.close()
+
+
+class TestEmbeddingCache:
+    def test_round_trip_and_key_isolation(self, cache):
+        cache.put("openai", "m1", 3, "hello", [1.0, 2.0, 3.0])
+        assert cache.get("openai", "m1", 3, "hello") == [1.0, 2.0, 3.0]
+        assert cache.get("openai", "m2", 3, "hello") is None
+        assert cache.get("gemini", "m1", 3, "hello") is None
+        assert cache.get("openai", "m1", 768, "hello") is None
+
+    def test_disk_tier_survives_new_process(self, tmp_path, cache):
+        cache.put("openai", "m1", 3, "persist me", [0.25, 0.5, 0.75])
+        fresh = EmbeddingCache(db_path=tmp_path / "embedding_cache.db")
+        assert fresh.get("openai", "m1", 3, "persist me") == [0.25, 0.5, 0.75]
+        assert fresh.stats["disk_hits"] == 1
+        assert fresh.get("openai", "m1", 3, "persist me") == [0.25, 0.5, 0.75]
+        assert fresh.stats["memory_hits"] == 1
+        fresh.close()
+
+    def test_lru_eviction(self, tmp_path):
+        small = EmbeddingCache(db_path=None, max_memory_entries=2)
+        for text in ("a", "b", "c"):
+            small.put("p", "m", 1, text, [1.0])
+        assert small.get("p", "m", 1, "a") is None
+        assert small.get("p", "m", 1, "c") == [1.0]
+
+    def test_disk_tier_trimmed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(embedding_cache, "_PRUNE_EVERY", 1)
+        c = EmbeddingCache(db_path=tmp_path / "c.db", max_memory_entries=0, max_disk_entries=3)
+        for i in range(6):
+            c.put("p", "m", 1, f"t{i}", [float(i)])
+        assert c.status()["disk_entries"] == 3
+        assert c.get("p", "m", 1, "t0") is None
+        assert c.get("p", "m", 1, "t5") == [5.0]
+        c.close()
+
+    def test_reads_do_not_create_db(self, tmp_path):
+        c = EmbeddingCache(db_path=tmp_path / "never.db")
+        assert c.get("p", "m", 1, "x") is None
+        assert not (tmp_path / "never.db").exists()
+
+
+class TestCachedProvider:
+    def test_repeated_query_costs_one_call(self, cache):
+        inner = CountingProvider()
+        provider = CachedEmbeddingProvider(inner, cache)
+        first = provider.embed("stig findings")
+        assert provider.embed("stig findings") == first
+        assert inner.embedded == ["stig findings"]
+
+    def test_batch_only_sends_misses_once(self, cache):
+        inner = CountingProvider()
+        provider = CachedEmbeddingProvider(inner, cache)
+        provider.embed("alpha")
+        vectors = provider.embed_batch(["alpha", "beta", "beta", "gamma"])
+        assert inner.embedded == ["alpha", "beta", "gamma"]
+        assert vectors[1] == vectors[2] == [4.0, 1.0, 0.5]
+        assert provider.embed_batch(["gamma", "beta"]) == [[5.0, 1.0, 0.5], [4.0, 1.0, 0.5]]
+        assert len(inner.embedded) == 3
+
+    def test_failures_not_cached(self, cache):
+        inner = CountingProvider()
+        provider = CachedEmbeddingProvider(inner, cache)
+        assert provider.embed_batch(["bad", "ok"])[0] is None
+        provider.embed_batch(["bad"])
+        assert inner.embedded.count("bad") == 2
+
+    def test_model_is_part_of_key(self, cache):
+        a = CachedEmbeddingProvider(CountingProvider(model_id="small"), cache)
+        b = CachedEmbeddingProvider(CountingProvider(model_id="large"), cache)
+        a.embed("same text")
+        b.embed("same text")
+        assert b.inner.embedded == ["same text"]
+
+    def test_passthrough_attributes(self, cache):
+        provider = CachedEmbeddingProvider(CountingProvider(), cache)
+        assert provider.provider_name == "openai"
+        assert provider.dimensions == 3
+        assert provider.model_id == "test-embed"
+        assert provider._model_id == "test-embed"
+        assert provider.check_availability()
+
+
+class TestSharedConsumers:
+    def test_router_wraps_embedding_provider(self, tmp_path, monkeypatch):
+        from tools.llm.router import LLMRouter
+        monkeypatch.setattr(embedding_cache, "_cache_instance", None)
+        monkeypatch.setenv("ICDEV_EMBEDDING_CACHE_DB", str(tmp_path / "shared.db"))
+        router = LLMRouter.__new__(LLMRouter)
+        router._config = {
+            "providers": {"ollama": {"type": "openai_compatible",
+                                     "base_url": "http://localhost:11434/v1"}},
+            "embeddings": {
+                "default_chain": ["nomic"],
+                "models": {"nomic": {"provider": "ollama", "model_id": "nomic-embed-text",
+                                     "dimensions": 768}},
+            },
+        }
+        router._embedding_providers = {}
+        from tools.llm.embedding_provider import OpenAIEmbeddingProvider
+        monkeypatch.setattr(OpenAIEmbeddingProvider, "check_availability", lambda self: True)
+        provider = router.get_embedding_provider()
+        assert isinstance(provider, CachedEmbeddingProvider)
+        assert (provider.provider_name, provider.model_id) == ("local", "nomic-embed-text")
+
+    def test_marketplace_reuses_cached_vector(self, tmp_path, monkeypatch):
+        from tools.marketplace import search_engine
+        monkeypatch.setattr(embedding_cache, "_cache_instance", None)
+        monkeypatch.setenv("ICDEV_EMBEDDING_CACHE_DB", str(tmp_path / "shared.db"))
+        calls = []
+
+        def fake_ollama(text):
+            calls.append(text)
+            return [0.1] * search_engine.OLLAMA_EMBED_DIMS
+
+        monkeypatch.setattr(search_engine, "_generate_embedding_ollama", fake_ollama)
+        first = search_engine.generate_embedding("STIG checker for Oracle")
+        second = search_engine.generate_embedding("STIG checker for Oracle")
+        assert calls == ["STIG checker for Oracle"]
+        assert second[1:] == first[1:] == ("nomic-embed-text", 768)
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("ICDEV_EMBEDDING_CACHE", "off")
+        inner = CountingProvider()
+        assert embedding_cache.with_cache(inner) is inner
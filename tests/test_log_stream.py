@@ -0,0 +1,199 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.monitor.log_analyzer — streaming log analysis and pattern matcher.
+
+Run: pytest tests/test_log_stream.py -v
+"""
+
+import gzip
+import json
+import random
+import re
+
+from tools.monitor import log_analyzer
+from tools.monitor.log_analyzer import (
+    DEFAULT_PATTERNS,
+    LogPatternMatcher,
+    LogStreamAnalyzer,
+    _TopCounter,
+    analyze_logs,
+    get_pattern_matcher,
+    iter_log_file,
+    search_patterns,
+)
+from tools.monitor.log_benchmark import run_benchmark
+
+
+def _per_pattern_scan(log_data, patterns):
+    """The original search: one full pass per compiled pattern."""
+    results = []
+    for pattern in patterns:
+        if not pattern.get("regex"):
+            continue
+        compiled = re.compile(pattern["regex"], re.IGNORECASE)
+        matches = [
+            msg[:200] for msg in (
+                e.get("message") or e.get("msg") or e.get("_raw") or "" for e in log_data)
+            if compiled.search(msg)
+        ]
+        if matches:
+            results.append({"name": pattern.get("name", "unknown"), "regex": pattern["regex"],
+                            "count": len(matches), "sample_messages": matches[:5]})
+    results.sort(key=lambda r: r["count"], reverse=True)
+    return results
+
+
+FRAGMENTS = ["Connection REFUSED", "timed out", "NoneType", "oom", "HTTP 401", "ssl",
+             "TLS Handshake", "429", "lock timeout", "ok", "ſsl", "K", "Ünïcode", "deadlock"]
+
+
+class TestMatcher:
+    def test_matches_per_pattern_scan(self):
+        rng = random.Random(5)
+        patterns = DEFAULT_PATTERNS + [{"name": "Kelvin", "regex": r"K\d"},
+                                       {"name": "Codes", "regex": r"[A-Z]{3}\d+"},
+                                       {"name": "Blank", "regex": ""}]
+        for _ in range(200):
+            logs = [{"message": " ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 5)))
+                     + f" K{rng.randint(0, 9)}"} for _ in range(rng.randint(0, 25))]
+            logs += [{"msg": "deadlock found"}, {"_raw": "SSL error"}, {}]
+            for pats in (DEFAULT_PATTERNS, patterns):
+                assert search_patterns(iter(logs), pats) == _per_pattern_scan(logs, pats)
+
+    def test_anchor_prefilter_skips_regexes(self):
+        calls = []
+
+        class Spy:
+            def __init__(self, compiled):
+                self.compiled = compiled
+
+            def search(self, message):
+                calls.append(message)
+                return self.compiled.search(message)
+
+        matcher = LogPatternMatcher(DEFAULT_PATTERNS)
+        matcher.patterns = [(name, regex, Spy(compiled))
+                            for name, regex, compiled in matcher.patterns]
+        assert matcher.matches("request served in 12ms") == []
+        assert calls == []
+        assert [matcher.patterns[i][0] for i in matcher.matches("Connection refused")] == [
+            "ConnectionRefused"]
+        assert len(calls) == 1
+
+    def test_matcher_is_shared(self):
+        assert get_pattern_matcher() is get_pattern_matcher(DEFAULT_PATTERNS)
+
+
+class TestFileIngestion:
+    def test_plain_jsonl_and_gzip(self, tmp_path):
+        lines = [
+            json.dumps({"message": "a", "level": "ERROR"}),
+            json.dumps({"result": {"_raw": "b"}}),
+            json.dumps({"_source": {"msg": "c"}}),
+            "",
+            "plain text line",
+            "{not json",
+        ]
+        plain = tmp_path / "export.jsonl"
+        plain.write_text("\n".join(lines) + "\n")
+        packed = tmp_path / "export.jsonl.gz"
+        with gzip.open(packed, "wt") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+        expected = [{"message": "a", "level": "ERROR"}, {"_raw": "b"}, {"msg": "c"},
+                    {"message": "plain text line"}, {"message": "{not json"}]
+        assert list(iter_log_file(plain)) == expected
+        assert list(iter_log_file(packed)) == expected
+
+    def test_analyze_file_source(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("Connection refused 1\nConnection refused 2\nall good\n")
+        result = analyze_logs("file", "", "24h", log_file=str(path))
+        assert result["total_logs"] == 3
+        assert result["source_results"]["file"] == {"total_hits": 3, "error": None}
+        assert result["matched_patterns"][0]["name"] == "ConnectionRefused"
+        assert result["top_messages"] == [{"message": "Connection refused N", "count": 2}]
+
+    def test_missing_file_is_reported(self, tmp_path):
+        result = analyze_logs("file", "", "24h", log_file=str(tmp_path / "missing.log"))
+        assert result["total_logs"] == 0
+        assert result["source_results"]["file"]["error"]
+
+
+class TestBoundedState:
+    def test_samples_and_top_messages_are_bounded(self):
+        analyzer = LogStreamAnalyzer(top_capacity=10)
+        analyzer.add_many({"message": "timed out waiting for job " + "".join(
+                              chr(97 + (i // 26 ** k) % 26) for k in range(3))}
+                          for i in range(5000))
+        analyzer.add_many({"message": "disk full"} for _ in range(50))
+        patterns = {p["name"]: p for p in analyzer.matched_patterns()}
+        assert patterns["Timeout"]["count"] == 5000
+        assert len(patterns["Timeout"]["sample_messages"]) == 5
+        assert len(analyzer._messages.counts) < 20
+        assert analyzer.top_messages()[0] == {"message": "disk full", "count": 50}
+
+    def test_top_counter_exact_below_capacity(self):
+        counter = _TopCounter(capacity=4)
+        for key in "aabbbcd":
+            counter.add(key)
+        assert counter.most_common(2) == [("b", 3), ("a", 2)]
+        assert counter.pruned is False
+
+    def test_analyzer_streams_backend_pages(self, monkeypatch):
+        records = [{"message": "Connection refused", "level": "error",
+                    "@timestamp": "2026-01-01T00:00:00Z"}] * 3
+
+        def fake_hits(*args, status=None, **kwargs):
+            status["total_hits"] = 3
+            yield from records
+
+        monkeypatch.setattr(log_analyzer, "iter_elk_hits", fake_hits)
+        result = analyze_logs("elk", "q", "24h")
+        assert result["total_logs"] == 3
+        assert result["error_rate"] == 1.0
+        assert result["source_results"]["elk"] == {"total_hits": 3, "error": None}
+
+
+    def test_elk_pages_with_search_after(self, monkeypatch):
+        bodies = []
+        docs = [{"message": f"m{i}"} for i in range(5)]
+
+        class Response:
+            def __init__(self, payload):
+                self.payload = payload
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def read(self):
+                return json.dumps(self.payload).encode("utf-8")
+
+        def fake_urlopen(req, timeout=None):
+            body = json.loads(req.data)
+            bodies.append(body)
+            start = body.get("search_after", [-1])[0] + 1
+            page = [{"_source": docs[i], "sort": [i]}
+                    for i in range(start, min(start + body["size"], len(docs)))]
+            return Response({"took": 1, "hits": {"total": {"value": 5}, "hits": page}})
+
+        monkeypatch.setattr(log_analyzer.urllib.request, "urlopen", fake_urlopen)
+        status = {}
+        hits = list(log_analyzer.iter_elk_hits("app-*", "", "1h", page_size=2, status=status))
+        assert hits == docs
+        assert [b.get("search_after") for b in bodies] == [None, [1], [3]]
+        assert status == {"total_hits": 5, "took_ms": 3}
+        assert log_analyzer._query_elk("app-*", "", "1h", size=3)["hits"] == docs[:3]
+
+
+class TestBenchmark:
+    def test_benchmark_paths_agree(self):
+        result = run_benchmark(records=2000, trace_memory=False)
+        assert result["results_match"] is True
+        assert result["streaming"]["analysis"]["pattern_counts"]
@@ -0,0 +1,288 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.mbse.stream_import — streaming XMI and ReqIF importers.
+
+Run: pytest tests/test_mbse_stream_import.py -v
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from tools.mbse import reqif_parser, xmi_parser
+from tools.mbse.stream_import import XmlStream, bulk_insert, local_name
+
+MODEL_XMI = """<?xml version="1.0" encoding="UTF-8"?>
+<xmi:XMI xmi:version="2.5" xmlns:xmi="http://www.omg.org/spec/XMI/20131001"
+    xmlns:uml="http://www.omg.org/spec/UML/20131001"
+    xmlns:sysml="http://www.omg.org/spec/SysML/20181001">
+  <uml:Model xmi:id="model" name="Model">
+    <packagedElement xmi:type="uml:Package" xmi:id="pkg1" name="Vehicle">
+      <packagedElement xmi:type="uml:Class" xmi:id="blk1" name="Engine">
+        <ownedComment xmi:id="c1"><body>Provides thrust</body></ownedComment>
+        <ownedAttribute xmi:id="a1" name="rpm"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:Class" xmi:id="blk2" name="Turbo">
+        <generalization xmi:id="g1" general="blk1"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:Class" xmi:id="ib1" name="FuelPort"/>
+      <packagedElement xmi:type="uml:Class" xmi:id="req1" name="Thrust"/>
+      <packagedElement xmi:type="uml:Association" xmi:id="as1">
+        <ownedEnd xmi:id="e1" type="blk1" aggregation="composite"/>
+        <ownedEnd xmi:id="e2" type="blk2"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:Abstraction" xmi:id="sat1" client="blk1" supplier="req1"/>
+      <packagedElement xmi:type="uml:Dependency" xmi:id="dep1" client="blk2" supplier="ib1"/>
+      <packagedElement xmi:type="uml:Activity" xmi:id="act1" name="Start">
+        <node xmi:type="uml:OpaqueAction" xmi:id="n1" name="Ignite"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:StateMachine" xmi:id="sm1" name="Modes">
+        <region xmi:id="r1">
+          <subvertex xmi:type="uml:State" xmi:id="s1" name="Off"/>
+          <subvertex xmi:type="uml:State" xmi:id="s2" name="On"/>
+          <transition xmi:id="t1" source="s1" target="s2"/>
+        </region>
+      </packagedElement>
+      <packagedElement xmi:type="uml:UseCase" xmi:id="uc1" name="Drive"/>
+      <packagedElement xmi:type="uml:Actor" xmi:id="ac1" name="Driver"/>
+    </packagedElement>
+  </uml:Model>
+  <sysml:Block xmi:id="st1" base_Class="blk1"/>
+  <sysml:Block xmi:id="st1b" base_Class="blk2"/>
+  <sysml:InterfaceBlock xmi:id="st2" base_Class="ib1"/>
+  <sysml:Requirement xmi:id="st3" base_Class="req1" id="R-1" text="Shall produce thrust"/>
+  <sysml:Satisfy xmi:id="st4" base_Abstraction="sat1"/>
+  <sysml:Verify xmi:id="st5" base_Dependency="dep1"/>
+</xmi:XMI>
+"""
+
+
+def _reqif_object(identifier, name, foreign_id=None):
+    values = ""
+    if foreign_id:
+        values = (
+            "<VALUES><ATTRIBUTE-VALUE-STRING THE-VALUE=\"%s\"><DEFINITION>"
+            "<ATTRIBUTE-DEFINITION-STRING-REF>ad-fid</ATTRIBUTE-DEFINITION-STRING-REF>"
+            "</DEFINITION></ATTRIBUTE-VALUE-STRING></VALUES>" % foreign_id
+        )
+    return (
+        f'<SPEC-OBJECT IDENTIFIER="{identifier}" LONG-NAME="{name}"><TYPE>'
+        f"<SPEC-OBJECT-TYPE-REF>sot-req</SPEC-OBJECT-TYPE-REF></TYPE>{values}</SPEC-OBJECT>"
+    )
+
+
+def _reqif_document(objects_first=False):
+    types = """
+      <DATATYPES>
+        <DATATYPE-DEFINITION-STRING IDENTIFIER="dt-str" LONG-NAME="String"/>
+      </DATATYPES>
+      <SPEC-TYPES>
+        <SPEC-OBJECT-TYPE IDENTIFIER="sot-req" LONG-NAME="Requirement">
+          <SPEC-ATTRIBUTES>
+            <ATTRIBUTE-DEFINITION-STRING IDENTIFIER="ad-fid" LONG-NAME="ReqIF.ForeignID">
+              <TYPE><DATATYPE-DEFINITION-STRING-REF>dt-str</DATATYPE-DEFINITION-STRING-REF></TYPE>
+            </ATTRIBUTE-DEFINITION-STRING>
+          </SPEC-ATTRIBUTES>
+        </SPEC-OBJECT-TYPE>
+      </SPEC-TYPES>"""
+    objects = "<SPEC-OBJECTS>%s</SPEC-OBJECTS>" % "".join([
+        _reqif_object("so-3", "Grandchild"),
+        _reqif_object("so-2", "Child", "SYS-2"),
+        _reqif_object("so-1", "Top", "SYS-1"),
+    ])
+    rest = """
+      <SPEC-RELATIONS>
+        <SPEC-RELATION IDENTIFIER="rel-1">
+          <SOURCE><SPEC-OBJECT-REF>so-2</SPEC-OBJECT-REF></SOURCE>
+          <TARGET><SPEC-OBJECT-REF>so-1</SPEC-OBJECT-REF></TARGET>
+        </SPEC-RELATION>
+      </SPEC-RELATIONS>
+      <SPECIFICATIONS>
+        <SPECIFICATION IDENTIFIER="spec-1" LONG-NAME="System Requirements">
+          <CHILDREN>
+            <SPEC-HIERARCHY IDENTIFIER="h-1"><OBJECT><SPEC-OBJECT-REF>so-1</SPEC-OBJECT-REF></OBJECT>
+              <CHILDREN>
+                <SPEC-HIERARCHY IDENTIFIER="h-2"><OBJECT><SPEC-OBJECT-REF>so-2</SPEC-OBJECT-REF></OBJECT>
+                  <CHILDREN>
+                    <SPEC-HIERARCHY IDENTIFIER="h-3"><OBJECT><SPEC-OBJECT-REF>so-3</SPEC-OBJECT-REF></OBJECT></SPEC-HIERARCHY>
+                  </CHILDREN>
+                </SPEC-HIERARCHY>
+              </CHILDREN>
+            </SPEC-HIERARCHY>
+          </CHILDREN>
+        </SPECIFICATION>
+      </SPECIFICATIONS>"""
+    content = objects + types if objects_first else types + objects
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<REQ-IF xmlns="http://www.omg.org/spec/ReqIF/20110401/reqif.xsd">'
+        '<THE-HEADER><REQ-IF-HEADER IDENTIFIER="hdr" TITLE="Vehicle"/></THE-HEADER>'
+        f"<CORE-CONTENT><REQ-IF-CONTENT>{content}{rest}</REQ-IF-CONTENT></CORE-CONTENT>"
+        "</REQ-IF>\n"
+    )
+
+
+@pytest.fixture
+def mbse_db(tmp_path):
+    db_path = tmp_path / "icdev.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE sysml_elements (
+            id TEXT PRIMARY KEY, project_id TEXT NOT NULL, xmi_id TEXT NOT NULL,
+            element_type TEXT NOT NULL CHECK(element_type != 'actor'),
+            name TEXT NOT NULL, qualified_name TEXT, parent_id TEXT, stereotype TEXT,
+            description TEXT, properties TEXT, diagram_type TEXT,
+            source_file TEXT NOT NULL, source_hash TEXT NOT NULL,
+            imported_at TEXT, updated_at TEXT, UNIQUE(project_id, xmi_id)
+        );
+        CREATE TABLE sysml_relationships (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT NOT NULL,
+            source_element_id TEXT NOT NULL, target_element_id TEXT NOT NULL,
+            relationship_type TEXT NOT NULL, name TEXT, properties TEXT, source_file TEXT,
+            UNIQUE(project_id, source_element_id, target_element_id, relationship_type)
+        );
+        CREATE TABLE doors_requirements (
+            id TEXT PRIMARY KEY, project_id TEXT NOT NULL, doors_id TEXT NOT NULL,
+            module_name TEXT, requirement_type TEXT, title TEXT NOT NULL, description TEXT,
+            priority TEXT, status TEXT DEFAULT 'active', parent_req_id TEXT,
+            source_file TEXT NOT NULL, source_hash TEXT NOT NULL,
+            imported_at TEXT, updated_at TEXT, UNIQUE(project_id, doors_id)
+        );
+        CREATE TABLE digital_thread_links (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT NOT NULL,
+            source_type TEXT, source_id TEXT, target_type TEXT, target_id TEXT,
+            link_type TEXT, confidence REAL, evidence TEXT, created_by TEXT, created_at TEXT,
+            UNIQUE(project_id, source_type, source_id, target_type, target_id, link_type)
+        );
+        CREATE TABLE model_imports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT, import_type TEXT,
+            source_file TEXT, source_hash TEXT, elements_imported INTEGER,
+            relationships_imported INTEGER, errors INTEGER, error_details TEXT,
+            status TEXT, imported_by TEXT, imported_at TEXT
+        );
+        CREATE TABLE audit_trail (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT, event_type TEXT,
+            actor TEXT, action TEXT, details TEXT, affected_files TEXT, classification TEXT
+        );
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def model_xmi(tmp_path):
+    path = tmp_path / "model.xmi"
+    path.write_text(MODEL_XMI, encoding="utf-8")
+    return path
+
+
+class TestStreamHelpers:
+    def test_hash_matches_full_read_and_release_detaches(self, model_xmi):
+        stream = XmlStream(model_xmi)
+        ends = 0
+        for event, elem in stream:
+            if event == "end" and local_name(elem.tag) == "packagedElement":
+                ends += 1
+                stream.release(elem)
+                assert len(elem) == 0
+        assert ends == 12
+        assert stream.file_hash == xmi_parser._file_hash(str(model_xmi))
+        assert "http://www.omg.org/spec/SysML/20181001" in stream.namespace_uris
+
+    def test_bulk_insert_falls_back_to_rows(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (k TEXT UNIQUE, v INTEGER NOT NULL)")
+        errors = []
+        stored = bulk_insert(conn, "INSERT INTO t VALUES (?, ?)",
+                             [("a", 1), ("b", None), ("c", 3)],
+                             lambda row: f"Row '{row[0]}'", errors)
+        assert stored == 2
+        assert [r[0] for r in conn.execute("SELECT k FROM t ORDER BY k")] == ["a", "c"]
+        assert len(errors) == 1 and errors[0].startswith("Row 'b': NOT NULL")
+        assert bulk_insert(conn, "INSERT INTO t VALUES (?, ?)", [], str, errors) == 0
+
+
+class TestXmi:
+    def test_parse_classifies_elements_and_relationships(self, model_xmi):
+        parsed = xmi_parser.parse_xmi(str(model_xmi))
+        by_xmi = {e["xmi_id"]: e for e in parsed["elements"]}
+        assert by_xmi["blk1"]["element_type"] == "block"
+        assert by_xmi["blk1"]["qualified_name"] == "Model::Vehicle::Engine"
+        assert by_xmi["blk1"]["description"] == "Provides thrust"
+        assert by_xmi["ib1"]["element_type"] == "interface_block"
+        assert by_xmi["req1"]["element_type"] == "requirement"
+        assert (by_xmi["act1"]["element_type"], by_xmi["sm1"]["element_type"]) == (
+            "activity", "state_machine")
+        assert (by_xmi["uc1"]["element_type"], by_xmi["ac1"]["element_type"]) == (
+            "use_case", "actor")
+
+        ids = {e["id"]: e["xmi_id"] for e in parsed["elements"]}
+        rels = {(ids[r["source_element_id"]], ids[r["target_element_id"]]): r["relationship_type"]
+                for r in parsed["relationships"]}
+        assert rels == {
+            ("blk1", "blk2"): "composition",
+            ("blk2", "blk1"): "generalization",
+            ("blk1", "req1"): "satisfy",
+            ("blk2", "ib1"): "verify",
+        }
+        assert parsed["metadata"]["file_hash"] == xmi_parser._file_hash(str(model_xmi))
+
+    def test_validate_reports_structure_errors(self, model_xmi, tmp_path):
+        result = xmi_parser.validate_xmi(str(model_xmi))
+        assert result["valid"] and result["errors"] == []
+        broken = tmp_path / "broken.xmi"
+        broken.write_text("<xmi:XMI", encoding="utf-8")
+        assert not xmi_parser.validate_xmi(str(broken))["valid"]
+        assert not xmi_parser.validate_xmi(str(tmp_path / "missing.xmi"))["valid"]
+
+    def test_import_skips_only_rejected_rows(self, model_xmi, mbse_db):
+        result = xmi_parser.import_xmi("proj-1", str(model_xmi), db_path=str(mbse_db))
+        assert result["status"] == "partial"
+        assert result["elements_imported"] == 8
+        assert result["relationships_imported"] == 4
+        conn = sqlite3.connect(str(mbse_db))
+        try:
+            details = json.loads(conn.execute(
+                "SELECT error_details FROM model_imports").fetchone()[0])
+            assert len(details) == 1 and details[0].startswith("Element 'Driver'")
+            assert conn.execute("SELECT COUNT(*) FROM sysml_elements").fetchone()[0] == 8
+        finally:
+            conn.close()
+
+
+class TestReqif:
+    def test_objects_before_types_parse_identically(self, tmp_path):
+        ordered = tmp_path / "ordered.reqif"
+        ordered.write_text(_reqif_document(), encoding="utf-8")
+        reversed_ = tmp_path / "reversed.reqif"
+        reversed_.write_text(_reqif_document(objects_first=True), encoding="utf-8")
+        a = reqif_parser.parse_reqif(str(ordered))
+        b = reqif_parser.parse_reqif(str(reversed_))
+        assert [r["doors_id"] for r in a["requirements"]] == ["so-3", "SYS-2", "SYS-1"]
+        assert a["requirements"] == b["requirements"]
+        assert a["relations"] == b["relations"]
+        assert reqif_parser.validate_reqif(str(ordered)) == {
+            "valid": True, "errors": [], "spec_count": 1, "object_count": 3}
+
+    def test_import_resolves_parents_and_relations(self, tmp_path, mbse_db):
+        path = tmp_path / "reqs.reqif"
+        path.write_text(_reqif_document(), encoding="utf-8")
+        result = reqif_parser.import_reqif("proj-1", str(path), db_path=str(mbse_db))
+        assert result["status"] == "completed"
+        assert (result["requirements_imported"], result["relations_imported"]) == (3, 1)
+        conn = sqlite3.connect(str(mbse_db))
+        try:
+            ids = dict(conn.execute("SELECT id, doors_id FROM doors_requirements"))
+            parents = {doors_id: ids.get(parent) for doors_id, parent in conn.execute(
+                "SELECT doors_id, parent_req_id FROM doors_requirements")}
+            assert parents == {"SYS-1": None, "SYS-2": "SYS-1", "so-3": "SYS-2"}
+            assert conn.execute(
+                "SELECT source_id, target_id FROM digital_thread_links").fetchall() == [
+                ("SYS-2", "SYS-1")]
+        finally:
+            conn.close()
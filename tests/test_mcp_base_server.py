@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for concurrent tools/call dispatch in tools/mcp/base_server.py.
+
+Drives MCPServer.run() with an in-memory message queue instead of stdin and
+captures the Content-Length framed responses written to stdout.
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.mcp import base_server  # noqa: E402
+from tools.mcp.base_server import MCPServer, request_cancelled  # noqa: E402
+
+
+class _Stdout:
+    """Collects framed responses; parsing fails if two frames interleave."""
+
+    def __init__(self):
+        self.raw = b""
+        self.lock = threading.Lock()
+
+    def write(self, data):
+        with self.lock:
+            self.raw += data
+
+    def flush(self):
+        pass
+
+    def responses(self):
+        out, data = [], self.raw
+        while data:
+            header, _, rest = data.partition(b"\r\n\r\n")
+            length = int(header.split(b":")[1])
+            out.append(json.loads(rest[:length]))
+            data = rest[length:]
+        return out
+
+    def wait_for(self, request_id, timeout=5):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if any(r.get("id") == request_id for r in self.responses()):
+                return True
+            time.sleep(0.01)
+        return False
+
+
+class QueueServer(MCPServer):
+    """MCPServer reading messages from a queue; None means EOF."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="test-mcp", **kwargs)
+        self.inbox = queue.Queue()
+
+    def _read_message(self):
+        return self.inbox.get()
+
+    def send(self, method, request_id=None, **params):
+        msg = {"jsonrpc": "2.0", "method": method, "params": params}
+        if request_id is not None:
+            msg["id"] = request_id
+        self.inbox.put(msg)
+
+
+@pytest.fixture
+def stdout(monkeypatch):
+    out = _Stdout()
+    # Installed by _start(): pytest re-binds sys.stdout between fixture setup and the test
+    out.install = lambda: monkeypatch.setattr(sys, "stdout", SimpleNamespace(buffer=out))
+    return out
+
+
+def _start(server, stdout):
+    stdout.install()
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _stop(server, thread):
+    server.inbox.put(None)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def _text(response):
+    return json.loads(response["result"]["content"][0]["text"])
+
+
+class TestConcurrentDispatch:
+    def test_slow_tool_does_not_block_ping(self, stdout):
+        server = QueueServer(max_workers=4)
+        release = threading.Event()
+        server.register_tool("slow", "", {"type": "object"},
+                             lambda args: {"done": release.wait(5)})
+        thread = _start(server, stdout)
+        server.send("tools/call", 1, name="slow", arguments={})
+        server.send("ping", 2)
+        assert stdout.wait_for(2)
+        assert not stdout.wait_for(1, timeout=0.1)
+        release.set()
+        _stop(server, thread)
+        responses = stdout.responses()
+        assert [r["id"] for r in responses] == [2, 1]
+        assert _text(responses[1]) == {"done": True}
+
+    def test_eof_waits_for_running_calls(self, stdout):
+        server = QueueServer(max_workers=2)
+        server.register_tool("nap", "", {"type": "object"},
+                             lambda args: time.sleep(0.2) or {"ok": True})
+        thread = _start(server, stdout)
+        for i in range(4):
+            server.send("tools/call", i, name="nap", arguments={})
+        _stop(server, thread)
+        assert sorted(r["id"] for r in stdout.responses()) == [0, 1, 2, 3]
+
+    def test_sequential_by_default(self, monkeypatch):
+        monkeypatch.delenv("ICDEV_MCP_WORKERS", raising=False)
+        assert QueueServer().max_workers == 1
+
+    def test_env_enables_workers(self, monkeypatch):
+        monkeypatch.setenv("ICDEV_MCP_WORKERS", "4")
+        assert QueueServer().max_workers == 4
+
+    def test_sequential_when_single_worker(self, stdout, monkeypatch):
+        monkeypatch.setenv("ICDEV_MCP_WORKERS", "1")
+        server = QueueServer()
+        assert server.max_workers == 1
+        server.register_tool("nap", "", {"type": "object"},
+                             lambda args: time.sleep(0.05) or {"ok": True})
+        thread = _start(server, stdout)
+        server.send("tools/call", "a", name="nap", arguments={})
+        server.send("ping", "b")
+        _stop(server, thread)
+        assert [r["id"] for r in stdout.responses()] == ["a", "b"]
+
+    def test_duplicate_inflight_id_rejected(self, stdout):
+        server = QueueServer(max_workers=2)
+        release = threading.Event()
+        server.register_tool("slow", "", {"type": "object"}, lambda args: release.wait(5))
+        thread = _start(server, stdout)
+        server.send("tools/call", 7, name="slow", arguments={})
+        server.send("tools/call", 7, name="slow", arguments={})
+        assert stdout.wait_for(7)
+        assert stdout.responses()[0]["error"]["code"] == MCPServer.INVALID_REQUEST
+        release.set()
+        _stop(server, thread)
+        assert len(stdout.responses()) == 2
+
+
+class TestCancellation:
+    def test_running_call_sees_cancel_and_sends_no_response(self, stdout):
+        server = QueueServer(max_workers=2)
+        started, observed = threading.Event(), threading.Event()
+
+        def long_scan(args):
+            started.set()
+            while not request_cancelled():
+                time.sleep(0.01)
+            observed.set()
+            return {"partial": True}
+
+        server.register_tool("scan", "", {"type": "object"}, long_scan)
+        thread = _start(server, stdout)
+        server.send("tools/call", 1, name="scan", arguments={})
+        assert started.wait(5)
+        server.send("notifications/cancelled", requestId=1, reason="user abort")
+        assert observed.wait(5)
+        server.send("ping", 2)
+        _stop(server, thread)
+        assert [r["id"] for r in stdout.responses()] == [2]
+
+    def test_parked_call_dropped(self, stdout):
+        server = QueueServer(max_workers=4)
+        release = threading.Event()
+        runs = []
+
+        def deploy(args):
+            runs.append(args["n"])
+            release.wait(5)
+            return {"n": args["n"]}
+
+        server.register_tool("deploy", "", {"type": "object"}, deploy, max_concurrency=1)
+        thread = _start(server, stdout)
+        server.send("tools/call", 1, name="deploy", arguments={"n": 1})
+        server.send("tools/call", 2, name="deploy", arguments={"n": 2})
+        server.send("tools/call", 3, name="deploy", arguments={"n": 3})
+        server.send("notifications/cancelled", requestId=2)
+        server.send("ping", 4)
+        assert stdout.wait_for(4)
+        release.set()
+        _stop(server, thread)
+        assert runs == [1, 3]
+        assert sorted(r["id"] for r in stdout.responses()) == [1, 3, 4]
+
+    def test_unknown_request_id_ignored(self, stdout):
+        server = QueueServer(max_workers=2)
+        thread = _start(server, stdout)
+        server.send("notifications/cancelled", requestId=99)
+        server.send("ping", 1)
+        _stop(server, thread)
+        assert [r["id"] for r in stdout.responses()] == [1]
+
+
+class TestPerToolLimits:
+    def test_limit_caps_concurrency_without_blocking_other_tools(self, stdout):
+        server = QueueServer(max_workers=4)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def apply(args):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return {"ok": True}
+
+        server.register_tool("apply", "", {"type": "object"}, apply, max_concurrency=1)
+        server.register_tool("echo", "", {"type": "object"}, lambda args: args)
+        thread = _start(server, stdout)
+        for i in range(5):
+            server.send("tools/call", i, name="apply", arguments={})
+        server.send("tools/call", "echo", name="echo", arguments={"x": 1})
+        assert stdout.wait_for("echo", timeout=0.2)
+        _stop(server, thread)
+        assert state["peak"] == 1
+        assert len(stdout.responses()) == 6
+        assert server._tool_active == {} and server._inflight == {}
+
+    def test_limits_default_from_registry(self):
+        from tools.mcp.tool_registry import TOOL_CONCURRENCY
+        server = MCPServer()
+        server.register_tool("terraform_apply", "", {"type": "object"}, lambda a: a)
+        server.register_tool("project_list", "", {"type": "object"}, lambda a: a)
+        assert server._tools["terraform_apply"]["max_concurrency"] == TOOL_CONCURRENCY["terraform_apply"]
+        assert server._tools["project_list"]["max_concurrency"] is None
+
+    def test_registry_limits_reference_known_tools(self):
+        from tools.mcp.tool_registry import TOOL_CONCURRENCY, TOOL_REGISTRY
+        assert set(TOOL_CONCURRENCY) <= set(TOOL_REGISTRY)
+        assert all(isinstance(v, int) and v >= 1 for v in TOOL_CONCURRENCY.values())
+
+
+def test_request_cancelled_outside_call():
+    assert base_server.request_cancelled() is False
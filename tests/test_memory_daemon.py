@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for the resident memory query daemon (tools/memory/memory_daemon.py)."""
+
+import json
+import sqlite3
+import stat
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from tools.memory import memory_daemon  # noqa: E402
+from tools.memory.memory_daemon import MemoryQueryService  # noqa: E402
+
+
+@pytest.fixture
+def memory_db(tmp_path):
+    db_path = tmp_path / "memory.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE memory_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            type TEXT DEFAULT 'event',
+            importance INTEGER DEFAULT 5,
+            embedding BLOB,
+            created_at TEXT DEFAULT (datetime('now')),
+            updated_at TEXT DEFAULT (datetime('now')),
+            content_hash TEXT,
+            user_id TEXT,
+            tenant_id TEXT,
+            source TEXT DEFAULT 'manual'
+        );
+        CREATE TABLE memory_access_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entry_id TEXT,
+            query TEXT,
+            results_count INTEGER,
+            search_type TEXT,
+            accessed_at TEXT DEFAULT (datetime('now'))
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO memory_entries (content, type, user_id) VALUES (?, 'fact', ?)",
+        [("fedramp high baseline selected", "u1"),
+         ("cmmc level 2 assessment scheduled", "u2"),
+         ("fedramp moderate inherited controls", None)],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def service(memory_db):
+    svc = MemoryQueryService(db_path=memory_db)
+    svc._provider_resolved = True  # keyword-only: no embedding provider in tests
+    yield svc
+    svc.close()
+
+
+class TestQueryService:
+    def test_search_returns_cli_payload(self, service):
+        payload = service.search({"query": "fedramp", "limit": 5})
+        assert payload["classification"] == "CUI // SP-CTI"
+        assert payload["search_type"] == "hybrid"
+        assert {e["id"] for e in payload["entries"]} == {1, 3}
+
+    def test_user_scope(self, service):
+        payload = service.search({"query": "fedramp cmmc", "user_id": "u2"})
+        assert {e["id"] for e in payload["entries"]} == {2, 3}
+
+    def test_access_log_does_not_invalidate_cache(self, service):
+        service.search({"query": "fedramp"})
+        service.search({"query": "cmmc"})
+        assert service.stats["refreshes"] == 1
+        assert service.stats["queries"] == 2
+
+    def test_external_write_refreshes_entries(self, service, memory_db):
+        service.search({"query": "fedramp"})
+        conn = sqlite3.connect(str(memory_db))
+        conn.execute("INSERT INTO memory_entries (content) VALUES ('fedramp 20x pilot')")
+        conn.commit()
+        conn.close()
+        payload = service.search({"query": "pilot"})
+        assert [e["id"] for e in payload["entries"]] == [4]
+        assert service.stats["refreshes"] == 2
+
+    def test_write_during_refresh_is_not_absorbed(self, service, memory_db, monkeypatch):
+        from tools.memory import hybrid_search
+        original = hybrid_search._get_vector_index
+
+        def _get_index_with_concurrent_write(db_path):
+            conn = sqlite3.connect(str(memory_db))
+            conn.execute("INSERT INTO memory_entries (content) VALUES ('concurrent pilot')")
+            conn.commit()
+            conn.close()
+            monkeypatch.setattr(hybrid_search, "_get_vector_index", original)
+            return original(db_path)
+
+        monkeypatch.setattr(hybrid_search, "_get_vector_index", _get_index_with_concurrent_write)
+        service.search({"query": "fedramp"})
+        payload = service.search({"query": "concurrent"})
+        assert service.stats["refreshes"] == 2
+        assert [e["id"] for e in payload["entries"]] == [4]
+
+    def test_missing_query_rejected(self, service):
+        with pytest.raises(ValueError):
+            service.search({"limit": 3})
+
+
+@pytest.fixture
+def running_daemon(service, tmp_path, monkeypatch):
+    token_path = tmp_path / "daemon.token"
+    monkeypatch.setattr(memory_daemon, "TOKEN_PATH", token_path)
+    token = memory_daemon.write_token_file(token_path)
+    server = memory_daemon.make_server(service, token, host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setenv("ICDEV_MEMORY_DAEMON_URL", url)
+    yield url, token
+    server.shutdown()
+    server.server_close()
+
+
+def _raw_post(url, body, headers):
+    req = urllib.request.Request(url, data=body, method="POST", headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+class TestTransport:
+    def test_non_loopback_bind_refused(self, service):
+        with pytest.raises(ValueError):
+            memory_daemon.make_server(service, "t", host="0.0.0.0", port=0)
+
+    def test_token_required_to_start(self, service):
+        with pytest.raises(ValueError):
+            memory_daemon.make_server(service, "", host="127.0.0.1", port=0)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_token_file_is_owner_only(self, tmp_path):
+        path = tmp_path / "daemon.token"
+        token = memory_daemon.write_token_file(path)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert memory_daemon.read_token_file(path) == token
+
+    def test_client_round_trip(self, running_daemon):
+        health = memory_daemon.query_daemon("health")
+        assert health["status"] == "ok"
+        payload = memory_daemon.query_daemon("search", {"query": "cmmc"})
+        assert payload["entries"][0]["id"] == 2
+
+    def test_missing_or_wrong_token_rejected(self, running_daemon):
+        url, _ = running_daemon
+        body = json.dumps({"query": "cmmc"}).encode()
+        assert _raw_post(f"{url}/search", body,
+                         {"Content-Type": "application/json"}) == 401
+        assert _raw_post(f"{url}/search", body,
+                         {"Content-Type": "application/json",
+                          memory_daemon.TOKEN_HEADER: "guess"}) == 401
+
+    def test_simple_text_plain_post_rejected(self, running_daemon):
+        url, token = running_daemon
+        assert _raw_post(f"{url}/shutdown", b"{}",
+                         {"Content-Type": "text/plain",
+                          memory_daemon.TOKEN_HEADER: token}) == 415
+
+    def test_non_loopback_host_header_rejected(self, running_daemon):
+        url, token = running_daemon
+        assert _raw_post(f"{url}/search", b'{"query": "cmmc"}',
+                         {"Content-Type": "application/json", "Host": "evil.example:8765",
+                          memory_daemon.TOKEN_HEADER: token}) == 403
+
+    def test_client_without_token_file_falls_back(self, running_daemon, tmp_path, monkeypatch):
+        monkeypatch.setattr(memory_daemon, "TOKEN_PATH", tmp_path / "absent.token")
+        assert memory_daemon.query_daemon("health") is None
+
+    def test_non_loopback_url_override_ignored(self, monkeypatch):
+        monkeypatch.setenv("ICDEV_MEMORY_DAEMON_URL", "http://203.0.113.5:8765")
+        config = dict(memory_daemon.DEFAULT_CONFIG)
+        assert memory_daemon._daemon_url(config) == "http://127.0.0.1:8765"
+
+    def test_client_returns_none_when_not_running(self, monkeypatch):
+        monkeypatch.setenv("ICDEV_MEMORY_DAEMON_URL", "http://127.0.0.1:9")
+        assert memory_daemon.query_daemon("health") is None
@@ -0,0 +1,173 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.simulation.monte_carlo -- vectorized and stdlib engines.
+
+Run: pytest tests/test_monte_carlo.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from tools.simulation import monte_carlo
+from tools.simulation.monte_carlo import (
+    HAS_NUMPY,
+    run_monte_carlo,
+    simulate,
+    summarize_results,
+)
+
+needs_numpy = pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+
+ITEMS = [
+    {"optimistic": h * 0.5, "most_likely": float(h), "pessimistic": h * 2.5}
+    for h in (8, 40, 80, 200, 400)
+]
+EVENTS = [
+    {"probability": 0.3, "impact_hours": 100},
+    {"probability": 0.1, "impact_hours": 50},
+    {"probability": 0.05, "impact_hours": 200},
+]
+LEVELS = [0.10, 0.50, 0.80, 0.90]
+
+
+def _pert_mean(items):
+    return sum((i["optimistic"] + 4 * i["most_likely"] + i["pessimistic"]) / 6 for i in items)
+
+
+@pytest.fixture
+def mc_db(tmp_path):
+    db_path = tmp_path / "icdev.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE simulation_scenarios (id TEXT PRIMARY KEY, project_id TEXT);
+        CREATE TABLE safe_decomposition (
+            id TEXT, project_id TEXT, level TEXT, title TEXT,
+            t_shirt_size TEXT, story_points INTEGER, wsjf_score REAL
+        );
+        CREATE TABLE monte_carlo_runs (
+            id TEXT PRIMARY KEY, scenario_id TEXT, iterations INTEGER, dimension TEXT,
+            distribution_type TEXT, input_parameters TEXT, p10_value REAL,
+            p50_value REAL, p80_value REAL, p90_value REAL, mean_value REAL,
+            std_deviation REAL, histogram_data TEXT, cdf_data TEXT,
+            confidence_intervals TEXT, run_duration_ms INTEGER, completed_at TEXT
+        );
+        CREATE TABLE audit_trail (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT, event_type TEXT,
+            actor TEXT, action TEXT, details TEXT, classification TEXT
+        );
+    """)
+    conn.execute("INSERT INTO simulation_scenarios VALUES ('scn-1', 'proj-1')")
+    conn.executemany(
+        "INSERT INTO safe_decomposition VALUES (?, 'proj-1', 'story', ?, ?, 3, 1.0)",
+        [(f"s-{i}", f"Story {i}", size) for i, size in enumerate(["S", "M", "L", "XL"])],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+class TestStdlibEngine:
+    def test_seeded_runs_reproducible(self):
+        a, engine = simulate("schedule", ITEMS, 500, seed=7, engine="stdlib")
+        b, _ = simulate("schedule", ITEMS, 500, seed=7, engine="stdlib")
+        assert engine == "stdlib" and a == b
+        assert simulate("risk", EVENTS, 500, seed=7, engine="stdlib")[0] == \
+            simulate("risk", EVENTS, 500, seed=7, engine="stdlib")[0]
+
+    def test_degenerate_item_returns_most_likely(self):
+        items = [{"optimistic": 10.0, "most_likely": 12.0, "pessimistic": 10.0}]
+        values, _ = simulate("cost", items, 50, seed=1, engine="stdlib")
+        assert set(values) == {12.0}
+
+    def test_summary_matches_helpers(self):
+        values = [float(v) for v in range(101)]
+        stats = summarize_results(list(reversed(values)), LEVELS)
+        assert stats["percentiles"] == {"p10": 10.0, "p50": 50.0, "p80": 80.0, "p90": 90.0}
+        assert (stats["min"], stats["max"], stats["mean"]) == (0.0, 100.0, 50.0)
+        assert sum(stats["histogram"]["counts"]) == 101
+
+
+@needs_numpy
+class TestNumpyEngine:
+    def test_seeded_runs_reproducible(self):
+        a, engine = simulate("schedule", ITEMS, 2000, seed=11, engine="numpy")
+        b, _ = simulate("schedule", ITEMS, 2000, seed=11, engine="numpy")
+        assert engine == "numpy"
+        assert (a == b).all()
+        c, _ = simulate("schedule", ITEMS, 2000, seed=12, engine="numpy")
+        assert not (a == c).all()
+
+    def test_chunked_execution_bounds_matrix(self, monkeypatch):
+        rows = []
+        original = monte_carlo._chunk_rows
+        monkeypatch.setattr(monte_carlo, "_chunk_rows",
+                            lambda width, chunk_size=None: rows.append(
+                                original(width, chunk_size)) or rows[-1])
+        monkeypatch.setattr(monte_carlo, "MAX_CHUNK_ELEMENTS", 1000)
+        values, _ = simulate("schedule", ITEMS, 5003, seed=3, engine="numpy")
+        assert rows == [200]
+        assert values.shape == (5003,)
+        assert (values > 0).all()
+
+    def test_schedule_statistically_equivalent(self):
+        fast, _ = simulate("schedule", ITEMS, 50000, seed=5, engine="numpy")
+        slow, _ = simulate("schedule", ITEMS, 20000, seed=5, engine="stdlib")
+        fast_stats = summarize_results(fast, LEVELS)
+        slow_stats = summarize_results(slow, LEVELS)
+        assert fast_stats["mean"] == pytest.approx(_pert_mean(ITEMS), rel=0.01)
+        assert fast_stats["mean"] == pytest.approx(slow_stats["mean"], rel=0.01)
+        assert fast_stats["std_dev"] == pytest.approx(slow_stats["std_dev"], rel=0.05)
+        for key in ("p10", "p50", "p90"):
+            assert fast_stats["percentiles"][key] == pytest.approx(
+                slow_stats["percentiles"][key], rel=0.02)
+
+    def test_risk_bernoulli_mean(self):
+        values, _ = simulate("risk", EVENTS, 100000, seed=9, engine="numpy")
+        expected = sum(e["probability"] * e["impact_hours"] for e in EVENTS)
+        assert values.mean() == pytest.approx(expected, rel=0.02)
+        assert set(values.tolist()) <= {0, 50, 100, 150, 200, 250, 300, 350}
+
+    def test_degenerate_items_constant(self):
+        items = [{"optimistic": 5.0, "most_likely": 5.0, "pessimistic": 5.0}] * 3
+        values, _ = simulate("schedule", items, 10, seed=1, engine="numpy")
+        assert values.tolist() == [15.0] * 10
+
+    def test_vectorized_summary_matches_stdlib(self):
+        import numpy as np
+        values = np.random.default_rng(1).normal(100, 15, 999)
+        fast = summarize_results(values, LEVELS)
+        slow = summarize_results(values.tolist(), LEVELS)
+        assert fast["percentiles"] == slow["percentiles"]
+        assert fast["cdf"] == slow["cdf"]
+        assert fast["histogram"]["bins"] == slow["histogram"]["bins"]
+        assert fast["histogram"]["counts"] == slow["histogram"]["counts"]
+        assert fast["mean"] == pytest.approx(slow["mean"])
+        assert fast["std_dev"] == pytest.approx(slow["std_dev"])
+
+
+class TestRunMonteCarlo:
+    def test_run_persists_engine_results(self, mc_db):
+        result = run_monte_carlo("scn-1", "schedule", iterations=2000, db_path=mc_db, seed=42)
+        assert result["engine"] == ("numpy" if HAS_NUMPY else "stdlib")
+        assert result["percentiles"]["p10"] <= result["percentiles"]["p50"] <= \
+            result["percentiles"]["p90"]
+        again = run_monte_carlo("scn-1", "schedule", iterations=2000, db_path=mc_db, seed=42)
+        assert again["percentiles"] == result["percentiles"]
+        conn = sqlite3.connect(str(mc_db))
+        assert conn.execute("SELECT COUNT(*) FROM monte_carlo_runs").fetchone()[0] == 2
+        conn.close()
+
+    def test_unknown_engine_rejected(self, mc_db):
+        with pytest.raises(ValueError, match="Invalid engine"):
+            run_monte_carlo("scn-1", "cost", db_path=mc_db, engine="gpu")
+
+    def test_numpy_engine_requires_numpy(self, mc_db, monkeypatch):
+        monkeypatch.setattr(monte_carlo, "HAS_NUMPY", False)
+        with pytest.raises(ValueError, match="numpy is not installed"):
+            run_monte_carlo("scn-1", "cost", db_path=mc_db, engine="numpy")
+        result = run_monte_carlo("scn-1", "risk", iterations=200, db_path=mc_db)
+        assert result["engine"] == "stdlib"
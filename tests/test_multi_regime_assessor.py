@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for the multi-regime assessor's parallel engine (ADR D113).
+
+Validates:
+    - Parallel and sequential runs produce identical results
+    - The project snapshot is read once and is immutable
+    - All frameworks are written in one transaction
+    - Deduplicated NIST 800-53 control set
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.compliance import multi_regime_assessor  # noqa: E402
+from tools.compliance.multi_regime_assessor import (  # noqa: E402
+    ProjectSnapshot,
+    assess_all,
+    compute_control_set,
+    load_project_snapshot,
+)
+
+FRAMEWORKS = ["cjis", "hipaa", "soc2", "iso_27001"]
+
+
+@pytest.fixture
+def icdev_db(tmp_path):
+    db_path = tmp_path / "icdev.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE projects (id TEXT PRIMARY KEY, name TEXT, status TEXT DEFAULT 'active');
+        CREATE TABLE project_controls (
+            project_id TEXT, control_id TEXT, implementation_status TEXT
+        );
+        CREATE TABLE project_framework_status (
+            project_id TEXT, framework_id TEXT, total_controls INTEGER,
+            implemented_controls INTEGER, coverage_pct REAL, gate_status TEXT,
+            last_assessed TEXT, updated_at TEXT,
+            UNIQUE(project_id, framework_id)
+        );
+        CREATE TABLE audit_trail (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT, event_type TEXT,
+            actor TEXT, action TEXT, details TEXT, affected_files TEXT,
+            classification TEXT
+        );
+    """)
+    conn.execute("INSERT INTO projects (id, name) VALUES ('proj-1', 'Demo')")
+    conn.executemany(
+        "INSERT INTO project_controls VALUES ('proj-1', ?, ?)",
+        [("ac-2", "implemented"), ("AU-2", "implemented"),
+         ("SC-7", "partially_implemented"), ("IA-2", "planned")],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _base_class(framework_id):
+    """BaseAssessor as seen by the dynamically loaded assessor classes."""
+    cls = multi_regime_assessor._load_assessor(framework_id)
+    return next(c for c in cls.__mro__ if c.__name__ == "BaseAssessor")
+
+
+def _strip_dates(result):
+    result = dict(result)
+    result.pop("assessment_date")
+    return result
+
+
+def _count(db_path, sql):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(sql).fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestAssessAll:
+    def test_parallel_matches_sequential(self, icdev_db):
+        parallel = assess_all("proj-1", frameworks=FRAMEWORKS, db_path=icdev_db, max_workers=4)
+        sequential = assess_all("proj-1", frameworks=FRAMEWORKS, db_path=icdev_db, max_workers=1)
+        assert parallel["errors"] == {}
+        assert parallel["frameworks_assessed"] == len(FRAMEWORKS)
+        assert _strip_dates(parallel) == _strip_dates(sequential)
+
+    def test_results_stored_for_every_framework(self, icdev_db):
+        result = assess_all("proj-1", frameworks=FRAMEWORKS, db_path=icdev_db)
+        for summary in result["framework_results"]:
+            table = multi_regime_assessor._load_assessor(summary["framework_id"]).TABLE_NAME
+            assert _count(icdev_db, f"SELECT COUNT(*) FROM {table}") == summary["total_requirements"]
+        assert _count(icdev_db, "SELECT COUNT(*) FROM project_framework_status") == len(FRAMEWORKS)
+        assert _count(icdev_db, "SELECT COUNT(*) FROM audit_trail") == len(FRAMEWORKS)
+
+    def test_nist_implementations_read_once(self, icdev_db, monkeypatch):
+        loads = []
+        original = multi_regime_assessor.load_project_snapshot
+        monkeypatch.setattr(multi_regime_assessor, "load_project_snapshot",
+                            lambda *a: loads.append(a) or original(*a))
+        monkeypatch.setattr(_base_class("cjis"), "_get_nist_implementations",
+                            lambda *a: pytest.fail("assessor re-queried project_controls"))
+        result = assess_all("proj-1", frameworks=FRAMEWORKS, db_path=icdev_db)
+        assert result["errors"] == {}
+        assert len(loads) == 1
+
+    def test_write_failure_rolls_back_all_frameworks(self, icdev_db, monkeypatch):
+        hipaa_cls = multi_regime_assessor._load_assessor("hipaa")
+        base = _base_class("hipaa")
+        original = base.write_results
+
+        def write_results(self, conn, evaluation):
+            if isinstance(self, hipaa_cls):
+                raise sqlite3.OperationalError("disk I/O error")
+            return original(self, conn, evaluation)
+
+        monkeypatch.setattr(base, "write_results", write_results)
+        result = assess_all("proj-1", frameworks=["cjis", "hipaa"], db_path=icdev_db)
+        assert result["frameworks_assessed"] == 0
+        assert set(result["errors"]) == {"cjis", "hipaa"}
+        assert _count(icdev_db, "SELECT COUNT(*) FROM cjis_assessments") == 0
+        assert _count(icdev_db, "SELECT COUNT(*) FROM audit_trail") == 0
+
+    def test_assessor_failure_isolated(self, icdev_db, monkeypatch):
+        soc2_cls = multi_regime_assessor._load_assessor("soc2")
+        monkeypatch.setattr(soc2_cls, "get_automated_checks",
+                            lambda self, project, project_dir=None: 1 / 0)
+        result = assess_all("proj-1", frameworks=["cjis", "soc2"], db_path=icdev_db)
+        assert "division by zero" in result["errors"]["soc2"]
+        assert [f["framework_id"] for f in result["framework_results"]] == ["cjis"]
+
+    def test_unknown_project_reported_per_framework(self, icdev_db):
+        result = assess_all("missing", frameworks=["cjis", "hipaa"], db_path=icdev_db)
+        assert result["frameworks_assessed"] == 0
+        assert all("not found" in e for e in result["errors"].values())
+        assert result["control_set"] is None
+
+    def test_unified_metrics_include_deduplicated_set(self, icdev_db):
+        result = assess_all("proj-1", frameworks=FRAMEWORKS, db_path=icdev_db)
+        metrics = result["unified_metrics"]
+        control_set = result["control_set"]
+        assert metrics["deduplicated_controls"] == control_set["unique_controls"] > 0
+        assert metrics["duplicates_eliminated"] == (
+            control_set["control_references"] - control_set["unique_controls"])
+        assert metrics["nist_controls_implemented"] == 2
+
+
+class TestSnapshot:
+    def test_snapshot_is_read_only(self, icdev_db):
+        snapshot = load_project_snapshot("proj-1", icdev_db)
+        assert snapshot.nist_impl["AC-2"] == "implemented"
+        with pytest.raises(TypeError):
+            snapshot.nist_impl["AC-3"] = "implemented"
+        with pytest.raises(AttributeError):
+            snapshot.project_id = "other"
+        assert "AC-2" in snapshot.crosswalk
+
+    def test_missing_project_raises(self, icdev_db):
+        with pytest.raises(ValueError, match="not found"):
+            load_project_snapshot("nope", icdev_db)
+
+
+class TestControlSet:
+    def _snapshot(self, crosswalk=None):
+        return ProjectSnapshot(
+            project_id="p", project={"id": "p"},
+            nist_impl={"AC-2": "implemented", "SC-7": "partially_implemented"},
+            crosswalk=crosswalk or {},
+        )
+
+    def test_overlapping_controls_counted_once(self):
+        catalogs = {
+            "fw_a": [{"nist_800_53_crosswalk": ["AC-2", "au-2"]},
+                     {"nist_800_53_crosswalk": "AC-2"}],
+            "fw_b": [{"nist_800_53_crosswalk": ["AC-2", "SC-7"]}, {}],
+        }
+        result = compute_control_set(self._snapshot(), catalogs)
+        assert result["unique_controls"] == 3
+        assert result["control_references"] == 4
+        assert result["duplicates_eliminated"] == 1
+        assert result["shared_controls"] == 1
+        assert result["controls"][0] == {"nist_id": "AC-2", "status": "implemented",
+                                         "frameworks": ["fw_a", "fw_b"]}
+        assert result["status_counts"] == {"implemented": 1, "partially_implemented": 1,
+                                           "not_implemented": 1}
+        assert result["coverage_pct"] == 50.0
+
+    def test_crosswalk_frameworks_contribute_controls(self):
+        crosswalk = {"AC-2": {"fedramp_moderate": True}, "PE-3": {"fedramp_moderate": False},
+                     "CP-9": {"fedramp_moderate": "CP-9"}}
+        result = compute_control_set(self._snapshot(crosswalk),
+                                     {"fw_a": [{"nist_800_53_crosswalk": ["AC-2"]}]},
+                                     crosswalk_frameworks=["fedramp_moderate"])
+        assert {c["nist_id"] for c in result["controls"]} == {"AC-2", "CP-9"}
+        assert result["shared_controls"] == 1
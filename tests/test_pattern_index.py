@@ -0,0 +1,220 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.knowledge.pattern_index — cached knowledge pattern index.
+
+Run: pytest tests/test_pattern_index.py -v
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from tools.knowledge import pattern_detector, pattern_index
+from tools.knowledge.pattern_detector import (
+    _similarity,
+    extract_features,
+    match_known_pattern,
+    match_known_patterns,
+    update_pattern_confidence,
+)
+
+
+SCHEMA = """
+CREATE TABLE knowledge_patterns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pattern_type TEXT NOT NULL,
+    pattern_signature TEXT,
+    description TEXT,
+    root_cause TEXT,
+    remediation TEXT,
+    confidence REAL DEFAULT 0.5,
+    auto_healable INTEGER DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    pattern_index.clear_index_cache()
+    yield
+    pattern_index.clear_index_cache()
+
+
+def _make_db(tmp_path, rows):
+    db_path = tmp_path / "kb.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO knowledge_patterns (pattern_type, pattern_signature, description, "
+        "root_cause, remediation, confidence, auto_healable) VALUES ('error', ?, ?, 'rc', 'fix', ?, 0)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _random_rows(n, seed=7):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    rows = []
+    for _ in range(n):
+        sig = "|".join("".join(rng.choice(letters) for _ in range(8)) for _ in range(3))
+        rows.append((sig, "Generic failure " + "".join(rng.choice(letters) for _ in range(6)), 0.9))
+    return rows
+
+
+def _brute_force(features, rows):
+    """Exhaustive scoring with the original signature similarity."""
+    best = []
+    for sig, desc, conf in rows:
+        score = _similarity(features["signature"], sig)
+        boost = 0.0
+        if features["error_type"].lower() in desc.lower():
+            boost = 0.15
+        if features["error_type"].lower() in sig.lower():
+            boost = 0.25
+        if features.get("has_timeout") and "timeout" in desc.lower():
+            boost += 0.1
+        combined = min((score + boost) * conf, 1.0)
+        if combined > 0.1:
+            best.append((round(combined, 3), sig))
+    return sorted(best, reverse=True)
+
+
+class TestIndex:
+    def test_small_index_matches_exhaustive_scan(self, tmp_path):
+        rows = [
+            ("TimeoutError|api|timeout", "Upstream timeout", 0.9),
+            ("MemoryError|worker|memory", "Heap exhaustion", 0.8),
+            ("KeyError|api", "Missing config key", 0.5),
+        ]
+        db_path = _make_db(tmp_path, rows)
+        features = extract_features({"error_type": "TimeoutError", "source": "api",
+                                     "error_message": "request timed out"})
+        matches = match_known_pattern(features, db_path)
+        expected = _brute_force(features, rows)
+        assert [m["combined_score"] for m in matches] == [score for score, _ in expected]
+
+    def test_large_index_matches_exhaustive_scan(self, tmp_path):
+        rows = _random_rows(300)
+        target = rows[123][0]
+        db_path = _make_db(tmp_path, rows)
+        features = {"signature": target + "x", "error_type": "zzzz"}
+        matches = match_known_pattern(features, db_path)
+        assert matches[0]["pattern_id"] == 124
+        expected = _brute_force(features, rows)
+        assert [m["combined_score"] for m in matches] == [score for score, _ in expected]
+
+    def test_signature_only_recall_at_cutoff(self, tmp_path):
+        # Signatures built to sit just above the 0.1 score cut-off (Jaccard
+        # 0.1-0.3) must all be scored, so the result list equals the scan.
+        rng = random.Random(11)
+        base = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(60))
+        rows = _random_rows(200)
+        for i in range(60):
+            keep = rng.randint(12, 30)
+            start = rng.randint(0, len(base) - keep)
+            noise = "".join(rng.choice("0123456789") for _ in range(60 - keep))
+            rows.append((base[start:start + keep] + noise, "unrelated", 1.0))
+        db_path = _make_db(tmp_path, rows)
+        features = {"signature": base, "error_type": "zzzz"}
+        expected = _brute_force(features, rows)
+        assert sum(1 for score, _ in expected if score < 0.3) >= 10
+        matches = match_known_pattern(features, db_path)
+        assert [m["combined_score"] for m in matches] == [score for score, _ in expected]
+
+    def test_boost_only_match_found(self, tmp_path):
+        rows = _random_rows(200) + [("qqqqqqqq|TlsHandshakeError", "unrelated", 1.0)]
+        db_path = _make_db(tmp_path, rows)
+        features = {"signature": "nothing-alike", "error_type": "TlsHandshakeError"}
+        matches = match_known_pattern(features, db_path)
+        assert [m["pattern_id"] for m in matches] == [201]
+
+
+class TestBatch:
+    def test_batch_equals_single_lookups(self, tmp_path):
+        rows = _random_rows(150) + [
+            ("ConnectionError|api|connection", "Connection pool exhausted", 0.9),
+            ("TimeoutError|db|timeout|database", "Database timeout", 0.7),
+        ]
+        db_path = _make_db(tmp_path, rows)
+        failures = [
+            {"error_type": "ConnectionError", "source": "api", "error_message": "connection refused"},
+            {"error_type": "TimeoutError", "source": "db", "error_message": "query timed out"},
+            {"error_type": "ConnectionError", "source": "api", "error_message": "connection refused"},
+        ]
+        features = [extract_features(f) for f in failures]
+        batch = match_known_patterns(features, db_path)
+        assert batch == [match_known_pattern(f, db_path) for f in features]
+        assert batch[0] == batch[2] and batch[0] is not batch[2]
+
+    def test_analyze_uses_one_index_load(self, tmp_path, monkeypatch):
+        db_path = _make_db(tmp_path, [("ValueError|svc", "Bad value", 0.9)])
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript("""
+            CREATE TABLE failure_log (id INTEGER PRIMARY KEY, project_id TEXT, error_type TEXT,
+                error_message TEXT, source TEXT, stack_trace TEXT, context TEXT,
+                resolved INTEGER DEFAULT 0, created_at TEXT);
+            CREATE TABLE deployments (id TEXT, project_id TEXT, environment TEXT, version TEXT,
+                status TEXT, created_at TEXT, completed_at TEXT);
+        """)
+        conn.executemany(
+            "INSERT INTO failure_log (project_id, error_type, error_message, source, stack_trace, "
+            "context, created_at) VALUES ('p', 'ValueError', 'bad', 'svc', '', '{}', datetime('now'))",
+            [()] * 5,
+        )
+        conn.commit()
+        conn.close()
+
+        loads = []
+        real_load = pattern_index.load_index
+        monkeypatch.setattr(pattern_index, "load_index",
+                            lambda conn, path: loads.append(path) or real_load(conn, path))
+        result = pattern_detector.analyze_project("p", db_path=db_path)
+        assert result["summary"]["pattern_matches_found"] == 5
+        assert len(loads) == 1
+
+
+class TestCache:
+    def test_index_reused_and_rebuilt_after_insert(self, tmp_path, monkeypatch):
+        db_path = _make_db(tmp_path, _random_rows(100))
+        conn = sqlite3.connect(str(db_path))
+        first = pattern_index.load_index(conn, db_path)
+        assert pattern_index.load_index(conn, db_path) is first
+
+        tokenized = []
+        real_ngrams = pattern_index.ngrams
+        monkeypatch.setattr(pattern_index, "ngrams",
+                            lambda text: tokenized.append(text) or real_ngrams(text))
+        conn.execute("INSERT INTO knowledge_patterns (pattern_type, pattern_signature, description, "
+                     "confidence) VALUES ('error', 'NewError|svc', 'new', 0.9)")
+        conn.commit()
+        second = pattern_index.load_index(conn, db_path)
+        conn.close()
+        assert second is not first and len(second) == 101
+        assert tokenized == ["NewError|svc"]  # only the new signature
+
+    def test_confidence_update_applied_in_place(self, tmp_path):
+        db_path = _make_db(tmp_path, [
+            ("ValueError|svc", "first", 0.5),
+            ("ValueError|svc|x", "second", 0.6),
+        ])
+        features = {"signature": "ValueError|svc", "error_type": "ValueError"}
+        before = match_known_pattern(features, db_path)
+        conn = sqlite3.connect(str(db_path))
+        index = pattern_index.load_index(conn, db_path)
+
+        update_pattern_confidence(1, "success", db_path)
+        assert pattern_index.load_index(conn, db_path) is index
+        conn.close()
+        assert index.in_scan_order()[0].id == 1  # 0.6 ties 0.6, lower id first
+
+        after = match_known_pattern(features, db_path)
+        assert after[0]["confidence"] == pytest.approx(0.6)
+        assert after[0]["combined_score"] > before[0]["combined_score"]
@@ -0,0 +1,211 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for the SaaS API-key principal cache and batched auth audit writes.
+
+Run: pytest tests/test_saas_auth_cache.py -v
+"""
+
+import hashlib
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tools.saas.auth import api_key_auth, middleware
+from tools.saas.auth.api_key_auth import PrincipalCache, validate_api_key
+
+try:
+    from tools.saas import tenant_manager
+    _TENANT_MANAGER_OK = True
+except ImportError:
+    _TENANT_MANAGER_OK = False
+
+SCHEMA_SQL = """
+CREATE TABLE tenants (
+    id TEXT PRIMARY KEY, name TEXT, slug TEXT, status TEXT DEFAULT 'active',
+    tier TEXT DEFAULT 'professional', impact_level TEXT DEFAULT 'IL4',
+    updated_at TEXT
+);
+CREATE TABLE users (
+    id TEXT PRIMARY KEY, tenant_id TEXT NOT NULL, email TEXT NOT NULL,
+    role TEXT DEFAULT 'developer', status TEXT DEFAULT 'active'
+);
+CREATE TABLE api_keys (
+    id TEXT PRIMARY KEY, tenant_id TEXT NOT NULL, user_id TEXT NOT NULL,
+    key_hash TEXT UNIQUE NOT NULL, key_prefix TEXT, name TEXT,
+    scopes TEXT DEFAULT '["*"]', status TEXT DEFAULT 'active',
+    expires_at TEXT, last_used_at TEXT, created_at TEXT
+);
+CREATE TABLE audit_platform (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, tenant_id TEXT, user_id TEXT,
+    event_type TEXT, action TEXT, details TEXT, ip_address TEXT, recorded_at TEXT
+);
+"""
+
+KEY = "icdev_" + "a" * 32
+OTHER_KEY = "icdev_" + "b" * 32
+
+
+def _add_key(db, key, key_id, tenant_id="tenant-1", user_id="user-1", expires_at=None):
+    conn = sqlite3.connect(str(db))
+    conn.execute(
+        "INSERT INTO api_keys (id, tenant_id, user_id, key_hash, expires_at) VALUES (?, ?, ?, ?, ?)",
+        (key_id, tenant_id, user_id, hashlib.sha256(key.encode()).hexdigest(), expires_at))
+    conn.commit()
+    conn.close()
+
+
+def _execute(db, sql, params=()):
+    conn = sqlite3.connect(str(db))
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def platform_db(tmp_path, monkeypatch):
+    db = tmp_path / "platform.db"
+    conn = sqlite3.connect(str(db))
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO tenants (id, name, slug) VALUES ('tenant-1', 'Org', 'org')")
+    conn.execute("INSERT INTO users (id, tenant_id, email) VALUES ('user-1', 'tenant-1', 'a@b.mil')")
+    conn.execute("INSERT INTO users (id, tenant_id, email) VALUES ('user-2', 'tenant-1', 'c@d.mil')")
+    conn.commit()
+    conn.close()
+    _add_key(db, KEY, "key-1")
+    monkeypatch.setattr(api_key_auth, "PLATFORM_DB_PATH", db)
+    monkeypatch.setenv("PLATFORM_DB_PATH", str(db))
+    monkeypatch.setattr(api_key_auth, "_cache", PrincipalCache(ttl=60, negative_ttl=10))
+    return db
+
+
+def _db_reads(monkeypatch):
+    calls = []
+    original = api_key_auth._get_platform_conn
+    monkeypatch.setattr(api_key_auth, "_get_platform_conn",
+                        lambda: calls.append(1) or original())
+    return calls
+
+
+class TestPrincipalCache:
+    def test_hit_skips_database(self, platform_db, monkeypatch):
+        reads = _db_reads(monkeypatch)
+        first = validate_api_key(KEY)
+        second = validate_api_key(KEY)
+        assert first == second and first["tenant_id"] == "tenant-1"
+        assert len(reads) == 1
+        assert not any(k.startswith("_") for k in second)
+
+    def test_unknown_key_negatively_cached(self, platform_db, monkeypatch):
+        reads = _db_reads(monkeypatch)
+        assert validate_api_key(OTHER_KEY) is None
+        assert validate_api_key(OTHER_KEY) is None
+        assert len(reads) == 1
+        assert api_key_auth.get_principal_cache().stats["negative_hits"] == 1
+
+    def test_inactive_key_not_cached(self, platform_db, monkeypatch):
+        _execute(platform_db, "UPDATE api_keys SET status = 'revoked'")
+        reads = _db_reads(monkeypatch)
+        assert validate_api_key(KEY) is None
+        _execute(platform_db, "UPDATE api_keys SET status = 'active'")
+        assert validate_api_key(KEY) is not None
+        assert len(reads) == 2
+
+    def test_ttl_expiry_rereads(self, platform_db, monkeypatch):
+        monkeypatch.setattr(api_key_auth, "_cache", PrincipalCache(ttl=0.01))
+        validate_api_key(KEY)
+        _execute(platform_db, "UPDATE api_keys SET status = 'revoked'")
+        time.sleep(0.02)
+        assert validate_api_key(KEY) is None
+
+    def test_key_expiring_within_ttl_rejected(self, platform_db):
+        soon = (datetime.now(timezone.utc) + timedelta(seconds=0.05)).isoformat()
+        _add_key(platform_db, OTHER_KEY, "key-2", expires_at=soon)
+        assert validate_api_key(OTHER_KEY) is not None
+        time.sleep(0.1)
+        assert validate_api_key(OTHER_KEY) is None
+
+    def test_lru_bound(self):
+        cache = PrincipalCache(max_entries=2)
+        for h in ("a", "b", "c"):
+            cache.put(h, None)
+        assert len(cache) == 2 and cache.get("a") == (False, None)
+
+    def test_disabled_when_ttl_zero(self, platform_db, monkeypatch):
+        monkeypatch.setattr(api_key_auth, "_cache", PrincipalCache(ttl=0))
+        reads = _db_reads(monkeypatch)
+        validate_api_key(KEY)
+        validate_api_key(KEY)
+        assert len(reads) == 2
+
+
+class TestInvalidation:
+    def test_invalidate_by_key_id(self, platform_db):
+        validate_api_key(KEY)
+        _execute(platform_db, "UPDATE api_keys SET status = 'revoked'")
+        assert validate_api_key(KEY) is not None  # Still cached
+        assert api_key_auth.invalidate_api_key(key_id="key-1") == 1
+        assert validate_api_key(KEY) is None
+
+    def test_invalidate_tenant_and_user(self, platform_db):
+        _add_key(platform_db, OTHER_KEY, "key-2", user_id="user-2")
+        validate_api_key(KEY)
+        validate_api_key(OTHER_KEY)
+        assert api_key_auth.invalidate_user("user-2", tenant_id="tenant-1") == 1
+        assert api_key_auth.invalidate_tenant("tenant-1") == 1
+        assert len(api_key_auth.get_principal_cache()) == 0
+
+    @pytest.mark.skipif(not _TENANT_MANAGER_OK, reason="tenant_manager dependencies not installed")
+    def test_suspend_tenant_evicts(self, platform_db, monkeypatch):
+        def _conn():
+            c = sqlite3.connect(str(platform_db))
+            c.row_factory = sqlite3.Row
+            return c
+
+        monkeypatch.setattr(tenant_manager, "get_platform_connection", _conn)
+        monkeypatch.setattr(tenant_manager, "_audit_platform", lambda *a, **kw: None)
+        assert validate_api_key(KEY) is not None
+        tenant_manager.suspend_tenant("tenant-1")
+        assert validate_api_key(KEY) is None
+
+
+class TestAuthEventBuffer:
+    def test_events_written_in_one_batch(self, platform_db):
+        buffer = middleware.AuthEventBuffer(flush_interval=60, batch_size=1000)
+        for i in range(25):
+            buffer.add((None, None, "auth.failed", "invalid_credentials",
+                        "{}", f"10.0.0.{i}", "2026-01-01T00:00:00Z"))
+        conn = sqlite3.connect(str(platform_db))
+        assert conn.execute("SELECT COUNT(*) FROM audit_platform").fetchone()[0] == 0
+        assert buffer.flush() == 25
+        assert conn.execute("SELECT COUNT(*) FROM audit_platform").fetchone()[0] == 25
+        conn.close()
+
+    def test_batch_size_triggers_background_flush(self, platform_db):
+        buffer = middleware.AuthEventBuffer(flush_interval=60, batch_size=5)
+        for _ in range(5):
+            buffer.add((None, None, "auth.failed", "x", "{}", "ip", "ts"))
+        deadline = time.time() + 5
+        while buffer._pending and time.time() < deadline:
+            time.sleep(0.01)
+        conn = sqlite3.connect(str(platform_db))
+        assert conn.execute("SELECT COUNT(*) FROM audit_platform").fetchone()[0] == 5
+        conn.close()
+
+    def test_overflow_drops_oldest(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PLATFORM_DB_PATH", str(tmp_path / "missing.db"))
+        buffer = middleware.AuthEventBuffer(flush_interval=60, batch_size=100, max_pending=3)
+        for i in range(5):
+            buffer.add((i,))
+        assert [row[0] for row in buffer._pending] == [2, 3, 4]
+
+    def test_log_auth_event_is_buffered(self, platform_db, monkeypatch):
+        buffer = middleware.AuthEventBuffer(flush_interval=60)
+        monkeypatch.setattr(middleware, "_auth_events", buffer)
+        middleware._log_auth_event(None, None, "auth.failed",
+                                   {"action": "missing_credentials"}, "1.2.3.4")
+        assert middleware.flush_auth_events() == 1
@@ -0,0 +1,201 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.security.sast_executor — parallel, incremental SAST runs.
+
+Run: pytest tests/test_sast_executor.py -v
+"""
+
+import threading
+
+import pytest
+
+from tools.security import sast_runner
+from tools.security.sast_executor import SastExecutor, merge_findings
+
+
+class FakeRunner:
+    """Stands in for a sast_runner runner; reports one finding per file containing "bad"."""
+
+    def __init__(self, tool, barrier=None, success=True):
+        self.tool = tool
+        self.barrier = barrier
+        self.success = success
+        self.calls = []
+
+    def __call__(self, project_path, output_file=None, targets=None, timeout=300):
+        self.calls.append({"targets": targets, "timeout": timeout})
+        if self.barrier is not None:
+            self.barrier.wait()
+        root = Path(project_path)
+        if targets is None:
+            files = sorted(p for p in root.rglob("*") if p.is_file())
+        elif self.tool == "gosec":
+            files = sorted(p for t in targets for p in (root / t).glob("*.go"))
+        else:
+            files = [Path(t) for t in targets]
+        findings = [
+            {"file": str(f), "line": 1, "severity": "HIGH", "message": "bad call", "cwe": "X1"}
+            for f in files if "bad" in f.read_text()
+        ]
+        return {"tool": self.tool, "success": self.success, "findings": findings,
+                "summary": {}, "raw_output": ""}
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "a.py").write_text("bad\n")
+    (root / "pkg" / "b.py").write_text("ok\n")
+    (root / "pkg" / "c.py").write_text("ok\n")
+    return root
+
+
+@pytest.fixture
+def available(monkeypatch):
+    monkeypatch.setattr(sast_runner, "probe_tool",
+                        lambda tool, cwd=None: {"available": True, "version": "1.0", "message": ""})
+
+
+def _executor(tmp_path, **kwargs):
+    return SastExecutor(cache_path=str(tmp_path / "cache.json"), **kwargs)
+
+
+class TestProbeCache:
+    def test_probe_runs_once_until_cleared(self, monkeypatch):
+        calls = []
+
+        class Proc:
+            returncode = 0
+            stdout = "bandit 1.7.9\nextra\n"
+            stderr = ""
+
+        monkeypatch.setattr(sast_runner.subprocess, "run",
+                            lambda cmd, **kw: calls.append(cmd) or Proc())
+        sast_runner.clear_probe_cache()
+        try:
+            first = sast_runner.probe_tool("bandit")
+            assert sast_runner.probe_tool("bandit") == first
+            assert first == {"available": True, "version": "bandit 1.7.9", "message": ""}
+            assert len(calls) == 1
+            sast_runner.clear_probe_cache()
+            sast_runner.probe_tool("bandit")
+            assert len(calls) == 2
+        finally:
+            sast_runner.clear_probe_cache()
+
+    def test_missing_tool_reports_install_hint(self, monkeypatch):
+        def missing(cmd, **kw):
+            raise FileNotFoundError(cmd[0])
+
+        monkeypatch.setattr(sast_runner.subprocess, "run", missing)
+        sast_runner.clear_probe_cache()
+        try:
+            result = sast_runner.run_gosec("/nonexistent")
+        finally:
+            sast_runner.clear_probe_cache()
+        assert result["success"] is False
+        assert "go install" in result["raw_output"]
+
+
+class TestIncremental:
+    def test_only_changed_files_rescanned(self, tmp_path, project, available, monkeypatch):
+        bandit = FakeRunner("bandit")
+        monkeypatch.setattr(sast_runner, "run_bandit", bandit)
+        executor = _executor(tmp_path)
+
+        first = executor.run(str(project), ["python"])
+        assert bandit.calls[-1]["targets"] is None
+        assert first["tools"]["bandit"]["cache"]["mode"] == "full"
+        assert first["summary"]["HIGH"] == 1
+
+        second = executor.run(str(project), ["python"])
+        assert len(bandit.calls) == 1
+        assert second["tools"]["bandit"]["cache"] == {
+            "mode": "cached", "units": 3, "rescanned": 0, "reused": 3}
+        assert second["all_findings"] == first["all_findings"]
+
+        (project / "pkg" / "b.py").write_text("bad again\n")
+        third = executor.run(str(project), ["python"])
+        assert bandit.calls[-1]["targets"] == [str(project.resolve() / "pkg" / "b.py")]
+        assert third["tools"]["bandit"]["cache"]["mode"] == "incremental"
+        assert sorted(Path(f["file"]).name for f in third["all_findings"]) == ["a.py", "b.py"]
+
+    def test_config_change_forces_full_rescan(self, tmp_path, project, available, monkeypatch):
+        bandit = FakeRunner("bandit")
+        monkeypatch.setattr(sast_runner, "run_bandit", bandit)
+        executor = _executor(tmp_path)
+        executor.run(str(project), ["python"])
+        (project / ".bandit").write_text("[bandit]\nskips = B101\n")
+        result = executor.run(str(project), ["python"])
+        assert len(bandit.calls) == 2
+        assert result["tools"]["bandit"]["cache"]["mode"] == "full"
+
+    def test_go_packages_are_units(self, tmp_path, available, monkeypatch):
+        root = tmp_path / "goproj"
+        for pkg in ("auth", "db"):
+            (root / pkg).mkdir(parents=True)
+            (root / pkg / "x.go").write_text("ok\n")
+        gosec = FakeRunner("gosec")
+        monkeypatch.setattr(sast_runner, "run_gosec", gosec)
+        executor = _executor(tmp_path)
+        executor.run(str(root), ["go"])
+        (root / "db" / "y.go").write_text("bad\n")
+        result = executor.run(str(root), ["go"])
+        assert gosec.calls[-1]["targets"] == ["./db"]
+        assert result["summary"]["total"] == 1
+
+    def test_failed_run_is_not_cached(self, tmp_path, project, available, monkeypatch):
+        bandit = FakeRunner("bandit", success=False)
+        monkeypatch.setattr(sast_runner, "run_bandit", bandit)
+        executor = _executor(tmp_path)
+        assert executor.run(str(project), ["python"])["overall_success"] is False
+        executor.run(str(project), ["python"])
+        assert len(bandit.calls) == 2
+
+    def test_no_cache_always_scans(self, tmp_path, project, available, monkeypatch):
+        bandit = FakeRunner("bandit")
+        monkeypatch.setattr(sast_runner, "run_bandit", bandit)
+        executor = SastExecutor(use_cache=False)
+        executor.run(str(project), ["python"])
+        executor.run(str(project), ["python"])
+        assert [c["targets"] for c in bandit.calls] == [None, None]
+
+
+class TestParallel:
+    def test_tools_run_concurrently_with_own_timeouts(self, tmp_path, project, available,
+                                                      monkeypatch):
+        (project / "main.go").write_text("bad\n")
+        barrier = threading.Barrier(2, timeout=5)
+        bandit = FakeRunner("bandit", barrier=barrier)
+        gosec = FakeRunner("gosec", barrier=barrier)
+        monkeypatch.setattr(sast_runner, "run_bandit", bandit)
+        monkeypatch.setattr(sast_runner, "run_gosec", gosec)
+
+        result = _executor(tmp_path, timeouts={"gosec": 42}).run(str(project), ["python", "go"])
+        assert result["overall_success"] is True
+        assert bandit.calls[0]["timeout"] == sast_runner.DEFAULT_TIMEOUT
+        assert gosec.calls[0]["timeout"] == 42
+        assert set(result["results"]) == {"python", "go"}
+
+    def test_javascript_and_typescript_share_one_eslint_run(self, tmp_path, available,
+                                                            monkeypatch):
+        root = tmp_path / "web"
+        (root / "src").mkdir(parents=True)
+        (root / "src" / "app.ts").write_text("bad\n")
+        (root / "dist.js").write_text("ok\n")  # outside src/, not a scan unit
+        eslint = FakeRunner("eslint-security")
+        monkeypatch.setattr(sast_runner, "run_eslint_security", eslint)
+
+        result = _executor(tmp_path).run(str(root), ["javascript", "typescript"])
+        assert len(eslint.calls) == 1
+        assert result["results"]["javascript"] is result["results"]["typescript"]
+        assert result["tools"]["eslint-security"]["cache"]["units"] == 1
+
+    def test_merge_findings_drops_duplicates(self):
+        finding = {"file": "/p/./a.py", "line": 3, "test_id": "B605", "issue_text": "shell"}
+        other = dict(finding, line=4)
+        assert merge_findings([finding, dict(finding, file="/p/a.py"), other]) == [finding, other]
@@ -0,0 +1,156 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.monitor.alert_correlator — streaming, indexed alert correlation.
+
+Run: pytest tests/test_stream_correlator.py -v
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from tools.monitor.alert_correlator import (
+    StreamingCorrelator,
+    _normalize_alert,
+    _similarity,
+    correlate,
+    deduplicate,
+)
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+WORDS = "cpu high memory disk latency error timeout pod crash restart api db queue".split()
+
+
+def _alert(i, seconds, service="api", title="High CPU", description="", labels=None, **extra):
+    return {
+        "id": i,
+        "title": title,
+        "description": description,
+        "service": service,
+        "source": extra.pop("source", "prometheus"),
+        "severity": extra.pop("severity", "warning"),
+        "labels": labels or {},
+        "timestamp": (BASE + timedelta(seconds=seconds)).isoformat(),
+        **extra,
+    }
+
+
+def _pairwise(alerts, window):
+    """The original nested-loop grouping, as lists of alert ids per incident."""
+    normalized = [_normalize_alert(a) for a in alerts]
+    for a in normalized:
+        a["_dt"] = datetime.fromisoformat(a["timestamp"])
+    normalized.sort(key=lambda a: a["_dt"])
+    groups, used = [], set()
+    for i, alert in enumerate(normalized):
+        if i in used:
+            continue
+        used.add(i)
+        group = [alert["id"]]
+        for j, other in enumerate(normalized):
+            if j in used or abs((other["_dt"] - alert["_dt"]).total_seconds()) > window:
+                continue
+            shared = set(alert["labels"].items()) & set(other["labels"].items())
+            if (other["service"] == alert["service"]
+                    or _similarity(other["title"], alert["title"]) > 0.4
+                    or _similarity(other["description"], alert["description"]) > 0.5
+                    or len(shared) >= 2):
+                group.append(other["id"])
+                used.add(j)
+        groups.append(group)
+    return groups
+
+
+def _groups(incidents):
+    return sorted(
+        [inc["primary_alert"]["id"]] + [a["id"] for a in inc["related_alerts"]]
+        for inc in incidents
+    )
+
+
+class TestParity:
+    def test_random_bursts_match_pairwise_scan(self):
+        rng = random.Random(11)
+        for _ in range(50):
+            alerts = [
+                _alert(i, rng.randint(0, 600),
+                       service=f"svc{rng.randint(0, 12)}",
+                       title=" ".join(rng.sample(WORDS, rng.randint(1, 4))),
+                       description=" ".join(rng.sample(WORDS, rng.randint(0, 4))),
+                       labels={f"k{k}": rng.randint(0, 1)
+                               for k in rng.sample(range(4), rng.randint(0, 3))})
+                for i in range(rng.randint(1, 60))
+            ]
+            window = rng.choice([30, 120, 300])
+            expected = sorted(_pairwise(alerts, window))
+            assert _groups(correlate(alerts, timedelta(seconds=window))) == expected
+
+    def test_incident_fields(self):
+        alerts = [
+            _alert(1, 0, severity="warning", source="elk"),
+            _alert(2, 90, severity="critical", source="splunk"),
+            _alert(3, 1000, service="db", title="Disk full"),
+        ]
+        incidents = correlate(alerts)
+        first = incidents[0]
+        assert first["incident_id"] == "INC-0001"
+        assert first["severity"] == "critical"
+        assert sorted(first["sources"]) == ["elk", "splunk"]
+        assert first["duration_seconds"] == 90.0
+        assert "_dt" not in first["primary_alert"] and "raw" not in first["related_alerts"][0]
+        assert incidents[1]["incident_id"] == "INC-0003"
+
+    def test_window_is_anchored_on_primary(self):
+        # 3 is within 5 minutes of 2 but not of the primary 1
+        alerts = [_alert(1, 0), _alert(2, 200), _alert(3, 400)]
+        assert _groups(correlate(alerts)) == [[1, 2], [3]]
+
+
+class TestStreaming:
+    def test_incremental_matches_batch(self):
+        alerts = [
+            _alert(1, 0, service="api", title="Pod crash loop"),
+            _alert(2, 30, service="web", title="Pod crash loop detected"),
+            _alert(3, 45, service="db", labels={"pod": "p1", "ns": "prod"}),
+            _alert(4, 50, service="cache", labels={"pod": "p1", "ns": "prod"}),
+        ]
+        correlator = StreamingCorrelator()
+        ids = [correlator.add(a) for a in alerts]
+        assert ids == ["INC-0001", "INC-0001", "INC-0003", "INC-0003"]
+        assert correlator.incidents() == correlate(alerts)
+
+    def test_unrelated_burst_is_not_compared_pairwise(self):
+        correlator = StreamingCorrelator(timedelta(minutes=5))
+        for i in range(2000):
+            correlator.add(_alert(i, i // 10, service=f"svc{i}", title=f"alert{i} fired"))
+        assert len(correlator.incidents()) == 2000
+        assert correlator.candidates_checked == 0
+
+    def test_window_slides_and_closed_incidents_are_released(self):
+        correlator = StreamingCorrelator(timedelta(seconds=60))
+        correlator.add(_alert(1, 0))
+        correlator.add(_alert(2, 30))
+        assert correlator.open_count() == 1 and correlator.pop_closed() == []
+
+        assert correlator.add(_alert(3, 200)) == "INC-0003"
+        closed = correlator.pop_closed()
+        assert [c["incident_id"] for c in closed] == ["INC-0001"]
+        assert closed[0]["alert_count"] == 2
+        assert [i["incident_id"] for i in correlator.incidents()] == ["INC-0003"]
+        assert correlator.open_count() == 1
+
+
+class TestDeduplicate:
+    def test_only_same_service_duplicates_merge(self):
+        alerts = [
+            _alert(1, 0, source="elk"),
+            _alert(2, 60, source="splunk", severity="critical"),
+            _alert(3, 10, service="db"),
+            _alert(4, 500, source="prometheus"),
+        ]
+        deduped = deduplicate(alerts)
+        assert [d["id"] for d in deduped] == [1, 3, 4]
+        assert deduped[0]["duplicate_sources"] == ["elk", "splunk"]
+        assert deduped[0]["severity"] == "critical"
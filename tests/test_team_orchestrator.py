@@ -7,6 +7,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import json
 import sqlite3
+import threading
+import time
 from dataclasses import asdict
 from unittest.mock import MagicMock, patch
 
@@ -16,8 +18,10 @@ from tools.agent.team_orchestrator import (
     Subtask,
     TeamOrchestrator,
     Workflow,
+    _critical_path_ranks,
     _ensure_tables,
     _get_db,
+    _load_agent_limits,
 )
 
 
@@ -364,6 +368,172 @@ class TestExecuteWorkflow:
         assert result.status == "partially_completed"
 
 
+class TestStreamingScheduler:
+    """execute_workflow: event-driven dispatch, priorities, agent caps, resume."""
+
+    @staticmethod
+    def _succeed(subtask, context):
+        subtask.status = "completed"
+        subtask.output_data = {"result": f"done-{subtask.id}"}
+        subtask.duration_ms = 1
+        return subtask
+
+    @patch("tools.agent.team_orchestrator._audit_log")
+    def test_slow_branch_does_not_stall_independent_branch(self, mock_audit, orchestrator):
+        """A dependent of a fast subtask starts while an unrelated slow one still runs."""
+        wf = Workflow(id="wf-stream-1", name="Streaming", project_id="proj-1")
+        wf.subtasks["slow"] = Subtask(id="slow", agent_id="a", skill_id="sk")
+        wf.subtasks["fast"] = Subtask(id="fast", agent_id="a", skill_id="sk")
+        wf.subtasks["after_fast"] = Subtask(id="after_fast", agent_id="a", skill_id="sk",
+                                            depends_on=["fast"])
+        orchestrator._persist_workflow(wf)
+        after_fast_started = threading.Event()
+
+        def _exec(subtask, context):
+            if subtask.id == "slow":
+                # Only succeeds if after_fast is dispatched without waiting for this wave
+                if not after_fast_started.wait(5):
+                    subtask.status = "failed"
+                    return subtask
+            if subtask.id == "after_fast":
+                after_fast_started.set()
+            return self._succeed(subtask, context)
+
+        orchestrator._max_workers = 3
+        orchestrator._execute_subtask = _exec
+        result = orchestrator.execute_workflow(wf, timeout=30)
+        assert result.status == "completed"
+
+    @patch("tools.agent.team_orchestrator._audit_log")
+    def test_critical_path_started_first(self, mock_audit, orch_db):
+        """With one worker, the head of the longest chain runs before a lone subtask."""
+        orch = TeamOrchestrator(max_workers=1, db_path=orch_db, agent_limits={})
+        wf = Workflow(id="wf-crit-1", name="Critical path")
+        wf.subtasks["a-lone"] = Subtask(id="a-lone", agent_id="a", skill_id="sk")
+        wf.subtasks["z-head"] = Subtask(id="z-head", agent_id="a", skill_id="sk")
+        wf.subtasks["z-mid"] = Subtask(id="z-mid", agent_id="a", skill_id="sk", depends_on=["z-head"])
+        wf.subtasks["z-tail"] = Subtask(id="z-tail", agent_id="a", skill_id="sk", depends_on=["z-mid"])
+        order = []
+
+        def _exec(subtask, context):
+            order.append(subtask.id)
+            return self._succeed(subtask, context)
+
+        orch._execute_subtask = _exec
+        orch.execute_workflow(wf, timeout=30)
+        # Ties (z-tail vs a-lone, both 1 step left) go to the earlier-ready subtask
+        assert order == ["z-head", "z-mid", "a-lone", "z-tail"]
+
+    @patch("tools.agent.team_orchestrator._audit_log")
+    def test_per_agent_concurrency_cap(self, mock_audit, orch_db):
+        """An agent never runs more than its cap, while other agents keep working."""
+        orch = TeamOrchestrator(max_workers=4, db_path=orch_db, agent_limits={"capped": 1})
+        wf = Workflow(id="wf-cap-1", name="Caps")
+        for i in range(3):
+            wf.subtasks[f"c{i}"] = Subtask(id=f"c{i}", agent_id="capped", skill_id="sk")
+            wf.subtasks[f"f{i}"] = Subtask(id=f"f{i}", agent_id="free", skill_id="sk")
+        lock = threading.Lock()
+        active = {"capped": 0, "free": 0}
+        peak = {"capped": 0, "free": 0}
+
+        def _exec(subtask, context):
+            with lock:
+                active[subtask.agent_id] += 1
+                peak[subtask.agent_id] = max(peak[subtask.agent_id], active[subtask.agent_id])
+            time.sleep(0.05)
+            with lock:
+                active[subtask.agent_id] -= 1
+            return self._succeed(subtask, context)
+
+        orch._execute_subtask = _exec
+        result = orch.execute_workflow(wf, timeout=30)
+        assert result.status == "completed"
+        assert peak["capped"] == 1
+        assert peak["free"] > 1
+
+    @patch("tools.agent.team_orchestrator._audit_log")
+    def test_failure_blocks_all_descendants(self, mock_audit, orchestrator):
+        """Descendants of a failed subtask are blocked and never dispatched."""
+        wf = Workflow(id="wf-chain-1", name="Chain")
+        wf.subtasks["s1"] = Subtask(id="s1", agent_id="a", skill_id="sk")
+        wf.subtasks["s2"] = Subtask(id="s2", agent_id="a", skill_id="sk", depends_on=["s1"])
+        wf.subtasks["s3"] = Subtask(id="s3", agent_id="a", skill_id="sk", depends_on=["s2"])
+        orchestrator._persist_workflow(wf)
+        executed = []
+
+        def _exec(subtask, context):
+            executed.append(subtask.id)
+            subtask.status = "failed"
+            subtask.error_message = "boom"
+            return subtask
+
+        orchestrator._execute_subtask = _exec
+        result = orchestrator.execute_workflow(wf, timeout=30)
+        assert executed == ["s1"]
+        assert result.subtasks["s2"].status == "blocked"
+        assert result.subtasks["s3"].status == "blocked"
+        assert result.aggregated_result["summary"]["blocked"] == 2
+
+    @patch("tools.agent.team_orchestrator._audit_log")
+    def test_timeout_cancels_remaining(self, mock_audit, orchestrator):
+        """Subtasks not finished by the deadline are canceled without waiting."""
+        wf = Workflow(id="wf-timeout-1", name="Timeout")
+        wf.subtasks["s1"] = Subtask(id="s1", agent_id="a", skill_id="sk")
+        wf.subtasks["s2"] = Subtask(id="s2", agent_id="a", skill_id="sk", depends_on=["s1"])
+        orchestrator._persist_workflow(wf)
+        release = threading.Event()
+
+        def _exec(subtask, context):
+            release.wait(5)
+            return self._succeed(subtask, context)
+
+        orchestrator._execute_subtask = _exec
+        started = time.time()
+        result = orchestrator.execute_workflow(wf, timeout=0.2)
+        release.set()
+        assert time.time() - started < 2
+        assert result.status == "failed"
+        assert result.subtasks["s2"].status == "canceled"
+
+    @patch("tools.agent.team_orchestrator._audit_log")
+    def test_resume_skips_completed_subtasks(self, mock_audit, orchestrator):
+        """A workflow interrupted mid-run resumes from its persisted state."""
+        wf = Workflow(id="wf-resume-1", name="Resume", project_id="proj-r", status="running")
+        wf.subtasks["s1"] = Subtask(id="s1", agent_id="a", skill_id="sk", status="completed",
+                                    output_data={"schema": "v1"}, duration_ms=40)
+        wf.subtasks["s2"] = Subtask(id="s2", agent_id="a", skill_id="sk", depends_on=["s1"],
+                                    status="queued")
+        wf.subtasks["s3"] = Subtask(id="s3", agent_id="a", skill_id="sk", depends_on=["s2"])
+        orchestrator._persist_workflow(wf)
+        executed, contexts = [], {}
+
+        def _exec(subtask, context):
+            executed.append(subtask.id)
+            contexts[subtask.id] = context
+            return self._succeed(subtask, context)
+
+        restarted = TeamOrchestrator(max_workers=2, db_path=orchestrator._db_path)
+        restarted._execute_subtask = _exec
+        result = restarted.resume_workflow("wf-resume-1", timeout=30)
+
+        assert executed == ["s2", "s3"]
+        assert contexts["s2"]["dependency_outputs"] == {"s1": {"schema": "v1"}}
+        assert result.status == "completed"
+        assert restarted.get_workflow_status("wf-resume-1")["status"] == "completed"
+
+    def test_resume_unknown_workflow(self, orchestrator):
+        assert orchestrator.resume_workflow("wf-missing") is None
+
+    def test_critical_path_ranks(self):
+        graph = {"a": set(), "b": {"a"}, "c": {"b"}, "d": set()}
+        ranks = _critical_path_ranks(graph, {"a": 1, "b": 5, "c": 1, "d": 4})
+        assert ranks == {"a": 7, "b": 6, "c": 1, "d": 4}
+
+    def test_agent_limits_from_config(self):
+        limits = _load_agent_limits()
+        assert limits.get("orchestrator-agent") == 20
+
+
 # ---------------------------------------------------------------------------
 # TestWorkflowPersistence
 # ---------------------------------------------------------------------------
@@ -0,0 +1,230 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.saas.tenant_db_adapter — compiled tool dispatch and tenant caches.
+
+Run: pytest tests/test_tenant_db_adapter.py -v
+"""
+
+import sqlite3
+import types
+
+import pytest
+
+from tools.compat import db_utils
+from tools.saas import tenant_db_adapter
+from tools.saas.tenant_db_adapter import (
+    ToolArgumentError,
+    ToolBinding,
+    ToolDispatchTable,
+    call_tool_with_tenant_db,
+)
+
+SCHEMA_SQL = """
+CREATE TABLE tenants (
+    id TEXT PRIMARY KEY, slug TEXT, db_host TEXT, db_name TEXT, db_port INTEGER,
+    status TEXT, impact_level TEXT, tier TEXT
+);
+"""
+
+
+@pytest.fixture
+def platform(tmp_path, monkeypatch):
+    db = tmp_path / "platform.db"
+    conn = sqlite3.connect(str(db))
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO tenants VALUES ('t1', 'acme', 'localhost-sqlite', 'acme.db', "
+                 "NULL, 'active', 'IL4', 'professional')")
+    conn.execute("INSERT INTO tenants VALUES ('t2', 'beta', NULL, NULL, NULL, 'active', "
+                 "'IL2', 'starter')")
+    conn.commit()
+    conn.close()
+    tenants_dir = tmp_path / "tenants"
+    tenants_dir.mkdir()
+    monkeypatch.setattr(tenant_db_adapter, "PLATFORM_DB_PATH", db)
+    monkeypatch.setattr(tenant_db_adapter, "TENANTS_DATA_DIR", tenants_dir)
+    tenant_db_adapter._cache_clear()
+    yield db
+    tenant_db_adapter._cache_clear()
+
+
+def _platform_reads(monkeypatch):
+    calls = []
+    original = tenant_db_adapter._get_platform_conn
+    monkeypatch.setattr(tenant_db_adapter, "_get_platform_conn",
+                        lambda: calls.append(1) or original())
+    return calls
+
+
+def _tool_module(monkeypatch, calls):
+    """Register a fake tool module so the table can import it by name."""
+    module = types.ModuleType("fake_icdev_tools")
+
+    def scan(project_id, depth=1, db_path=None):
+        calls.append({"project_id": project_id, "depth": depth, "db_path": db_path})
+        return {"project_id": project_id, "db_path": db_path}
+
+    def lint(path, db=None):
+        calls.append({"path": path, "db": db})
+        return {"db": db}
+
+    def plain(target):
+        calls.append({"target": target})
+        return target
+
+    module.scan, module.lint, module.plain = scan, lint, plain
+    monkeypatch.setitem(sys.modules, "fake_icdev_tools", module)
+    return ToolDispatchTable([
+        {"name": name, "module": "fake_icdev_tools", "function": name}
+        for name in ("scan", "lint", "plain")
+    ] + [{"name": "broken", "module": "fake_icdev_tools", "function": "missing"}])
+
+
+class TestToolBinding:
+    def test_plan_resolved_from_signature(self):
+        def tool(project_id, *, fmt="json", database=None):
+            return None
+        binding = ToolBinding(tool)
+        assert binding.db_param == "database"
+        assert binding.required == {"project_id"}
+        assert binding.accepted == {"project_id", "fmt", "database"}
+
+    def test_db_path_preferred_over_db(self):
+        def tool(db=None, db_path=None):
+            return None
+        assert ToolBinding(tool).db_param == "db_path"
+
+    def test_var_kwargs_accepts_anything(self):
+        def tool(project_id, **options):
+            return None
+        ToolBinding(tool).check_arguments({"project_id": "p", "anything": 1})
+
+
+class TestDispatchTable:
+    def test_injects_tenant_db_path(self, platform, monkeypatch):
+        calls = []
+        table = _tool_module(monkeypatch, calls)
+        result = table.call("scan", {"project_id": "p1"}, "t1")
+        expected = str(tenant_db_adapter.TENANTS_DATA_DIR / "acme.db")
+        assert result == {"project_id": "p1", "db_path": expected}
+        table.call("lint", {"path": "x"}, "t2")
+        assert calls[-1]["db"] == str(tenant_db_adapter.TENANTS_DATA_DIR / "beta.db")
+
+    def test_caller_cannot_override_db_path(self, platform, monkeypatch):
+        calls = []
+        table = _tool_module(monkeypatch, calls)
+        table.call("scan", {"project_id": "p1", "db_path": "/etc/other.db"}, "t1")
+        assert calls[0]["db_path"].endswith("acme.db")
+
+    def test_tool_without_db_param(self, platform, monkeypatch):
+        calls = []
+        table = _tool_module(monkeypatch, calls)
+        assert table.call("plain", {"target": "repo"}, "t1") == "repo"
+
+    def test_bad_arguments_rejected_before_execution(self, platform, monkeypatch):
+        calls = []
+        table = _tool_module(monkeypatch, calls)
+        with pytest.raises(ToolArgumentError, match="unexpected colour"):
+            table.call("scan", {"project_id": "p1", "colour": "red"}, "t1")
+        with pytest.raises(ToolArgumentError, match="missing project_id"):
+            table.call("scan", {}, "t1")
+        assert calls == []
+
+    def test_tool_type_error_not_retried(self, platform, monkeypatch):
+        attempts = []
+
+        def flaky(project_id, db_path=None):
+            attempts.append(db_path)
+            raise TypeError("bug inside the tool")
+
+        table = ToolDispatchTable([])
+        table._bindings["flaky"] = ToolBinding(flaky, name="flaky")
+        with pytest.raises(TypeError, match="bug inside"):
+            table.call("flaky", {"project_id": "p1"}, "t1")
+        assert len(attempts) == 1 and attempts[0].endswith("acme.db")
+
+    def test_resolved_once_per_tool(self, platform, monkeypatch):
+        calls = []
+        table = _tool_module(monkeypatch, calls)
+        signatures = []
+        original = tenant_db_adapter.inspect.signature
+        monkeypatch.setattr(tenant_db_adapter.inspect, "signature",
+                            lambda f: signatures.append(f) or original(f))
+        reads = _platform_reads(monkeypatch)
+        for _ in range(5):
+            table.call("scan", {"project_id": "p1"}, "t1")
+        assert len(signatures) == 1
+        assert len(reads) == 1
+
+    def test_unknown_tool_and_inactive_tenant(self, platform, monkeypatch):
+        table = _tool_module(monkeypatch, [])
+        with pytest.raises(ValueError, match="Unknown tool"):
+            table.call("nope", {}, "t1")
+        with pytest.raises(ValueError, match="not found or not active"):
+            table.call("plain", {"target": "x"}, "missing-tenant")
+
+    def test_warm_reports_failures(self, platform, monkeypatch):
+        table = _tool_module(monkeypatch, [])
+        failed = table.warm()
+        assert list(failed) == ["broken"]
+        assert set(table._bindings) == {"scan", "lint", "plain"}
+
+    def test_call_tool_with_tenant_db_uses_cached_binding(self, platform):
+        def tool(name, db_path=None):
+            return db_path
+        assert call_tool_with_tenant_db(tool, "t1", name="x").endswith("acme.db")
+        assert tenant_db_adapter.get_tool_binding(tool) is tenant_db_adapter.get_tool_binding(tool)
+        with pytest.raises(ToolArgumentError):
+            call_tool_with_tenant_db(tool, "t1", nme="typo")
+
+
+class TestTenantCache:
+    def test_invalidate_tenant_rereads_config(self, platform, monkeypatch):
+        reads = _platform_reads(monkeypatch)
+        assert tenant_db_adapter.resolve_tenant_db_path("t1").endswith("acme.db")
+        conn = sqlite3.connect(str(platform))
+        conn.execute("UPDATE tenants SET db_name = 'acme-v2.db' WHERE id = 't1'")
+        conn.commit()
+        conn.close()
+        assert tenant_db_adapter.resolve_tenant_db_path("t1").endswith("acme.db")
+        tenant_db_adapter.invalidate_tenant("t1")
+        assert tenant_db_adapter.resolve_tenant_db_path("t1").endswith("acme-v2.db")
+        assert len(reads) == 2
+
+    def test_suspended_tenant_rejected_after_invalidation(self, platform):
+        tenant_db_adapter.resolve_tenant_db_path("t1")
+        conn = sqlite3.connect(str(platform))
+        conn.execute("UPDATE tenants SET status = 'suspended' WHERE id = 't1'")
+        conn.commit()
+        conn.close()
+        tenant_db_adapter.invalidate_tenant("t1")
+        with pytest.raises(ValueError):
+            tenant_db_adapter.resolve_tenant_db_path("t1")
+
+    def test_tenant_connection_pooled_and_closed_on_invalidate(self, platform):
+        db_path = tenant_db_adapter.TENANTS_DATA_DIR / "acme.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TABLE projects (id TEXT PRIMARY KEY)")
+        conn.execute("INSERT INTO projects VALUES ('p1')")
+        conn.commit()
+        conn.close()
+        assert tenant_db_adapter.verify_project_belongs_to_tenant("t1", "p1")
+        assert not tenant_db_adapter.verify_project_belongs_to_tenant("t1", "p2")
+        key = str(db_path.resolve())
+        assert db_utils.get_pool_metrics()[key]["opened"] == 1
+        tenant_db_adapter.invalidate_tenant("t1")
+        assert key not in db_utils.get_pool_metrics()
+
+    def test_tenant_connection_requires_provisioned_db(self, platform):
+        with pytest.raises(FileNotFoundError):
+            with tenant_db_adapter.tenant_connection("t2"):
+                pass
+
+
+def test_benchmark_reports_both_paths():
+    result = tenant_db_adapter.run_benchmark(iterations=50)
+    assert result["iterations"] == 50
+    assert result["legacy"]["per_call_us"] > 0
+    assert result["compiled"]["per_call_us"] > 0
@@ -0,0 +1,208 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.mbse.thread_graph — cached digital thread graph engine.
+
+Run: pytest tests/test_thread_graph.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from tools.mbse import digital_thread, thread_graph
+from tools.mbse.thread_graph import ThreadGraph, ThreadLink, load_graph
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    thread_graph.clear_graph_cache()
+    yield
+    thread_graph.clear_graph_cache()
+
+
+@pytest.fixture
+def thread_db(tmp_path):
+    db_path = tmp_path / "icdev.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE digital_thread_links (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT NOT NULL,
+            source_type TEXT, source_id TEXT, target_type TEXT, target_id TEXT,
+            link_type TEXT, confidence REAL DEFAULT 1.0, evidence TEXT,
+            created_by TEXT, created_at TEXT,
+            UNIQUE(project_id, source_type, source_id, target_type, target_id, link_type)
+        );
+        CREATE TABLE doors_requirements (id TEXT, project_id TEXT, doors_id TEXT, title TEXT);
+        CREATE TABLE sysml_elements (id TEXT, project_id TEXT, name TEXT, element_type TEXT);
+        CREATE TABLE project_controls (project_id TEXT, control_id TEXT);
+        CREATE TABLE compliance_controls (id TEXT, title TEXT, family TEXT);
+    """)
+    conn.executemany("INSERT INTO doors_requirements VALUES (?, 'p', ?, ?)", [
+        ("r1", "REQ-1", "Encrypt data"), ("r2", "REQ-2", "Log access"),
+        ("r3", "REQ-3", "Unlinked"),
+    ])
+    conn.executemany("INSERT INTO sysml_elements VALUES (?, 'p', ?, 'block')", [
+        ("m1", "CryptoBlock"), ("m2", "AuditBlock"), ("m3", "IdleBlock"),
+    ])
+    conn.executemany("INSERT INTO project_controls VALUES ('p', ?)", [
+        ("SC-13",), ("AU-2",), ("AC-2",),
+    ])
+    conn.execute("INSERT INTO compliance_controls VALUES ('SC-13', 'Cryptographic Protection', 'SC')")
+    conn.executemany(
+        """INSERT INTO digital_thread_links
+           (project_id, source_type, source_id, target_type, target_id, link_type)
+           VALUES ('p', ?, ?, ?, ?, ?)""",
+        [
+            ("doors_requirement", "r1", "sysml_element", "m1", "satisfies"),
+            ("sysml_element", "m1", "code_module", "crypto.py", "implements"),
+            ("code_module", "crypto.py", "test_file", "test_crypto.py", "verifies"),
+            ("code_module", "crypto.py", "nist_control", "SC-13", "maps_to"),
+            ("doors_requirement", "r2", "sysml_element", "m2", "satisfies"),
+            ("sysml_element", "m2", "code_module", "audit.py", "implements"),
+            ("code_module", "orphan.py", "nist_control", "AU-2", "maps_to"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _external_link(db_path, source_id, target_id):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        """INSERT INTO digital_thread_links
+           (project_id, source_type, source_id, target_type, target_id, link_type)
+           VALUES ('p', 'code_module', ?, 'test_file', ?, 'verifies')""",
+        (source_id, target_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestTraces:
+    def test_forward_trace_named_and_nested(self, thread_db):
+        trace = digital_thread.get_forward_trace("p", "doors_requirement", "r1", db_path=thread_db)
+        assert trace["source"]["name"] == "Encrypt data"
+        model = trace["links"][0]
+        assert model["target"] == {"type": "sysml_element", "id": "m1", "name": "CryptoBlock"}
+        code = model["children"][0]
+        assert [c["target"]["id"] for c in code["children"]] == ["test_crypto.py", "SC-13"]
+        assert code["children"][1]["target"]["name"] == "Cryptographic Protection"
+
+    def test_backward_trace_and_depth_limit(self, thread_db):
+        trace = digital_thread.get_backward_trace("p", "test_file", "test_crypto.py",
+                                                  db_path=thread_db)
+        chain = []
+        links = trace["links"]
+        while links:
+            chain.append(links[0]["source"]["id"])
+            links = links[0]["children"]
+        assert chain == ["crypto.py", "m1", "r1"]
+        shallow = digital_thread.get_backward_trace("p", "test_file", "test_crypto.py",
+                                                    max_depth=1, db_path=thread_db)
+        assert shallow["links"][0]["children"] == []
+
+    def test_cycle_reports_edge_but_stops(self):
+        graph = ThreadGraph("p", [
+            ThreadLink(1, "code_module", "a", "code_module", "b", "traces_to", 1.0),
+            ThreadLink(2, "code_module", "b", "code_module", "a", "traces_to", 1.0),
+        ])
+        links, unnamed = graph.trace(("code_module", "a"))
+        back = links[0]["children"][0]
+        assert back["target"]["id"] == "a" and back["children"] == []
+        assert len(unnamed) == 2
+        assert graph.cycle_link_ids() == [2]
+
+    def test_long_chain_cycle_detection_is_iterative(self):
+        n = 5000
+        links = [ThreadLink(i, "code_module", str(i), "code_module", str(i + 1), "traces_to", 1.0)
+                 for i in range(n)]
+        links.append(ThreadLink(n, "code_module", str(n), "code_module", "0", "traces_to", 1.0))
+        assert ThreadGraph("p", links).cycle_link_ids() == [n]
+
+
+class TestCache:
+    def test_graph_reused_until_links_change(self, thread_db):
+        conn = sqlite3.connect(str(thread_db))
+        first = load_graph(conn, "p", db_path=thread_db)
+        assert load_graph(conn, "p", db_path=thread_db) is first
+        conn.close()
+
+        _external_link(thread_db, "audit.py", "test_audit.py")
+        conn = sqlite3.connect(str(thread_db))
+        second = load_graph(conn, "p", db_path=thread_db)
+        conn.close()
+        assert second is not first
+        assert len(second.links) == len(first.links) + 1
+
+    def test_create_and_delete_link_invalidate(self, thread_db, monkeypatch):
+        monkeypatch.setattr(digital_thread, "log_event", lambda **kw: None)
+        before = digital_thread.find_orphans("p", db_path=thread_db)
+        assert before["blocks_without_code"]["count"] == 1
+
+        created = digital_thread.create_link("p", "sysml_element", "m3", "code_module",
+                                             "idle.py", "implements", db_path=thread_db)
+        after = digital_thread.find_orphans("p", db_path=thread_db)
+        assert after["blocks_without_code"]["count"] == 0
+
+        assert digital_thread.delete_link("p", created["id"], db_path=thread_db)
+        again = digital_thread.find_orphans("p", db_path=thread_db)
+        assert again["blocks_without_code"]["items"] == [{"id": "m3", "name": "IdleBlock"}]
+
+    def test_batched_name_resolution(self, thread_db):
+        conn = sqlite3.connect(str(thread_db))
+        statements = []
+        conn.set_trace_callback(statements.append)
+        keys = [("doors_requirement", f"x{i}") for i in range(1200)]
+        keys += [("doors_requirement", "r1"), ("code_module", "a.py"),
+                 ("compliance_artifact", "ssp"), ("stig_rule", "V-1")]
+        names = digital_thread._resolve_element_names(keys, conn)
+        conn.close()
+        assert names[("doors_requirement", "r1")] == "Encrypt data"
+        assert names[("doors_requirement", "x7")] == "x7"
+        assert names[("compliance_artifact", "ssp")] == "artifact: ssp"
+        assert names[("stig_rule", "V-1")] == "V-1"  # missing table
+        assert len(statements) == 3  # 1201 requirement IDs in chunks of 500
+
+
+class TestAnalysis:
+    def test_orphans(self, thread_db):
+        orphans = digital_thread.find_orphans("p", db_path=thread_db)
+        assert [r["id"] for r in orphans["requirements_without_model"]["items"]] == ["r3"]
+        assert [b["id"] for b in orphans["blocks_without_code"]["items"]] == ["m3"]
+        assert [c["id"] for c in orphans["code_without_tests"]["items"]] == [
+            "audit.py", "orphan.py"]
+        assert orphans["controls_without_evidence"]["items"] == [{"control_id": "AC-2"}]
+
+    def test_gaps(self, thread_db):
+        _external_link(thread_db, "audit.py", "test_audit.py")
+        gaps = digital_thread.find_gaps("p", db_path=thread_db)
+        assert [(g["gap_type"], g.get("test_id")) for g in gaps["gaps"]] == [
+            ("test_without_control", "test_audit.py")]
+
+    def test_coverage_full_chain(self, thread_db):
+        coverage = digital_thread.compute_coverage("p", db_path=thread_db)
+        details = coverage["details"]
+        assert details["requirements_linked"] == 2
+        assert details["total_code_modules"] == 3
+        assert details["controls_linked"] == 2
+        assert details["full_chain_requirements"] == 1
+
+    def test_integrity(self, thread_db):
+        conn = sqlite3.connect(str(thread_db))
+        conn.execute(
+            """INSERT INTO digital_thread_links
+               (project_id, source_type, source_id, target_type, target_id, link_type)
+               VALUES ('p', 'sysml_element', 'ghost', 'bogus', 'x', 'implements')""")
+        conn.commit()
+        conn.close()
+        result = digital_thread.validate_thread_integrity("p", db_path=thread_db)
+        types = sorted(issue["type"] for issue in result["issues"])
+        assert types == ["broken_source_link", "broken_target_link", "invalid_target_type"]
+        broken_target = next(i for i in result["issues"] if i["type"] == "broken_target_link")
+        assert "AU-2" in broken_target["description"]
+        assert not result["valid"]
+        assert result["total_links"] == 8
@@ -314,6 +314,108 @@ class TestUnifiedServerLifecycle:
         assert all("name" in t and "description" in t for t in tools_list)
 
 
+# ── Registry Snapshot & Warm Imports ─────────────────────────────
+
+class TestRegistrySnapshot:
+    """Precompiled registry snapshot and background handler warm-up."""
+
+    @pytest.fixture
+    def snapshot(self, tmp_path):
+        from tools.mcp.registry_snapshot import build_snapshot
+        path = tmp_path / "snapshot.json"
+        build_snapshot(path)
+        return path
+
+    def test_snapshot_matches_registry(self, snapshot):
+        """Snapshot-backed server must expose exactly the imported registry."""
+        import json
+        from tools.mcp.unified_server import UnifiedMCPServer
+        fast = UnifiedMCPServer(snapshot_path=snapshot)
+        legacy = UnifiedMCPServer(use_snapshot=False)
+        assert fast._tools_list_json is not None
+        assert json.loads(fast._handle_tools_list({})) == legacy._handle_tools_list({})
+        assert fast._tools.keys() == legacy._tools.keys()
+        assert fast._resources.keys() == legacy._resources.keys()
+        assert fast._tools["terraform_apply"]["max_concurrency"] == 1
+        assert len(fast._handler_cache) == 0
+
+    def test_stale_snapshot_ignored(self, snapshot):
+        import json
+        from tools.mcp.registry_snapshot import load_snapshot
+        from tools.mcp.unified_server import UnifiedMCPServer
+        data = json.loads(snapshot.read_text())
+        data["source_sha256"] = "0" * 64
+        snapshot.write_text(json.dumps(data))
+        assert load_snapshot(snapshot) is None
+        server = UnifiedMCPServer(snapshot_path=snapshot)
+        assert server._tools_list_json is None
+        assert len(server._tools) == len(TOOL_REGISTRY)
+
+    def test_missing_or_corrupt_snapshot_falls_back(self, tmp_path):
+        from tools.mcp.registry_snapshot import load_snapshot
+        assert load_snapshot(tmp_path / "absent.json") is None
+        (tmp_path / "bad.json").write_text("{not json")
+        assert load_snapshot(tmp_path / "bad.json") is None
+
+    def test_validation_rejects_broken_entries(self):
+        from tools.mcp.registry_snapshot import validate_registry
+        problems = validate_registry(
+            {"t": {"category": "x", "module": "tools..bad", "handler": "h-1",
+                   "description": "", "input_schema": {"type": "string"}}},
+            {}, {"ghost": 0},
+        )
+        assert len(problems) == 5
+
+    def test_tools_list_written_verbatim(self, snapshot, monkeypatch):
+        import io
+        import json
+        from types import SimpleNamespace
+        from tools.mcp.unified_server import UnifiedMCPServer
+        server = UnifiedMCPServer(snapshot_path=snapshot)
+        out = io.BytesIO()
+        monkeypatch.setattr(sys, "stdout", SimpleNamespace(buffer=out))
+        server._write_message(server._dispatch({"jsonrpc": "2.0", "id": "l1", "method": "tools/list"}))
+        header, _, body = out.getvalue().partition(b"\r\n\r\n")
+        assert int(header.split(b":")[1]) == len(body)
+        message = json.loads(body)
+        assert message["id"] == "l1"
+        assert len(message["result"]["tools"]) == len(TOOL_REGISTRY)
+
+    def test_late_registration_keeps_tools_list_complete(self, snapshot):
+        from tools.mcp.unified_server import UnifiedMCPServer
+        server = UnifiedMCPServer(snapshot_path=snapshot)
+        server.register_tool("extra_tool", "Extra", {"type": "object"}, lambda a: a)
+        tools = server._handle_tools_list({})["tools"]
+        assert len(tools) == len(TOOL_REGISTRY) + 1
+        assert all(isinstance(t["inputSchema"], dict) for t in tools)
+
+    def test_warm_handlers_uses_recorded_usage(self, tmp_path, monkeypatch):
+        import json
+        import sqlite3
+        from tools.mcp import registry_snapshot
+        from tools.mcp.unified_server import UnifiedMCPServer
+        db = tmp_path / "icdev.db"
+        conn = sqlite3.connect(str(db))
+        conn.execute("CREATE TABLE otel_spans (id TEXT PRIMARY KEY, name TEXT, "
+                     "start_time TEXT, attributes TEXT)")
+        calls = ["project_list"] * 3 + ["nist_lookup"] * 2 + ["project_status"]
+        for i, tool in enumerate(calls):
+            conn.execute("INSERT INTO otel_spans VALUES (?, 'mcp.tool_call', datetime('now'), ?)",
+                         (str(i), json.dumps({"mcp.tool.name": tool})))
+        conn.commit()
+        conn.close()
+        assert registry_snapshot.most_called_tools(2, db_path=db) == ["project_list", "nist_lookup"]
+
+        monkeypatch.setattr(registry_snapshot, "DB_PATH", db)
+        server = UnifiedMCPServer(use_snapshot=False)
+        assert server.warm_handlers(limit=2) == ["project_list", "nist_lookup"]
+        assert set(server._handler_cache) == {"project_list", "nist_lookup"}
+
+    def test_usage_without_database(self, tmp_path):
+        from tools.mcp.registry_snapshot import most_called_tools
+        assert most_called_tools(5, db_path=tmp_path / "none.db") == []
+
+
 # ── Module Path Validation ───────────────────────────────────────
 
 class TestModulePathValidation:
@@ -0,0 +1,253 @@
+# [TEMPLATE: CUI // SP-CTI]
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+"""Tests for tools.saas.usage_meter — buffered usage metering with rollups.
+
+Run: pytest tests/test_usage_meter.py -v
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from tools.saas import request_logger, usage_meter
+from tools.saas.usage_meter import UsageMeter, backfill_rollups, summarize_usage
+
+SCHEMA_SQL = """
+CREATE TABLE usage_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tenant_id TEXT NOT NULL, user_id TEXT,
+    endpoint TEXT NOT NULL, method TEXT NOT NULL,
+    tokens_used INTEGER DEFAULT 0, status_code INTEGER, duration_ms INTEGER,
+    metadata TEXT DEFAULT '{}',
+    recorded_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "platform.db"
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA_SQL)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def meter(db, tmp_path):
+    return UsageMeter(db_path=db, spill_dir=tmp_path / "spill", flush_interval=0,
+                      buffer_size=10000, raw_threshold=0)
+
+
+def _query(db, sql, params=()):
+    conn = sqlite3.connect(str(db))
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+class TestBufferedFlush:
+    def test_nothing_written_until_flush(self, meter, db):
+        for i in range(5):
+            meter.record("t1", "u1", "/api/v1/projects", "GET", 200, 10 + i)
+        assert _query(db, "SELECT COUNT(*) FROM usage_records")[0][0] == 0
+        assert meter.flush() == 5
+        assert _query(db, "SELECT COUNT(*) FROM usage_records")[0][0] == 5
+
+    def test_rollups_aggregate_per_tenant_endpoint_minute(self, meter, db):
+        meter.record("t1", "u1", "/a", "GET", 200, 10, tokens_used=5)
+        meter.record("t1", "u1", "/a", "GET", 500, 30, tokens_used=7)
+        meter.record("t1", "u1", "/b", "POST", 201, 4)
+        meter.record("t2", "u9", "/a", "GET", 200, 1)
+        meter.flush()
+        rows = _query(db, """SELECT tenant_id, endpoint, request_count, error_count,
+                                    tokens_used, duration_ms_total, duration_ms_max
+                             FROM usage_rollups ORDER BY tenant_id, endpoint""")
+        assert [r[:2] for r in rows] == [("t1", "/a"), ("t1", "/b"), ("t2", "/a")]
+        assert rows[0][2:] == (2, 1, 12, 40, 30)
+
+    def test_second_flush_accumulates_into_same_minute(self, meter, db):
+        meter.record("t1", None, "/a", "GET", 200, 10)
+        meter.flush()
+        meter.record("t1", None, "/a", "GET", 200, 20)
+        meter.flush()
+        rows = _query(db, "SELECT request_count, duration_ms_total FROM usage_rollups")
+        assert len(rows) == 1 and rows[0] == (2, 30)
+
+    def test_buffer_size_forces_inline_flush(self, db, tmp_path):
+        meter = UsageMeter(db_path=db, spill_dir=tmp_path / "spill", flush_interval=0,
+                           buffer_size=3)
+        for _ in range(3):
+            meter.record("t1", None, "/a", "GET", 200, 1)
+        assert meter.metrics["inline_flushes"] == 1
+        assert _query(db, "SELECT COUNT(*) FROM usage_records")[0][0] == 3
+
+    def test_pending_usage_counts_unflushed_samples(self, meter):
+        meter.record("t1", None, "bedrock_proxy", "BEDROCK", 200, 0,
+                     tokens_used=30, input_tokens=10, output_tokens=20)
+        meter.record("t2", None, "bedrock_proxy", "BEDROCK", 200, 0, tokens_used=99)
+        pending = meter.pending_usage("t1", endpoint="bedrock_proxy")
+        assert pending == {"request_count": 1, "tokens_used": 30,
+                           "input_tokens": 10, "output_tokens": 20}
+
+
+class TestRawSampling:
+    def test_high_volume_tenant_sampled_rollups_exact(self, db, tmp_path):
+        meter = UsageMeter(db_path=db, spill_dir=tmp_path / "spill", flush_interval=0,
+                           buffer_size=10000, raw_threshold=5, raw_sample_every=4)
+        for _ in range(25):
+            meter.record("busy", None, "/a", "GET", 200, 1)
+        meter.record("busy", None, "/a", "GET", 503, 1)
+        meter.flush()
+        assert _query(db, "SELECT request_count, error_count FROM usage_rollups")[0] == (26, 1)
+        raw = _query(db, "SELECT status_code, metadata FROM usage_records")
+        # 5 under the threshold, every 4th of the next 20, plus the error
+        assert len(raw) == 5 + 5 + 1
+        weights = [json.loads(m).get("sample_weight", 1) for s, m in raw if s == 200]
+        assert sum(weights) == 25
+
+    def test_threshold_is_per_tenant(self, db, tmp_path):
+        meter = UsageMeter(db_path=db, spill_dir=tmp_path / "spill", flush_interval=0,
+                           raw_threshold=2, raw_sample_every=100)
+        for _ in range(10):
+            meter.record("busy", None, "/a", "GET", 200, 1)
+        meter.record("quiet", None, "/a", "GET", 200, 1)
+        meter.flush()
+        counts = dict(_query(db, "SELECT tenant_id, COUNT(*) FROM usage_records GROUP BY 1"))
+        assert counts == {"busy": 2, "quiet": 1}
+
+
+class TestSpillRecovery:
+    def test_crashed_writer_replayed_on_next_flush(self, db, tmp_path):
+        spill = tmp_path / "spill"
+        crashed = UsageMeter(db_path=db, spill_dir=spill, flush_interval=0)
+        for _ in range(3):
+            crashed.record("t1", None, "/a", "GET", 200, 1)
+        crashed._spill.close()  # Process dies: buffer lost, spill file remains
+        assert len(list(spill.glob("*.jsonl"))) == 1
+
+        survivor = UsageMeter(db_path=db, spill_dir=spill, flush_interval=0)
+        assert survivor.flush() == 3
+        assert _query(db, "SELECT request_count FROM usage_rollups")[0][0] == 3
+        assert list(spill.glob("*.jsonl")) == []
+
+    def test_windows_dead_writer_detected(self, monkeypatch):
+        monkeypatch.setattr(usage_meter.os, "name", "nt")
+        monkeypatch.setattr(usage_meter, "_pid_alive_windows", lambda pid: pid == 4242)
+        assert usage_meter._pid_alive(4242) is True
+        assert usage_meter._pid_alive(4243) is False
+
+    def test_windows_probe_failure_assumes_alive(self, monkeypatch):
+        def _no_kernel32(pid):
+            raise OSError("kernel32 unavailable")
+
+        monkeypatch.setattr(usage_meter.os, "name", "nt")
+        monkeypatch.setattr(usage_meter, "_pid_alive_windows", _no_kernel32)
+        assert usage_meter._pid_alive(4243) is True
+
+    def test_replay_is_exactly_once(self, db, tmp_path):
+        spill = tmp_path / "spill"
+        crashed = UsageMeter(db_path=db, spill_dir=spill, flush_interval=0)
+        crashed.record("t1", None, "/a", "GET", 200, 1)
+        crashed.record("t1", None, "/a", "GET", 200, 1)
+        # Crash after commit but before the spill file was deleted
+        crashed._commit(list(crashed._buffer), crashed._spill_path.stem)
+        crashed._spill.close()
+
+        UsageMeter(db_path=db, spill_dir=spill, flush_interval=0).flush()
+        assert _query(db, "SELECT request_count FROM usage_rollups")[0][0] == 2
+        assert list(spill.glob("*.jsonl")) == []
+
+    def test_torn_final_line_ignored(self, db, tmp_path):
+        spill = tmp_path / "spill"
+        crashed = UsageMeter(db_path=db, spill_dir=spill, flush_interval=0)
+        crashed.record("t1", None, "/a", "GET", 200, 1)
+        crashed._spill.write('["t1", null, "/a", "GE')
+        crashed._spill.close()
+        assert UsageMeter(db_path=db, spill_dir=spill, flush_interval=0).flush() == 1
+
+    def test_failed_commit_retried_from_spill(self, db, tmp_path):
+        spill = tmp_path / "spill"
+        meter = UsageMeter(db_path=tmp_path / "missing" / "platform.db", spill_dir=spill,
+                           flush_interval=0)
+        meter.record("t1", None, "/a", "GET", 200, 1)
+        assert meter.flush() == 0
+        assert meter.metrics["errors"] == 1
+        meter.db_path = db
+        assert meter.flush() == 1
+        assert _query(db, "SELECT COUNT(*) FROM usage_records")[0][0] == 1
+
+
+class TestBackfillAndSummary:
+    def _seed_history(self, db):
+        conn = sqlite3.connect(str(db))
+        conn.executemany(
+            "INSERT INTO usage_records (tenant_id, endpoint, method, status_code, duration_ms, "
+            "tokens_used, metadata, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [("t1", "/a", "GET", 200, 10, 0, "{}", "2026-01-01T10:00:05Z"),
+             ("t1", "/a", "GET", 404, 30, 0, "{}", "2026-01-01T10:00:50Z"),
+             ("t1", "bedrock_proxy", "BEDROCK", 200, 0, 12,
+              '{"input_tokens": 5, "output_tokens": 7}', "2026-01-02T08:00:00Z")])
+        conn.commit()
+        conn.close()
+
+    def test_backfill_runs_once(self, db):
+        self._seed_history(db)
+        assert backfill_rollups(db)["rollup_rows"] == 2
+        assert backfill_rollups(db)["skipped"] is True
+        rows = _query(db, "SELECT endpoint, request_count, error_count, input_tokens "
+                          "FROM usage_rollups ORDER BY endpoint")
+        assert rows == [("/a", 2, 1, 0), ("bedrock_proxy", 1, 0, 5)]
+
+    def test_meter_backfills_before_first_commit(self, meter, db):
+        self._seed_history(db)
+        meter.record("t1", None, "/a", "GET", 200, 1)
+        meter.flush()
+        conn = sqlite3.connect(str(db))
+        summary = summarize_usage(conn, "t1")
+        conn.close()
+        assert summary["total_calls"] == 4
+        assert summary["total_tokens"] == 12
+        assert summary["top_endpoints"][0] == {"endpoint": "/a", "call_count": 3,
+                                               "avg_ms": pytest.approx(41 / 3)}
+
+    def test_summary_falls_back_to_raw_rows(self, db):
+        self._seed_history(db)
+        conn = sqlite3.connect(str(db))
+        summary = summarize_usage(conn, "t1", since="2026-01-02T00:00:00Z")
+        conn.close()
+        assert summary["total_calls"] == 1 and summary["total_tokens"] == 12
+
+
+class TestCallers:
+    def test_log_request_goes_through_meter(self, meter, db, monkeypatch):
+        monkeypatch.setattr(usage_meter, "_meter", meter)
+        request_logger.log_request("t1", "u1", "/api/v1/x", "GET", 200, 5,
+                                   metadata={"k": "v"})
+        assert meter.pending_usage("t1")["request_count"] == 1
+        meter.flush()
+        row = _query(db, "SELECT endpoint, metadata FROM usage_records")[0]
+        assert row == ("/api/v1/x", '{"k": "v"}')
+
+    def test_token_usage_reads_rollups_and_pending(self, meter, db, monkeypatch):
+        from tools.saas.bedrock import token_metering
+
+        def _conn():
+            conn = sqlite3.connect(str(db))
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        monkeypatch.setattr(usage_meter, "_meter", meter)
+        monkeypatch.setattr(token_metering, "get_platform_connection", _conn)
+        token_metering.record_token_usage("t1", "u1", "model-x", 100, 50)
+        meter.flush()
+        token_metering.record_token_usage("t1", "u1", "model-x", 10, 5)
+        usage = token_metering.get_token_usage("t1", period="day")
+        assert usage["total_tokens"] == 165
+        assert usage["total_requests"] == 2
+        assert (usage["input_tokens"], usage["output_tokens"]) == (110, 55)
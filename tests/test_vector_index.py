@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Tests for the persistent memory vector index (tools/memory/vector_index.py)."""
+
+import sqlite3
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from tools.memory import vector_index  # noqa: E402
+from tools.memory.vector_index import VectorIndex  # noqa: E402
+
+
+def _blob(vec):
+    return struct.pack(f"{len(vec)}f", *vec)
+
+
+@pytest.fixture
+def memory_db(tmp_path):
+    db_path = tmp_path / "memory.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE memory_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            type TEXT DEFAULT 'event',
+            importance INTEGER DEFAULT 5,
+            embedding BLOB,
+            created_at TEXT DEFAULT (datetime('now')),
+            updated_at TEXT DEFAULT (datetime('now')),
+            content_hash TEXT,
+            user_id TEXT,
+            tenant_id TEXT,
+            source TEXT DEFAULT 'manual'
+        );
+        CREATE TABLE memory_access_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entry_id TEXT,
+            query TEXT,
+            results_count INTEGER,
+            search_type TEXT,
+            accessed_at TEXT DEFAULT (datetime('now'))
+        );
+    """)
+    rows = [
+        ("north", [1.0, 0.0, 0.0], None, None),
+        ("east", [0.0, 1.0, 0.0], "alice", None),
+        ("up", [0.0, 0.0, 1.0], "bob", "t1"),
+        ("north-east", [0.7, 0.7, 0.0], "bob", None),
+        ("unembedded", None, None, None),
+    ]
+    for content, vec, user, tenant in rows:
+        conn.execute(
+            "INSERT INTO memory_entries (content, embedding, user_id, tenant_id) VALUES (?, ?, ?, ?)",
+            (content, _blob(vec) if vec else None, user, tenant),
+        )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def index(memory_db):
+    idx = VectorIndex(db_path=memory_db, config={"hnsw_min_items": 10 ** 9})
+    idx.rebuild()
+    return idx
+
+
+class TestSearch:
+    def test_rebuild_indexes_only_embedded_rows(self, index):
+        assert index.size == 4
+        assert index.dims == 3
+        assert 5 not in index
+
+    def test_top_k_ordering(self, index):
+        hits = index.search([1.0, 0.1, 0.0], limit=2)
+        assert [entry_id for _, entry_id in hits] == [1, 4]
+        assert hits[0][0] == pytest.approx(0.995, abs=1e-3)
+
+    def test_user_scope_includes_null_owner(self, index):
+        ids = {entry_id for _, entry_id in index.search([0.0, 1.0, 0.0], limit=10, user_id="alice")}
+        assert ids == {1, 2}
+
+    def test_tenant_scope(self, index):
+        ids = {entry_id for _, entry_id in index.search([0.0, 0.0, 1.0], limit=10, tenant_id="t2")}
+        assert 3 not in ids
+
+    def test_similarities_aligned_with_ids(self, index):
+        scores = index.similarities([0.0, 1.0, 0.0], [2, 99, 1])
+        assert scores[0] == pytest.approx(1.0)
+        assert scores[1] == 0.0
+        assert scores[2] == pytest.approx(0.0, abs=1e-6)
+
+    def test_dimension_mismatch_returns_nothing(self, index):
+        assert index.search([1.0, 0.0], limit=3) == []
+
+
+class TestPersistence:
+    def test_snapshot_round_trip(self, index, memory_db):
+        fresh = VectorIndex(db_path=memory_db)
+        assert fresh.load() is True
+        assert fresh.size == 4
+        assert fresh.search([0.0, 0.0, 1.0], limit=1)[0][1] == 3
+
+    def test_delta_log_replayed(self, index, memory_db):
+        index.add(42, [0.0, -1.0, 0.0], user_id="carol")
+        index.remove(1)
+        assert index.log_path.exists()
+
+        fresh = VectorIndex(db_path=memory_db)
+        fresh.load()
+        assert 42 in fresh
+        assert 1 not in fresh
+        assert fresh.search([0.0, -1.0, 0.0], limit=1)[0][1] == 42
+
+    def test_save_truncates_log(self, index):
+        index.add(42, [0.0, -1.0, 0.0])
+        index.save()
+        assert not index.log_path.exists()
+
+    def test_sync_picks_up_external_changes(self, index, memory_db):
+        conn = sqlite3.connect(str(memory_db))
+        conn.execute("DELETE FROM memory_entries WHERE id = 2")
+        conn.execute("UPDATE memory_entries SET embedding = ? WHERE id = 5",
+                     (_blob([0.0, 0.0, -1.0]),))
+        conn.commit()
+        conn.close()
+
+        result = index.sync()
+        assert result == {"added": 1, "removed": 1}
+        assert 2 not in index and 5 in index
+        assert index.sync() == {"added": 0, "removed": 0}
+
+    def test_record_embeddings_appends_to_log(self, index, memory_db, monkeypatch):
+        monkeypatch.setattr(vector_index, "_indexes", {})
+        count = vector_index.record_embeddings([(7, [0.5, 0.5, 0.5], None, None)],
+                                               db_path=memory_db)
+        assert count == 1
+        fresh = VectorIndex(db_path=memory_db)
+        fresh.load()
+        assert 7 in fresh
+
+
+    def test_record_embeddings_reuses_warm_index(self, index, memory_db, monkeypatch):
+        monkeypatch.setattr(vector_index, "_indexes", {})
+        loads = []
+        original_load = VectorIndex.load
+
+        def _counting_load(self):
+            loads.append(1)
+            return original_load(self)
+
+        monkeypatch.setattr(VectorIndex, "load", _counting_load)
+        vector_index.record_embeddings([(7, [0.5, 0.5, 0.5], None, None)], db_path=memory_db)
+        vector_index.record_embeddings([(8, [0.5, 0.0, 0.5], None, None)], db_path=memory_db)
+        assert len(loads) == 1
+        cached = vector_index._cached_index(memory_db)
+        assert 7 in cached and 8 in cached
+
+    def test_unchanged_db_skips_fingerprint(self, index, memory_db, monkeypatch):
+        index.sync()
+        calls = []
+        original = VectorIndex._db_fingerprint
+        monkeypatch.setattr(VectorIndex, "_db_fingerprint",
+                            staticmethod(lambda conn: calls.append(1) or original(conn)))
+        assert index.sync() == {"added": 0, "removed": 0}
+        assert calls == []
+
+        conn = sqlite3.connect(str(memory_db))
+        conn.execute("DELETE FROM memory_entries WHERE id = 2")
+        conn.commit()
+        conn.close()
+        assert index.sync() == {"added": 0, "removed": 1}
+        assert calls == [1]
+        index.close()
+
+
+class TestSearchIntegration:
+    def test_semantic_search_uses_index(self, memory_db, monkeypatch):
+        from tools.memory import semantic_search
+
+        class _Provider:
+            def embed(self, text):
+                return [0.0, 1.0, 0.0]
+
+        monkeypatch.setattr(semantic_search, "DB_PATH", memory_db)
+        monkeypatch.setattr(semantic_search, "get_openai_client", lambda: _Provider())
+        monkeypatch.setattr(vector_index, "_indexes", {})
+
+        results = semantic_search.search("east", limit=2)
+        assert results[0][1] == 2
+        assert results[0][2] == "east"
+        assert len(results) == 2
+
+    def test_hybrid_semantic_reports_unavailable_when_index_fails(self):
+        from tools.memory import hybrid_search
+
+        class _Provider:
+            def embed(self, text):
+                return [0.0, 1.0, 0.0]
+
+        class _BrokenIndex:
+            def similarities(self, query_embedding, ids):
+                raise RuntimeError("dimension mismatch")
+
+        entries = [(1, "north", "fact", 5, None, "2026-01-01")]
+        assert hybrid_search.semantic_search("north", entries, index=_BrokenIndex(),
+                                             provider=_Provider()) is None
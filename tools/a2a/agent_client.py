@@ -7,11 +7,18 @@ Implements:
 - send_task(url, skill_id, input_data, project_id) -> POST task (JSON-RPC 2.0)
 - get_task_status(url, task_id) -> GET task status
 - cancel_task(url, task_id) -> cancel
-- wait_for_completion(url, task_id, timeout) -> poll until done
+- wait_for_completion(url, task_id, timeout) -> wait until done
+
+Waits are multiplexed: one background long-poll on GET /tasks/events per
+agent wakes every thread waiting on a task of that agent, instead of each
+thread polling GET /tasks/<id>. Agents without the events endpoint fall
+back to interval polling.
 """
 
 import argparse
 import json
+import logging
+import threading
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -25,6 +32,102 @@ except ImportError:
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+logger = logging.getLogger("a2a.client")
+
+TERMINAL_STATES = frozenset({"completed", "failed", "canceled"})
+
+
+class _TaskEventWatcher:
+    """Multiplexes task waits for one agent over a single long-poll loop.
+
+    Waiters register a task ID and block on the returned Event. The watcher
+    thread follows the agent's change feed and sets the Event when that task
+    reaches a terminal state. It also wakes every waiter whenever it cannot
+    vouch for having seen all events (handshake, reset, request error) so
+    callers re-read task status themselves. The thread exits once no
+    waiters remain.
+    """
+
+    def __init__(self, session, agent_url: str, event_wait: float, timeout: float,
+                 retry_delay: float = 1.0):
+        self.session = session
+        self.url = f"{agent_url.rstrip('/')}/tasks/events"
+        self.event_wait = event_wait
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.supported = True
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, List[threading.Event]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._cursor: Optional[int] = None
+        self._stream: Optional[str] = None
+
+    def watch(self, task_id: str) -> threading.Event:
+        """Register a one-shot wake-up for a task's terminal transition."""
+        event = threading.Event()
+        with self._lock:
+            self._waiters.setdefault(task_id, []).append(event)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="a2a-task-events", daemon=True)
+                self._thread.start()
+        return event
+
+    def unwatch(self, task_id: str, event: threading.Event) -> None:
+        with self._lock:
+            events = self._waiters.get(task_id, [])
+            if event in events:
+                events.remove(event)
+            if not events:
+                self._waiters.pop(task_id, None)
+
+    def _wake(self, task_ids=None) -> None:
+        """Set and drop waiters for ``task_ids`` (all when None). Holds lock."""
+        for task_id in list(self._waiters) if task_ids is None else task_ids:
+            for event in self._waiters.pop(task_id, []):
+                event.set()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._waiters or not self.supported:
+                    self._thread = None
+                    return
+            params = {"wait": self.event_wait}
+            if self._cursor is not None:
+                params.update(since=self._cursor, stream=self._stream)
+            try:
+                resp = self.session.get(self.url, params=params,
+                                        timeout=self.event_wait + self.timeout)
+                if resp.status_code in (404, 405, 501):
+                    logger.info("%s has no task event feed; falling back to polling", self.url)
+                    with self._lock:
+                        self.supported = False
+                        self._wake()
+                    continue
+                resp.raise_for_status()
+                page = resp.json()
+            except Exception as exc:
+                logger.debug("Task event long-poll failed (%s): %s", self.url, exc)
+                with self._lock:
+                    self._cursor = None
+                    self._wake()
+                time.sleep(self.retry_delay)
+                continue
+
+            with self._lock:
+                if self._cursor is None or page.get("reset"):
+                    # Position (re)established: transitions before it may have
+                    # been missed, so every current waiter re-reads its task
+                    self._wake()
+                else:
+                    self._wake([
+                        e["task_id"] for e in page.get("events", [])
+                        if e.get("status") in TERMINAL_STATES
+                    ])
+                self._cursor = page.get("seq", 0)
+                self._stream = page.get("stream_id")
+
 
 class A2AAgentClient:
     """Client for interacting with A2A agent servers."""
@@ -37,6 +140,8 @@ class A2AAgentClient:
         api_key: Optional[str] = None,
         verify_ssl: bool = True,
         timeout: int = 30,
+        use_task_events: bool = True,
+        event_wait: float = 25.0,
     ):
         """Initialize the A2A client.
 
@@ -47,6 +152,9 @@ class A2AAgentClient:
             api_key: API key for authentication.
             verify_ssl: Whether to verify SSL certificates (disable for dev).
             timeout: Default request timeout in seconds.
+            use_task_events: Wait on the agent's /tasks/events feed instead
+                of polling each task.
+            event_wait: Seconds each events long-poll is held open.
         """
         if requests is None:
             raise ImportError("requests is required. Install with: pip install requests")
@@ -67,6 +175,11 @@ class A2AAgentClient:
 
         self.session.headers["Content-Type"] = "application/json"
 
+        self.use_task_events = use_task_events
+        self.event_wait = event_wait
+        self._watchers: Dict[str, _TaskEventWatcher] = {}
+        self._watchers_lock = threading.Lock()
+
     def discover_agent(self, agent_url: str) -> dict:
         """Fetch the Agent Card from /.well-known/agent.json.
 
@@ -194,13 +307,17 @@ class A2AAgentClient:
         timeout: int = 300,
         poll_interval: float = 2.0,
     ) -> dict:
-        """Poll a task until it reaches a terminal state.
+        """Wait for a task to reach a terminal state.
+
+        The wait is registered with the agent's shared event watcher before
+        each status read, so a transition after the read always wakes it.
+        Agents without a task event feed are polled every poll_interval.
 
         Args:
             agent_url: Base URL of the agent.
             task_id: ID of the task to monitor.
             timeout: Maximum seconds to wait.
-            poll_interval: Seconds between polls.
+            poll_interval: Seconds between polls (polling fallback only).
 
         Returns:
             Final task dictionary.
@@ -208,23 +325,44 @@ class A2AAgentClient:
         Raises:
             TimeoutError: If task does not complete within timeout.
         """
-        terminal_states = {"completed", "failed", "canceled"}
-        start = time.time()
+        deadline = time.time() + timeout
+        watcher = self._get_watcher(agent_url)
+        status = ""
 
-        while (time.time() - start) < timeout:
-            task = self.get_task_status(agent_url, task_id)
-            status = task.get("status", "")
-
-            if status in terminal_states:
-                return task
-
-            time.sleep(poll_interval)
+        while True:
+            event = watcher.watch(task_id) if watcher and watcher.supported else None
+            try:
+                task = self.get_task_status(agent_url, task_id)
+                status = task.get("status", "")
+                if status in TERMINAL_STATES:
+                    return task
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                if event is not None:
+                    event.wait(remaining)
+                else:
+                    time.sleep(min(poll_interval, remaining))
+            finally:
+                if event is not None:
+                    watcher.unwatch(task_id, event)
 
         raise TimeoutError(
             f"Task {task_id} did not complete within {timeout} seconds. "
             f"Last status: {status}"
         )
 
+    def _get_watcher(self, agent_url: str) -> Optional[_TaskEventWatcher]:
+        """Shared event watcher for an agent (None when disabled)."""
+        if not self.use_task_events:
+            return None
+        key = agent_url.rstrip("/")
+        with self._watchers_lock:
+            watcher = self._watchers.get(key)
+            if watcher is None:
+                watcher = _TaskEventWatcher(self.session, key, self.event_wait, self.timeout)
+                self._watchers[key] = watcher
+            return watcher
 
     def send_tasks_parallel(
         self,
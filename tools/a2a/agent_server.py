@@ -5,7 +5,8 @@
 Uses Flask for HTTP. Implements:
 - GET /.well-known/agent.json  -> Agent Card
 - POST /tasks/send             -> Create and process task (JSON-RPC 2.0)
-- GET /tasks/<task_id>         -> Get task status
+- GET /tasks/<task_id>         -> Get task status (ETag; long-poll with ?wait=N)
+- GET /tasks/events            -> Long-poll change feed of task transitions
 - POST /tasks/<task_id>/cancel -> Cancel task
 - Skill registration with handler functions
 - Task lifecycle management with history tracking
@@ -30,6 +31,7 @@ except ImportError:
     Flask = None  # Handled at runtime
 
 from tools.a2a.task import Task, TaskStatus
+from tools.a2a.task_events import MAX_WAIT_SECONDS, TaskEventLog
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
@@ -69,6 +71,8 @@ class A2AAgentServer:
         self._skills: Dict[str, Dict[str, Any]] = {}
         # In-memory task cache for fast access (also persisted to DB)
         self._tasks: Dict[str, Task] = {}
+        # Change feed of task transitions for long-poll subscribers
+        self._events = TaskEventLog()
         # Thread pool for async task execution (Phase B)
         self._executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix=f"{agent_id}-worker")
 
@@ -89,6 +93,10 @@ class A2AAgentServer:
         def send_task():
             return self._handle_send_task()
 
+        @self.app.route("/tasks/events", methods=["GET"])
+        def task_events():
+            return self._handle_task_events()
+
         @self.app.route("/tasks/<task_id>", methods=["GET"])
         def get_task(task_id):
             return self._handle_get_task(task_id)
@@ -160,6 +168,7 @@ class A2AAgentServer:
             "capabilities": {
                 "streaming": False,
                 "pushNotifications": False,
+                "taskEvents": True,
             },
             "authentication": {
                 "schemes": ["mutual_tls", "api_key"],
@@ -280,21 +289,37 @@ class A2AAgentServer:
             if task.status == TaskStatus.WORKING.value:
                 task.update_status(TaskStatus.COMPLETED.value, "Processing completed")
 
+            self._tasks[task.id] = task  # Visible before subscribers are woken
             self._persist_task(task)
-            self._tasks[task.id] = task
             logger.info(f"Async task {task_id} completed with status: {task.status}")
 
         except Exception as e:
             logger.exception(f"Async skill handler failed for {skill_id} (task {task_id})")
             task.update_status(TaskStatus.FAILED.value, f"Handler error: {str(e)}")
-            self._persist_task(task)
             self._tasks[task.id] = task
+            self._persist_task(task)
 
     def _handle_get_task(self, task_id: str):
-        """Handle GET /tasks/<task_id>."""
+        """Handle GET /tasks/<task_id>.
+
+        Responses carry an ETag for the task's current version. With
+        If-None-Match and ?wait=<seconds>, the request is held until the
+        task changes (200) or the wait elapses (304).
+        """
+        etag = self._events.etag(task_id)
+        if etag and request.headers.get("If-None-Match") == etag:
+            wait = self._wait_param()
+            if wait:
+                etag = self._events.wait_for_change(task_id, etag, wait)
+            if etag == request.headers.get("If-None-Match"):
+                return "", 304, {"ETag": etag}
+
         # Try memory cache first
         if task_id in self._tasks:
-            return jsonify(self._tasks[task_id].to_dict())
+            resp = jsonify(self._tasks[task_id].to_dict())
+            if etag:
+                resp.headers["ETag"] = etag
+            return resp
 
         # Fall back to DB
         task_dict = self._load_task_from_db(task_id)
@@ -322,6 +347,33 @@ class A2AAgentServer:
 
         return jsonify(task.to_dict())
 
+    def _handle_task_events(self):
+        """Handle GET /tasks/events?since=<seq>&stream=<id>&wait=<seconds>.
+
+        Returns every task transition after ``since``, holding the request
+        until one arrives or the wait elapses. Omitting ``since`` returns
+        the current cursor. ``reset: true`` means events were missed and
+        the subscriber must re-read the tasks it is waiting on.
+        """
+        since = request.args.get("since")
+        try:
+            cursor = int(since) if since is not None else None
+        except ValueError:
+            return jsonify({"error": f"Invalid since cursor: {since}"}), 400
+        return jsonify(self._events.since(
+            cursor,
+            stream_id=request.args.get("stream"),
+            timeout=self._wait_param(),
+        ))
+
+    @staticmethod
+    def _wait_param() -> float:
+        """Parse the ?wait=<seconds> long-poll parameter (capped)."""
+        try:
+            return max(0.0, min(float(request.args.get("wait", 0)), MAX_WAIT_SECONDS))
+        except ValueError:
+            return 0.0
+
     # ── Mailbox Handlers (Phase C) ─────────────────────────────────
 
     def _handle_send_message(self):
@@ -437,6 +489,8 @@ class A2AAgentServer:
             conn.rollback()
         finally:
             conn.close()
+        # Publish after persisting so a woken subscriber can read the result
+        self._events.publish(task.id, task.status, task.updated_at)
 
     def _load_task_from_db(self, task_id: str) -> Optional[dict]:
         """Load a task from the database."""
@@ -524,13 +578,24 @@ class A2AAgentServer:
                     "Starting without TLS."
                 )
 
+        # Batch audit writes off the request path for the server's lifetime
+        try:
+            from tools.audit.audit_logger import disable_group_commit, enable_group_commit
+            enable_group_commit(server=True)
+        except ImportError:
+            disable_group_commit = None
+
         logger.info(f"Starting {self.name} on {self.host}:{self.port}")
-        self.app.run(
-            host=self.host,
-            port=self.port,
-            debug=debug,
-            ssl_context=ssl_ctx,
-        )
+        try:
+            self.app.run(
+                host=self.host,
+                port=self.port,
+                debug=debug,
+                ssl_context=ssl_ctx,
+            )
+        finally:
+            if disable_group_commit is not None:
+                disable_group_commit()  # Durable flush of queued audit events
 
 
 def main():
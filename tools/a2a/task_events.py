@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""A2A Task Event Log — in-process change feed of task state transitions.
+
+The agent server publishes every status transition here. Clients subscribe
+with a long-poll on GET /tasks/events?since=<seq>&wait=<seconds>, which
+returns as soon as any transition newer than ``since`` exists, so one
+request per agent covers every task a client is waiting on. Each task also
+carries a version (the sequence number of its latest transition) used as
+the ETag for conditional long-polls on GET /tasks/<task_id>.
+
+Events are kept in a bounded ring buffer. A cursor older than the oldest
+retained event, or from a previous server instance (different stream_id),
+yields ``reset: True`` and the subscriber must re-read task state directly.
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CAPACITY = 4096
+MAX_WAIT_SECONDS = 30.0
+
+
+class TaskEventLog:
+    """Thread-safe, bounded change feed of task status transitions."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.stream_id = uuid.uuid4().hex
+        self._cond = threading.Condition()
+        self._events: deque = deque(maxlen=capacity)
+        self._seq = 0
+        # task_id -> (version, status) of the latest transition
+        self._latest: Dict[str, Tuple[int, str]] = {}
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the most recent event (0 before any)."""
+        with self._cond:
+            return self._seq
+
+    def publish(self, task_id: str, status: str, updated_at: str = "") -> int:
+        """Record a transition and wake subscribers.
+
+        Re-publishing a task's current status is a no-op, so callers may
+        publish on every persist without flooding the feed.
+
+        Returns:
+            The task's version after the call.
+        """
+        with self._cond:
+            latest = self._latest.get(task_id)
+            if latest and latest[1] == status:
+                return latest[0]
+            self._seq += 1
+            self._latest[task_id] = (self._seq, status)
+            self._events.append({
+                "seq": self._seq,
+                "task_id": task_id,
+                "status": status,
+                "updated_at": updated_at,
+            })
+            self._cond.notify_all()
+            return self._seq
+
+    def version(self, task_id: str) -> Optional[int]:
+        """Version of a task, or None if no transition was published for it."""
+        with self._cond:
+            latest = self._latest.get(task_id)
+            return latest[0] if latest else None
+
+    def etag(self, task_id: str) -> Optional[str]:
+        """Strong ETag for a task's current version."""
+        version = self.version(task_id)
+        return None if version is None else f'"{self.stream_id}-{version}"'
+
+    def since(self, cursor: Optional[int] = None, stream_id: Optional[str] = None,
+              timeout: float = 0.0) -> dict:
+        """Return events newer than ``cursor``, long-polling up to ``timeout``.
+
+        A missing cursor returns the current position without events (the
+        subscriber's handshake).
+
+        Returns:
+            Dict with stream_id, seq (the next cursor), events, and reset.
+        """
+        timeout = max(0.0, min(float(timeout), MAX_WAIT_SECONDS))
+        with self._cond:
+            if cursor is None:
+                return self._page([], reset=False)
+            if (stream_id and stream_id != self.stream_id) or cursor > self._seq:
+                return self._page([], reset=True)
+            if cursor == self._seq and timeout:
+                self._cond.wait_for(lambda: self._seq > cursor, timeout)
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            if cursor < oldest - 1:
+                return self._page([], reset=True)
+            events = [e for e in self._events if e["seq"] > cursor]
+            return self._page(events, reset=False)
+
+    def wait_for_change(self, task_id: str, etag: str, timeout: float) -> Optional[str]:
+        """Block until the task's ETag differs from ``etag`` or timeout.
+
+        Returns:
+            The task's current ETag.
+        """
+        deadline = time.monotonic() + max(0.0, min(float(timeout), MAX_WAIT_SECONDS))
+        with self._cond:
+            while True:
+                current = self._etag_locked(task_id)
+                remaining = deadline - time.monotonic()
+                if current != etag or remaining <= 0:
+                    return current
+                self._cond.wait(remaining)
+
+    def _etag_locked(self, task_id: str) -> Optional[str]:
+        latest = self._latest.get(task_id)
+        return None if latest is None else f'"{self.stream_id}-{latest[0]}"'
+
+    def _page(self, events: list, reset: bool) -> dict:
+        return {
+            "stream_id": self.stream_id,
+            "seq": self._seq,
+            "events": events,
+            "reset": reset,
+        }
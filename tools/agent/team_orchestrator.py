@@ -3,7 +3,9 @@
 
 Decomposes high-level tasks into subtask DAGs using Bedrock LLM, then
 executes them in parallel where dependencies allow using TopologicalSorter
-and ThreadPoolExecutor.
+and ThreadPoolExecutor. Subtasks start as soon as their own dependencies
+finish (no wave barriers), ordered by critical path and capped per agent;
+persisted workflows can be resumed after a restart.
 
 Decision D36: ThreadPoolExecutor for parallel subtask dispatch.
 Decision D40: graphlib.TopologicalSorter (Python 3.9+ stdlib) for DAG resolution.
@@ -11,13 +13,15 @@ Decision D-DISP-1: Dispatcher mode enforcement in _execute_subtask (Phase 61).
 """
 
 import argparse
+import heapq
+import itertools
 import json
 import logging
 import sqlite3
 import sys
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import asdict, dataclass, field
 from graphlib import TopologicalSorter
 from pathlib import Path
@@ -30,6 +34,7 @@ if str(BASE_DIR) not in sys.path:
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 HARDPROMPT_PATH = BASE_DIR / "hardprompts" / "agent" / "task_decomposition.md"
 SCHEMA_PATH = BASE_DIR / "context" / "agent" / "response_schemas" / "task_decomposition.json"
+AGENT_CONFIG_PATH = BASE_DIR / "args" / "agent_config.yaml"
 
 logger = logging.getLogger("icdev.team_orchestrator")
 
@@ -115,6 +120,45 @@ def _ensure_tables(db_path: Path = None):
         conn.close()
 
 
+def _load_agent_limits(config_path: Path = None) -> Dict[str, int]:
+    """Map agent id -> max_concurrent from agent_config.yaml (empty if unavailable)."""
+    path = config_path or AGENT_CONFIG_PATH
+    try:
+        import yaml
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            config = yaml.safe_load(f) or {}
+    except (ImportError, OSError, ValueError) as exc:
+        logger.debug("Agent concurrency limits unavailable: %s", exc)
+        return {}
+
+    limits = {}
+    for agent in (config.get("agents") or {}).values():
+        if isinstance(agent, dict) and agent.get("id") and agent.get("max_concurrent"):
+            limits[agent["id"]] = int(agent["max_concurrent"])
+    return limits
+
+
+def _critical_path_ranks(graph: Dict[str, set], estimates: Dict[str, float]) -> Dict[str, float]:
+    """Longest estimated duration from each subtask to the end of the workflow.
+
+    ``graph`` maps subtask -> dependencies. A subtask's rank is its own
+    estimate plus the largest rank among its dependents, so the chain that
+    bounds total runtime is started first.
+    """
+    dependents: Dict[str, List[str]] = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(node)
+
+    ranks: Dict[str, float] = {}
+    # Reverse topological order: every dependent is ranked before its dependency
+    for node in reversed(list(TopologicalSorter(graph).static_order())):
+        ranks[node] = estimates.get(node, 1.0) + max(
+            (ranks[child] for child in dependents[node]), default=0.0,
+        )
+    return ranks
+
+
 def _audit_log(event_type: str, actor: str, action: str,
                project_id: str = None, details: dict = None,
                db_path: Path = None):
@@ -151,15 +195,19 @@ class TeamOrchestrator:
         print(workflow.status, workflow.aggregated_result)
     """
 
-    def __init__(self, max_workers: int = 5, db_path: Path = None):
+    def __init__(self, max_workers: int = 5, db_path: Path = None,
+                 agent_limits: Dict[str, int] = None):
         """Initialize the orchestrator.
 
         Args:
             max_workers: Maximum parallel subtask threads (Decision D36).
             db_path: Override database path (default: data/icdev.db).
+            agent_limits: Max concurrent subtasks per agent id. Defaults to
+                ``max_concurrent`` from args/agent_config.yaml.
         """
         self._max_workers = max_workers
         self._db_path = Path(db_path) if db_path else DB_PATH
+        self._agent_limits = dict(agent_limits) if agent_limits is not None else None
         self._llm_router = None
         self._agent_client = None
         _ensure_tables(self._db_path)
@@ -419,8 +467,15 @@ class TeamOrchestrator:
     def execute_workflow(self, workflow: Workflow, timeout: int = 600) -> Workflow:
         """Execute a workflow by resolving the DAG and running subtasks in parallel.
 
-        Uses graphlib.TopologicalSorter (Decision D40) for dependency ordering
-        and concurrent.futures.ThreadPoolExecutor (Decision D36) for parallelism.
+        Uses graphlib.TopologicalSorter (Decision D40) to validate the DAG and
+        concurrent.futures.ThreadPoolExecutor (Decision D36) for parallelism.
+        Scheduling is event-driven: each completion immediately releases its
+        dependents, so one slow subtask only delays its own descendants.
+        Ready subtasks are started longest-remaining-critical-path first and
+        never exceed an agent's ``max_concurrent`` (args/agent_config.yaml).
+
+        Subtasks already ``completed`` (e.g. a workflow reloaded by
+        resume_workflow) are not re-run; their outputs feed dependents.
 
         Args:
             workflow: Workflow with populated subtasks.
@@ -448,8 +503,7 @@ class TeamOrchestrator:
             graph[st_id] = deps
 
         try:
-            sorter = TopologicalSorter(graph)
-            sorter.prepare()
+            TopologicalSorter(graph).prepare()
         except Exception as exc:
             logger.error("DAG has a cycle or is invalid: %s", exc)
             workflow.status = "failed"
@@ -464,122 +518,84 @@ class TeamOrchestrator:
             )
             return workflow
 
-        completed_count = 0
-        failed_count = 0
-
-        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
-            while sorter.is_active():
-                # Check timeout
-                elapsed = time.time() - start_time
-                if elapsed > timeout:
-                    logger.error(
-                        "Workflow '%s' timed out after %.0fs", workflow.id, elapsed,
-                    )
-                    # Cancel remaining subtasks
-                    for st_id, st in workflow.subtasks.items():
-                        if st.status in ("pending", "queued"):
-                            st.status = "canceled"
-                            self._update_subtask_status(st, workflow.id)
-                    workflow.status = "failed"
-                    break
-
-                # Get ready nodes (no unfinished dependencies)
-                ready = sorter.get_ready()
-                if not ready:
-                    # All submitted, waiting for futures
-                    time.sleep(0.1)
-                    continue
-
-                # Submit ready subtasks in parallel
-                futures = {}
-                for st_id in ready:
-                    st = workflow.subtasks[st_id]
-                    st.status = "queued"
-                    self._update_subtask_status(st, workflow.id)
+        ranks = _critical_path_ranks(graph, self._estimate_durations(workflow))
+        agent_limits = self._get_agent_limits()
 
-                    # Build context from completed dependencies
-                    context = self._build_subtask_context(st, workflow)
+        dependents: Dict[str, List[str]] = {st_id: [] for st_id in graph}
+        for st_id, deps in graph.items():
+            for dep_id in deps:
+                dependents[dep_id].append(st_id)
 
-                    _audit_log(
-                        event_type="subtask_dispatched",
-                        actor=workflow.created_by,
-                        action=f"Dispatched subtask '{st_id}' to {st.agent_id}:{st.skill_id}",
-                        project_id=workflow.project_id,
-                        details={
-                            "workflow_id": workflow.id,
-                            "subtask_id": st_id,
-                            "agent_id": st.agent_id,
-                            "skill_id": st.skill_id,
-                        },
-                        db_path=self._db_path,
-                    )
+        completed_count = sum(1 for st in workflow.subtasks.values() if st.status == "completed")
+        failed_count = 0
 
-                    future = executor.submit(self._execute_subtask, st, context)
-                    futures[future] = st_id
-
-                # Wait for submitted subtasks to complete
-                remaining_timeout = max(1, timeout - (time.time() - start_time))
-                for future in as_completed(futures, timeout=remaining_timeout):
-                    st_id = futures[future]
-                    try:
-                        completed_st = future.result()
-                        workflow.subtasks[st_id] = completed_st
-
-                        if completed_st.status == "completed":
-                            completed_count += 1
-                            sorter.done(st_id)
-                            _audit_log(
-                                event_type="subtask_completed",
-                                actor=workflow.created_by,
-                                action=f"Subtask '{st_id}' completed in {completed_st.duration_ms}ms",
-                                project_id=workflow.project_id,
-                                details={
-                                    "workflow_id": workflow.id,
-                                    "subtask_id": st_id,
-                                    "duration_ms": completed_st.duration_ms,
-                                },
-                                db_path=self._db_path,
-                            )
-                        else:
-                            failed_count += 1
-                            sorter.done(st_id)
-                            _audit_log(
-                                event_type="subtask_failed",
-                                actor=workflow.created_by,
-                                action=f"Subtask '{st_id}' failed: {completed_st.error_message}",
-                                project_id=workflow.project_id,
-                                details={
-                                    "workflow_id": workflow.id,
-                                    "subtask_id": st_id,
-                                    "error": completed_st.error_message,
-                                    "attempt_count": completed_st.attempt_count,
-                                },
-                                db_path=self._db_path,
-                            )
-                            # Mark downstream subtasks as blocked
-                            self._block_downstream(st_id, workflow)
+        # Unfinished dependencies per subtask; heap of (-critical path, order, id)
+        waiting_on: Dict[str, set] = {}
+        ready: List[tuple] = []
+        order = itertools.count()
+        for st_id, deps in graph.items():
+            if workflow.subtasks[st_id].status == "completed":
+                continue
+            waiting_on[st_id] = {d for d in deps if workflow.subtasks[d].status != "completed"}
+            if not waiting_on[st_id]:
+                heapq.heappush(ready, (-ranks[st_id], next(order), st_id))
+
+        running: Dict[Future, tuple] = {}  # future -> (subtask id, agent id at dispatch)
+        agent_active: Dict[str, int] = {}
+        timed_out = False
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            while ready or running:
+                # Start the highest-priority ready subtasks that fit the
+                # worker pool and their agent's concurrency cap
+                deferred = []
+                while ready and len(running) < self._max_workers:
+                    entry = heapq.heappop(ready)
+                    st = workflow.subtasks[entry[2]]
+                    cap = agent_limits.get(st.agent_id)
+                    if cap and agent_active.get(st.agent_id, 0) >= cap:
+                        deferred.append(entry)
+                        continue
+                    agent_active[st.agent_id] = agent_active.get(st.agent_id, 0) + 1
+                    running[self._dispatch_subtask(executor, st, workflow)] = (st.id, st.agent_id)
+                for entry in deferred:
+                    heapq.heappush(ready, entry)
+
+                remaining = timeout - (time.time() - start_time)
+                done = set()
+                if remaining > 0:
+                    done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    timed_out = True
+                    break
 
-                    except Exception as exc:
+                for future in done:
+                    st_id, agent_id = running.pop(future)
+                    agent_active[agent_id] -= 1
+                    if self._record_subtask_result(future, st_id, workflow):
+                        completed_count += 1
+                        for child_id in dependents[st_id]:
+                            pending = waiting_on[child_id]
+                            pending.discard(st_id)
+                            if not pending and workflow.subtasks[child_id].status == "pending":
+                                heapq.heappush(ready, (-ranks[child_id], next(order), child_id))
+                    else:
                         failed_count += 1
-                        st = workflow.subtasks[st_id]
-                        st.status = "failed"
-                        st.error_message = str(exc)
-                        self._update_subtask_status(st, workflow.id)
-                        sorter.done(st_id)
-
-                        _audit_log(
-                            event_type="subtask_failed",
-                            actor=workflow.created_by,
-                            action=f"Subtask '{st_id}' raised exception: {exc}",
-                            project_id=workflow.project_id,
-                            details={
-                                "workflow_id": workflow.id,
-                                "subtask_id": st_id,
-                                "error": str(exc),
-                            },
-                            db_path=self._db_path,
-                        )
                         self._block_downstream(st_id, workflow)
+        finally:
+            # On timeout, drop queued work and do not wait for running agents
+            executor.shutdown(wait=not timed_out, cancel_futures=timed_out)
+
+        if timed_out:
+            logger.error(
+                "Workflow '%s' timed out after %.0fs", workflow.id, time.time() - start_time,
+            )
+            # Results of subtasks still running are discarded
+            for st in workflow.subtasks.values():
+                if st.status in ("pending", "queued", "working"):
+                    st.status = "canceled"
+                    self._update_subtask_status(st, workflow.id)
+            workflow.status = "failed"
 
         # Determine final workflow status
         total = len(workflow.subtasks)
@@ -618,6 +634,187 @@ class TeamOrchestrator:
 
         return workflow
 
+    def resume_workflow(self, workflow_id: str, timeout: int = 600) -> Optional[Workflow]:
+        """Resume a persisted workflow after a restart, skipping completed subtasks.
+
+        Subtasks that were queued, working, failed, blocked or canceled when
+        the previous process stopped are run again; completed subtasks keep
+        their recorded output and are not re-dispatched.
+
+        Args:
+            workflow_id: Workflow previously persisted to agent_workflows.
+            timeout: Maximum seconds for the remaining work.
+
+        Returns:
+            The updated workflow, or None if the workflow is not found.
+        """
+        workflow = self.load_workflow(workflow_id, reset=False)
+        if workflow is None:
+            return None
+        rerun = 0
+        for st in workflow.subtasks.values():
+            if st.status != "completed":
+                st.status = "pending"
+                st.error_message = ""
+                rerun += 1
+        logger.info(
+            "Resuming workflow '%s': %d of %d subtask(s) remaining",
+            workflow.id, rerun, len(workflow.subtasks),
+        )
+        return self.execute_workflow(workflow, timeout=timeout)
+
+    def load_workflow(self, workflow_id: str, reset: bool = True) -> Optional[Workflow]:
+        """Rebuild a Workflow object from the database.
+
+        Args:
+            workflow_id: The workflow identifier to load.
+            reset: Reset every subtask to pending for a full re-execution.
+                When False, persisted statuses and outputs are kept.
+
+        Returns:
+            The Workflow, or None if not found.
+        """
+        status = self.get_workflow_status(workflow_id)
+        if not status:
+            return None
+
+        workflow = Workflow(
+            id=status["id"],
+            name=status["name"],
+            project_id=status.get("project_id", ""),
+            status=status.get("status", "pending"),
+            created_by=status.get("created_by", "orchestrator-agent"),
+        )
+        for st_data in status.get("subtasks", []):
+            st = Subtask(
+                id=st_data["id"],
+                agent_id=st_data["agent_id"],
+                skill_id=st_data["skill_id"],
+                description=st_data.get("description", ""),
+                depends_on=st_data.get("depends_on", []),
+                status="pending" if reset else st_data.get("status", "pending"),
+                input_data=st_data.get("input_data"),
+            )
+            if not reset:
+                st.output_data = st_data.get("output_data")
+                st.error_message = st_data.get("error_message") or ""
+                st.attempt_count = st_data.get("attempt_count") or 0
+                st.duration_ms = st_data.get("duration_ms") or 0
+            workflow.subtasks[st.id] = st
+        return workflow
+
+    def _dispatch_subtask(self, executor: ThreadPoolExecutor, st: Subtask,
+                          workflow: Workflow) -> Future:
+        """Mark a subtask queued, audit the dispatch and submit it to the pool."""
+        st.status = "queued"
+        self._update_subtask_status(st, workflow.id)
+
+        # Build context from completed dependencies
+        context = self._build_subtask_context(st, workflow)
+
+        _audit_log(
+            event_type="subtask_dispatched",
+            actor=workflow.created_by,
+            action=f"Dispatched subtask '{st.id}' to {st.agent_id}:{st.skill_id}",
+            project_id=workflow.project_id,
+            details={
+                "workflow_id": workflow.id,
+                "subtask_id": st.id,
+                "agent_id": st.agent_id,
+                "skill_id": st.skill_id,
+            },
+            db_path=self._db_path,
+        )
+        return executor.submit(self._execute_subtask, st, context)
+
+    def _record_subtask_result(self, future: Future, st_id: str, workflow: Workflow) -> bool:
+        """Store a finished subtask's outcome and audit it. Returns True on success."""
+        try:
+            completed_st = future.result()
+        except Exception as exc:
+            st = workflow.subtasks[st_id]
+            st.status = "failed"
+            st.error_message = str(exc)
+            self._update_subtask_status(st, workflow.id)
+            _audit_log(
+                event_type="subtask_failed",
+                actor=workflow.created_by,
+                action=f"Subtask '{st_id}' raised exception: {exc}",
+                project_id=workflow.project_id,
+                details={
+                    "workflow_id": workflow.id,
+                    "subtask_id": st_id,
+                    "error": str(exc),
+                },
+                db_path=self._db_path,
+            )
+            return False
+
+        workflow.subtasks[st_id] = completed_st
+        if completed_st.status == "completed":
+            _audit_log(
+                event_type="subtask_completed",
+                actor=workflow.created_by,
+                action=f"Subtask '{st_id}' completed in {completed_st.duration_ms}ms",
+                project_id=workflow.project_id,
+                details={
+                    "workflow_id": workflow.id,
+                    "subtask_id": st_id,
+                    "duration_ms": completed_st.duration_ms,
+                },
+                db_path=self._db_path,
+            )
+            return True
+
+        _audit_log(
+            event_type="subtask_failed",
+            actor=workflow.created_by,
+            action=f"Subtask '{st_id}' failed: {completed_st.error_message}",
+            project_id=workflow.project_id,
+            details={
+                "workflow_id": workflow.id,
+                "subtask_id": st_id,
+                "error": completed_st.error_message,
+                "attempt_count": completed_st.attempt_count,
+            },
+            db_path=self._db_path,
+        )
+        return False
+
+    def _get_agent_limits(self) -> Dict[str, int]:
+        """Per-agent concurrency caps: constructor override, else agent_config.yaml."""
+        if self._agent_limits is None:
+            self._agent_limits = _load_agent_limits()
+        return self._agent_limits
+
+    def _estimate_durations(self, workflow: Workflow) -> Dict[str, float]:
+        """Expected duration per subtask from completed runs of the same agent skill.
+
+        Unknown agent/skill pairs use the mean of the known ones (or 1 when
+        there is no history, which ranks purely by remaining depth).
+        """
+        history: Dict[tuple, float] = {}
+        try:
+            conn = _get_db(self._db_path)
+            try:
+                rows = conn.execute(
+                    """SELECT agent_id, skill_id, AVG(duration_ms) AS avg_ms
+                       FROM agent_subtasks
+                       WHERE status = 'completed' AND duration_ms > 0
+                       GROUP BY agent_id, skill_id"""
+                ).fetchall()
+            finally:
+                conn.close()
+            history = {(r["agent_id"], r["skill_id"]): float(r["avg_ms"]) for r in rows}
+        except sqlite3.Error as exc:
+            logger.debug("Subtask duration history unavailable: %s", exc)
+
+        default = sum(history.values()) / len(history) if history else 1.0
+        return {
+            st_id: history.get((st.agent_id, st.skill_id), default)
+            for st_id, st in workflow.subtasks.items()
+        }
+
     def _build_subtask_context(self, subtask: Subtask, workflow: Workflow) -> Dict:
         """Build execution context from completed dependency outputs."""
         context = {
@@ -765,15 +962,19 @@ class TeamOrchestrator:
         return subtask
 
     def _block_downstream(self, failed_id: str, workflow: Workflow):
-        """Mark all subtasks that depend on the failed subtask as blocked."""
-        for st_id, st in workflow.subtasks.items():
-            if failed_id in st.depends_on and st.status in ("pending", "queued"):
-                st.status = "blocked"
-                self._update_subtask_status(st, workflow.id)
-                logger.info(
-                    "Subtask '%s' blocked due to failed dependency '%s'",
-                    st_id, failed_id,
-                )
+        """Mark all subtasks that (transitively) depend on the failed subtask as blocked."""
+        stack = [failed_id]
+        while stack:
+            upstream_id = stack.pop()
+            for st_id, st in workflow.subtasks.items():
+                if upstream_id in st.depends_on and st.status in ("pending", "queued"):
+                    st.status = "blocked"
+                    self._update_subtask_status(st, workflow.id)
+                    logger.info(
+                        "Subtask '%s' blocked due to failed dependency '%s'",
+                        st_id, upstream_id,
+                    )
+                    stack.append(st_id)
 
     # -------------------------------------------------------------------
     # Result aggregation
@@ -974,6 +1175,10 @@ def main():
         "--execute",
         help="Workflow ID to execute (must have been previously decomposed)",
     )
+    parser.add_argument(
+        "--resume",
+        help="Workflow ID to resume after a restart (completed subtasks are skipped)",
+    )
     parser.add_argument(
         "--status",
         help="Get status of a workflow by ID",
@@ -1036,35 +1241,18 @@ def main():
                 print(f"    Depends on: {deps}")
                 print()
 
-    elif args.execute:
-        # Load workflow from DB
-        status = orchestrator.get_workflow_status(args.execute)
-        if not status:
-            print(f"Workflow not found: {args.execute}", file=sys.stderr)
+    elif args.execute or args.resume:
+        if args.resume:
+            workflow = orchestrator.resume_workflow(args.resume, timeout=args.timeout)
+        else:
+            # Reconstruct from DB with every subtask reset for re-execution
+            workflow = orchestrator.load_workflow(args.execute)
+            if workflow is not None:
+                workflow = orchestrator.execute_workflow(workflow, timeout=args.timeout)
+        if workflow is None:
+            print(f"Workflow not found: {args.resume or args.execute}", file=sys.stderr)
             sys.exit(1)
 
-        # Reconstruct Workflow object from DB
-        workflow = Workflow(
-            id=status["id"],
-            name=status["name"],
-            project_id=status.get("project_id", ""),
-            status=status.get("status", "pending"),
-            created_by=status.get("created_by", "orchestrator-agent"),
-        )
-        for st_data in status.get("subtasks", []):
-            st = Subtask(
-                id=st_data["id"],
-                agent_id=st_data["agent_id"],
-                skill_id=st_data["skill_id"],
-                description=st_data.get("description", ""),
-                depends_on=st_data.get("depends_on", []),
-                status="pending",  # Reset for re-execution
-                input_data=st_data.get("input_data"),
-            )
-            workflow.subtasks[st.id] = st
-
-        workflow = orchestrator.execute_workflow(workflow, timeout=args.timeout)
-
         if args.json:
             print(json.dumps(workflow.aggregated_result or {}, indent=2, default=str))
         else:
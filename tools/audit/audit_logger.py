@@ -1,20 +1,45 @@
 #!/usr/bin/env python3
 # CUI // SP-CTI
 """Append-only audit trail writer. Satisfies NIST 800-53 AU controls.
-No UPDATE or DELETE operations — all entries are immutable."""
+No UPDATE or DELETE operations — all entries are immutable.
+
+Two write modes:
+  sync          — each log_event() INSERTs and commits before returning
+                  (default; CLI tools and callers that need the row ID)
+  group commit  — long-running servers call enable_group_commit(); events
+                  go to a bounded queue and a writer thread INSERTs them in
+                  batched transactions (size or time threshold).  Critical
+                  events and sync=True calls wait for their batch to commit
+                  and return the row ID.  A full queue blocks the caller
+                  (backpressure) and, past enqueue_timeout, falls back to a
+                  direct write — events are never dropped.  The queue is
+                  flushed on disable_group_commit() and at interpreter exit.
+
+Configuration: ``audit_writer`` in args/db_config.yaml;
+ICDEV_AUDIT_WRITER=group_commit|sync overrides the mode.
+"""
 
 import argparse
+import atexit
 import json
+import logging
+import os
+import queue
 import sqlite3
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+logger = logging.getLogger("icdev.audit.logger")
+
 try:
-    from tools.compat.db_utils import get_db_connection
+    from tools.compat.db_utils import pooled_connection
 except ImportError:
-    get_db_connection = None
+    pooled_connection = None
 
 VALID_EVENT_TYPES = (
     "project_created", "project_updated",
@@ -111,6 +136,304 @@ VALID_EVENT_TYPES = (
 )
 
 
+# Events that must be durable before log_event() returns, even in
+# group-commit mode (security findings, denials, escalations, failures).
+CRITICAL_EVENT_TYPES = frozenset((
+    "vulnerability_found", "deployment_failed", "rollback_executed",
+    "approval_denied", "approval_rejected", "approval_escalated",
+    "config_changed", "secret_rotated",
+    "boundary_impact_red", "supply_chain_risk_escalated",
+    "agent_veto_issued", "agent_veto_overridden", "agent_escalation_created",
+    "nlq_query_blocked", "remote_command_rejected",
+    "heartbeat_check_critical", "auto_resolution_escalated",
+))
+
+DEFAULT_WRITER_CONFIG = {
+    "mode": "sync",                  # sync | group_commit
+    "servers_group_commit": True,    # MCP / A2A servers enable group commit
+    "max_queue": 10000,
+    "batch_size": 256,
+    "flush_interval_ms": 200,
+    "enqueue_timeout_seconds": 5.0,
+}
+
+_INSERT_SQL = """INSERT INTO audit_trail
+           (project_id, event_type, actor, action, details, affected_files,
+            classification, ip_address, session_id)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def load_writer_config() -> dict:
+    """Load ``audit_writer`` from args/db_config.yaml with defaults."""
+    config = dict(DEFAULT_WRITER_CONFIG)
+    try:
+        import yaml
+        config_path = BASE_DIR / "args" / "db_config.yaml"
+        if config_path.exists():
+            with open(config_path, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            config.update(data.get("audit_writer", {}) or {})
+    except (ImportError, Exception):
+        pass
+    env_mode = os.environ.get("ICDEV_AUDIT_WRITER")
+    if env_mode:
+        config["mode"] = env_mode
+    return config
+
+
+def _write_direct(path, row) -> int:
+    """INSERT + commit one event on its own transaction."""
+    if pooled_connection:
+        # Reuse a pooled WAL connection instead of opening one per event
+        with pooled_connection(path, row_factory=False) as conn:
+            return _insert_event(conn, row)
+    conn = sqlite3.connect(str(path))
+    try:
+        return _insert_event(conn, row)
+    finally:
+        conn.close()
+
+
+def _insert_event(conn, row) -> int:
+    c = conn.cursor()
+    c.execute(_INSERT_SQL, row)
+    conn.commit()
+    return c.lastrowid
+
+
+class _Pending:
+    """A queued event (or a flush/stop marker when ``row`` is None)."""
+
+    __slots__ = ("path", "row", "done", "entry_id", "error", "stop")
+
+    def __init__(self, path=None, row=None, wait=False, stop=False):
+        self.path = path
+        self.row = row
+        self.done = threading.Event() if wait else None
+        self.entry_id = None
+        self.error = None
+        self.stop = stop
+
+
+class AuditWriter:
+    """Background group-commit writer for audit_trail rows.
+
+    Rows are only ever INSERTed, in submission order, so the append-only
+    guarantee is unchanged; batching only amortizes the commit.
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 256,
+                 flush_interval_ms: int = 200, enqueue_timeout_seconds: float = 5.0):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.0, float(flush_interval_ms) / 1000.0)
+        self.enqueue_timeout = float(enqueue_timeout_seconds)
+        self._queue: "queue.Queue[_Pending]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "enqueued": 0, "written": 0, "batches": 0, "errors": 0,
+            "backpressure_waits": 0, "direct_fallbacks": 0, "max_batch": 0,
+        }
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._metrics_lock:
+            self.metrics[key] += n
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "AuditWriter":
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name="icdev-audit-writer",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def _put(self, item: _Pending) -> bool:
+        """Enqueue with backpressure. False if the queue stayed full."""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self._count("backpressure_waits")
+        try:
+            self._queue.put(item, timeout=self.enqueue_timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def submit(self, path, row, wait: bool = False) -> Optional[int]:
+        """Queue one event. With *wait*, block until committed and return its ID."""
+        item = _Pending(path, row, wait=wait)
+        if not self.running or not self._put(item):
+            # Never drop an audit record: write it on the caller's thread
+            self._count("direct_fallbacks")
+            return _write_direct(path, row)
+        self._count("enqueued")
+        if not wait:
+            return None
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.entry_id
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event queued before this call is committed."""
+        if not self.running:
+            return True
+        marker = _Pending(wait=True)
+        if not self._put(marker):
+            return False
+        return marker.done.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush everything queued, then stop the writer thread."""
+        if not self.running:
+            return
+        marker = _Pending(wait=True, stop=True)
+        self._queue.put(marker)
+        marker.done.wait(timeout)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # -- writer thread -----------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # Gather until size/time threshold, or someone is waiting
+            while (len(batch) < self.batch_size and batch[-1].done is None):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch([item for item in batch if item.row is not None])
+            for item in batch:
+                if item.done is not None:
+                    item.done.set()
+            if any(item.stop for item in batch):
+                return
+
+    def _write_batch(self, events) -> None:
+        if not events:
+            return
+        by_path: Dict[str, list] = {}
+        for item in events:
+            by_path.setdefault(str(item.path), []).append(item)
+        for path, items in by_path.items():
+            try:
+                self._commit_group(path, items)
+            except Exception as exc:
+                # One bad row must not lose the rest: retry individually
+                logger.warning("Audit batch of %d failed (%s); writing individually",
+                               len(items), exc)
+                for item in items:
+                    try:
+                        item.entry_id = _write_direct(item.path, item.row)
+                        self._count("written")
+                    except Exception as row_exc:
+                        item.error = row_exc
+                        self._count("errors")
+                        logger.error("Audit event lost (%s): %s", item.row[1], row_exc)
+        with self._metrics_lock:
+            self.metrics["batches"] += 1
+            self.metrics["max_batch"] = max(self.metrics["max_batch"], len(events))
+
+    def _commit_group(self, path, items) -> None:
+        def insert_all(conn):
+            c = conn.cursor()
+            try:
+                for item in items:
+                    c.execute(_INSERT_SQL, item.row)
+                    item.entry_id = c.lastrowid
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                for item in items:
+                    item.entry_id = None
+                raise
+
+        if pooled_connection:
+            with pooled_connection(path, row_factory=False) as conn:
+                insert_all(conn)
+        else:
+            conn = sqlite3.connect(path)
+            try:
+                insert_all(conn)
+            finally:
+                conn.close()
+        self._count("written", len(items))
+
+
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+_mode: Optional[str] = None
+
+
+def _configured_mode() -> str:
+    """Configured writer mode, read once per process."""
+    global _mode
+    if _mode is None:
+        _mode = load_writer_config()["mode"]
+    return _mode
+
+
+def enable_group_commit(server: bool = False, **overrides) -> Optional[AuditWriter]:
+    """Start the process-wide group-commit writer.
+
+    With ``server=True`` (MCP/A2A server startup) this is a no-op unless
+    ``audit_writer.servers_group_commit`` is enabled or the mode is already
+    group_commit.  Returns the writer, or None when left in sync mode.
+    """
+    global _writer
+    config = {**load_writer_config(), **overrides}
+    if server and not (config.get("servers_group_commit") or config["mode"] == "group_commit"):
+        return None
+    with _writer_lock:
+        if _writer is None or not _writer.running:
+            _writer = AuditWriter(
+                max_queue=config["max_queue"],
+                batch_size=config["batch_size"],
+                flush_interval_ms=config["flush_interval_ms"],
+                enqueue_timeout_seconds=config["enqueue_timeout_seconds"],
+            ).start()
+        return _writer
+
+
+def disable_group_commit(timeout: Optional[float] = 30.0) -> None:
+    """Durably flush queued events and return to synchronous writes."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop(timeout)
+
+
+def flush_audit_log(timeout: Optional[float] = None) -> bool:
+    """Block until all queued audit events are committed."""
+    writer = _writer
+    return writer.flush(timeout) if writer is not None else True
+
+
+def get_writer_metrics() -> dict:
+    """Queue/batch counters for the group-commit writer (empty in sync mode)."""
+    writer = _writer
+    if writer is None:
+        return {"mode": "sync"}
+    with writer._metrics_lock:
+        metrics = dict(writer.metrics)
+    return {"mode": "group_commit", "queued": writer._queue.qsize(), **metrics}
+
+
+atexit.register(disable_group_commit)
+
+
 def log_event(
     event_type: str,
     actor: str,
@@ -122,8 +445,15 @@ def log_event(
     ip_address: str = None,
     session_id: str = None,
     db_path: Path = None,
-) -> int:
-    """Write an immutable audit trail entry. Returns the entry ID."""
+    sync: bool = False,
+    critical: bool = False,
+) -> Optional[int]:
+    """Write an immutable audit trail entry. Returns the entry ID.
+
+    In group-commit mode the event is queued and None is returned, unless
+    *sync* is set or the event is critical (*critical* or a type in
+    CRITICAL_EVENT_TYPES) — those wait for their batch to commit.
+    """
     if event_type not in VALID_EVENT_TYPES:
         raise ValueError(f"Invalid event_type '{event_type}'. Valid: {VALID_EVENT_TYPES}")
 
@@ -136,32 +466,25 @@ def log_event(
             pass
 
     path = db_path or DB_PATH
-    if get_db_connection:
-        conn = get_db_connection(path, row_factory=False)
-    else:
-        conn = sqlite3.connect(str(path))
-    c = conn.cursor()
-    c.execute(
-        """INSERT INTO audit_trail
-           (project_id, event_type, actor, action, details, affected_files,
-            classification, ip_address, session_id)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            project_id,
-            event_type,
-            actor,
-            action,
-            json.dumps(details) if details else None,
-            json.dumps(affected_files) if affected_files else None,
-            classification,
-            ip_address,
-            session_id,
-        ),
+    row = (
+        project_id,
+        event_type,
+        actor,
+        action,
+        json.dumps(details) if details else None,
+        json.dumps(affected_files) if affected_files else None,
+        classification,
+        ip_address,
+        session_id,
     )
-    conn.commit()
-    entry_id = c.lastrowid
-    conn.close()
-    return entry_id
+
+    writer = _writer
+    if writer is None and _configured_mode() == "group_commit":
+        writer = enable_group_commit()
+    if writer is None:
+        return _write_direct(path, row)
+    wait = sync or critical or event_type in CRITICAL_EVENT_TYPES
+    return writer.submit(path, row, wait=wait)
 
 
 def main():
@@ -1,83 +1,288 @@
 #!/usr/bin/env python3
 # CUI // SP-CTI
-"""Query the immutable audit trail. Read-only operations only."""
+"""Query the immutable audit trail. Read-only operations only.
+
+Queries combine any of project / event type(s) / actor(s) / session /
+classification / time-window filters and page with a keyset (seek) cursor
+on (created_at, id) instead of OFFSET, so page N costs the same as page 1.
+Composite (filter, created_at) indexes from migration 009 make each page an
+index range scan.
+
+iter_events() streams matching rows in keyset batches and export_events()
+writes them as JSONL or CSV evidence (AU-6/AU-9) in constant memory,
+returning a SHA-256 digest of the file.  Exports are bounded by the
+highest id present when they start, so rows appended during an export do
+not leak into the package.
+
+Usage:
+    python tools/audit/audit_query.py --project proj-123 --format json
+    python tools/audit/audit_query.py --type security_scan --type stig_checked \\
+        --since 2026-01-01 --limit 100 --format json
+    python tools/audit/audit_query.py --project proj-123 --cursor <next_cursor> --json
+    python tools/audit/audit_query.py --project proj-123 --export jsonl --output audit.jsonl
+"""
 
 import argparse
+import base64
+import csv
+import hashlib
+import io
 import json
 import sqlite3
+import sys
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+try:
+    from tools.compat.db_utils import pooled_connection
+except ImportError:
+    pooled_connection = None
+
+EXPORT_BATCH_SIZE = 1000
+
+
+# ---------------------------------------------------------------------------
+# Filters and cursors
+# ---------------------------------------------------------------------------
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _normalize_ts(value: Optional[str]) -> Optional[str]:
+    """Match the stored CURRENT_TIMESTAMP format ('YYYY-MM-DD HH:MM:SS')."""
+    if not value:
+        return None
+    value = value.strip().replace("T", " ")
+    for suffix in ("Z", "+00:00"):
+        if value.endswith(suffix):
+            value = value[: -len(suffix)]
+    return value
+
+
+def encode_cursor(created_at: Optional[str], entry_id: int) -> str:
+    """Opaque keyset cursor for the row *after* which the next page starts."""
+    raw = json.dumps([created_at, entry_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return created_at, int(entry_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid audit cursor: {cursor!r}") from exc
+
+
+def _build_where(project_id=None, event_types=None, actors=None, session_id=None,
+                 classification=None, since=None, until=None, max_id=None):
+    clauses, params = [], []
+    if project_id:
+        clauses.append("project_id = ?")
+        params.append(project_id)
+    for column, values in (("event_type", _as_list(event_types)), ("actor", _as_list(actors))):
+        if len(values) == 1:
+            clauses.append(f"{column} = ?")
+            params.extend(values)
+        elif values:
+            # Unary '+' keeps the planner on a created_at-ordered index; an
+            # IN over (column, created_at) would re-sort every match per page
+            clauses.append(f"+{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+    if session_id:
+        clauses.append("session_id = ?")
+        params.append(session_id)
+    if classification:
+        clauses.append("classification = ?")
+        params.append(classification)
+    if since:
+        clauses.append("created_at >= ?")
+        params.append(_normalize_ts(since))
+    if until:
+        clauses.append("created_at < ?")
+        params.append(_normalize_ts(until))
+    if max_id is not None:
+        clauses.append("id <= ?")
+        params.append(max_id)
+    return clauses, params
+
+
+def _page_sql(clauses, params, order, after, limit):
+    clauses, params = list(clauses), list(params)
+    op, direction = ("<", "DESC") if order == "desc" else (">", "ASC")
+    if after is not None:
+        # Row-value comparison: SQLite seeks the (filter, created_at) index
+        clauses.append(f"(created_at, id) {op} (?, ?)")
+        params.extend(after)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (f"SELECT * FROM audit_trail{where} "
+           f"ORDER BY created_at {direction}, id {direction} LIMIT ?")
+    params.append(limit)
+    return sql, params
+
+
+class _Connection:
+    """Pooled read connection when available, else a private one."""
+
+    def __init__(self, db_path):
+        self.path = db_path or DB_PATH
+        self._ctx = None
+
+    def __enter__(self) -> sqlite3.Connection:
+        if pooled_connection:
+            self._ctx = pooled_connection(self.path)
+            return self._ctx.__enter__()
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def __exit__(self, *exc):
+        if self._ctx is not None:
+            return self._ctx.__exit__(*exc)
+        self._conn.close()
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def query_events(project_id: str = None, event_types: Union[str, Sequence[str]] = None,
+                 actors: Union[str, Sequence[str]] = None, session_id: str = None,
+                 classification: str = None, since: str = None, until: str = None,
+                 limit: int = 50, cursor: str = None, order: str = "desc",
+                 db_path: Path = None) -> Dict:
+    """One keyset page of audit entries matching every given filter.
+
+    Args:
+        project_id / event_types / actors / session_id / classification:
+            Equality filters (event_types and actors accept a list).
+        since / until: created_at window, ``since <= created_at < until``.
+        limit: Page size.
+        cursor: ``next_cursor`` from the previous page.
+        order: ``desc`` (newest first, default) or ``asc``.
+
+    Returns:
+        {"entries": [...], "next_cursor": str or None}
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    clauses, params = _build_where(project_id, event_types, actors, session_id,
+                                   classification, since, until)
+    after = decode_cursor(cursor) if cursor else None
+    sql, params = _page_sql(clauses, params, order, after, limit)
+    with _Connection(db_path) as conn:
+        entries = [dict(r) for r in conn.execute(sql, params)]
+    next_cursor = None
+    if len(entries) == limit and entries:
+        next_cursor = encode_cursor(entries[-1]["created_at"], entries[-1]["id"])
+    return {"entries": entries, "next_cursor": next_cursor}
+
+
+def iter_events(batch_size: int = EXPORT_BATCH_SIZE, order: str = "asc",
+                db_path: Path = None, **filters) -> Iterator[Dict]:
+    """Stream every matching entry in keyset batches (constant memory).
+
+    The connection is only held while a batch is fetched, so a slow
+    consumer never pins a read transaction.  Rows appended after the
+    stream starts are excluded.
+    """
+    with _Connection(db_path) as conn:
+        max_id = conn.execute("SELECT MAX(id) FROM audit_trail").fetchone()[0]
+    if max_id is None:
+        return
+    clauses, params = _build_where(max_id=max_id, **filters)
+    after = None
+    while True:
+        sql, page_params = _page_sql(clauses, params, order, after, batch_size)
+        with _Connection(db_path) as conn:
+            rows = [dict(r) for r in conn.execute(sql, page_params)]
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+class _HashingWriter:
+    """Text sink that SHA-256 hashes everything written through it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        self.digest.update(text.encode("utf-8"))
+        return self.stream.write(text)
+
+
+def export_events(fmt: str, output, db_path: Path = None,
+                  batch_size: int = EXPORT_BATCH_SIZE, **filters) -> Dict:
+    """Stream matching entries to *output* as ``jsonl`` or ``csv``.
+
+    Args:
+        fmt: ``jsonl`` or ``csv``.
+        output: Path or writable text stream.
+        filters: Same keyword filters as :func:`query_events`.
+
+    Returns:
+        {"format", "count", "sha256"} — the digest covers the exported bytes.
+    """
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError("fmt must be 'jsonl' or 'csv'")
+    own_stream = not hasattr(output, "write")
+    stream = open(output, "w", encoding="utf-8", newline="") if own_stream else output
+    sink = _HashingWriter(stream)
+    count = 0
+    try:
+        writer = None
+        for entry in iter_events(batch_size=batch_size, db_path=db_path, **filters):
+            if fmt == "jsonl":
+                sink.write(json.dumps(entry, sort_keys=True) + "\n")
+            else:
+                if writer is None:
+                    writer = csv.DictWriter(sink, fieldnames=list(entry), lineterminator="\n")
+                    writer.writeheader()
+                writer.writerow(entry)
+            count += 1
+    finally:
+        if own_stream:
+            stream.close()
+    return {"format": fmt, "count": count, "sha256": sink.digest.hexdigest()}
+
 
 def query_by_project(project_id: str, limit: int = 50, db_path: Path = None) -> list:
     """Get audit entries for a project."""
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute(
-        """SELECT * FROM audit_trail WHERE project_id = ?
-           ORDER BY created_at DESC LIMIT ?""",
-        (project_id, limit),
-    )
-    rows = [dict(r) for r in c.fetchall()]
-    conn.close()
-    return rows
+    return query_events(project_id=project_id, limit=limit, db_path=db_path)["entries"]
 
 
 def query_by_type(event_type: str, limit: int = 50, db_path: Path = None) -> list:
     """Get audit entries by event type."""
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute(
-        """SELECT * FROM audit_trail WHERE event_type = ?
-           ORDER BY created_at DESC LIMIT ?""",
-        (event_type, limit),
-    )
-    rows = [dict(r) for r in c.fetchall()]
-    conn.close()
-    return rows
+    return query_events(event_types=event_type, limit=limit, db_path=db_path)["entries"]
 
 
 def query_by_actor(actor: str, limit: int = 50, db_path: Path = None) -> list:
     """Get audit entries by actor."""
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute(
-        """SELECT * FROM audit_trail WHERE actor = ?
-           ORDER BY created_at DESC LIMIT ?""",
-        (actor, limit),
-    )
-    rows = [dict(r) for r in c.fetchall()]
-    conn.close()
-    return rows
+    return query_events(actors=actor, limit=limit, db_path=db_path)["entries"]
 
 
 def query_recent(limit: int = 50, db_path: Path = None) -> list:
     """Get most recent audit entries."""
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute("SELECT * FROM audit_trail ORDER BY created_at DESC LIMIT ?", (limit,))
-    rows = [dict(r) for r in c.fetchall()]
-    conn.close()
-    return rows
+    return query_events(limit=limit, db_path=db_path)["entries"]
 
 
 def verify_completeness(project_id: str, db_path: Path = None) -> dict:
     """Verify audit trail completeness for a project.
     Checks that key lifecycle events exist."""
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    c = conn.cursor()
-
     required_events = [
         "project_created",
         "test_written",
@@ -86,16 +291,21 @@ def verify_completeness(project_id: str, db_path: Path = None) -> dict:
         "compliance_check",
     ]
 
+    # One grouped count, covered by idx_audit_project_type_created
+    placeholders = ",".join("?" * len(required_events))
+    with _Connection(db_path) as conn:
+        counts = dict(conn.execute(
+            f"""SELECT event_type, COUNT(*) FROM audit_trail
+                WHERE project_id = ? AND event_type IN ({placeholders})
+                GROUP BY event_type""",
+            [project_id] + required_events,
+        ).fetchall())
+
     results = {}
     for event in required_events:
-        c.execute(
-            "SELECT COUNT(*) FROM audit_trail WHERE project_id = ? AND event_type = ?",
-            (project_id, event),
-        )
-        count = c.fetchone()[0]
+        count = counts.get(event, 0)
         results[event] = {"present": count > 0, "count": count}
 
-    conn.close()
     all_present = all(r["present"] for r in results.values())
     return {"complete": all_present, "events": results}
 
@@ -114,20 +324,29 @@ def format_entries(entries: list) -> str:
 def main():
     parser = argparse.ArgumentParser(description="Query audit trail")
     parser.add_argument("--project-id", "--project", help="Filter by project ID", dest="project_id")
-    parser.add_argument("--type", help="Filter by event type")
-    parser.add_argument("--actor", help="Filter by actor")
+    parser.add_argument("--type", action="append", help="Filter by event type (repeatable)")
+    parser.add_argument("--actor", action="append", help="Filter by actor (repeatable)")
+    parser.add_argument("--session-id", help="Filter by session / correlation ID")
+    parser.add_argument("--since", help="Entries at or after this timestamp (ISO-8601)")
+    parser.add_argument("--until", help="Entries before this timestamp (ISO-8601)")
     parser.add_argument("--limit", type=int, default=50, help="Max results")
+    parser.add_argument("--cursor", help="Continue from a previous page's next_cursor")
+    parser.add_argument("--order", choices=["desc", "asc"], default="desc")
     parser.add_argument("--verify-completeness", action="store_true", help="Verify audit completeness for project")
+    parser.add_argument("--export", choices=["jsonl", "csv"], help="Stream all matches as evidence")
+    parser.add_argument("--output", help="Export file (default: stdout)")
+    parser.add_argument("--db-path", help="Override icdev.db path")
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--json", action="store_true", dest="json_output", help="JSON output")
     args = parser.parse_args()
+    db_path = Path(args.db_path) if args.db_path else None
 
     if args.verify_completeness:
         if not args.project_id:
             print("Error: --project required with --verify-completeness")
             return
-        result = verify_completeness(args.project_id)
-        if args.format == "json":
+        result = verify_completeness(args.project_id, db_path=db_path)
+        if args.format == "json" or args.json_output:
             print(json.dumps(result, indent=2))
         else:
             status = "COMPLETE" if result["complete"] else "INCOMPLETE"
@@ -137,19 +356,41 @@ def main():
                 print(f"  [{mark}] {event}: {info['count']} entries")
         return
 
-    if args.project_id:
-        entries = query_by_project(args.project_id, args.limit)
-    elif args.type:
-        entries = query_by_type(args.type, args.limit)
-    elif args.actor:
-        entries = query_by_actor(args.actor, args.limit)
-    else:
-        entries = query_recent(args.limit)
+    filters = {
+        "project_id": args.project_id,
+        "event_types": args.type,
+        "actors": args.actor,
+        "session_id": args.session_id,
+        "since": args.since,
+        "until": args.until,
+    }
+
+    if args.export:
+        output = args.output or io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8",
+                                                 newline="", write_through=True)
+        result = export_events(args.export, output, db_path=db_path, **filters)
+        if args.output:
+            result["output"] = args.output
+            result["classification"] = "CUI // SP-CTI"
+            print(json.dumps(result, indent=2) if args.json_output else
+                  f"Exported {result['count']} audit entries to {args.output} "
+                  f"(sha256 {result['sha256']})")
+        return
+
+    page = query_events(limit=args.limit, cursor=args.cursor, order=args.order,
+                        db_path=db_path, **filters)
+    entries = page["entries"]
 
-    if args.format == "json":
+    if args.json_output:
+        # Page envelope: pass next_cursor back via --cursor for the next page
+        print(json.dumps({"classification": "CUI // SP-CTI", "count": len(entries),
+                          **page}, indent=2))
+    elif args.format == "json":
         print(json.dumps(entries, indent=2))
     else:
         print(format_entries(entries) if entries else "No audit entries found.")
+        if page["next_cursor"]:
+            print(f"\nMore results: --cursor {page['next_cursor']}")
 
 
 if __name__ == "__main__":
@@ -15,6 +15,16 @@ Usage:
     conn = get_db_connection(validate=True)           # raise if DB missing
     conn = get_db_connection(db_path="/other.db")    # explicit DB
 
+    # Pooled, long-lived connection (returned to the pool on exit)
+    with pooled_connection() as conn:
+        conn.execute("INSERT ...")
+        conn.commit()
+
+Every connection handed out here gets the same tuned pragmas (WAL,
+synchronous=NORMAL, mmap_size, cache_size, busy_timeout) from the
+``connections`` section of args/db_config.yaml, so readers never block
+writers and lock contention waits instead of failing.
+
 Fallback chain:
     1. Explicit path argument (if provided)
     2. ICDEV_DB_PATH environment variable
@@ -23,15 +33,37 @@ Fallback chain:
 This module uses only Python stdlib (air-gap safe).
 """
 
+import atexit
+import logging
 import os
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, Iterator, Optional, Union
+
+logger = logging.getLogger("icdev.compat.db_utils")
 
 # Project root: 3 levels up from tools/compat/db_utils.py
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 _DEFAULT_DB = _PROJECT_ROOT / "data" / "icdev.db"
 
+DEFAULT_CONNECTION_CONFIG = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,       # 256 MB memory-mapped reads
+    "cache_size": -65536,         # 64 MB page cache (negative = KiB)
+    "busy_timeout_ms": 5000,      # Wait on locks instead of raising
+    "cached_statements": 256,     # Per-connection prepared-statement cache
+    "pool_size": 8,               # Max connections per database file
+    "pool_timeout_seconds": 30,   # Max wait for a free pooled connection
+    "max_pools": 16,              # Least recently used pools closed past this
+}
+
+_connection_config: Optional[dict] = None
+
 
 def get_project_root() -> Path:
     """Return the ICDEV project root directory."""
@@ -97,6 +129,59 @@ def get_platform_db_path(explicit: Optional[Union[str, Path]] = None) -> Path:
 # ---------------------------------------------------------------------------
 
 
+def get_connection_config() -> dict:
+    """Return connection tuning from ``args/db_config.yaml`` (cached).
+
+    Falls back to :data:`DEFAULT_CONNECTION_CONFIG` when PyYAML or the file
+    is unavailable (air-gap safe).
+    """
+    global _connection_config
+    if _connection_config is None:
+        config = dict(DEFAULT_CONNECTION_CONFIG)
+        try:
+            import yaml
+            config_path = _PROJECT_ROOT / "args" / "db_config.yaml"
+            if config_path.exists():
+                with open(config_path, encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+                config.update(data.get("connections", {}) or {})
+        except (ImportError, Exception):
+            pass
+        _connection_config = config
+    return _connection_config
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the standard ICDEV pragmas to *conn*.
+
+    ``busy_timeout`` is set first so switching to WAL waits out a
+    concurrent writer rather than failing.  WAL is persistent in the file;
+    if it cannot be enabled (e.g. read-only media) the connection is still
+    usable with the default rollback journal.
+    """
+    cfg = get_connection_config()
+    conn.execute(f"PRAGMA busy_timeout = {int(cfg['busy_timeout_ms'])}")
+    try:
+        conn.execute(f"PRAGMA journal_mode = {cfg['journal_mode']}")
+    except sqlite3.OperationalError as exc:
+        logger.debug("journal_mode=%s not applied: %s", cfg["journal_mode"], exc)
+    conn.execute(f"PRAGMA synchronous = {cfg['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {int(cfg['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = {int(cfg['cache_size'])}")
+    return conn
+
+
+def _connect(path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    cfg = get_connection_config()
+    conn = sqlite3.connect(
+        str(path),
+        timeout=int(cfg["busy_timeout_ms"]) / 1000.0,
+        cached_statements=int(cfg["cached_statements"]),
+        check_same_thread=check_same_thread,
+    )
+    return configure_connection(conn)
+
+
 def get_db_connection(
     db_path: Optional[Union[str, Path]] = None,
     validate: bool = False,
@@ -123,7 +208,7 @@ def get_db_connection(
             f"Database not found: {path}\n"
             "Run: python tools/db/init_icdev_db.py"
         )
-    conn = sqlite3.connect(str(path))
+    conn = _connect(path)
     if row_factory:
         conn.row_factory = sqlite3.Row
     return conn
@@ -138,7 +223,7 @@ def get_memory_connection(
     path = get_memory_db_path(db_path)
     if validate and not path.exists():
         raise FileNotFoundError(f"Memory database not found: {path}")
-    conn = sqlite3.connect(str(path))
+    conn = _connect(path)
     if row_factory:
         conn.row_factory = sqlite3.Row
     return conn
@@ -153,7 +238,208 @@ def get_platform_connection(
     path = get_platform_db_path(db_path)
     if validate and not path.exists():
         raise FileNotFoundError(f"Platform database not found: {path}")
-    conn = sqlite3.connect(str(path))
+    conn = _connect(path)
     if row_factory:
         conn.row_factory = sqlite3.Row
     return conn
+
+
+# ---------------------------------------------------------------------------
+# Connection pooling — long-lived, pre-configured connections per DB file
+# ---------------------------------------------------------------------------
+
+
+def _file_identity(path: Path):
+    try:
+        st = os.stat(path)
+        return st.st_dev, st.st_ino
+    except OSError:
+        return None
+
+
+class ConnectionPool:
+    """Bounded LIFO pool of configured connections to one database file.
+
+    Connections are opened lazily up to ``max_size``; callers beyond that
+    wait (up to ``timeout`` seconds) for one to be returned.  A connection
+    whose file was deleted or replaced since it was opened is discarded at
+    checkout.  Any transaction left open by a caller is rolled back on
+    release so the next user starts clean.
+    """
+
+    def __init__(self, path: Union[str, Path], max_size: int = 8, timeout: float = 30.0):
+        self.path = Path(path)
+        self.max_size = max(1, int(max_size))
+        self.timeout = float(timeout)
+        self._idle = []                 # [(conn, file_identity)]
+        self._identity = {}             # id(conn) -> file_identity at open
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._metrics = {
+            "opened": 0, "closed": 0, "checkouts": 0, "timeouts": 0,
+            "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+        }
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close *conn* and free its slot (caller holds ``_cond``)."""
+        self._identity.pop(id(conn), None)
+        self._size -= 1
+        self._metrics["closed"] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._cond.notify()
+
+    def acquire(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError(f"Connection pool closed: {self.path}")
+                current = _file_identity(self.path) if self._idle else None
+                while self._idle:
+                    conn, identity = self._idle.pop()
+                    if identity == current:
+                        self._record_wait(start)
+                        return conn
+                    self._discard(conn)  # DB file replaced or deleted
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise sqlite3.OperationalError(
+                        f"Timed out after {self.timeout}s waiting for a connection to {self.path}"
+                    )
+                self._cond.wait(remaining)
+
+        # Open outside the lock; the slot is already reserved
+        try:
+            conn = _connect(self.path, check_same_thread=False)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._identity[id(conn)] = _file_identity(self.path)
+            self._metrics["opened"] += 1
+            self._record_wait(start)
+        return conn
+
+    def _record_wait(self, start: float) -> None:
+        waited = time.perf_counter() - start
+        self._metrics["checkouts"] += 1
+        self._metrics["wait_seconds_total"] += waited
+        self._metrics["wait_seconds_max"] = max(self._metrics["wait_seconds_max"], waited)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = True
+        except sqlite3.Error:
+            healthy = False
+        with self._cond:
+            if self._closed or not healthy:
+                self._discard(conn)
+                return
+            conn.row_factory = None
+            self._idle.append((conn, self._identity.get(id(conn))))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close idle connections now; in-use ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, Union[int, float]]:
+        with self._cond:
+            checkouts = self._metrics["checkouts"]
+            return {
+                **self._metrics,
+                "open": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                "wait_seconds_avg": (self._metrics["wait_seconds_total"] / checkouts
+                                     if checkouts else 0.0),
+            }
+
+
+_pools: "OrderedDict[str, ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Optional[Union[str, Path]] = None) -> ConnectionPool:
+    """Return the process-wide pool for *db_path* (default icdev.db)."""
+    path = get_icdev_db_path(db_path)
+    key = str(path.resolve())
+    cfg = get_connection_config()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(path, max_size=cfg["pool_size"],
+                                  timeout=cfg["pool_timeout_seconds"])
+            _pools[key] = pool
+            while len(_pools) > int(cfg["max_pools"]):
+                _pools.popitem(last=False)[1].close()
+        else:
+            _pools.move_to_end(key)
+        return pool
+
+
+@contextmanager
+def pooled_connection(
+    db_path: Optional[Union[str, Path]] = None,
+    row_factory: bool = True,
+) -> Iterator[sqlite3.Connection]:
+    """Borrow a configured connection from the pool for *db_path*.
+
+    The caller commits its own work; an uncommitted transaction is rolled
+    back when the block exits.  Do not close the connection.
+    """
+    pool = get_pool(db_path)
+    conn = pool.acquire()
+    conn.row_factory = sqlite3.Row if row_factory else None
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Union[int, float]]]:
+    """Per-database pool metrics: open/idle/in-use counts and checkout wait times."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {key: pool.metrics() for key, pool in pools}
+
+
+def close_pool(db_path: Union[str, Path]) -> bool:
+    """Close and forget the pool for one database file, if there is one."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.pop(key, None)
+    if pool is None:
+        return False
+    pool.close()
+    return True
+
+
+def close_all_pools() -> None:
+    """Close every pool (registered atexit so WAL is checkpointed on exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
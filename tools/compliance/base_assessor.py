@@ -27,15 +27,20 @@ import argparse
 import json
 import sqlite3
 import sys
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 CATALOG_DIR = BASE_DIR / "context" / "compliance"
 
+# Parsed catalogs shared by all assessor instances: path -> (mtime_ns, catalog)
+_catalog_files: Dict[str, Tuple[int, List[Dict]]] = {}
+_catalog_lock = threading.Lock()
+
 
 class BaseAssessor(ABC):
     """Abstract base class for compliance framework assessors."""
@@ -79,6 +84,7 @@ class BaseAssessor(ABC):
     def _log_audit_event(
         self, conn: sqlite3.Connection, project_id: str,
         action: str, details: Dict, file_path: Optional[str] = None,
+        commit: bool = True,
     ) -> None:
         try:
             conn.execute(
@@ -96,7 +102,8 @@ class BaseAssessor(ABC):
                     "CUI",
                 ),
             )
-            conn.commit()
+            if commit:
+                conn.commit()
         except Exception as e:
             print(f"Warning: Could not log audit event: {e}", file=sys.stderr)
 
@@ -137,20 +144,31 @@ class BaseAssessor(ABC):
         if self._catalog_cache is not None:
             return self._catalog_cache
         catalog_path = CATALOG_DIR / self.CATALOG_FILENAME
-        if not catalog_path.exists():
+        try:
+            mtime = catalog_path.stat().st_mtime_ns
+        except OSError:
             raise FileNotFoundError(
                 f"Catalog not found: {catalog_path}\n"
                 f"Expected: context/compliance/{self.CATALOG_FILENAME}"
             )
-        with open(catalog_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Support both "requirements" and "controls" root keys
-        self._catalog_cache = (
-            data.get("requirements")
-            or data.get("controls")
-            or data.get("criteria")
-            or []
-        )
+        # Shared across instances; reloaded when the file changes
+        key = str(catalog_path)
+        with _catalog_lock:
+            cached = _catalog_files.get(key)
+        if cached is None or cached[0] != mtime:
+            with open(catalog_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Support both "requirements" and "controls" root keys
+            catalog = (
+                data.get("requirements")
+                or data.get("controls")
+                or data.get("criteria")
+                or []
+            )
+            cached = (mtime, catalog)
+            with _catalog_lock:
+                _catalog_files[key] = cached
+        self._catalog_cache = cached[1]
         return self._catalog_cache
 
     # -----------------------------------------------------------------
@@ -224,6 +242,161 @@ class BaseAssessor(ABC):
         """
         return {}
 
+    def evaluate(
+        self,
+        project: Dict,
+        nist_impl: Mapping[str, str],
+        project_dir: Optional[str] = None,
+        now: Optional[str] = None,
+    ) -> Dict:
+        """Compute assessment results without touching the database.
+
+        Status precedence per requirement: automated check, then NIST
+        800-53 crosswalk inheritance, then not_assessed.
+
+        Args:
+            project: Project row dict.
+            nist_impl: {CONTROL-ID: implementation_status} for the project.
+            project_dir: Optional path to project source code.
+            now: Assessment timestamp (defaults to the current UTC time).
+
+        Returns:
+            Assessment summary dict (see assess()) plus "_rows", the
+            per-requirement rows for write_results().
+        """
+        catalog = self.load_catalog()
+        auto_checks = self.get_automated_checks(project, project_dir)
+        project_id = project["id"]
+
+        now = now or datetime.now(timezone.utc).isoformat()
+        results = []
+        rows = []
+        status_counts = {s: 0 for s in self.STATUS_VALUES}
+
+        for req in catalog:
+            req_id = req.get("id", "")
+            req_title = req.get("title", "")
+            family = req.get("family", "")
+            crosswalk = req.get("nist_800_53_crosswalk", [])
+
+            # Determine status: auto-check > crosswalk > not_assessed
+            status = "not_assessed"
+            evidence = ""
+            automation_result = ""
+
+            # 1. Auto-check result
+            if req_id in auto_checks:
+                status = auto_checks[req_id]
+                automation_result = f"Automated check: {status}"
+
+            # 2. Crosswalk inheritance
+            if status == "not_assessed":
+                cw_status = self._crosswalk_status(req, nist_impl)
+                if cw_status:
+                    status = cw_status
+                    evidence = "Inherited from NIST 800-53 crosswalk"
+
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+            crosswalk_json = json.dumps(crosswalk) if crosswalk else None
+            rows.append((
+                project_id, now, req_id, req_title, family,
+                status, evidence, automation_result,
+                crosswalk_json, now,
+            ))
+            results.append({
+                "requirement_id": req_id,
+                "title": req_title,
+                "family": family,
+                "status": status,
+            })
+
+        # Compute summary
+        total = len(results)
+        satisfied = status_counts.get("satisfied", 0)
+        partial = status_counts.get("partially_satisfied", 0)
+        not_satisfied = status_counts.get("not_satisfied", 0)
+        coverage_pct = round(
+            ((satisfied + partial * 0.5) / total * 100) if total > 0 else 0, 1
+        )
+
+        gate = "not_started"
+        if coverage_pct >= 100.0:
+            gate = "compliant"
+        elif coverage_pct > 0:
+            gate = "in_progress"
+        if not_satisfied > 0:
+            gate = "non_compliant"
+
+        return {
+            "framework_id": self.FRAMEWORK_ID,
+            "framework_name": self.FRAMEWORK_NAME,
+            "project_id": project_id,
+            "assessment_date": now,
+            "total_requirements": total,
+            "status_counts": status_counts,
+            "coverage_pct": coverage_pct,
+            "gate_status": gate,
+            "results": results,
+            "_rows": rows,
+        }
+
+    def write_results(self, conn: sqlite3.Connection, evaluation: Dict) -> Dict:
+        """Persist an evaluate() result without committing.
+
+        Upserts the requirement rows, updates project_framework_status and
+        queues the audit event, so callers can group several frameworks
+        into one transaction.  The framework table must already exist
+        (_ensure_table).
+
+        Returns:
+            The summary with the internal "_rows" removed.
+        """
+        summary = dict(evaluation)
+        rows = summary.pop("_rows")
+        project_id = summary["project_id"]
+        now = summary["assessment_date"]
+        gate = summary.pop("gate_status")
+        counts = summary["status_counts"]
+
+        conn.executemany(
+            f"""INSERT OR REPLACE INTO {self.TABLE_NAME}
+               (project_id, assessment_date, requirement_id,
+                requirement_title, family, status,
+                evidence_description, automation_result,
+                nist_800_53_crosswalk, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+
+        # Update project_framework_status
+        try:
+            conn.execute(
+                """INSERT OR REPLACE INTO project_framework_status
+                   (project_id, framework_id, total_controls,
+                    implemented_controls, coverage_pct, gate_status,
+                    last_assessed, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    project_id, self.FRAMEWORK_ID, summary["total_requirements"],
+                    counts.get("satisfied", 0), summary["coverage_pct"],
+                    gate, now, now,
+                ),
+            )
+        except sqlite3.Error:
+            pass  # Table may not exist yet
+
+        self._log_audit_event(conn, project_id, f"{self.FRAMEWORK_NAME} assessment", {
+            "total": summary["total_requirements"],
+            "satisfied": counts.get("satisfied", 0),
+            "partially_satisfied": counts.get("partially_satisfied", 0),
+            "not_satisfied": counts.get("not_satisfied", 0),
+            "not_assessed": counts.get("not_assessed", 0),
+            "coverage_pct": summary["coverage_pct"],
+            "gate_status": gate,
+        }, commit=False)
+        return summary
+
     def assess(
         self,
         project_id: str,
@@ -244,122 +417,10 @@ class BaseAssessor(ABC):
         try:
             self._ensure_table(conn)
             project = self._get_project(conn, project_id)
-            catalog = self.load_catalog()
             nist_impl = self._get_nist_implementations(conn, project_id)
-
-            # Run automated checks
-            auto_checks = self.get_automated_checks(project, project_dir)
-
-            now = datetime.now(timezone.utc).isoformat()
-            results = []
-            status_counts = {s: 0 for s in self.STATUS_VALUES}
-
-            for req in catalog:
-                req_id = req.get("id", "")
-                req_title = req.get("title", "")
-                family = req.get("family", "")
-                crosswalk = req.get("nist_800_53_crosswalk", [])
-
-                # Determine status: auto-check > crosswalk > not_assessed
-                status = "not_assessed"
-                evidence = ""
-                automation_result = ""
-
-                # 1. Auto-check result
-                if req_id in auto_checks:
-                    status = auto_checks[req_id]
-                    automation_result = f"Automated check: {status}"
-
-                # 2. Crosswalk inheritance
-                if status == "not_assessed":
-                    cw_status = self._crosswalk_status(req, nist_impl)
-                    if cw_status:
-                        status = cw_status
-                        evidence = "Inherited from NIST 800-53 crosswalk"
-
-                status_counts[status] = status_counts.get(status, 0) + 1
-
-                # Upsert to DB
-                crosswalk_json = json.dumps(crosswalk) if crosswalk else None
-                conn.execute(
-                    f"""INSERT OR REPLACE INTO {self.TABLE_NAME}
-                       (project_id, assessment_date, requirement_id,
-                        requirement_title, family, status,
-                        evidence_description, automation_result,
-                        nist_800_53_crosswalk, updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        project_id, now, req_id, req_title, family,
-                        status, evidence, automation_result,
-                        crosswalk_json, now,
-                    ),
-                )
-
-                results.append({
-                    "requirement_id": req_id,
-                    "title": req_title,
-                    "family": family,
-                    "status": status,
-                })
-
+            evaluation = self.evaluate(project, nist_impl, project_dir)
+            summary = self.write_results(conn, evaluation)
             conn.commit()
-
-            # Compute summary
-            total = len(results)
-            satisfied = status_counts.get("satisfied", 0)
-            partial = status_counts.get("partially_satisfied", 0)
-            not_satisfied = status_counts.get("not_satisfied", 0)
-            not_assessed = status_counts.get("not_assessed", 0)
-            coverage_pct = round(
-                ((satisfied + partial * 0.5) / total * 100) if total > 0 else 0, 1
-            )
-
-            summary = {
-                "framework_id": self.FRAMEWORK_ID,
-                "framework_name": self.FRAMEWORK_NAME,
-                "project_id": project_id,
-                "assessment_date": now,
-                "total_requirements": total,
-                "status_counts": status_counts,
-                "coverage_pct": coverage_pct,
-                "results": results,
-            }
-
-            # Update project_framework_status
-            gate = "not_started"
-            if coverage_pct >= 100.0:
-                gate = "compliant"
-            elif coverage_pct > 0:
-                gate = "in_progress"
-            if not_satisfied > 0:
-                gate = "non_compliant"
-
-            try:
-                conn.execute(
-                    """INSERT OR REPLACE INTO project_framework_status
-                       (project_id, framework_id, total_controls,
-                        implemented_controls, coverage_pct, gate_status,
-                        last_assessed, updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        project_id, self.FRAMEWORK_ID, total,
-                        satisfied, coverage_pct, gate, now, now,
-                    ),
-                )
-                conn.commit()
-            except Exception:
-                pass  # Table may not exist yet
-
-            self._log_audit_event(conn, project_id, f"{self.FRAMEWORK_NAME} assessment", {
-                "total": total,
-                "satisfied": satisfied,
-                "partially_satisfied": partial,
-                "not_satisfied": not_satisfied,
-                "not_assessed": not_assessed,
-                "coverage_pct": coverage_pct,
-                "gate_status": gate,
-            })
-
             return summary
         finally:
             conn.close()
@@ -5,11 +5,22 @@ Loads marking configuration from args/cui_markings.yaml and applies
 appropriate banners/headers based on file type."""
 
 import argparse
+import json
 import os
+import re
 import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.compliance.source_scanner import (  # noqa: E402
+    ScanRule,
+    SourceScanner,
+    default_cache_path,
+)
+
 ARGS_DIR = BASE_DIR / "args"
 CUI_CONFIG_PATH = ARGS_DIR / "cui_markings.yaml"
 
@@ -33,6 +44,9 @@ COMMENT_STYLES = {
 # Document extensions that get banner treatment (top + bottom banners)
 DOCUMENT_EXTENSIONS = {".md", ".txt", ".rst", ".adoc", ".html"}
 
+# Directories mark_directory never descends into (hidden dirs are skipped too)
+SKIP_DIRS = {"node_modules", "__pycache__", ".git", "venv", "env", ".tox", ".tmp"}
+
 
 def load_cui_config(config_path=None):
     """Load CUI marking configuration from YAML file.
@@ -300,8 +314,7 @@ def mark_directory(dir_path, extensions=None, config=None, dry_run=False):
 
     for root, dirs, files in os.walk(dir_path):
         # Skip hidden directories and common non-project directories
-        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in
-                   {"node_modules", "__pycache__", ".git", "venv", "env", ".tox", ".tmp"}]
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS]
 
         for fname in files:
             fpath = Path(root) / fname
@@ -330,6 +343,34 @@ def mark_directory(dir_path, extensions=None, config=None, dry_run=False):
     return marked_files
 
 
+def cui_scan_rules(config=None, extensions=None):
+    """SourceScanner rule matching the CUI banner in markable files."""
+    if config is None:
+        config = load_cui_config()
+    if extensions is None:
+        extensions = set(COMMENT_STYLES.keys()) | DOCUMENT_EXTENSIONS
+    banner = config.get("banner_top", "CUI // SP-CTI")
+    return [ScanRule("cui.banner", re.escape(banner), frozenset(extensions),
+                     ignore_case=False)]
+
+
+def find_unmarked_files(dir_path, extensions=None, config=None, use_cache=True):
+    """Return markable files under dir_path that lack the CUI banner.
+    Uses the shared single-pass scanner; unchanged files are answered from
+    its content-hash cache without being re-read."""
+    dir_path = Path(dir_path)
+    if not dir_path.is_dir():
+        raise NotADirectoryError(f"Not a directory: {dir_path}")
+
+    if extensions is not None:
+        extensions = {e if e.startswith(".") else f".{e}" for e in extensions}
+    scanner = SourceScanner(ignore_dirs=SKIP_DIRS, ignore_hidden=True)
+    scanner.register(cui_scan_rules(config, extensions))
+    cache_path = default_cache_path(dir_path, "cui") if use_cache else None
+    result = scanner.scan(dir_path, cache_path=cache_path)
+    return [str(dir_path / rel) for rel in sorted(result.scanned) if rel not in result.files]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Apply CUI classification markings to files"
@@ -349,6 +390,10 @@ def main():
         "--dry-run", action="store_true",
         help="Show what would be done without making changes"
     )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="With --directory: list files missing CUI markings without modifying them"
+    )
     parser.add_argument("--json", action="store_true", dest="json_output", help="JSON output")
     args = parser.parse_args()
 
@@ -375,6 +420,20 @@ def main():
         extensions = None
         if args.extensions:
             extensions = [e.strip() for e in args.extensions.split(",")]
+        if args.check:
+            unmarked = find_unmarked_files(args.directory, extensions=extensions, config=config)
+            if args.json_output:
+                print(json.dumps({
+                    "directory": str(Path(args.directory).resolve()),
+                    "unmarked_files": unmarked,
+                    "unmarked_count": len(unmarked),
+                    "classification": "CUI // SP-CTI",
+                }, indent=2))
+            else:
+                print(f"Files missing CUI markings: {len(unmarked)}")
+                for fp in unmarked:
+                    print(f"  {fp}")
+            sys.exit(1 if unmarked else 0)
         marked = mark_directory(
             args.directory, extensions=extensions, config=config, dry_run=args.dry_run
         )
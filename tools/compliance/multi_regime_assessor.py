@@ -11,8 +11,14 @@ deduplicates overlapping controls via the crosswalk engine (ADR D113),
 and produces a unified compliance report showing per-framework coverage
 and the minimal set of controls needed to satisfy all regimes.
 
+assess_all() reads the project, its NIST 800-53 implementations and the
+control crosswalk once into a read-only ProjectSnapshot, evaluates the
+framework assessors concurrently against it, and writes every framework's
+results in a single transaction.
+
 CLI:
     python tools/compliance/multi_regime_assessor.py --project-id proj-123 --json
+    python tools/compliance/multi_regime_assessor.py --project-id proj-123 --workers 1
     python tools/compliance/multi_regime_assessor.py --project-id proj-123 --gate
     python tools/compliance/multi_regime_assessor.py --project-id proj-123 --minimal-controls
 """
@@ -21,12 +27,20 @@ import argparse
 import json
 import sqlite3
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
+CROSSWALK_PATH = BASE_DIR / "context" / "compliance" / "control_crosswalk.json"
+
+# Upper bound on concurrently evaluated frameworks
+DEFAULT_MAX_WORKERS = 8
 
 # Map framework_id -> assessor class import path
 ASSESSOR_REGISTRY = {
@@ -91,114 +105,302 @@ def _load_assessor(framework_id):
         return None
 
 
+# ---------------------------------------------------------------------------
+# Shared project snapshot
+# ---------------------------------------------------------------------------
+_crosswalk_cache: Dict[str, Tuple[int, Tuple[Dict, ...]]] = {}
+_crosswalk_lock = threading.Lock()
+
+
+def _load_crosswalk() -> Tuple[Dict, ...]:
+    """Load control_crosswalk.json entries (cached until the file changes)."""
+    try:
+        mtime = CROSSWALK_PATH.stat().st_mtime_ns
+    except OSError:
+        return ()
+    key = str(CROSSWALK_PATH)
+    with _crosswalk_lock:
+        cached = _crosswalk_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        with open(CROSSWALK_PATH, "r", encoding="utf-8") as f:
+            entries = tuple(json.load(f).get("crosswalk", []))
+        cached = (mtime, entries)
+        with _crosswalk_lock:
+            _crosswalk_cache[key] = cached
+    return cached[1]
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    """Read-only project state shared by every assessor in one run."""
+
+    project_id: str
+    project: Mapping[str, Any]
+    nist_impl: Mapping[str, str]      # CONTROL-ID -> implementation_status
+    crosswalk: Mapping[str, Mapping]  # CONTROL-ID -> control_crosswalk.json entry
+
+
+def load_project_snapshot(project_id: str, db_path: Optional[Path] = None) -> ProjectSnapshot:
+    """Read the project row, NIST implementations and crosswalk once.
+
+    Raises:
+        FileNotFoundError: If the database does not exist.
+        ValueError: If the project is not found.
+    """
+    conn = _get_connection(db_path)
+    try:
+        row = conn.execute(
+            "SELECT * FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        if not row:
+            raise ValueError(f"Project '{project_id}' not found.")
+        try:
+            rows = conn.execute(
+                """SELECT control_id, implementation_status
+                   FROM project_controls WHERE project_id = ?""",
+                (project_id,),
+            ).fetchall()
+            nist_impl = {
+                r["control_id"].upper(): r["implementation_status"]
+                for r in rows
+            }
+        except Exception:
+            nist_impl = {}
+    finally:
+        conn.close()
+
+    crosswalk = {}
+    for entry in _load_crosswalk():
+        nist_id = entry.get("nist_800_53", entry.get("nist_id", ""))
+        if nist_id:
+            crosswalk[nist_id.upper()] = MappingProxyType(entry)
+
+    return ProjectSnapshot(
+        project_id=project_id,
+        project=MappingProxyType(dict(row)),
+        nist_impl=MappingProxyType(nist_impl),
+        crosswalk=MappingProxyType(crosswalk),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Deduplicated control set
+# ---------------------------------------------------------------------------
+def _requirement_controls(requirement: Dict) -> List[str]:
+    crosswalk = requirement.get("nist_800_53_crosswalk") or []
+    if isinstance(crosswalk, str):
+        crosswalk = [crosswalk]
+    return [c.upper() for c in crosswalk if c]
+
+
+def compute_control_set(
+    snapshot: ProjectSnapshot,
+    catalogs: Mapping[str, List[Dict]],
+    crosswalk_frameworks: Optional[List[str]] = None,
+) -> Dict:
+    """Deduplicate the NIST 800-53 controls behind a set of frameworks.
+
+    Controls come from each assessed framework's catalog crosswalk refs
+    and, for frameworks tracked as columns of control_crosswalk.json
+    (FedRAMP, CMMC), from the crosswalk itself.  A control required by
+    several frameworks is counted once (ADR D113).
+
+    Args:
+        snapshot: Project snapshot (NIST implementations + crosswalk).
+        catalogs: {framework_id: catalog requirements}.
+        crosswalk_frameworks: Framework ids to read from the crosswalk.
+
+    Returns:
+        Dict with counts, coverage, and the per-control framework list.
+    """
+    control_frameworks: Dict[str, set] = {}
+    for fw_id, catalog in catalogs.items():
+        for req in catalog:
+            for nist_id in _requirement_controls(req):
+                control_frameworks.setdefault(nist_id, set()).add(fw_id)
+    for fw_id in crosswalk_frameworks or []:
+        for nist_id, entry in snapshot.crosswalk.items():
+            if entry.get(fw_id) not in (None, False):
+                control_frameworks.setdefault(nist_id, set()).add(fw_id)
+
+    status_counts = {"implemented": 0, "partially_implemented": 0, "not_implemented": 0}
+    controls = []
+    for nist_id, fws in control_frameworks.items():
+        status = snapshot.nist_impl.get(nist_id) or "not_implemented"
+        bucket = status if status in status_counts else "not_implemented"
+        status_counts[bucket] += 1
+        controls.append({
+            "nist_id": nist_id,
+            "status": status,
+            "frameworks": sorted(fws),
+        })
+    controls.sort(key=lambda c: (-len(c["frameworks"]), c["nist_id"]))
+
+    unique = len(controls)
+    references = sum(len(c["frameworks"]) for c in controls)
+    covered = status_counts["implemented"] + 0.5 * status_counts["partially_implemented"]
+    return {
+        "unique_controls": unique,
+        "control_references": references,
+        "duplicates_eliminated": references - unique,
+        "shared_controls": sum(1 for c in controls if len(c["frameworks"]) > 1),
+        "status_counts": status_counts,
+        "coverage_pct": round(covered / unique * 100, 1) if unique else 0,
+        "controls": controls,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Assessment
+# ---------------------------------------------------------------------------
+def _resolve_frameworks(project_id, frameworks, db_path):
+    if frameworks:
+        return list(frameworks)
+    applicable = _get_applicable_frameworks(project_id, db_path)
+    if applicable:
+        return [r["framework_id"] for r in applicable]
+    return list(ASSESSOR_REGISTRY.keys())
+
+
 def assess_all(
     project_id: str,
     project_dir: Optional[str] = None,
     frameworks: Optional[List[str]] = None,
     db_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict:
     """Run all applicable assessors for a project.
 
     If frameworks is None, reads from framework_applicability table.
     Falls back to all registered assessors if no applicability data.
 
+    Assessors are evaluated concurrently (up to max_workers, default
+    DEFAULT_MAX_WORKERS; 1 runs them inline) against one ProjectSnapshot,
+    then all results are stored in a single transaction.
+
     Returns:
         Dict with per-framework results, unified summary, and
         deduplicated control counts.
     """
-    # Determine which frameworks to assess
-    if frameworks:
-        fw_list = frameworks
-    else:
-        applicable = _get_applicable_frameworks(project_id, db_path)
-        if applicable:
-            fw_list = [r["framework_id"] for r in applicable]
-        else:
-            fw_list = list(ASSESSOR_REGISTRY.keys())
+    fw_list = _resolve_frameworks(project_id, frameworks, db_path)
+    db_path = db_path or DB_PATH
 
-    # Run assessors
     results = {}
     errors = {}
 
+    # Resolve assessor classes up front (imports are not parallelised)
+    assessors = {}
     for fw_id in fw_list:
-        if fw_id not in ASSESSOR_REGISTRY:
+        if fw_id not in ASSESSOR_REGISTRY or fw_id in assessors:
             continue
         assessor_cls = _load_assessor(fw_id)
         if assessor_cls is None:
             errors[fw_id] = "Assessor not available"
             continue
+        assessors[fw_id] = assessor_cls(db_path=db_path)
+
+    try:
+        snapshot = load_project_snapshot(project_id, db_path)
+    except ValueError as e:
+        # Every assessor would fail the same project lookup
+        errors.update({fw_id: str(e) for fw_id in assessors})
+        assessors = {}
+        snapshot = None
+
+    # Evaluate concurrently against the shared snapshot
+    now = datetime.now(timezone.utc).isoformat()
+    evaluations = {}
+
+    def _evaluate(fw_id):
         try:
-            assessor = assessor_cls(db_path=db_path or DB_PATH)
-            result = assessor.assess(project_id, project_dir=project_dir)
-            results[fw_id] = result
+            return assessors[fw_id].evaluate(
+                snapshot.project, snapshot.nist_impl, project_dir, now=now), None
         except Exception as e:
-            errors[fw_id] = str(e)
+            return None, e
 
-    # Compute unified metrics
-    framework_summaries = []
+    workers = max(1, min(max_workers or DEFAULT_MAX_WORKERS, len(assessors) or 1))
+    if workers == 1:
+        outcomes = [_evaluate(fw_id) for fw_id in assessors]
+    else:
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="multi-regime") as pool:
+            outcomes = list(pool.map(_evaluate, assessors))
+    for fw_id, (evaluation, exc) in zip(assessors, outcomes):
+        if exc is not None:
+            errors[fw_id] = str(exc)
+        else:
+            evaluations[fw_id] = evaluation
 
-    conn = _get_connection(db_path)
-    try:
-        # Get NIST implementations
+    # Persist every framework in one transaction
+    if evaluations:
+        conn = _get_connection(db_path)
         try:
-            rows = conn.execute(
-                """SELECT control_id, implementation_status
-                   FROM project_controls WHERE project_id = ?""",
-                (project_id,),
-            ).fetchall()
-            nist_impl = {
-                r["control_id"].upper(): r["implementation_status"]
-                for r in rows
-            }
-        except Exception:
-            nist_impl = {}
+            for fw_id in evaluations:
+                assessors[fw_id]._ensure_table(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            for fw_id, evaluation in evaluations.items():
+                results[fw_id] = assessors[fw_id].write_results(conn, evaluation)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            results = {}
+            errors.update({fw_id: f"Could not store results: {e}"
+                           for fw_id in evaluations})
+        finally:
+            conn.close()
 
-        for fw_id, result in results.items():
-            fw_summary = {
-                "framework_id": fw_id,
-                "framework_name": result.get("framework_name", fw_id),
-                "total_requirements": result.get("total_requirements", 0),
-                "coverage_pct": result.get("coverage_pct", 0),
-                "status_counts": result.get("status_counts", {}),
-            }
-            framework_summaries.append(fw_summary)
-
-            # Collect NIST crosswalk references for deduplication
-            for req in result.get("results", []):
-                # We'd need the catalog to get crosswalk refs
-                pass
-
-        # Compute overall metrics
-        total_frameworks = len(results)
-        avg_coverage = (
-            sum(r.get("coverage_pct", 0) for r in results.values()) / total_frameworks
-            if total_frameworks > 0 else 0
-        )
+    # Compute unified metrics
+    framework_summaries = []
+    for fw_id, result in results.items():
+        framework_summaries.append({
+            "framework_id": fw_id,
+            "framework_name": result.get("framework_name", fw_id),
+            "total_requirements": result.get("total_requirements", 0),
+            "coverage_pct": result.get("coverage_pct", 0),
+            "status_counts": result.get("status_counts", {}),
+        })
+
+    total_frameworks = len(results)
+    avg_coverage = (
+        sum(r.get("coverage_pct", 0) for r in results.values()) / total_frameworks
+        if total_frameworks > 0 else 0
+    )
 
-        # Count implemented NIST controls
-        implemented_count = sum(
-            1 for s in nist_impl.values() if s == "implemented"
-        )
-        total_nist = len(nist_impl)
+    nist_impl = snapshot.nist_impl if snapshot else {}
+    implemented_count = sum(1 for s in nist_impl.values() if s == "implemented")
 
-    finally:
-        conn.close()
+    control_set = None
+    if snapshot is not None:
+        control_set = compute_control_set(
+            snapshot,
+            {fw_id: assessors[fw_id].load_catalog() for fw_id in results},
+            crosswalk_frameworks=[f for f in fw_list if f in EXISTING_ASSESSORS],
+        )
 
     unified = {
         "project_id": project_id,
-        "assessment_date": datetime.now(timezone.utc).isoformat(),
+        "assessment_date": now,
         "frameworks_assessed": total_frameworks,
         "framework_results": framework_summaries,
         "errors": errors,
         "unified_metrics": {
             "average_coverage_pct": round(avg_coverage, 1),
             "nist_controls_implemented": implemented_count,
-            "nist_controls_total": total_nist,
+            "nist_controls_total": len(nist_impl),
+            "deduplicated_controls": (
+                control_set["unique_controls"] if control_set else 0),
+            "control_references": (
+                control_set["control_references"] if control_set else 0),
+            "duplicates_eliminated": (
+                control_set["duplicates_eliminated"] if control_set else 0),
+            "deduplicated_coverage_pct": (
+                control_set["coverage_pct"] if control_set else 0),
             "deduplication_note": (
                 "Controls implemented once in NIST 800-53 cascade to all "
                 "frameworks via the crosswalk engine (ADR D113)."
             ),
         },
+        "control_set": control_set,
     }
 
     return unified
@@ -213,14 +415,7 @@ def evaluate_all_gates(
 
     Returns overall pass/fail plus per-framework gate results.
     """
-    if frameworks:
-        fw_list = frameworks
-    else:
-        applicable = _get_applicable_frameworks(project_id, db_path)
-        if applicable:
-            fw_list = [r["framework_id"] for r in applicable]
-        else:
-            fw_list = list(ASSESSOR_REGISTRY.keys())
+    fw_list = _resolve_frameworks(project_id, frameworks, db_path)
 
     gate_results = {}
     all_pass = True
@@ -281,13 +476,9 @@ def get_minimal_controls(
             implemented = set()
 
         # Load crosswalk data
-        crosswalk_path = BASE_DIR / "context" / "compliance" / "control_crosswalk.json"
-        if not crosswalk_path.exists():
+        if not CROSSWALK_PATH.exists():
             return {"error": "Crosswalk data not found"}
-
-        with open(crosswalk_path, "r", encoding="utf-8") as f:
-            crosswalk_data = json.load(f)
-        crosswalk = crosswalk_data.get("crosswalk", [])
+        crosswalk = _load_crosswalk()
 
         if frameworks:
             fw_set = set(frameworks)
@@ -368,6 +559,10 @@ def main():
     )
     parser.add_argument("--json", action="store_true", help="JSON output")
     parser.add_argument("--db-path", type=Path, default=None)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help=f"Frameworks evaluated concurrently (default: {DEFAULT_MAX_WORKERS})",
+    )
     args = parser.parse_args()
 
     try:
@@ -390,6 +585,7 @@ def main():
                 project_dir=args.project_dir,
                 frameworks=fw_list,
                 db_path=args.db_path,
+                max_workers=args.workers,
             )
 
         if args.json:
@@ -429,6 +625,10 @@ def main():
                 print(f"  Multi-Regime Assessment: {args.project_id}")
                 print(f"  Frameworks assessed: {result['frameworks_assessed']}")
                 print(f"  Avg coverage: {result['unified_metrics']['average_coverage_pct']}%")
+                metrics = result["unified_metrics"]
+                print(f"  Deduplicated NIST controls: {metrics['deduplicated_controls']} "
+                      f"({metrics['duplicates_eliminated']} shared references, "
+                      f"{metrics['deduplicated_coverage_pct']}% covered)")
                 print(f"{'=' * 70}")
                 for fw in result.get("framework_results", []):
                     print(
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Shared single-pass source scanner for code-level compliance checks.
+
+STIG auto-checks, the built-in secret scan and CUI-marking checks register
+ScanRules against one SourceScanner, which:
+
+- walks the tree once, pruning ignored directories and glob patterns
+- reads each file once (memory-mapped above MMAP_THRESHOLD bytes and
+  matched in line-aligned windows of that size)
+- prefilters every rule applicable to the file's extension with one
+  combined alternation regex, then searches individual rules only from
+  the first offset anything matched; case-insensitive rules run against
+  a single lower-cased copy of the file instead of using IGNORECASE
+- caches per-file results by content hash (plus a size/mtime stat cache),
+  optionally persisted to JSON so a rerun only reads changed files
+
+Matching is done on bytes, so rule patterns should be ASCII, and they are
+joined into one alternation, so they must not use numeric backreferences.
+
+CLI:
+    python tools/compliance/source_scanner.py --project-dir PATH --rules stig --json
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("ICDEV_SCAN_CACHE_DIR", str(BASE_DIR / ".tmp" / "scan_cache"))
+)
+
+DEFAULT_IGNORE_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", "venv", ".venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".eggs",
+})
+
+# Files never handed to extension-agnostic rules
+BINARY_EXTENSIONS = frozenset({
+    ".pyc", ".pyo", ".so", ".dylib", ".dll", ".exe", ".bin",
+    ".jpg", ".jpeg", ".png", ".gif", ".ico", ".svg", ".bmp",
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx",
+    ".zip", ".tar", ".gz", ".bz2", ".7z", ".rar",
+    ".woff", ".woff2", ".ttf", ".eot",
+    ".db", ".sqlite", ".sqlite3",
+    ".lock",
+})
+
+MMAP_THRESHOLD = 1024 * 1024           # 1 MiB
+MAX_FILE_BYTES = 50 * 1024 * 1024      # Larger files are skipped
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """One pattern registered with the scanner.
+
+    Attributes:
+        rule_id: Unique id, conventionally "<owner>.<check>.<n>".
+        pattern: Regular expression (ASCII) matched against file bytes.
+        extensions: Lower-case suffixes (".py") the rule applies to; None
+            means every file not in BINARY_EXTENSIONS.
+        ignore_case: Match case-insensitively.
+        all_lines: Record the line of every match instead of the first.
+    """
+
+    rule_id: str
+    pattern: str
+    extensions: Optional[FrozenSet[str]] = None
+    ignore_case: bool = True
+    all_lines: bool = False
+
+    def applies_to(self, ext: str) -> bool:
+        if self.extensions is None:
+            return ext not in BINARY_EXTENSIONS
+        return ext in self.extensions
+
+
+def file_extension(name: str) -> str:
+    """Lower-case suffix including the dot; dotfiles such as ".env" count."""
+    idx = name.rfind(".")
+    return name[idx:].lower() if idx >= 0 else ""
+
+
+def rules_from_patterns(prefix: str, patterns: Iterable[str],
+                        extensions: Optional[Iterable[str]] = None,
+                        **kwargs) -> List[ScanRule]:
+    """Build ScanRules "<prefix>.0", "<prefix>.1", ... from a pattern list."""
+    exts = frozenset(extensions) if extensions is not None else None
+    return [ScanRule(f"{prefix}.{i}", p, exts, **kwargs) for i, p in enumerate(patterns)]
+
+
+def _fold_pattern(pattern: str) -> str:
+    """Lower-case the literal characters of a pattern, leaving escapes intact.
+
+    Matching the folded pattern case-sensitively against ``data.lower()``
+    is equivalent to IGNORECASE for ASCII bytes, and lets the regex engine
+    use its literal-prefix search, which IGNORECASE disables.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        out.append(ch.lower())
+        i += 1
+    return "".join(out)
+
+
+def _combine(patterns: List[str], flags: int = 0):
+    return re.compile("|".join("(?:%s)" % p for p in patterns).encode(), flags)
+
+
+class _Matcher:
+    """Matcher for the rules that apply to one file extension.
+
+    A combined alternation of every rule finds the first offset at which
+    anything matches (files with no hit cost one pass); individual rules
+    are then searched from that offset only, stopping at their first hit
+    unless the rule records all lines.
+    """
+
+    def __init__(self, rules: List[ScanRule]):
+        self.rules = rules
+        self.passes = []
+        # Case-insensitive rules run on one lower-cased copy of the buffer
+        folded = [r for r in rules if r.ignore_case]
+        exact = [r for r in rules if not r.ignore_case]
+        if folded:
+            patterns = [_fold_pattern(r.pattern) for r in folded]
+            self.passes.append((True, _combine(patterns),
+                                [(r, re.compile(p.encode())) for r, p in zip(folded, patterns)]))
+        if exact:
+            self.passes.append((False, _combine([r.pattern for r in exact]),
+                                [(r, re.compile(r.pattern.encode())) for r in exact]))
+
+    def match(self, data, window: Optional[int] = None) -> Dict[str, List[int]]:
+        """Match ``data`` (bytes or mmap).
+
+        With ``window`` set, large buffers are processed in line-aligned
+        windows of about that many bytes so memory stays bounded; a match
+        spanning two windows is not reported.
+        """
+        hits: Dict[str, List[int]] = {}
+        if not self.rules:
+            return hits
+        size = len(data)
+        if window is None or size <= window:
+            self._match_buffer(bytes(data) if not isinstance(data, bytes) else data, hits, 0)
+            return hits
+        pos = line_base = 0
+        while pos < size:
+            end = min(pos + window, size)
+            if end < size:
+                nl = data.rfind(b"\n", pos, end)
+                if nl < 0:
+                    nl = data.find(b"\n", end)
+                end = size if nl < 0 else nl + 1
+            chunk = data[pos:end]
+            self._match_buffer(chunk, hits, line_base)
+            line_base += chunk.count(b"\n")
+            pos = end
+        return hits
+
+    def _match_buffer(self, data: bytes, hits: Dict[str, List[int]], line_base: int) -> None:
+        lowered = None
+        for fold, combined, singles in self.passes:
+            if fold and lowered is None:
+                lowered = data.lower()
+            buf = lowered if fold else data
+            first = combined.search(buf)
+            if first is None:
+                continue
+            start = first.start()  # No rule can match before this offset
+            lines = _LineIndex(buf, line_base)
+            for rule, regex in singles:
+                if rule.all_lines:
+                    found = [lines.line_of(m.start()) for m in regex.finditer(buf, start)]
+                    if found:
+                        hits.setdefault(rule.rule_id, []).extend(found)
+                elif rule.rule_id not in hits:
+                    m = regex.search(buf, start)
+                    if m:
+                        hits[rule.rule_id] = [lines.line_of(m.start())]
+
+
+class _LineIndex:
+    """1-based line numbers for byte offsets into one buffer."""
+
+    def __init__(self, data: bytes, line_base: int = 0):
+        self._data = data
+        self._base = line_base
+        self._pos = 0
+        self._line = 1
+
+    def line_of(self, offset: int) -> int:
+        if offset < self._pos:
+            self._pos, self._line = 0, 1
+        self._line += self._data.count(b"\n", self._pos, offset)
+        self._pos = offset
+        return self._base + self._line
+
+
+class ScanResult:
+    """Per-file rule hits from one scan: {relative_path: {rule_id: [lines]}}."""
+
+    def __init__(self, root: Path, files: Dict[str, Dict[str, List[int]]],
+                 scanned: List[str], stats: Dict):
+        self.root = root
+        self.files = files
+        self.scanned = scanned  # Every file at least one rule applied to
+        self.stats = stats
+
+    def files_matching(self, rule_ids: Iterable[str]) -> List[str]:
+        """Relative paths (sorted) with a hit for any of ``rule_ids``."""
+        wanted = set(rule_ids)
+        return sorted(p for p, hits in self.files.items() if wanted.intersection(hits))
+
+    def any_match(self, rule_ids: Iterable[str]) -> bool:
+        wanted = set(rule_ids)
+        return any(wanted.intersection(hits) for hits in self.files.values())
+
+    def count_rule_hits(self, rule_ids: Iterable[str]) -> int:
+        """Number of (file, rule) pairs with a hit."""
+        wanted = set(rule_ids)
+        return sum(len(wanted.intersection(hits)) for hits in self.files.values())
+
+    def matches(self, prefix: str) -> Iterator[Tuple[str, str, List[int]]]:
+        """Yield (relative_path, rule_id, lines) for rules starting with ``prefix``."""
+        for path in sorted(self.files):
+            for rule_id, lines in self.files[path].items():
+                if rule_id.startswith(prefix):
+                    yield path, rule_id, lines
+
+
+class SourceScanner:
+    """Registry of ScanRules plus the single-pass tree walker."""
+
+    def __init__(self, ignore_dirs: Iterable[str] = DEFAULT_IGNORE_DIRS,
+                 ignore_globs: Iterable[str] = (),
+                 ignore_hidden: bool = False,
+                 mmap_threshold: int = MMAP_THRESHOLD,
+                 max_file_bytes: int = MAX_FILE_BYTES):
+        self.ignore_dirs = frozenset(ignore_dirs)
+        self.ignore_globs = tuple(ignore_globs)
+        self.ignore_hidden = ignore_hidden
+        self.mmap_threshold = mmap_threshold
+        self.max_file_bytes = max_file_bytes
+        self._rules: Dict[str, ScanRule] = {}
+        self._matchers: Dict[str, _Matcher] = {}
+        self._fingerprint: Optional[str] = None
+
+    # -- registration --------------------------------------------------
+
+    def register(self, rules: Iterable[ScanRule]) -> "SourceScanner":
+        """Add rules; re-registering an identical rule is a no-op.
+
+        Raises:
+            ValueError: On a conflicting duplicate rule_id or a bad pattern.
+        """
+        for rule in rules:
+            existing = self._rules.get(rule.rule_id)
+            if existing == rule:
+                continue
+            if existing is not None:
+                raise ValueError(f"Conflicting scan rule id: {rule.rule_id}")
+            try:
+                re.compile(rule.pattern.encode())
+            except re.error as e:
+                raise ValueError(f"Invalid pattern for {rule.rule_id}: {e}") from e
+            self._rules[rule.rule_id] = rule
+        self._matchers.clear()
+        self._fingerprint = None
+        return self
+
+    @property
+    def rules(self) -> List[ScanRule]:
+        return list(self._rules.values())
+
+    def fingerprint(self) -> str:
+        """Hash of the registered rule set (cached results depend on it)."""
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            for rule_id in sorted(self._rules):
+                r = self._rules[rule_id]
+                h.update(json.dumps([r.rule_id, r.pattern, sorted(r.extensions or []),
+                                     r.extensions is None, r.ignore_case,
+                                     r.all_lines]).encode())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def _matcher(self, ext: str) -> _Matcher:
+        matcher = self._matchers.get(ext)
+        if matcher is None:
+            applicable = [r for r in self._rules.values() if r.applies_to(ext)]
+            matcher = self._matchers[ext] = _Matcher(applicable)
+        return matcher
+
+    # -- walking -------------------------------------------------------
+
+    def _ignored(self, rel: str) -> bool:
+        return any(fnmatch.fnmatch(rel, g) for g in self.ignore_globs)
+
+    def iter_files(self, root: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (relative posix path, DirEntry) for every non-ignored file."""
+        stack = [(str(root), "")]
+        while stack:
+            current, prefix = stack.pop()
+            try:
+                entries = sorted(os.scandir(current), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                rel = prefix + entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if (entry.name in self.ignore_dirs or self._ignored(rel)
+                                or (self.ignore_hidden and entry.name.startswith("."))):
+                            continue
+                        stack.append((entry.path, rel + "/"))
+                    elif entry.is_file(follow_symlinks=False) and not self._ignored(rel):
+                        yield rel, entry
+                except OSError:
+                    continue
+
+    # -- scanning ------------------------------------------------------
+
+    def _scan_file(self, path: str, size: int, ext: str) -> Tuple[str, Dict[str, List[int]], int]:
+        """Read, hash and match one file; returns (sha256, hits, bytes_read)."""
+        with open(path, "rb") as f:
+            if size >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    hits = self._matcher(ext).match(data, window=self.mmap_threshold)
+                    return hashlib.sha256(data).hexdigest(), hits, size
+            data = f.read()
+        return hashlib.sha256(data).hexdigest(), self._matcher(ext).match(data), len(data)
+
+    def scan(self, root, cache_path: Optional[Path] = None) -> ScanResult:
+        """Scan ``root`` once for every registered rule.
+
+        Args:
+            root: Directory to scan.
+            cache_path: Optional JSON cache file; unchanged files (same
+                size and mtime, or same content hash) are not re-matched.
+
+        Returns:
+            ScanResult with hits for files that matched at least one rule.
+        """
+        root = Path(root)
+        cache = self._load_cache(cache_path)
+        stat_cache = cache["files"]
+        hash_cache = cache["results"]
+
+        files: Dict[str, Dict[str, List[int]]] = {}
+        scanned: List[str] = []
+        new_stat: Dict[str, list] = {}
+        used_keys = set()
+        stats = {"files_walked": 0, "files_read": 0, "bytes_read": 0,
+                 "cache_hits": 0, "skipped_large": 0, "errors": 0}
+
+        for rel, entry in self.iter_files(root):
+            ext = file_extension(entry.name)
+            if not self._matcher(ext).rules:
+                continue
+            stats["files_walked"] += 1
+            scanned.append(rel)
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                stats["errors"] += 1
+                continue
+            if st.st_size > self.max_file_bytes:
+                stats["skipped_large"] += 1
+                continue
+
+            prior = stat_cache.get(rel)
+            if prior and prior[0] == st.st_size and prior[1] == st.st_mtime_ns \
+                    and f"{prior[2]}:{ext}" in hash_cache:
+                key = f"{prior[2]}:{ext}"
+                hits = hash_cache[key]
+                new_stat[rel] = prior
+                stats["cache_hits"] += 1
+            else:
+                try:
+                    digest, hits, nbytes = self._scan_file(entry.path, st.st_size, ext)
+                except (OSError, ValueError):
+                    stats["errors"] += 1
+                    continue
+                stats["files_read"] += 1
+                stats["bytes_read"] += nbytes
+                key = f"{digest}:{ext}"
+                if key in hash_cache:
+                    hits = hash_cache[key]
+                    stats["cache_hits"] += 1
+                else:
+                    hash_cache[key] = hits
+                new_stat[rel] = [st.st_size, st.st_mtime_ns, digest]
+            used_keys.add(key)
+            if hits:
+                files[rel] = hits
+
+        if cache_path is not None:
+            self._save_cache(cache_path, {
+                "version": CACHE_VERSION,
+                "fingerprint": self.fingerprint(),
+                "files": new_stat,
+                "results": {k: v for k, v in hash_cache.items() if k in used_keys},
+            })
+        return ScanResult(root, files, scanned, stats)
+
+    # -- cache persistence ---------------------------------------------
+
+    def _load_cache(self, cache_path: Optional[Path]) -> Dict:
+        empty = {"files": {}, "results": {}}
+        if cache_path is None:
+            return empty
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if data.get("version") != CACHE_VERSION or data.get("fingerprint") != self.fingerprint():
+            return empty
+        return {"files": data.get("files", {}), "results": data.get("results", {})}
+
+    @staticmethod
+    def _save_cache(cache_path: Path, data: Dict) -> None:
+        cache_path = Path(cache_path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(cache_path.name + f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write scan cache {cache_path}: {e}", file=sys.stderr)
+
+
+def default_cache_path(project_dir, name: str) -> Path:
+    """Per-project cache file under .tmp/scan_cache (ICDEV_SCAN_CACHE_DIR)."""
+    key = hashlib.sha256(str(Path(project_dir).resolve()).encode()).hexdigest()[:16]
+    return DEFAULT_CACHE_DIR / f"{name}-{key}.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass source scanner")
+    parser.add_argument("--project-dir", required=True, help="Directory to scan")
+    parser.add_argument("--rules", default="stig",
+                        help="Comma-separated rule sets: stig, secrets, cui")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the cache")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    scanner = SourceScanner()
+    selected = [r.strip() for r in args.rules.split(",") if r.strip()]
+    for name in selected:
+        if name == "stig":
+            from tools.compliance.stig_checker import STIG_SCAN_RULES
+            scanner.register(STIG_SCAN_RULES)
+        elif name == "secrets":
+            from tools.security.secret_detector import SECRET_SCAN_RULES
+            scanner.register(SECRET_SCAN_RULES)
+        elif name == "cui":
+            from tools.compliance.cui_marker import cui_scan_rules
+            scanner.register(cui_scan_rules())
+        else:
+            parser.error(f"Unknown rule set: {name}")
+
+    cache_path = None if args.no_cache else default_cache_path(
+        args.project_dir, "-".join(sorted(selected)))
+    result = scanner.scan(args.project_dir, cache_path=cache_path)
+    output = {
+        "project_dir": str(Path(args.project_dir).resolve()),
+        "rule_sets": selected,
+        "rules": len(scanner.rules),
+        "stats": result.stats,
+        "files": result.files,
+        "classification": "CUI // SP-CTI",
+    }
+    if args.json:
+        print(json.dumps(output, indent=2))
+    else:
+        s = result.stats
+        print(f"Scanned {s['files_walked']} files ({s['files_read']} read, "
+              f"{s['cache_hits']} cached) against {len(scanner.rules)} rules")
+        for path, hits in sorted(result.files.items()):
+            print(f"  {path}: {', '.join(sorted(hits))}")
+
+
+if __name__ == "__main__":
+    main()
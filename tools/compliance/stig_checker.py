@@ -8,13 +8,21 @@ applies CUI markings, and logs audit events."""
 import argparse
 import json
 import os
-import re
 import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.compliance.source_scanner import (  # noqa: E402
+    SourceScanner,
+    default_cache_path,
+    rules_from_patterns,
+)
+
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 STIG_TEMPLATES_DIR = BASE_DIR / "context" / "compliance" / "stig_templates"
 
@@ -114,290 +122,183 @@ def _log_audit_event(conn, project_id, action, details, file_path=None):
 # Each returns a tuple: (status, comments)
 #   status: "Open" | "NotAFinding" | "Not_Applicable" | "Not_Reviewed"
 #   comments: explanation string
+#
+# Patterns are registered with the shared SourceScanner so one pass
+# over the project (cached per file by content hash) serves every
+# check. Each _check_* accepts an optional precomputed ScanResult.
 # ─────────────────────────────────────────────────────────────
 
-def _check_url_parameters(project_dir):
-    """V-222602: Check that sensitive info is not in URL parameters."""
-    # Look for common patterns of session/token in URL params
-    bad_patterns = [
+_CODE_EXTS = (".py", ".js", ".ts", ".java")
+
+# group -> (extensions, patterns)
+STIG_PATTERNS = {
+    # V-222602: session/token in URL params
+    "url_params": (_CODE_EXTS + (".html",), [
         r'[?&](session_id|token|password|secret|api_key)=',
         r'GET.*[?&](auth|credential|ssn)=',
-    ]
-    issues = []
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java', '.html')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in bad_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        issues.append(fpath)
-                        break
-            except Exception:
-                continue
+    ]),
+    # V-222604: parameterized queries and validation frameworks
+    "input_validation": (_CODE_EXTS, [
+        r'parameterized|prepared_statement|bindparam|execute\(.+,\s*\(',
+        r'@validates|@validator|ValidationError|validate_input|sanitize',
+        r'escape_html|bleach\.clean|markupsafe\.escape|xss_clean',
+    ]),
+    # V-222607
+    "access": (_CODE_EXTS, [
+        r'@login_required|@permission_required|@requires_auth',
+        r'requireAuth|isAuthenticated|authorize|checkPermission',
+        r'@Secured|@PreAuthorize|@RolesAllowed',
+        r'middleware.*auth|authMiddleware|guardRoute',
+    ]),
+    # V-222609
+    "fips_bad": (_CODE_EXTS + (".yaml", ".yml", ".tf"), [
+        r'md5|sha1[^0-9]|DES\b|RC4|arcfour|3DES',
+    ]),
+    "fips_good": (_CODE_EXTS + (".yaml", ".yml", ".tf"), [
+        r'sha256|sha384|sha512|aes|AES_256|FIPS|fips_mode',
+    ]),
+    # V-222612
+    "cookie": (_CODE_EXTS + (".yaml", ".yml"), [
+        r'SESSION_COOKIE_SECURE\s*=\s*True',
+        r'SESSION_COOKIE_HTTPONLY\s*=\s*True',
+        r'secure:\s*true.*httpOnly:\s*true|httpOnly:\s*true.*secure:\s*true',
+        r'cookie\.setSecure\(true\)|cookie\.setHttpOnly\(true\)',
+        r'SameSite.*Strict|SameSite.*Lax',
+    ]),
+    # V-222614
+    "headers": (_CODE_EXTS + (".yaml", ".yml", ".conf"), [
+        r'Content-Security-Policy|CSP_DEFAULT_SRC|contentSecurityPolicy',
+        r'X-Content-Type-Options.*nosniff',
+        r'X-Frame-Options.*(DENY|SAMEORIGIN)',
+        r'Strict-Transport-Security|HSTS|hsts',
+        r'Referrer-Policy',
+        r'helmet\(\)|securityHeaders|SecurityMiddleware',
+    ]),
+    # V-222617
+    "csrf": (_CODE_EXTS + (".html",), [
+        r'csrf_token|csrfmiddleware|CsrfViewMiddleware',
+        r'csurf|csrf\(\)|csrfProtection',
+        r'@csrf_protect|csrf_exempt',
+        r'CsrfFilter|_csrf|csrfToken',
+    ]),
+    # V-222620
+    "audit_logging": (_CODE_EXTS, [
+        r'audit_log|audit_trail|security_log',
+        r'logging\.getLogger|logger\.\w+|log\.\w+\(',
+        r'AuditEvent|SecurityEvent|audit_entry',
+    ]),
+    # V-222635
+    "error_bad": (_CODE_EXTS + (".yaml", ".yml", ".env"), [
+        r'DEBUG\s*=\s*True',
+        r'NODE_ENV.*development',
+        r'traceback\.print_exc|print_stack',
+        r'stack_trace.*response|response.*stack_trace',
+    ]),
+    "error_good": (_CODE_EXTS + (".yaml", ".yml", ".env"), [
+        r'DEBUG\s*=\s*False',
+        r'NODE_ENV.*production',
+        r'custom_error_handler|errorHandler|exception_handler',
+    ]),
+}
 
+STIG_SCAN_RULES = [
+    rule
+    for group, (exts, patterns) in STIG_PATTERNS.items()
+    for rule in rules_from_patterns(f"stig.{group}", patterns, exts)
+]
+
+
+def _ids(group):
+    """Rule ids registered for a STIG_PATTERNS group."""
+    return [f"stig.{group}.{i}" for i in range(len(STIG_PATTERNS[group][1]))]
+
+
+def scan_project(project_dir, use_cache=True):
+    """Run every STIG pattern over project_dir in a single pass."""
+    scanner = SourceScanner().register(STIG_SCAN_RULES)
+    cache_path = default_cache_path(project_dir, "stig") if use_cache else None
+    return scanner.scan(project_dir, cache_path=cache_path)
+
+
+def _abs_paths(project_dir, rel_paths):
+    return [os.path.join(project_dir, p) for p in rel_paths]
+
+
+def _check_url_parameters(project_dir, scan=None):
+    """V-222602: Check that sensitive info is not in URL parameters."""
+    scan = scan or scan_project(project_dir)
+    issues = _abs_paths(project_dir, scan.files_matching(_ids("url_params")))
     if issues:
         return "Open", f"Potential sensitive URL params in: {', '.join(issues[:5])}"
     return "Not_Reviewed", "Automated scan found no obvious issues; manual review needed."
 
 
-def _check_input_validation(project_dir):
+def _check_input_validation(project_dir, scan=None):
     """V-222604: Check for input validation patterns."""
-    # Look for parameterized queries and validation frameworks
-    good_patterns = [
-        r'parameterized|prepared_statement|bindparam|execute\(.+,\s*\(',
-        r'@validates|@validator|ValidationError|validate_input|sanitize',
-        r'escape_html|bleach\.clean|markupsafe\.escape|xss_clean',
-    ]
-    found_validation = False
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in good_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found_validation = True
-                        break
-            except Exception:
-                continue
-        if found_validation:
-            break
-
-    if found_validation:
+    scan = scan or scan_project(project_dir)
+    if scan.any_match(_ids("input_validation")):
         return "Not_Reviewed", "Validation patterns detected; manual verification of completeness needed."
     return "Not_Reviewed", "No validation patterns detected; manual review required."
 
 
-def _check_access_enforcement(project_dir):
+def _check_access_enforcement(project_dir, scan=None):
     """V-222607: Check for access control enforcement."""
-    auth_patterns = [
-        r'@login_required|@permission_required|@requires_auth',
-        r'requireAuth|isAuthenticated|authorize|checkPermission',
-        r'@Secured|@PreAuthorize|@RolesAllowed',
-        r'middleware.*auth|authMiddleware|guardRoute',
-    ]
-    found_auth = False
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in auth_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found_auth = True
-                        break
-            except Exception:
-                continue
-        if found_auth:
-            break
-
-    if found_auth:
+    scan = scan or scan_project(project_dir)
+    if scan.any_match(_ids("access")):
         return "Not_Reviewed", "Authorization patterns detected; verify enforcement completeness manually."
     return "Not_Reviewed", "No authorization patterns found; manual review required."
 
 
-def _check_fips_crypto(project_dir):
+def _check_fips_crypto(project_dir, scan=None):
     """V-222609: Check for FIPS-validated crypto usage."""
-    bad_crypto = [
-        r'md5|sha1[^0-9]|DES\b|RC4|arcfour|3DES',
-    ]
-    good_crypto = [
-        r'sha256|sha384|sha512|aes|AES_256|FIPS|fips_mode',
-    ]
-    found_bad = []
-    found_good = False
-
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java', '.yaml', '.yml', '.tf')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in bad_crypto:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found_bad.append(fpath)
-                        break
-                for pattern in good_crypto:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found_good = True
-            except Exception:
-                continue
-
+    scan = scan or scan_project(project_dir)
+    found_bad = _abs_paths(project_dir, scan.files_matching(_ids("fips_bad")))
     if found_bad:
         return "Open", f"Deprecated crypto found in: {', '.join(found_bad[:5])}"
-    if found_good:
+    if scan.any_match(_ids("fips_good")):
         return "Not_Reviewed", "FIPS-compatible crypto patterns detected; verify FIPS validation status."
     return "Not_Reviewed", "No cryptographic usage detected; manual review needed."
 
 
-def _check_cookie_flags(project_dir):
+def _check_cookie_flags(project_dir, scan=None):
     """V-222612: Check for Secure and HttpOnly cookie flags."""
-    secure_cookie_patterns = [
-        r'SESSION_COOKIE_SECURE\s*=\s*True',
-        r'SESSION_COOKIE_HTTPONLY\s*=\s*True',
-        r'secure:\s*true.*httpOnly:\s*true|httpOnly:\s*true.*secure:\s*true',
-        r'cookie\.setSecure\(true\)|cookie\.setHttpOnly\(true\)',
-        r'SameSite.*Strict|SameSite.*Lax',
-    ]
-    found = 0
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java', '.yaml', '.yml')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in secure_cookie_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found += 1
-            except Exception:
-                continue
-
-    if found >= 2:
+    scan = scan or scan_project(project_dir)
+    if scan.count_rule_hits(_ids("cookie")) >= 2:
         return "Not_Reviewed", "Cookie security patterns detected; verify all cookies are covered."
     return "Not_Reviewed", "Cookie security configuration not confirmed; manual review needed."
 
 
-def _check_security_headers(project_dir):
+def _check_security_headers(project_dir, scan=None):
     """V-222614: Check for security headers configuration."""
-    header_patterns = [
-        r'Content-Security-Policy|CSP_DEFAULT_SRC|contentSecurityPolicy',
-        r'X-Content-Type-Options.*nosniff',
-        r'X-Frame-Options.*(DENY|SAMEORIGIN)',
-        r'Strict-Transport-Security|HSTS|hsts',
-        r'Referrer-Policy',
-        r'helmet\(\)|securityHeaders|SecurityMiddleware',
-    ]
-    found = 0
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java', '.yaml', '.yml', '.conf')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in header_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found += 1
-            except Exception:
-                continue
-
+    scan = scan or scan_project(project_dir)
+    found = scan.count_rule_hits(_ids("headers"))
     if found >= 3:
         return "Not_Reviewed", f"Security header patterns found ({found} matches); verify all required headers."
     return "Not_Reviewed", "Security headers not confirmed; manual review needed."
 
 
-def _check_csrf_protection(project_dir):
+def _check_csrf_protection(project_dir, scan=None):
     """V-222617: Check for CSRF protection."""
-    csrf_patterns = [
-        r'csrf_token|csrfmiddleware|CsrfViewMiddleware',
-        r'csurf|csrf\(\)|csrfProtection',
-        r'@csrf_protect|csrf_exempt',
-        r'CsrfFilter|_csrf|csrfToken',
-    ]
-    found = False
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java', '.html')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in csrf_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found = True
-                        break
-            except Exception:
-                continue
-        if found:
-            break
-
-    if found:
+    scan = scan or scan_project(project_dir)
+    if scan.any_match(_ids("csrf")):
         return "Not_Reviewed", "CSRF protection patterns detected; verify coverage of all state-changing endpoints."
     return "Not_Reviewed", "No CSRF protection patterns found; manual review required."
 
 
-def _check_audit_logging(project_dir):
+def _check_audit_logging(project_dir, scan=None):
     """V-222620: Check for audit/security logging."""
-    logging_patterns = [
-        r'audit_log|audit_trail|security_log',
-        r'logging\.getLogger|logger\.\w+|log\.\w+\(',
-        r'AuditEvent|SecurityEvent|audit_entry',
-    ]
-    found = False
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in logging_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found = True
-                        break
-            except Exception:
-                continue
-        if found:
-            break
-
-    if found:
+    scan = scan or scan_project(project_dir)
+    if scan.any_match(_ids("audit_logging")):
         return "Not_Reviewed", "Logging patterns detected; verify all security events are captured per AU-2."
     return "Not_Reviewed", "No structured logging detected; manual review needed."
 
 
-def _check_error_handling(project_dir):
+def _check_error_handling(project_dir, scan=None):
     """V-222635: Check that detailed errors are not exposed."""
-    bad_patterns = [
-        r'DEBUG\s*=\s*True',
-        r'NODE_ENV.*development',
-        r'traceback\.print_exc|print_stack',
-        r'stack_trace.*response|response.*stack_trace',
-    ]
-    good_patterns = [
-        r'DEBUG\s*=\s*False',
-        r'NODE_ENV.*production',
-        r'custom_error_handler|errorHandler|exception_handler',
-    ]
-    found_bad = False
-    found_good = False
-
-    for root, _, files in os.walk(project_dir):
-        for fname in files:
-            if not fname.endswith(('.py', '.js', '.ts', '.java', '.yaml', '.yml', '.env')):
-                continue
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                for pattern in bad_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found_bad = True
-                for pattern in good_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        found_good = True
-            except Exception:
-                continue
-
-    if found_bad:
+    scan = scan or scan_project(project_dir)
+    if scan.any_match(_ids("error_bad")):
         return "Open", "Debug mode or detailed error exposure detected."
-    if found_good:
+    if scan.any_match(_ids("error_good")):
         return "Not_Reviewed", "Production error handling detected; verify no leakage of sensitive details."
     return "Not_Reviewed", "Error handling configuration not confirmed; manual review needed."
 
@@ -453,6 +354,14 @@ def run_stig_check(
         results = []
         now = datetime.now(timezone.utc)
 
+        # One shared pass over the project serves every auto-check
+        scan = scan_error = None
+        if can_auto_check and any(f["finding_id"] in AUTO_CHECKS for f in findings):
+            try:
+                scan = scan_project(project_dir)
+            except Exception as e:
+                scan_error = e
+
         for finding in findings:
             status = "Not_Reviewed"
             comments = "Requires manual assessment."
@@ -460,7 +369,9 @@ def run_stig_check(
             # Try auto-check if project directory exists
             if can_auto_check and finding["finding_id"] in AUTO_CHECKS:
                 try:
-                    status, comments = AUTO_CHECKS[finding["finding_id"]](project_dir)
+                    if scan_error is not None:
+                        raise scan_error
+                    status, comments = AUTO_CHECKS[finding["finding_id"]](project_dir, scan=scan)
                 except Exception as e:
                     status = "Not_Reviewed"
                     comments = f"Auto-check error: {e}"
@@ -184,9 +184,11 @@ CREATE TABLE IF NOT EXISTS audit_trail (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_audit_project ON audit_trail(project_id);
-CREATE INDEX IF NOT EXISTS idx_audit_type ON audit_trail(event_type);
-CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_trail(actor);
+-- Composite (filter, created_at) indexes serve keyset pages in audit_query.py
+CREATE INDEX IF NOT EXISTS idx_audit_project_created ON audit_trail(project_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_project_type_created ON audit_trail(project_id, event_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_type_created ON audit_trail(event_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_actor_created ON audit_trail(actor, created_at);
 CREATE INDEX IF NOT EXISTS idx_audit_created ON audit_trail(created_at);
 
 -- ============================================================
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Migration 009 rollback: Restore single-column audit_trail indexes."""
+
+
+def down(conn):
+    """Recreate the original indexes and drop the composite ones."""
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_audit_project ON audit_trail(project_id);
+        CREATE INDEX IF NOT EXISTS idx_audit_type ON audit_trail(event_type);
+        CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_trail(actor);
+        DROP INDEX IF EXISTS idx_audit_project_created;
+        DROP INDEX IF EXISTS idx_audit_project_type_created;
+        DROP INDEX IF EXISTS idx_audit_type_created;
+        DROP INDEX IF EXISTS idx_audit_actor_created;
+    """)
+    conn.commit()
+    return True
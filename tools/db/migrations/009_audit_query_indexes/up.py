@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Migration 009: Composite audit_trail indexes for keyset queries.
+
+Targets data/icdev.db.
+Replaces the single-column project/type/actor indexes with composite
+(filter, created_at) indexes so filtered, time-ordered keyset pages
+(tools/audit/audit_query.py) are index range scans with no sort step.
+Every SQLite index entry also carries the rowid (= audit_trail.id), so
+these indexes order by (filter, created_at, id) — exactly the seek key.
+The single-column indexes are strict prefixes of the new ones and are
+dropped to keep audit INSERT cost flat.
+"""
+
+AUDIT_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_audit_project_created ON audit_trail(project_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_project_type_created ON audit_trail(project_id, event_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_type_created ON audit_trail(event_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_actor_created ON audit_trail(actor, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_created ON audit_trail(created_at);
+DROP INDEX IF EXISTS idx_audit_project;
+DROP INDEX IF EXISTS idx_audit_type;
+DROP INDEX IF EXISTS idx_audit_actor;
+"""
+
+
+def up(conn):
+    """Create composite audit indexes and drop the redundant prefixes."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='audit_trail'"
+    ).fetchone()
+    if not exists:
+        return True
+    conn.executescript(AUDIT_INDEX_SQL)
+    conn.execute("ANALYZE audit_trail")
+    conn.commit()
+    return True
@@ -2,18 +2,27 @@
 # CUI // SP-CTI
 """Detect patterns in failures using statistical methods (no GPU required).
 Includes feature extraction, pattern matching via string similarity,
-frequency anomaly detection, and deployment correlation analysis."""
+frequency anomaly detection, and deployment correlation analysis.
+Known-pattern lookups score a cached index of precomputed trigram sets
+(tools/knowledge/pattern_index.py)."""
 
 import argparse
 import json
 import re
 import sqlite3
+import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.knowledge import pattern_index  # noqa: E402
+from tools.knowledge.pattern_index import ngrams as _ngrams  # noqa: E402
+
 
 def _get_db(db_path: Path = None) -> sqlite3.Connection:
     path = db_path or DB_PATH
@@ -103,14 +112,6 @@ def extract_features(error_data: dict) -> dict:
 # ---------------------------------------------------------------------------
 # String similarity (Jaccard on character n-grams)
 # ---------------------------------------------------------------------------
-def _ngrams(text: str, n: int = 3) -> set:
-    """Generate character n-grams from text."""
-    text = text.lower().strip()
-    if len(text) < n:
-        return {text}
-    return {text[i:i + n] for i in range(len(text) - n + 1)}
-
-
 def _similarity(a: str, b: str) -> float:
     """Jaccard similarity between two strings using character trigrams."""
     if not a or not b:
@@ -127,66 +128,101 @@ def _similarity(a: str, b: str) -> float:
 # ---------------------------------------------------------------------------
 # Match against known patterns
 # ---------------------------------------------------------------------------
+def _score_pattern(features: dict, feature_sig: str, feature_grams: set,
+                   p: "pattern_index.IndexedPattern", error_type: str = None):
+    """Score one indexed pattern against extracted features (None if below threshold)."""
+    if error_type is None:
+        error_type = features.get("error_type", "").lower()
+
+    # Score based on signature similarity (same result as _similarity)
+    if not feature_sig or not p.signature:
+        sig_score = 0.0
+    elif feature_sig == p.signature:
+        sig_score = 1.0
+    else:
+        union = len(feature_grams | p.grams)
+        sig_score = len(feature_grams & p.grams) / union if union > 0 else 0.0
+
+    # Boost score if error_type matches pattern_type keywords
+    type_boost = 0.0
+    if error_type in p.description_lower:
+        type_boost = 0.15
+    if error_type in p.signature_lower:
+        type_boost = 0.25
+
+    # Boost if key features match description
+    desc = p.description_lower
+    if features.get("has_timeout") and "timeout" in desc:
+        type_boost += 0.1
+    if features.get("has_connection") and "connection" in desc:
+        type_boost += 0.1
+    if features.get("has_memory") and "memory" in desc:
+        type_boost += 0.1
+    if features.get("has_database") and ("database" in desc or "pool" in desc):
+        type_boost += 0.1
+
+    combined_score = min((sig_score + type_boost) * p.confidence, 1.0)
+
+    if combined_score <= 0.1:  # Minimum threshold
+        return None
+    return {
+        "pattern_id": p.id,
+        "pattern_type": p.pattern_type,
+        "description": p.description,
+        "root_cause": p.root_cause,
+        "remediation": p.remediation,
+        "confidence": p.confidence,
+        "similarity_score": round(sig_score, 3),
+        "combined_score": round(combined_score, 3),
+        "auto_healable": p.auto_healable,
+    }
+
+
+def _match_with_index(index, features: dict) -> list:
+    feature_sig = features.get("signature", "")
+    feature_grams = _ngrams(feature_sig) if feature_sig else set()
+    error_type = features.get("error_type", "").lower()
+    matches = []
+    for p in index.in_scan_order():
+        match = _score_pattern(features, feature_sig, feature_grams, p, error_type)
+        if match is not None:
+            matches.append(match)
+    matches.sort(key=lambda m: m["combined_score"], reverse=True)
+    return matches
+
+
 def match_known_pattern(features: dict, db_path: Path = None) -> list:
     """Match extracted features against knowledge_patterns table.
     Returns list of matches sorted by combined score (similarity * confidence)."""
-    conn = _get_db(db_path)
-    try:
-        patterns = conn.execute(
-            """SELECT id, pattern_type, pattern_signature, description,
-                      root_cause, remediation, confidence, auto_healable
-               FROM knowledge_patterns
-               ORDER BY confidence DESC"""
-        ).fetchall()
+    return match_known_patterns([features], db_path)[0]
 
-        matches = []
-        feature_sig = features.get("signature", "")
-
-        for p in patterns:
-            p_sig = p["pattern_signature"] or ""
-
-            # Score based on signature similarity
-            sig_score = _similarity(feature_sig, p_sig)
-
-            # Boost score if error_type matches pattern_type keywords
-            type_boost = 0.0
-            if features.get("error_type", "").lower() in (p["description"] or "").lower():
-                type_boost = 0.15
-            if features.get("error_type", "").lower() in (p["pattern_signature"] or "").lower():
-                type_boost = 0.25
-
-            # Boost if key features match description
-            desc = (p["description"] or "").lower()
-            if features.get("has_timeout") and "timeout" in desc:
-                type_boost += 0.1
-            if features.get("has_connection") and "connection" in desc:
-                type_boost += 0.1
-            if features.get("has_memory") and "memory" in desc:
-                type_boost += 0.1
-            if features.get("has_database") and ("database" in desc or "pool" in desc):
-                type_boost += 0.1
-
-            combined_score = min((sig_score + type_boost) * p["confidence"], 1.0)
-
-            if combined_score > 0.1:  # Minimum threshold
-                matches.append({
-                    "pattern_id": p["id"],
-                    "pattern_type": p["pattern_type"],
-                    "description": p["description"],
-                    "root_cause": p["root_cause"],
-                    "remediation": p["remediation"],
-                    "confidence": p["confidence"],
-                    "similarity_score": round(sig_score, 3),
-                    "combined_score": round(combined_score, 3),
-                    "auto_healable": bool(p["auto_healable"]),
-                })
 
-        matches.sort(key=lambda m: m["combined_score"], reverse=True)
-        return matches
+def match_known_patterns(features_list: list, db_path: Path = None) -> list:
+    """Match many failures' features in one pass over the pattern index.
 
+    Opens one connection, validates the cached index once, and scores
+    failures that share a signature, error type and keyword flags only once.
+    Returns one match list per entry of *features_list*, in order.
+    """
+    conn = _get_db(db_path)
+    try:
+        index = pattern_index.load_index(conn, db_path or DB_PATH)
     finally:
         conn.close()
 
+    results = []
+    memo = {}
+    for features in features_list:
+        key = (
+            features.get("signature", ""),
+            features.get("error_type", "").lower(),
+            tuple(bool(features.get(flag)) for flag in pattern_index.BOOST_KEYWORDS),
+        )
+        if key not in memo:
+            memo[key] = _match_with_index(index, features)
+        results.append([dict(m) for m in memo[key]])
+    return results
+
 
 # ---------------------------------------------------------------------------
 # Frequency anomaly detection
@@ -366,11 +402,13 @@ def update_pattern_confidence(
 
         new_conf = max(0.0, min(1.0, old_conf + delta))
 
+        before = pattern_index.table_fingerprint(conn)
         conn.execute(
             "UPDATE knowledge_patterns SET confidence = ?, updated_at = ? WHERE id = ?",
             (new_conf, datetime.now(timezone.utc).isoformat(), pattern_id),
         )
         conn.commit()
+        pattern_index.note_confidence(conn, db_path or DB_PATH, pattern_id, new_conf, before)
 
         return {
             "pattern_id": pattern_id,
@@ -415,18 +453,20 @@ def analyze_project(project_id: str, db_path: Path = None) -> dict:
             (project_id,),
         ).fetchall()
 
-        for failure in recent_failures:
-            error_data = {
+        features_list = [
+            extract_features({
                 "error_type": failure["error_type"],
                 "error_message": failure["error_message"],
                 "source": failure["source"],
                 "stack_trace": failure["stack_trace"],
                 "context": failure["context"],
                 "created_at": failure["created_at"],
-            }
-            features = extract_features(error_data)
-            matches = match_known_pattern(features, db_path)
+            })
+            for failure in recent_failures
+        ]
+        all_matches = match_known_patterns(features_list, db_path) if features_list else []
 
+        for failure, matches in zip(recent_failures, all_matches):
             if matches:
                 result["pattern_matches"].append({
                     "failure_id": failure["id"],
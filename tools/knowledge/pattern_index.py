@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Cached match-feature index for knowledge_patterns.
+
+pattern_detector.match_known_pattern() used to load every knowledge pattern
+and re-tokenize each signature into character trigrams for every failure.
+PatternIndex precomputes, per pattern:
+
+  - the character-trigram set of its signature
+  - lower-cased description/signature text for the error-type and keyword
+    boosts
+
+and keeps the patterns in the detector's scan order (confidence DESC, id).
+Every pattern is still scored: a signature-only match needs only trigram
+Jaccard above 0.1 to clear the detector's score cut-off, and on real
+failure signatures (error type, service and flag words) almost every pair
+shares some trigram, so no candidate filter -- MinHash/LSH included --
+prunes soundly at that threshold.  The saving is in not reloading rows or
+re-tokenizing signatures per lookup.
+
+Indexes are cached per database and revalidated with a cheap aggregate
+fingerprint, so patterns added by knowledge_ingest or the MCP knowledge
+server are picked up on the next lookup.  Trigram sets are cached by
+signature text, so a rebuild only tokenizes new or changed signatures.
+update_pattern_confidence() updates a cached index in place.
+
+Uses only the Python standard library (air-gapped environment).
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Tuple
+
+# Keyword boosts applied by the detector: feature flag -> description words
+BOOST_KEYWORDS = {
+    "has_timeout": ("timeout",),
+    "has_connection": ("connection",),
+    "has_memory": ("memory",),
+    "has_database": ("database", "pool"),
+}
+
+_PATTERNS_SQL = (
+    "SELECT id, pattern_type, pattern_signature, description, root_cause, "
+    "remediation, confidence, auto_healable FROM knowledge_patterns "
+    "ORDER BY confidence DESC, id"
+)
+
+_FINGERPRINT_SQL = (
+    "SELECT COUNT(*), COALESCE(MAX(id), 0), TOTAL(confidence), "
+    "TOTAL(LENGTH(pattern_signature)), TOTAL(LENGTH(description)){extra} "
+    "FROM knowledge_patterns"
+)
+
+
+def ngrams(text: str, n: int = 3) -> set:
+    """Generate character n-grams from text."""
+    text = text.lower().strip()
+    if len(text) < n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+@dataclass
+class IndexedPattern:
+    """One knowledge_patterns row with its precomputed match features."""
+
+    id: int
+    pattern_type: str
+    signature: str
+    description: str
+    root_cause: str
+    remediation: str
+    confidence: float
+    auto_healable: bool
+    grams: FrozenSet[str]
+    description_lower: str
+    signature_lower: str
+
+
+class PatternIndex:
+    """Every knowledge pattern in one database, with precomputed match features."""
+
+    def __init__(self, patterns: List[IndexedPattern], fingerprint: Tuple = ()):
+        self.fingerprint = fingerprint
+        self.patterns = patterns
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, IndexedPattern] = {p.id: p for p in patterns}
+        self._ordered: List[IndexedPattern] = []
+        self._rerank()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _rerank(self) -> None:
+        self._ordered = sorted(self.patterns, key=lambda p: (-p.confidence, p.id))
+
+    def in_scan_order(self) -> List[IndexedPattern]:
+        """Every pattern, ordered confidence DESC then id (the detector's scan order)."""
+        return self._ordered
+
+    def set_confidence(self, pattern_id: int, confidence: float) -> bool:
+        """Record a confidence change; returns False if the pattern is unknown."""
+        pattern = self._by_id.get(pattern_id)
+        if pattern is None:
+            return False
+        with self._lock:
+            pattern.confidence = confidence
+            self._rerank()
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+_index_cache: Dict[str, PatternIndex] = {}
+_gram_cache: Dict[str, Dict[str, FrozenSet[str]]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def table_fingerprint(conn: sqlite3.Connection) -> Tuple:
+    """Cheap aggregate that changes when patterns are added, removed or edited."""
+    try:
+        row = conn.execute(_FINGERPRINT_SQL.format(extra=", MAX(updated_at)")).fetchone()
+    except sqlite3.OperationalError:  # older schemas have no updated_at
+        row = conn.execute(_FINGERPRINT_SQL.format(extra="")).fetchone()
+    return tuple(row)
+
+
+def load_index(conn: sqlite3.Connection, db_path) -> PatternIndex:
+    """Return the database's pattern index, rebuilding it if patterns changed."""
+    key = str(db_path)
+    fingerprint = table_fingerprint(conn)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        previous = dict(_gram_cache.get(key, {}))
+    if index is not None and index.fingerprint == fingerprint:
+        return index
+
+    patterns = []
+    gram_sets = {}
+    for row in conn.execute(_PATTERNS_SQL).fetchall():
+        signature = row[2] or ""
+        grams = previous.get(signature)
+        if grams is None:
+            grams = frozenset(ngrams(signature))
+        gram_sets[signature] = grams
+        patterns.append(IndexedPattern(
+            id=row[0],
+            pattern_type=row[1],
+            signature=signature,
+            description=row[3],
+            root_cause=row[4],
+            remediation=row[5],
+            confidence=row[6],
+            auto_healable=bool(row[7]),
+            grams=grams,
+            description_lower=(row[3] or "").lower(),
+            signature_lower=signature.lower(),
+        ))
+    index = PatternIndex(patterns, fingerprint)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        _gram_cache[key] = gram_sets
+    return index
+
+
+def note_confidence(conn: sqlite3.Connection, db_path, pattern_id: int,
+                    confidence: float, previous_fingerprint: Tuple) -> None:
+    """Apply a committed confidence update to the cached index in place.
+
+    *previous_fingerprint* is table_fingerprint() taken before the update;
+    if the cached index was already stale it is dropped instead.
+    """
+    key = str(db_path)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+    if index is None:
+        return
+    if index.fingerprint == previous_fingerprint and index.set_confidence(pattern_id, confidence):
+        index.fingerprint = table_fingerprint(conn)
+    else:
+        invalidate_index(db_path)
+
+
+def invalidate_index(db_path) -> None:
+    """Drop the cached index (trigram sets are kept) for *db_path*."""
+    with _index_cache_lock:
+        _index_cache.pop(str(db_path), None)
+
+
+def clear_index_cache() -> None:
+    """Drop every cached index and trigram set."""
+    with _index_cache_lock:
+        _index_cache.clear()
+        _gram_cache.clear()
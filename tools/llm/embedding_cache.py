@@ -0,0 +1,376 @@
+# [TEMPLATE: CUI // SP-CTI]
+"""Content-hash embedding cache shared by every embedding consumer.
+
+Vectors are keyed by (provider, model, dimensions, sha256(text)), so the
+same text embedded by the memory backfill, the marketplace indexer or a
+repeated search query costs one provider call in total.
+
+Two tiers:
+    memory  — per-process LRU (``max_memory_entries``)
+    disk    — SQLite table ``embedding_cache`` in data/embedding_cache.db,
+              shared across processes (WAL), trimmed oldest-first past
+              ``max_disk_entries``
+
+``CachedEmbeddingProvider`` wraps any EmbeddingProvider so ``embed`` and
+``embed_batch`` consult the cache transparently; the LLM router applies it
+to every embedding provider it hands out.  Failed embeddings (None/empty)
+are never cached.
+
+Configuration: ``embeddings.cache`` in args/llm_config.yaml.
+Environment overrides:
+    ICDEV_EMBEDDING_CACHE=off       disable the cache
+    ICDEV_EMBEDDING_CACHE_DB=<path> alternate SQLite file
+
+CLI:
+    python -m tools.llm.embedding_cache --stats --json
+    python -m tools.llm.embedding_cache --clear --json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from tools.llm.provider import EmbeddingProvider
+
+logger = logging.getLogger("icdev.llm.embedding_cache")
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+CONFIG_PATH = BASE_DIR / "args" / "llm_config.yaml"
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "db_path": "data/embedding_cache.db",
+    "max_memory_entries": 10000,
+    "max_disk_entries": 500000,
+}
+
+_PRUNE_EVERY = 1000  # Disk-tier inserts between size checks
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS embedding_cache (
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    created_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (provider, model, dimensions, text_hash)
+)"""
+
+
+def load_cache_config(config_path=None) -> dict:
+    """Load ``embeddings.cache`` from llm_config.yaml with defaults."""
+    config = dict(DEFAULT_CONFIG)
+    path = Path(config_path) if config_path else CONFIG_PATH
+    try:
+        import yaml
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            config.update((data.get("embeddings", {}) or {}).get("cache", {}) or {})
+    except (ImportError, Exception):
+        pass
+    return config
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the exact text sent to the provider."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (LRU + SQLite) embedding cache. Thread-safe."""
+
+    def __init__(self, db_path=None, max_memory_entries: int = 10000,
+                 max_disk_entries: int = 500000):
+        self.db_path = Path(db_path) if db_path else None
+        self.max_memory_entries = max(0, int(max_memory_entries))
+        self.max_disk_entries = max(0, int(max_disk_entries))
+        self._lru: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_failed = False
+        self._inserts = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    # -- disk tier ---------------------------------------------------------
+    def _db(self, create: bool = False) -> Optional[sqlite3.Connection]:
+        """Lazily open the SQLite tier; disable it (memory-only) on error.
+
+        Reads do not create the file — only the first store does.
+        """
+        if self._conn is not None or self._disk_failed or self.db_path is None:
+            return self._conn
+        if not create and not self.db_path.exists():
+            return None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache disk tier unavailable (%s): %s", self.db_path, exc)
+            self._disk_failed = True
+        return self._conn
+
+    def _prune(self, conn) -> None:
+        excess = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0] \
+            - self.max_disk_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM embedding_cache WHERE rowid IN "
+                "(SELECT rowid FROM embedding_cache ORDER BY rowid LIMIT ?)",
+                (excess,),
+            )
+
+    # -- memory tier -------------------------------------------------------
+    def _remember(self, key: tuple, vector: List[float]) -> None:
+        if not self.max_memory_entries:
+            return
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_entries:
+            self._lru.popitem(last=False)
+
+    # -- public API --------------------------------------------------------
+    def get_many(self, provider: str, model: str, dimensions: int,
+                 texts: Sequence[str]) -> Dict[str, List[float]]:
+        """Return {text: vector} for every text found in either tier."""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            pending = {}
+            for text in texts:
+                if text in found or text in pending:
+                    continue
+                key = (provider, model, dimensions, text_hash(text))
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[text] = vector
+                    self.stats["memory_hits"] += 1
+                else:
+                    pending[text] = key
+
+            conn = self._db() if pending else None
+            if conn is not None:
+                by_hash = {key[3]: text for text, key in pending.items()}
+                hashes = list(by_hash)
+                try:
+                    for start in range(0, len(hashes), 500):
+                        chunk = hashes[start:start + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        for digest, blob in conn.execute(
+                            "SELECT text_hash, vector FROM embedding_cache "
+                            "WHERE provider = ? AND model = ? AND dimensions = ? "
+                            f"AND text_hash IN ({placeholders})",
+                            [provider, model, dimensions] + chunk,
+                        ):
+                            text = by_hash[digest]
+                            vector = list(struct.unpack(f"<{len(blob) // 4}f", blob))
+                            found[text] = vector
+                            self._remember(pending.pop(text), vector)
+                            self.stats["disk_hits"] += 1
+                except sqlite3.Error as exc:
+                    logger.warning("Embedding cache read failed: %s", exc)
+            self.stats["misses"] += len(pending)
+        return found
+
+    def get(self, provider: str, model: str, dimensions: int, text: str) -> Optional[List[float]]:
+        return self.get_many(provider, model, dimensions, [text]).get(text)
+
+    def put_many(self, provider: str, model: str, dimensions: int,
+                 items: Dict[str, List[float]]) -> None:
+        """Store {text: vector}; None/empty vectors are skipped."""
+        rows = []
+        with self._lock:
+            for text, vector in items.items():
+                if not vector:
+                    continue
+                digest = text_hash(text)
+                vector = list(vector)
+                self._remember((provider, model, dimensions, digest), vector)
+                rows.append((provider, model, dimensions, digest,
+                             struct.pack(f"<{len(vector)}f", *vector)))
+            self.stats["stores"] += len(rows)
+            conn = self._db(create=True) if rows else None
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache "
+                    "(provider, model, dimensions, text_hash, vector) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._inserts += len(rows)
+                if self.max_disk_entries and self._inserts >= _PRUNE_EVERY:
+                    self._inserts = 0
+                    self._prune(conn)
+                conn.commit()
+            except sqlite3.Error as exc:
+                logger.warning("Embedding cache write failed: %s", exc)
+                conn.rollback()
+
+    def put(self, provider: str, model: str, dimensions: int, text: str,
+            vector: List[float]) -> None:
+        self.put_many(provider, model, dimensions, {text: vector})
+
+    def clear(self) -> int:
+        """Empty both tiers. Returns the number of disk rows removed."""
+        with self._lock:
+            self._lru.clear()
+            conn = self._db()
+            if conn is None:
+                return 0
+            removed = conn.execute("DELETE FROM embedding_cache").rowcount
+            conn.commit()
+            return removed
+
+    def status(self) -> dict:
+        with self._lock:
+            conn = self._db()
+            disk_entries = (
+                conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+                if conn is not None else 0
+            )
+            return {
+                **self.stats,
+                "memory_entries": len(self._lru),
+                "disk_entries": disk_entries,
+                "db_path": str(self.db_path) if self.db_path else None,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """EmbeddingProvider wrapper that serves repeated texts from the cache."""
+
+    def __init__(self, provider: EmbeddingProvider, cache: EmbeddingCache):
+        self.inner = provider
+        self.cache = cache
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined here (e.g. _model_id)
+        inner = self.__dict__.get("inner")
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+    @property
+    def provider_name(self) -> str:
+        return self.inner.provider_name
+
+    @property
+    def dimensions(self) -> int:
+        return self.inner.dimensions
+
+    @property
+    def model_id(self) -> str:
+        return self.inner.model_id
+
+    def _key(self):
+        return self.inner.provider_name, self.inner.model_id, self.inner.dimensions
+
+    def embed(self, text: str) -> List[float]:
+        key = self._key()
+        vector = self.cache.get(*key, text)
+        if vector is None:
+            vector = self.inner.embed(text)
+            if vector:
+                self.cache.put(*key, text, vector)
+        return vector
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        key = self._key()
+        found = self.cache.get_many(*key, texts)
+        missing = list(dict.fromkeys(t for t in texts if t not in found))
+        if missing:
+            vectors = self.inner.embed_batch(missing)
+            fresh = dict(zip(missing, vectors))
+            self.cache.put_many(*key, fresh)
+            found.update(fresh)
+        return [found.get(t) for t in texts]
+
+    def check_availability(self) -> bool:
+        return self.inner.check_availability()
+
+
+_cache_instance: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(config: Optional[dict] = None) -> Optional[EmbeddingCache]:
+    """Process-wide cache singleton, or None when disabled."""
+    global _cache_instance
+    if os.environ.get("ICDEV_EMBEDDING_CACHE", "").lower() in ("0", "off", "false"):
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            cfg = {**DEFAULT_CONFIG, **(config if config is not None else load_cache_config())}
+            if not cfg.get("enabled", True):
+                return None
+            db_path = os.environ.get("ICDEV_EMBEDDING_CACHE_DB") or cfg.get("db_path")
+            if db_path and not Path(db_path).is_absolute():
+                db_path = BASE_DIR / db_path
+            _cache_instance = EmbeddingCache(
+                db_path=db_path,
+                max_memory_entries=cfg.get("max_memory_entries", 10000),
+                max_disk_entries=cfg.get("max_disk_entries", 500000),
+            )
+        return _cache_instance
+
+
+def with_cache(provider: EmbeddingProvider, config: Optional[dict] = None) -> EmbeddingProvider:
+    """Wrap *provider* in the shared cache (no-op when disabled or already wrapped)."""
+    if isinstance(provider, CachedEmbeddingProvider):
+        return provider
+    cache = get_embedding_cache(config)
+    return CachedEmbeddingProvider(provider, cache) if cache is not None else provider
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding cache maintenance")
+    parser.add_argument("--stats", action="store_true", help="Show cache size and hit counters")
+    parser.add_argument("--clear", action="store_true", help="Empty the cache")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    cache = get_embedding_cache()
+    if cache is None:
+        result = {"enabled": False}
+    else:
+        result = {"enabled": True}
+        if args.clear:
+            result["cleared"] = cache.clear()
+        result.update(cache.status())
+    result["classification"] = "CUI // SP-CTI"
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif not result["enabled"]:
+        print("Embedding cache disabled.")
+    else:
+        if "cleared" in result:
+            print(f"Cleared {result['cleared']} cached embeddings.")
+        print(f"Embedding cache: {result['disk_entries']} on disk ({result['db_path']}), "
+              f"{result['memory_entries']} in memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -124,6 +124,11 @@ class EmbeddingProvider(ABC):
     def dimensions(self) -> int:
         """Return the embedding dimensionality."""
 
+    @property
+    def model_id(self) -> str:
+        """Return the embedding model identifier (part of the cache key)."""
+        return getattr(self, "_model_id", "") or getattr(self, "_deployment", "")
+
     @abstractmethod
     def embed(self, text: str) -> List[float]:
         """Generate an embedding vector for a single text.
@@ -56,6 +56,7 @@ class LLMRouter:
         self._availability_cache: Dict[str, bool] = {}
         self._availability_cache_time: float = 0.0
         self._cache_ttl: float = 1800.0
+        self._injection_detector = None
 
         self._load_config()
 
@@ -320,12 +321,16 @@ class LLMRouter:
         if scanner is unavailable. Graceful import — does not fail if
         prompt_injection_detector is not importable.
         """
-        try:
-            from tools.security.prompt_injection_detector import PromptInjectionDetector
-        except ImportError:
-            return None
+        detector = self._injection_detector
+        if detector is None:
+            try:
+                from tools.security.prompt_injection_detector import PromptInjectionDetector
+            except ImportError:
+                return None
+            # Patterns are compiled once and per-message matches are cached by
+            # content hash, so one detector serves every request
+            detector = self._injection_detector = PromptInjectionDetector()
 
-        detector = PromptInjectionDetector()
         # Scan all user messages in the request
         texts = []
         for msg in (request.messages or []):
@@ -337,8 +342,7 @@ class LLMRouter:
         if not texts:
             return "allow"
 
-        combined = "\n".join(texts)
-        result = detector.scan_text(combined, source="llm_router")
+        result = detector.scan_messages(texts, source="llm_router")
 
         if result["detected"]:
             logger.warning(
@@ -737,6 +741,9 @@ class LLMRouter:
                     )
 
                 if emb and emb.check_availability():
+                    # Serve repeated texts from the shared embedding cache
+                    from tools.llm.embedding_cache import with_cache
+                    emb = with_cache(emb, emb_cfg.get("cache"))
                     self._embedding_providers[model_name] = emb
                     logger.info("Embedding provider ready: %s", model_name)
                     return emb
@@ -324,6 +324,15 @@ def _blob_to_embedding(blob):
     return list(struct.unpack(f"{n}f", blob))
 
 
+def _get_embedding_cache():
+    """Shared content-hash embedding cache, or None when unavailable/disabled."""
+    try:
+        from tools.llm.embedding_cache import get_embedding_cache
+        return get_embedding_cache()
+    except ImportError:
+        return None
+
+
 def _generate_embedding_ollama(text):
     """Generate embedding via Ollama nomic-embed-text (air-gapped).
 
@@ -415,7 +424,8 @@ def _generate_embedding_fallback(text):
 def generate_embedding(text, db_path=None):
     """Generate embedding vector for text.
 
-    Tries Ollama nomic-embed-text first (air-gapped, 768 dims).
+    Tries Ollama nomic-embed-text first (air-gapped, 768 dims), served from
+    the shared embedding cache when the same text was embedded before.
     Falls back to hashlib-based deterministic pseudo-vectors (256 dims).
 
     Args:
@@ -425,9 +435,18 @@ def generate_embedding(text, db_path=None):
     Returns:
         Tuple of (embedding_list, model_name, dimensions).
     """
+    # Keyed like the router's nomic-embed-local provider so vectors are shared
+    cache = _get_embedding_cache()
+    if cache is not None:
+        embedding = cache.get("local", OLLAMA_EMBED_MODEL, OLLAMA_EMBED_DIMS, text)
+        if embedding is not None:
+            return embedding, OLLAMA_EMBED_MODEL, OLLAMA_EMBED_DIMS
+
     # Try Ollama first
     embedding = _generate_embedding_ollama(text)
     if embedding is not None:
+        if cache is not None:
+            cache.put("local", OLLAMA_EMBED_MODEL, OLLAMA_EMBED_DIMS, text, embedding)
         return embedding, OLLAMA_EMBED_MODEL, OLLAMA_EMBED_DIMS
 
     # Fallback: deterministic hash-based vectors
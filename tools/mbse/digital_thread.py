@@ -7,6 +7,9 @@ Manages N:M links between: DOORS requirements -> SysML elements -> code modules
 
 Supports forward/backward trace, coverage analysis, orphan/gap detection,
 heuristic auto-linking, and CUI-marked traceability reports.
+
+Traces and analyses run over a per-project adjacency graph loaded once and
+cached by tools/mbse/thread_graph.py; element names are resolved in batches.
 """
 
 import argparse
@@ -14,7 +17,6 @@ import json
 import re
 import sqlite3
 import sys
-from collections import deque
 from datetime import datetime
 from pathlib import Path
 
@@ -29,6 +31,8 @@ except ImportError:
     def log_event(**kwargs):
         pass
 
+from tools.mbse.thread_graph import ThreadGraph, invalidate_graph, load_graph  # noqa: E402
+
 # Valid artifact types in the digital thread
 VALID_TYPES = (
     "doors_requirement", "sysml_element", "code_module",
@@ -61,8 +65,60 @@ CONTROL_KEYWORD_MAP = {
 
 
 # ---------------------------------------------------------------------------
-# Helper: resolve human-readable name for an element
+# Helper: resolve human-readable names for elements
 # ---------------------------------------------------------------------------
+# element_type -> (table, key column, name column)
+_NAME_SOURCES = {
+    "doors_requirement": ("doors_requirements", "id", "title"),
+    "sysml_element": ("sysml_elements", "id", "name"),
+    "nist_control": ("compliance_controls", "id", "title"),
+    "stig_rule": ("stig_findings", "rule_id", "title"),
+}
+
+# Stay well under SQLite's bound-parameter limit
+_NAME_BATCH_SIZE = 500
+
+
+def _resolve_element_names(keys, conn) -> dict:
+    """Resolve human-readable names for many (element_type, element_id) keys.
+
+    Issues one IN (...) query per element type (chunked) instead of one
+    query per element.  Unknown IDs resolve to the ID itself.
+    """
+    names = {}
+    pending = {}
+    for element_type, element_id in keys:
+        key = (element_type, element_id)
+        if key in names:
+            continue
+        if element_type in _NAME_SOURCES:
+            pending.setdefault(element_type, set()).add(element_id)
+        elif element_type == "compliance_artifact":
+            names[key] = f"artifact: {element_id}"
+        else:
+            names[key] = element_id
+
+    for element_type, id_set in pending.items():
+        table, key_col, name_col = _NAME_SOURCES[element_type]
+        ids = list(id_set)
+        for start in range(0, len(ids), _NAME_BATCH_SIZE):
+            chunk = ids[start:start + _NAME_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            try:
+                rows = conn.execute(
+                    f"SELECT {key_col}, {name_col} FROM {table} "
+                    f"WHERE {key_col} IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+            for element_id, name in rows:
+                names.setdefault((element_type, element_id), name)
+        for element_id in ids:
+            names.setdefault((element_type, element_id), element_id)
+    return names
+
+
 def _resolve_element_name(element_type: str, element_id: str, conn) -> str:
     """Resolve human-readable name for an element by type.
 
@@ -74,34 +130,8 @@ def _resolve_element_name(element_type: str, element_id: str, conn) -> str:
     stig_rule          -> stig_findings.title
     compliance_artifact -> 'artifact: ' + element_id
     """
-    c = conn.cursor()
-    try:
-        if element_type == "doors_requirement":
-            c.execute("SELECT title FROM doors_requirements WHERE id = ?", (element_id,))
-            row = c.fetchone()
-            return row[0] if row else element_id
-        elif element_type == "sysml_element":
-            c.execute("SELECT name FROM sysml_elements WHERE id = ?", (element_id,))
-            row = c.fetchone()
-            return row[0] if row else element_id
-        elif element_type == "code_module":
-            return element_id
-        elif element_type == "test_file":
-            return element_id
-        elif element_type == "nist_control":
-            c.execute("SELECT title FROM compliance_controls WHERE id = ?", (element_id,))
-            row = c.fetchone()
-            return row[0] if row else element_id
-        elif element_type == "stig_rule":
-            c.execute("SELECT title FROM stig_findings WHERE rule_id = ?", (element_id,))
-            row = c.fetchone()
-            return row[0] if row else element_id
-        elif element_type == "compliance_artifact":
-            return f"artifact: {element_id}"
-        else:
-            return element_id
-    except sqlite3.OperationalError:
-        return element_id
+    key = (element_type, element_id)
+    return _resolve_element_names([key], conn)[key]
 
 
 # ---------------------------------------------------------------------------
@@ -138,6 +168,7 @@ def create_link(project_id: str, source_type: str, source_id: str,
              datetime.now().isoformat()),
         )
         conn.commit()
+        invalidate_graph(path, project_id)
         link_id = c.lastrowid
         created = True
 
@@ -184,6 +215,8 @@ def delete_link(project_id: str, link_id: int, db_path=None) -> bool:
         )
         conn.commit()
         deleted = c.rowcount > 0
+        if deleted:
+            invalidate_graph(path, project_id)
         return deleted
     except sqlite3.Error:
         return False
@@ -191,6 +224,27 @@ def delete_link(project_id: str, link_id: int, db_path=None) -> bool:
         conn.close()
 
 
+# ---------------------------------------------------------------------------
+# Trace: shared graph helpers
+# ---------------------------------------------------------------------------
+def _open_graph(project_id: str, db_path=None):
+    """Open a connection and load the project's (cached) thread graph."""
+    path = db_path or DB_PATH
+    conn = sqlite3.connect(str(path))
+    return conn, load_graph(conn, project_id, db_path=path)
+
+
+def _trace(graph: ThreadGraph, conn, element_type: str, element_id: str,
+           forward: bool, max_depth: int) -> list:
+    """Build a trace tree from the graph and name every node in one batch."""
+    links, unnamed = graph.trace((element_type, element_id), forward=forward,
+                                 max_depth=max_depth)
+    names = _resolve_element_names((key for _, key in unnamed), conn)
+    for endpoint, key in unnamed:
+        endpoint["name"] = names[key]
+    return links
+
+
 # ---------------------------------------------------------------------------
 # Trace: forward (BFS)
 # ---------------------------------------------------------------------------
@@ -204,57 +258,17 @@ def get_forward_trace(project_id: str, source_type: str, source_id: str,
          "confidence": float, "children": [...]}
     ]}
     """
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-
-    source_name = _resolve_element_name(source_type, source_id, conn)
-    result = {
+    conn, graph = _open_graph(project_id, db_path)
+    try:
+        source_name = _resolve_element_name(source_type, source_id, conn)
+        links = _trace(graph, conn, source_type, source_id, True, max_depth)
+    finally:
+        conn.close()
+    return {
         "source": {"type": source_type, "id": source_id, "name": source_name},
-        "links": [],
+        "links": links,
     }
 
-    # BFS traversal
-    visited = set()
-    visited.add((source_type, source_id))
-    queue = deque()
-    queue.append((source_type, source_id, result["links"], 0))
-
-    c = conn.cursor()
-    while queue:
-        curr_type, curr_id, parent_links, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
-
-        c.execute(
-            """SELECT target_type, target_id, link_type, confidence, evidence
-               FROM digital_thread_links
-               WHERE project_id = ? AND source_type = ? AND source_id = ?""",
-            (project_id, curr_type, curr_id),
-        )
-        rows = c.fetchall()
-        for row in rows:
-            t_type = row["target_type"]
-            t_id = row["target_id"]
-            key = (t_type, t_id)
-
-            t_name = _resolve_element_name(t_type, t_id, conn)
-            child_links = []
-            node = {
-                "link_type": row["link_type"],
-                "confidence": row["confidence"],
-                "target": {"type": t_type, "id": t_id, "name": t_name},
-                "children": child_links,
-            }
-            parent_links.append(node)
-
-            if key not in visited:
-                visited.add(key)
-                queue.append((t_type, t_id, child_links, depth + 1))
-
-    conn.close()
-    return result
-
 
 # ---------------------------------------------------------------------------
 # Trace: backward (BFS)
@@ -262,57 +276,17 @@ def get_forward_trace(project_id: str, source_type: str, source_id: str,
 def get_backward_trace(project_id: str, target_type: str, target_id: str,
                        max_depth: int = 10, db_path=None) -> dict:
     """Trace backward from a target element. Same tree structure but reversed."""
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-
-    target_name = _resolve_element_name(target_type, target_id, conn)
-    result = {
+    conn, graph = _open_graph(project_id, db_path)
+    try:
+        target_name = _resolve_element_name(target_type, target_id, conn)
+        links = _trace(graph, conn, target_type, target_id, False, max_depth)
+    finally:
+        conn.close()
+    return {
         "target": {"type": target_type, "id": target_id, "name": target_name},
-        "links": [],
+        "links": links,
     }
 
-    # BFS traversal backward
-    visited = set()
-    visited.add((target_type, target_id))
-    queue = deque()
-    queue.append((target_type, target_id, result["links"], 0))
-
-    c = conn.cursor()
-    while queue:
-        curr_type, curr_id, parent_links, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
-
-        c.execute(
-            """SELECT source_type, source_id, link_type, confidence, evidence
-               FROM digital_thread_links
-               WHERE project_id = ? AND target_type = ? AND target_id = ?""",
-            (project_id, curr_type, curr_id),
-        )
-        rows = c.fetchall()
-        for row in rows:
-            s_type = row["source_type"]
-            s_id = row["source_id"]
-            key = (s_type, s_id)
-
-            s_name = _resolve_element_name(s_type, s_id, conn)
-            child_links = []
-            node = {
-                "link_type": row["link_type"],
-                "confidence": row["confidence"],
-                "source": {"type": s_type, "id": s_id, "name": s_name},
-                "children": child_links,
-            }
-            parent_links.append(node)
-
-            if key not in visited:
-                visited.add(key)
-                queue.append((s_type, s_id, child_links, depth + 1))
-
-    conn.close()
-    return result
-
 
 # ---------------------------------------------------------------------------
 # Trace: full bidirectional
@@ -320,16 +294,17 @@ def get_backward_trace(project_id: str, target_type: str, target_id: str,
 def get_full_thread(project_id: str, element_type: str, element_id: str,
                     db_path=None) -> dict:
     """Complete bidirectional trace from any point. Returns both forward and backward."""
-    path = db_path or DB_PATH
-    forward = get_forward_trace(project_id, element_type, element_id, db_path=path)
-    backward = get_backward_trace(project_id, element_type, element_id, db_path=path)
-    conn = sqlite3.connect(str(path))
-    name = _resolve_element_name(element_type, element_id, conn)
-    conn.close()
+    conn, graph = _open_graph(project_id, db_path)
+    try:
+        name = _resolve_element_name(element_type, element_id, conn)
+        forward = _trace(graph, conn, element_type, element_id, True, 10)
+        backward = _trace(graph, conn, element_type, element_id, False, 10)
+    finally:
+        conn.close()
     return {
         "element": {"type": element_type, "id": element_id, "name": name},
-        "forward": forward.get("links", []),
-        "backward": backward.get("links", []),
+        "forward": forward,
+        "backward": backward,
     }
 
 
@@ -346,22 +321,17 @@ def compute_coverage(project_id: str, db_path=None) -> dict:
     - overall_thread_completeness: % of requirements with full chain
       (req -> model -> code -> test -> control)
     """
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
+    conn, graph = _open_graph(project_id, db_path)
     c = conn.cursor()
 
     # Total DOORS requirements for this project
-    c.execute("SELECT COUNT(*) FROM doors_requirements WHERE project_id = ?", (project_id,))
-    total_reqs = c.fetchone()[0]
+    c.execute("SELECT id FROM doors_requirements WHERE project_id = ?", (project_id,))
+    req_ids = [row[0] for row in c.fetchall()]
+    total_reqs = len(req_ids)
 
     # Requirements linked to sysml_elements
-    c.execute(
-        """SELECT COUNT(DISTINCT source_id) FROM digital_thread_links
-           WHERE project_id = ? AND source_type = 'doors_requirement'
-             AND target_type = 'sysml_element'""",
-        (project_id,),
-    )
-    linked_reqs = c.fetchone()[0]
+    linked_reqs = len({link.source_id for link in
+                       graph.links_of("doors_requirement", "sysml_element")})
 
     # Total SysML blocks for this project
     c.execute(
@@ -371,115 +341,43 @@ def compute_coverage(project_id: str, db_path=None) -> dict:
     total_blocks = c.fetchone()[0]
 
     # Blocks linked to code_modules
-    c.execute(
-        """SELECT COUNT(DISTINCT source_id) FROM digital_thread_links
-           WHERE project_id = ? AND source_type = 'sysml_element'
-             AND target_type = 'code_module'""",
-        (project_id,),
-    )
-    linked_blocks = c.fetchone()[0]
+    linked_blocks = len({link.source_id for link in
+                         graph.links_of("sysml_element", "code_module")})
 
     # Unique code_modules that are link sources or targets
-    c.execute(
-        """SELECT COUNT(DISTINCT cm) FROM (
-               SELECT source_id AS cm FROM digital_thread_links
-               WHERE project_id = ? AND source_type = 'code_module'
-               UNION
-               SELECT target_id AS cm FROM digital_thread_links
-               WHERE project_id = ? AND target_type = 'code_module'
-           )""",
-        (project_id, project_id),
-    )
-    total_code = c.fetchone()[0]
+    total_code = len(graph.node_ids("code_module"))
 
     # Code modules linked to test_files
-    c.execute(
-        """SELECT COUNT(DISTINCT source_id) FROM digital_thread_links
-           WHERE project_id = ? AND source_type = 'code_module'
-             AND target_type = 'test_file'""",
-        (project_id,),
-    )
-    code_with_tests = c.fetchone()[0]
+    code_with_tests = len({link.source_id for link in
+                           graph.links_of("code_module", "test_file")})
 
-    # Total project_controls
-    c.execute("SELECT COUNT(*) FROM project_controls WHERE project_id = ?", (project_id,))
-    total_controls = c.fetchone()[0]
-
-    # Controls linked to any thread element
-    c.execute(
-        """SELECT COUNT(DISTINCT pc.control_id) FROM project_controls pc
-           WHERE pc.project_id = ?
-             AND (EXISTS (
-                 SELECT 1 FROM digital_thread_links dtl
-                 WHERE dtl.project_id = pc.project_id
-                   AND ((dtl.source_type = 'nist_control' AND dtl.source_id = pc.control_id)
-                     OR (dtl.target_type = 'nist_control' AND dtl.target_id = pc.control_id))
-             ))""",
-        (project_id,),
-    )
-    linked_controls = c.fetchone()[0]
+    # Total project_controls, and those linked to any thread element
+    c.execute("SELECT control_id FROM project_controls WHERE project_id = ?", (project_id,))
+    control_ids = [row[0] for row in c.fetchall()]
+    total_controls = len(control_ids)
+    linked_controls = len({cid for cid in control_ids if ("nist_control", cid) in graph})
 
     # Full chain completeness: requirement -> model -> code -> test -> control
     # For each requirement, check if a full chain exists
-    c.execute("SELECT id FROM doors_requirements WHERE project_id = ?", (project_id,))
-    req_ids = [row[0] for row in c.fetchall()]
-    full_chain_count = 0
+    def controlled(*keys):
+        return any(graph.outgoing(key, "nist_control") for key in keys)
 
+    full_chain_count = 0
     for req_id in req_ids:
-        # req -> sysml_element
-        c.execute(
-            """SELECT target_id FROM digital_thread_links
-               WHERE project_id = ? AND source_type = 'doors_requirement'
-                 AND source_id = ? AND target_type = 'sysml_element'""",
-            (project_id, req_id),
-        )
-        model_ids = [row[0] for row in c.fetchall()]
-        if not model_ids:
-            continue
-
+        req_key = ("doors_requirement", req_id)
         has_full_chain = False
-        for model_id in model_ids:
-            # sysml_element -> code_module
-            c.execute(
-                """SELECT target_id FROM digital_thread_links
-                   WHERE project_id = ? AND source_type = 'sysml_element'
-                     AND source_id = ? AND target_type = 'code_module'""",
-                (project_id, model_id),
-            )
-            code_ids = [row[0] for row in c.fetchall()]
-            if not code_ids:
-                continue
-
-            for code_id in code_ids:
-                # code_module -> test_file
-                c.execute(
-                    """SELECT target_id FROM digital_thread_links
-                       WHERE project_id = ? AND source_type = 'code_module'
-                         AND source_id = ? AND target_type = 'test_file'""",
-                    (project_id, code_id),
-                )
-                test_ids = [row[0] for row in c.fetchall()]
-                if not test_ids:
+        for model_link in graph.outgoing(req_key, "sysml_element"):
+            model_key = model_link.target
+            for code_link in graph.outgoing(model_key, "code_module"):
+                code_key = code_link.target
+                test_keys = [t.target for t in graph.outgoing(code_key, "test_file")]
+                if not test_keys:
                     continue
 
-                # Any element in chain -> nist_control
-                c.execute(
-                    """SELECT 1 FROM digital_thread_links
-                       WHERE project_id = ?
-                         AND target_type = 'nist_control'
-                         AND (
-                             (source_type = 'doors_requirement' AND source_id = ?)
-                             OR (source_type = 'sysml_element' AND source_id = ?)
-                             OR (source_type = 'code_module' AND source_id = ?)
-                             OR (source_type = 'test_file' AND source_id IN ({}))
-                         )
-                       LIMIT 1""".format(",".join("?" * len(test_ids))),
-                    (project_id, req_id, model_id, code_id, *test_ids),
-                )
-                if c.fetchone():
+                # Any element in chain -> nist_control; one complete path is enough
+                if controlled(req_key, model_key, code_key, *test_keys):
                     has_full_chain = True
                     break
-                break  # Only need one path
             if has_full_chain:
                 break
 
@@ -521,86 +419,42 @@ def find_orphans(project_id: str, db_path=None) -> dict:
     - code_without_tests: code_modules not linked to any test_file
     - controls_without_evidence: NIST controls not linked to any thread element
     """
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
+    conn, graph = _open_graph(project_id, db_path)
     c = conn.cursor()
 
     # Requirements without model links
     c.execute(
-        """SELECT dr.id, dr.doors_id, dr.title FROM doors_requirements dr
-           WHERE dr.project_id = ?
-             AND dr.id NOT IN (
-                 SELECT source_id FROM digital_thread_links
-                 WHERE project_id = ? AND source_type = 'doors_requirement'
-                   AND target_type = 'sysml_element'
-             )
-             AND dr.id NOT IN (
-                 SELECT target_id FROM digital_thread_links
-                 WHERE project_id = ? AND target_type = 'doors_requirement'
-                   AND source_type = 'sysml_element'
-             )""",
-        (project_id, project_id, project_id),
+        "SELECT id, doors_id, title FROM doors_requirements WHERE project_id = ?",
+        (project_id,),
     )
-    reqs_orphans = [{"id": r[0], "doors_id": r[1], "title": r[2]} for r in c.fetchall()]
+    reqs_orphans = [
+        {"id": r[0], "doors_id": r[1], "title": r[2]} for r in c.fetchall()
+        if not graph.has_link(("doors_requirement", r[0]), "sysml_element")
+    ]
 
     # SysML blocks without code links
     c.execute(
-        """SELECT se.id, se.name FROM sysml_elements se
-           WHERE se.project_id = ? AND se.element_type = 'block'
-             AND se.id NOT IN (
-                 SELECT source_id FROM digital_thread_links
-                 WHERE project_id = ? AND source_type = 'sysml_element'
-                   AND target_type = 'code_module'
-             )
-             AND se.id NOT IN (
-                 SELECT target_id FROM digital_thread_links
-                 WHERE project_id = ? AND target_type = 'sysml_element'
-                   AND source_type = 'code_module'
-             )""",
-        (project_id, project_id, project_id),
-    )
-    blocks_orphans = [{"id": r[0], "name": r[1]} for r in c.fetchall()]
-
-    # Code modules without test links
-    # Gather all code_modules that appear in links for this project
-    c.execute(
-        """SELECT DISTINCT cm FROM (
-               SELECT source_id AS cm FROM digital_thread_links
-               WHERE project_id = ? AND source_type = 'code_module'
-               UNION
-               SELECT target_id AS cm FROM digital_thread_links
-               WHERE project_id = ? AND target_type = 'code_module'
-           )""",
-        (project_id, project_id),
+        """SELECT id, name FROM sysml_elements
+           WHERE project_id = ? AND element_type = 'block'""",
+        (project_id,),
     )
-    all_code = [row[0] for row in c.fetchall()]
+    blocks_orphans = [
+        {"id": r[0], "name": r[1]} for r in c.fetchall()
+        if not graph.has_link(("sysml_element", r[0]), "code_module")
+    ]
 
-    code_orphans = []
-    for code_id in all_code:
-        c.execute(
-            """SELECT 1 FROM digital_thread_links
-               WHERE project_id = ?
-                 AND ((source_type = 'code_module' AND source_id = ? AND target_type = 'test_file')
-                   OR (target_type = 'code_module' AND target_id = ? AND source_type = 'test_file'))
-               LIMIT 1""",
-            (project_id, code_id, code_id),
-        )
-        if not c.fetchone():
-            code_orphans.append({"id": code_id})
+    # Code modules (any that appear in links) without test links
+    code_orphans = [
+        {"id": code_id} for code_id in graph.node_ids("code_module")
+        if not graph.has_link(("code_module", code_id), "test_file")
+    ]
 
     # NIST controls without evidence (no links at all)
-    c.execute(
-        """SELECT pc.control_id FROM project_controls pc
-           WHERE pc.project_id = ?
-             AND NOT EXISTS (
-                 SELECT 1 FROM digital_thread_links dtl
-                 WHERE dtl.project_id = pc.project_id
-                   AND ((dtl.source_type = 'nist_control' AND dtl.source_id = pc.control_id)
-                     OR (dtl.target_type = 'nist_control' AND dtl.target_id = pc.control_id))
-             )""",
-        (project_id,),
-    )
-    control_orphans = [{"control_id": r[0]} for r in c.fetchall()]
+    c.execute("SELECT control_id FROM project_controls WHERE project_id = ?", (project_id,))
+    control_orphans = [
+        {"control_id": r[0]} for r in c.fetchall()
+        if ("nist_control", r[0]) not in graph
+    ]
 
     conn.close()
     return {
@@ -633,107 +487,66 @@ def find_gaps(project_id: str, db_path=None) -> dict:
     - model has code link but code has no test link
     - code has test link but no control link
     """
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    c = conn.cursor()
+    conn, graph = _open_graph(project_id, db_path)
     gaps = []
 
     # Gap 1: requirement -> model exists, but model -> code missing
-    c.execute(
-        """SELECT dtl.source_id, dtl.target_id
-           FROM digital_thread_links dtl
-           WHERE dtl.project_id = ?
-             AND dtl.source_type = 'doors_requirement'
-             AND dtl.target_type = 'sysml_element'""",
-        (project_id,),
+    missing_code = [
+        link for link in graph.links_of("doors_requirement", "sysml_element")
+        if not graph.outgoing(link.target, "code_module")
+    ]
+    names = _resolve_element_names(
+        [link.source for link in missing_code] + [link.target for link in missing_code],
+        conn,
     )
-    req_model_links = c.fetchall()
-    for req_id, model_id in req_model_links:
-        c.execute(
-            """SELECT 1 FROM digital_thread_links
-               WHERE project_id = ? AND source_type = 'sysml_element'
-                 AND source_id = ? AND target_type = 'code_module'
-               LIMIT 1""",
-            (project_id, model_id),
-        )
-        if not c.fetchone():
-            req_name = _resolve_element_name("doors_requirement", req_id, conn)
-            model_name = _resolve_element_name("sysml_element", model_id, conn)
-            gaps.append({
-                "gap_type": "model_without_code",
-                "description": (
-                    f"Requirement '{req_name}' ({req_id}) traces to model "
-                    f"'{model_name}' ({model_id}), but model has no code link"
-                ),
-                "requirement_id": req_id,
-                "model_id": model_id,
-                "missing_link": "sysml_element -> code_module",
-            })
+    for link in missing_code:
+        req_id, model_id = link.source_id, link.target_id
+        gaps.append({
+            "gap_type": "model_without_code",
+            "description": (
+                f"Requirement '{names[link.source]}' ({req_id}) traces to model "
+                f"'{names[link.target]}' ({model_id}), but model has no code link"
+            ),
+            "requirement_id": req_id,
+            "model_id": model_id,
+            "missing_link": "sysml_element -> code_module",
+        })
 
     # Gap 2: model -> code exists, but code -> test missing
-    c.execute(
-        """SELECT dtl.source_id, dtl.target_id
-           FROM digital_thread_links dtl
-           WHERE dtl.project_id = ?
-             AND dtl.source_type = 'sysml_element'
-             AND dtl.target_type = 'code_module'""",
-        (project_id,),
-    )
-    model_code_links = c.fetchall()
-    for model_id, code_id in model_code_links:
-        c.execute(
-            """SELECT 1 FROM digital_thread_links
-               WHERE project_id = ? AND source_type = 'code_module'
-                 AND source_id = ? AND target_type = 'test_file'
-               LIMIT 1""",
-            (project_id, code_id),
-        )
-        if not c.fetchone():
-            model_name = _resolve_element_name("sysml_element", model_id, conn)
-            gaps.append({
-                "gap_type": "code_without_test",
-                "description": (
-                    f"Model '{model_name}' ({model_id}) traces to code "
-                    f"'{code_id}', but code has no test link"
-                ),
-                "model_id": model_id,
-                "code_id": code_id,
-                "missing_link": "code_module -> test_file",
-            })
+    missing_test = [
+        link for link in graph.links_of("sysml_element", "code_module")
+        if not graph.outgoing(link.target, "test_file")
+    ]
+    names = _resolve_element_names([link.source for link in missing_test], conn)
+    for link in missing_test:
+        model_id, code_id = link.source_id, link.target_id
+        gaps.append({
+            "gap_type": "code_without_test",
+            "description": (
+                f"Model '{names[link.source]}' ({model_id}) traces to code "
+                f"'{code_id}', but code has no test link"
+            ),
+            "model_id": model_id,
+            "code_id": code_id,
+            "missing_link": "code_module -> test_file",
+        })
 
     # Gap 3: code -> test exists, but no control link from any chain element
-    c.execute(
-        """SELECT dtl.source_id, dtl.target_id
-           FROM digital_thread_links dtl
-           WHERE dtl.project_id = ?
-             AND dtl.source_type = 'code_module'
-             AND dtl.target_type = 'test_file'""",
-        (project_id,),
-    )
-    code_test_links = c.fetchall()
-    for code_id, test_id in code_test_links:
-        c.execute(
-            """SELECT 1 FROM digital_thread_links
-               WHERE project_id = ?
-                 AND target_type = 'nist_control'
-                 AND (
-                     (source_type = 'code_module' AND source_id = ?)
-                     OR (source_type = 'test_file' AND source_id = ?)
-                 )
-               LIMIT 1""",
-            (project_id, code_id, test_id),
-        )
-        if not c.fetchone():
-            gaps.append({
-                "gap_type": "test_without_control",
-                "description": (
-                    f"Code '{code_id}' has test '{test_id}', "
-                    f"but neither is linked to a NIST control"
-                ),
-                "code_id": code_id,
-                "test_id": test_id,
-                "missing_link": "code_module/test_file -> nist_control",
-            })
+    for link in graph.links_of("code_module", "test_file"):
+        if graph.outgoing(link.source, "nist_control") or \
+                graph.outgoing(link.target, "nist_control"):
+            continue
+        code_id, test_id = link.source_id, link.target_id
+        gaps.append({
+            "gap_type": "test_without_control",
+            "description": (
+                f"Code '{code_id}' has test '{test_id}', "
+                f"but neither is linked to a NIST control"
+            ),
+            "code_id": code_id,
+            "test_id": test_id,
+            "missing_link": "code_module/test_file -> nist_control",
+        })
 
     conn.close()
     return {
@@ -1229,6 +1042,23 @@ def _count_chain_depth(links: list, depth: int = 0) -> int:
 # ---------------------------------------------------------------------------
 # Thread integrity validation
 # ---------------------------------------------------------------------------
+def _existing_ids(conn, table: str, col: str, ids):
+    """Subset of *ids* present in ``table.col``; None if the table is missing."""
+    ids = list(ids)
+    found = set()
+    for start in range(0, len(ids), _NAME_BATCH_SIZE):
+        chunk = ids[start:start + _NAME_BATCH_SIZE]
+        try:
+            rows = conn.execute(
+                f"SELECT {col} FROM {table} WHERE {col} IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return None
+        found.update(row[0] for row in rows)
+    return found
+
+
 def validate_thread_integrity(project_id: str, db_path=None) -> dict:
     """Check for data integrity issues.
 
@@ -1237,18 +1067,11 @@ def validate_thread_integrity(project_id: str, db_path=None) -> dict:
     - Duplicate links
     - Invalid types
     """
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path))
-    c = conn.cursor()
+    conn, graph = _open_graph(project_id, db_path)
     issues = []
 
-    # Get all links for this project
-    c.execute(
-        """SELECT id, source_type, source_id, target_type, target_id, link_type, confidence
-           FROM digital_thread_links WHERE project_id = ?""",
-        (project_id,),
-    )
-    all_links = c.fetchall()
+    # All links for this project, in id order
+    all_links = graph.links
 
     # Check 1: Invalid types
     for link_id, src_type, src_id, tgt_type, tgt_id, ltype, conf in all_links:
@@ -1282,70 +1105,43 @@ def validate_thread_integrity(project_id: str, db_path=None) -> dict:
         "stig_rule": ("stig_findings", "rule_id"),
     }
 
+    # Look up every referenced ID once per table instead of once per link
+    existing = {}
+    for element_type, (table, col) in type_table_map.items():
+        ids = {link.source_id for link in all_links if link.source_type == element_type}
+        ids.update(link.target_id for link in all_links if link.target_type == element_type)
+        if ids:
+            existing[element_type] = _existing_ids(conn, table, col, ids)
+
     for link_id, src_type, src_id, tgt_type, tgt_id, ltype, conf in all_links:
-        # Check source exists
-        if src_type in type_table_map:
-            table, col = type_table_map[src_type]
-            try:
-                c.execute(f"SELECT 1 FROM {table} WHERE {col} = ? LIMIT 1", (src_id,))
-                if not c.fetchone():
-                    issues.append({
-                        "severity": "warning",
-                        "type": "broken_source_link",
-                        "link_id": link_id,
-                        "description": (
-                            f"Link {link_id}: source {src_type} '{src_id}' "
-                            f"not found in {table}"
-                        ),
-                    })
-            except sqlite3.OperationalError:
-                pass  # Table might not exist
+        # Check source exists (None: table might not exist)
+        if existing.get(src_type) is not None and src_id not in existing[src_type]:
+            table = type_table_map[src_type][0]
+            issues.append({
+                "severity": "warning",
+                "type": "broken_source_link",
+                "link_id": link_id,
+                "description": (
+                    f"Link {link_id}: source {src_type} '{src_id}' "
+                    f"not found in {table}"
+                ),
+            })
 
         # Check target exists
-        if tgt_type in type_table_map:
-            table, col = type_table_map[tgt_type]
-            try:
-                c.execute(f"SELECT 1 FROM {table} WHERE {col} = ? LIMIT 1", (tgt_id,))
-                if not c.fetchone():
-                    issues.append({
-                        "severity": "warning",
-                        "type": "broken_target_link",
-                        "link_id": link_id,
-                        "description": (
-                            f"Link {link_id}: target {tgt_type} '{tgt_id}' "
-                            f"not found in {table}"
-                        ),
-                    })
-            except sqlite3.OperationalError:
-                pass  # Table might not exist
+        if existing.get(tgt_type) is not None and tgt_id not in existing[tgt_type]:
+            table = type_table_map[tgt_type][0]
+            issues.append({
+                "severity": "warning",
+                "type": "broken_target_link",
+                "link_id": link_id,
+                "description": (
+                    f"Link {link_id}: target {tgt_type} '{tgt_id}' "
+                    f"not found in {table}"
+                ),
+            })
 
     # Check 3: Circular references (detect cycles using DFS)
-    # Build adjacency list
-    adj = {}
-    for link_id, src_type, src_id, tgt_type, tgt_id, ltype, conf in all_links:
-        src_key = (src_type, src_id)
-        tgt_key = (tgt_type, tgt_id)
-        adj.setdefault(src_key, []).append((tgt_key, link_id))
-
-    visited = set()
-    in_stack = set()
-    cycle_links = set()
-
-    def dfs(node):
-        visited.add(node)
-        in_stack.add(node)
-        for neighbor, lid in adj.get(node, []):
-            if neighbor in in_stack:
-                cycle_links.add(lid)
-            elif neighbor not in visited:
-                dfs(neighbor)
-        in_stack.discard(node)
-
-    for node in adj:
-        if node not in visited:
-            dfs(node)
-
-    for lid in cycle_links:
+    for lid in graph.cycle_link_ids():
         issues.append({
             "severity": "warning",
             "type": "circular_reference",
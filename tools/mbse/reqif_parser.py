@@ -6,6 +6,11 @@ Parses, validates, imports, exports, and diffs ReqIF XML files against the
 ICDEV doors_requirements table.  Uses only Python stdlib xml.etree.ElementTree
 (no lxml — air-gapped environment).
 
+Documents are read in one streaming ``iterparse`` pass: type definitions are
+indexed by identifier as they close and each SPEC-OBJECT / SPEC-RELATION /
+SPECIFICATION is extracted and released in turn, so large DOORS NG exports
+are imported in bounded memory.
+
 CUI // SP-CTI
 """
 
@@ -26,6 +31,11 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.mbse.stream_import import XmlStream, bulk_insert, local_name  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Audit logger (optional — graceful fallback for standalone use)
 # ---------------------------------------------------------------------------
@@ -105,15 +115,6 @@ def _strip_xhtml(element) -> str:
     return text
 
 
-def _file_hash(file_path: str) -> str:
-    """Return the SHA-256 hex digest for a file."""
-    h = hashlib.sha256()
-    with open(file_path, "rb") as fh:
-        for chunk in iter(lambda: fh.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def _content_hash(text: str) -> str:
     """Return the SHA-256 hex digest for a string."""
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -146,110 +147,82 @@ def _now() -> str:
 # Validation
 # ===================================================================
 
-def validate_reqif(file_path: str) -> dict:
-    """Validate that *file_path* is a structurally sound ReqIF 1.2 document.
-
-    Returns::
-
-        {
-            "valid": bool,
-            "errors": [str, ...],
-            "spec_count": int,
-            "object_count": int,
-        }
-    """
+def _validate_scan(scan: "_ReqifScan") -> dict:
+    """Check the document structure recorded by a streaming scan."""
     errors: list[str] = []
-    spec_count = 0
-    object_count = 0
-
-    # --- Can we parse the XML at all? ---
-    try:
-        tree = ET.parse(file_path)
-    except ET.ParseError as exc:
-        return {"valid": False, "errors": [f"XML parse error: {exc}"],
-                "spec_count": 0, "object_count": 0}
-    except FileNotFoundError:
-        return {"valid": False, "errors": [f"File not found: {file_path}"],
-                "spec_count": 0, "object_count": 0}
-
-    root = tree.getroot()
 
     # --- Root element must be REQ-IF ---
     expected_root = _tag("reqif", "REQ-IF")
-    if root.tag != expected_root:
+    if scan.root_tag != expected_root:
         errors.append(
-            f"Root element is '{root.tag}', expected '{expected_root}'"
+            f"Root element is '{scan.root_tag}', expected '{expected_root}'"
         )
 
     # --- CORE-CONTENT must exist ---
-    core = root.find(_tag("reqif", "CORE-CONTENT"))
-    if core is None:
+    if not scan.has_core:
         errors.append("Missing CORE-CONTENT element")
         return {"valid": False, "errors": errors,
                 "spec_count": 0, "object_count": 0}
 
-    content = core.find(_tag("reqif", "REQ-IF-CONTENT"))
-    if content is None:
+    if not scan.has_content:
         errors.append("Missing REQ-IF-CONTENT element")
         return {"valid": False, "errors": errors,
                 "spec_count": 0, "object_count": 0}
 
-    # --- DATATYPES ---
-    datatypes_el = content.find(_tag("reqif", "DATATYPES"))
-    if datatypes_el is None:
-        errors.append("Missing DATATYPES element")
-
-    # --- SPEC-TYPES ---
-    spec_types_el = content.find(_tag("reqif", "SPEC-TYPES"))
-    if spec_types_el is None:
-        errors.append("Missing SPEC-TYPES element")
-
-    # --- SPEC-OBJECTS ---
-    spec_objects_el = content.find(_tag("reqif", "SPEC-OBJECTS"))
-    if spec_objects_el is not None:
-        object_count = len(spec_objects_el.findall(_tag("reqif", "SPEC-OBJECT")))
-    else:
-        errors.append("Missing SPEC-OBJECTS element")
-
-    # --- SPECIFICATIONS ---
-    specs_el = content.find(_tag("reqif", "SPECIFICATIONS"))
-    if specs_el is not None:
-        spec_count = len(specs_el.findall(_tag("reqif", "SPECIFICATION")))
-    else:
-        errors.append("Missing SPECIFICATIONS element")
-
-    # --- SPEC-RELATIONS (optional but note if missing) ---
-    relations_el = content.find(_tag("reqif", "SPEC-RELATIONS"))
-    if relations_el is None:
-        # Not an error — some exports omit relations
-        pass
+    # --- DATATYPES / SPEC-TYPES / SPEC-OBJECTS / SPECIFICATIONS ---
+    # (SPEC-RELATIONS is optional — some exports omit relations)
+    for section in ("DATATYPES", "SPEC-TYPES", "SPEC-OBJECTS", "SPECIFICATIONS"):
+        if section not in scan.sections:
+            errors.append(f"Missing {section} element")
 
     valid = len(errors) == 0
     return {
         "valid": valid,
         "errors": errors,
-        "spec_count": spec_count,
-        "object_count": object_count,
+        "spec_count": scan.spec_count,
+        "object_count": scan.object_count,
     }
 
 
+def _scan_and_validate(file_path: str, extract: bool) -> tuple:
+    """Stream *file_path* once; return ``(scan or None, validation)``."""
+    try:
+        scan = _scan_reqif(file_path, extract=extract)
+    except ET.ParseError as exc:
+        return None, {"valid": False, "errors": [f"XML parse error: {exc}"],
+                      "spec_count": 0, "object_count": 0}
+    except FileNotFoundError:
+        return None, {"valid": False, "errors": [f"File not found: {file_path}"],
+                      "spec_count": 0, "object_count": 0}
+    return scan, _validate_scan(scan)
+
+
+def validate_reqif(file_path: str) -> dict:
+    """Validate that *file_path* is a structurally sound ReqIF 1.2 document.
+
+    Returns::
+
+        {
+            "valid": bool,
+            "errors": [str, ...],
+            "spec_count": int,
+            "object_count": int,
+        }
+    """
+    return _scan_and_validate(file_path, extract=False)[1]
+
+
 # ===================================================================
 # Extraction helpers
 # ===================================================================
 
-def _extract_datatypes(root, ns: dict) -> dict:
-    """Extract ``DATATYPE-DEFINITION-*`` elements from *DATATYPES*.
+def _extract_datatypes(datatypes_el) -> dict:
+    """Extract ``DATATYPE-DEFINITION-*`` elements from a *DATATYPES* element.
 
     Returns ``{identifier: definition_dict}`` for STRING, ENUMERATION,
     INTEGER, DATE, BOOLEAN, and XHTML datatype definitions.
     """
     datatypes: dict = {}
-    content = root.find(_tag("reqif", "CORE-CONTENT")).find(
-        _tag("reqif", "REQ-IF-CONTENT")
-    )
-    datatypes_el = content.find(_tag("reqif", "DATATYPES"))
-    if datatypes_el is None:
-        return datatypes
 
     # Map of local tag suffix → friendly type name
     type_tags = {
@@ -295,18 +268,23 @@ def _extract_datatypes(root, ns: dict) -> dict:
     return datatypes
 
 
-def _extract_spec_types(root, ns: dict) -> dict:
-    """Extract ``SPEC-OBJECT-TYPE`` definitions and their attribute defs.
+def _enum_value_names(datatypes: dict) -> dict:
+    """Index enumeration values: ``{ENUM-VALUE identifier: long_name}``."""
+    names: dict = {}
+    for dt in datatypes.values():
+        if dt.get("type") == "enum":
+            for ev in dt.get("values", []):
+                names[ev["id"]] = ev["long_name"]
+    return names
+
+
+def _extract_spec_types(spec_types_el) -> dict:
+    """Extract ``SPEC-OBJECT-TYPE`` definitions and their attribute defs from
+    a *SPEC-TYPES* element.
 
     Returns ``{type_identifier: {name, attributes: {attr_id: attr_def}}}``
     """
     spec_types: dict = {}
-    content = root.find(_tag("reqif", "CORE-CONTENT")).find(
-        _tag("reqif", "REQ-IF-CONTENT")
-    )
-    spec_types_el = content.find(_tag("reqif", "SPEC-TYPES"))
-    if spec_types_el is None:
-        return spec_types
 
     for sot in spec_types_el.findall(_tag("reqif", "SPEC-OBJECT-TYPE")):
         type_id = sot.get("IDENTIFIER", "")
@@ -365,62 +343,57 @@ def _extract_spec_types(root, ns: dict) -> dict:
     return spec_types
 
 
-def _extract_spec_objects(root, ns: dict, datatypes: dict,
-                          spec_types: dict) -> list:
-    """Extract all ``SPEC-OBJECT`` elements (individual requirements).
+def _extract_spec_object(so, datatypes: dict, spec_types: dict,
+                         enum_values: dict) -> dict:
+    """Extract one ``SPEC-OBJECT`` element (an individual requirement).
 
-    Each requirement's raw attributes are resolved via *datatypes* and
-    *spec_types*, then mapped through ``_map_doors_attributes`` to produce
-    normalised field names.
+    The requirement's raw attributes are resolved via *datatypes*,
+    *spec_types* and the *enum_values* index, then mapped through
+    ``_map_doors_attributes`` to produce normalised field names.
     """
-    objects: list[dict] = []
-    content = root.find(_tag("reqif", "CORE-CONTENT")).find(
-        _tag("reqif", "REQ-IF-CONTENT")
-    )
-    spec_objects_el = content.find(_tag("reqif", "SPEC-OBJECTS"))
-    if spec_objects_el is None:
-        return objects
-
-    for so in spec_objects_el.findall(_tag("reqif", "SPEC-OBJECT")):
-        obj_id = so.get("IDENTIFIER", "")
-        obj_long = so.get("LONG-NAME", "")
-        last_change = so.get("LAST-CHANGE", "")
-
-        # Determine the SPEC-OBJECT-TYPE reference
-        type_ref = None
-        type_el = so.find(_tag("reqif", "TYPE"))
-        if type_el is not None:
-            ref_child = type_el.find(_tag("reqif", "SPEC-OBJECT-TYPE-REF"))
-            if ref_child is not None:
-                type_ref = (ref_child.text or "").strip()
-
-        # Collect attribute values
-        raw_attrs: dict = {}
-        values_el = so.find(_tag("reqif", "VALUES"))
-        if values_el is not None:
-            raw_attrs = _parse_attribute_values(values_el, ns, datatypes,
-                                                spec_types, type_ref)
-
-        obj = {
-            "reqif_identifier": obj_id,
-            "long_name": obj_long,
-            "last_change": last_change,
-            "type_ref": type_ref,
-            "raw_attributes": raw_attrs,
-        }
-
-        # Map to standard DOORS fields
-        obj = _map_doors_attributes(obj, datatypes, spec_types)
-        objects.append(obj)
+    obj_id = so.get("IDENTIFIER", "")
+    obj_long = so.get("LONG-NAME", "")
+    last_change = so.get("LAST-CHANGE", "")
+
+    # Determine the SPEC-OBJECT-TYPE reference
+    type_ref = None
+    type_el = so.find(_tag("reqif", "TYPE"))
+    if type_el is not None:
+        ref_child = type_el.find(_tag("reqif", "SPEC-OBJECT-TYPE-REF"))
+        if ref_child is not None:
+            type_ref = (ref_child.text or "").strip()
+
+    # Collect attribute values
+    raw_attrs: dict = {}
+    values_el = so.find(_tag("reqif", "VALUES"))
+    if values_el is not None:
+        raw_attrs = _parse_attribute_values(values_el, NS, datatypes,
+                                            spec_types, type_ref, enum_values)
+
+    obj = {
+        "reqif_identifier": obj_id,
+        "long_name": obj_long,
+        "last_change": last_change,
+        "type_ref": type_ref,
+        "raw_attributes": raw_attrs,
+    }
 
-    return objects
+    # Map to standard DOORS fields
+    return _map_doors_attributes(obj, datatypes, spec_types)
 
 
 def _parse_attribute_values(values_el, ns: dict, datatypes: dict,
                             spec_types: dict,
-                            type_ref: str | None) -> dict:
-    """Parse ``VALUES`` children into ``{long_name: value}``."""
+                            type_ref: str | None,
+                            enum_values: dict | None = None) -> dict:
+    """Parse ``VALUES`` children into ``{long_name: value}``.
+
+    *enum_values* is the ``_enum_value_names`` index of *datatypes*; it is
+    built on demand when not supplied.
+    """
     result: dict = {}
+    if enum_values is None:
+        enum_values = _enum_value_names(datatypes)
 
     attr_value_tags = {
         "ATTRIBUTE-VALUE-STRING": "string",
@@ -469,14 +442,7 @@ def _parse_attribute_values(values_el, ns: dict, datatypes: dict,
                     ):
                         ref_id = (eref.text or "").strip()
                         # Resolve enum value long name from datatypes
-                        resolved = ref_id
-                        for dt in datatypes.values():
-                            if dt.get("type") == "enum":
-                                for ev in dt.get("values", []):
-                                    if ev["id"] == ref_id:
-                                        resolved = ev["long_name"]
-                                        break
-                        enum_refs.append(resolved)
+                        enum_refs.append(enum_values.get(ref_id, ref_id))
                     value = ", ".join(enum_refs) if enum_refs else ""
             elif kind == "integer":
                 value = av.get("THE-VALUE", "")
@@ -493,103 +459,81 @@ def _parse_attribute_values(values_el, ns: dict, datatypes: dict,
     return result
 
 
-def _extract_spec_relations(root, ns: dict) -> list:
-    """Extract ``SPEC-RELATION`` elements (parent-child, derives, etc.)."""
-    relations: list[dict] = []
-    content = root.find(_tag("reqif", "CORE-CONTENT")).find(
-        _tag("reqif", "REQ-IF-CONTENT")
-    )
-    relations_el = content.find(_tag("reqif", "SPEC-RELATIONS"))
-    if relations_el is None:
-        return relations
-
-    for sr in relations_el.findall(_tag("reqif", "SPEC-RELATION")):
-        rel_id = sr.get("IDENTIFIER", "")
-        long_name = sr.get("LONG-NAME", "")
-        last_change = sr.get("LAST-CHANGE", "")
-
-        # Type reference
-        type_ref = None
-        type_el = sr.find(_tag("reqif", "TYPE"))
-        if type_el is not None:
-            ref_child = type_el.find(
-                _tag("reqif", "SPEC-RELATION-TYPE-REF")
-            )
-            if ref_child is not None:
-                type_ref = (ref_child.text or "").strip()
-
-        # Source
-        source_ref = None
-        source_el = sr.find(_tag("reqif", "SOURCE"))
-        if source_el is not None:
-            ref_child = source_el.find(_tag("reqif", "SPEC-OBJECT-REF"))
-            if ref_child is not None:
-                source_ref = (ref_child.text or "").strip()
+def _extract_spec_relation(sr) -> dict:
+    """Extract one ``SPEC-RELATION`` element (parent-child, derives, etc.)."""
+    rel_id = sr.get("IDENTIFIER", "")
+    long_name = sr.get("LONG-NAME", "")
+    last_change = sr.get("LAST-CHANGE", "")
 
-        # Target
-        target_ref = None
-        target_el = sr.find(_tag("reqif", "TARGET"))
-        if target_el is not None:
-            ref_child = target_el.find(_tag("reqif", "SPEC-OBJECT-REF"))
-            if ref_child is not None:
-                target_ref = (ref_child.text or "").strip()
-
-        relations.append({
-            "reqif_identifier": rel_id,
-            "long_name": long_name,
-            "last_change": last_change,
-            "type_ref": type_ref,
-            "source_ref": source_ref,
-            "target_ref": target_ref,
-        })
+    # Type reference
+    type_ref = None
+    type_el = sr.find(_tag("reqif", "TYPE"))
+    if type_el is not None:
+        ref_child = type_el.find(
+            _tag("reqif", "SPEC-RELATION-TYPE-REF")
+        )
+        if ref_child is not None:
+            type_ref = (ref_child.text or "").strip()
+
+    # Source
+    source_ref = None
+    source_el = sr.find(_tag("reqif", "SOURCE"))
+    if source_el is not None:
+        ref_child = source_el.find(_tag("reqif", "SPEC-OBJECT-REF"))
+        if ref_child is not None:
+            source_ref = (ref_child.text or "").strip()
+
+    # Target
+    target_ref = None
+    target_el = sr.find(_tag("reqif", "TARGET"))
+    if target_el is not None:
+        ref_child = target_el.find(_tag("reqif", "SPEC-OBJECT-REF"))
+        if ref_child is not None:
+            target_ref = (ref_child.text or "").strip()
 
-    return relations
+    return {
+        "reqif_identifier": rel_id,
+        "long_name": long_name,
+        "last_change": last_change,
+        "type_ref": type_ref,
+        "source_ref": source_ref,
+        "target_ref": target_ref,
+    }
 
 
-def _extract_specifications(root, ns: dict) -> list:
-    """Extract ``SPECIFICATION`` elements (requirement modules / documents).
+def _extract_specification(spec) -> dict:
+    """Extract one ``SPECIFICATION`` element (requirement module / document).
 
-    Each specification may contain a hierarchy of ``SPEC-HIERARCHY`` children
+    A specification may contain a hierarchy of ``SPEC-HIERARCHY`` children
     that order the SPEC-OBJECTS into a tree.
     """
-    specifications: list[dict] = []
-    content = root.find(_tag("reqif", "CORE-CONTENT")).find(
-        _tag("reqif", "REQ-IF-CONTENT")
-    )
-    specs_el = content.find(_tag("reqif", "SPECIFICATIONS"))
-    if specs_el is None:
-        return specifications
-
-    for spec in specs_el.findall(_tag("reqif", "SPECIFICATION")):
-        spec_id = spec.get("IDENTIFIER", "")
-        long_name = spec.get("LONG-NAME", "")
-        last_change = spec.get("LAST-CHANGE", "")
-
-        # Type reference
-        type_ref = None
-        type_el = spec.find(_tag("reqif", "TYPE"))
-        if type_el is not None:
-            ref_child = type_el.find(
-                _tag("reqif", "SPECIFICATION-TYPE-REF")
-            )
-            if ref_child is not None:
-                type_ref = (ref_child.text or "").strip()
+    spec_id = spec.get("IDENTIFIER", "")
+    long_name = spec.get("LONG-NAME", "")
+    last_change = spec.get("LAST-CHANGE", "")
+
+    # Type reference
+    type_ref = None
+    type_el = spec.find(_tag("reqif", "TYPE"))
+    if type_el is not None:
+        ref_child = type_el.find(
+            _tag("reqif", "SPECIFICATION-TYPE-REF")
+        )
+        if ref_child is not None:
+            type_ref = (ref_child.text or "").strip()
 
-        # Collect ordered object refs from SPEC-HIERARCHY tree
-        hierarchy_refs = []
-        children_el = spec.find(_tag("reqif", "CHILDREN"))
-        if children_el is not None:
-            hierarchy_refs = _walk_hierarchy(children_el, ns)
-
-        specifications.append({
-            "reqif_identifier": spec_id,
-            "long_name": long_name,
-            "last_change": last_change,
-            "type_ref": type_ref,
-            "hierarchy": hierarchy_refs,
-        })
+    # Collect ordered object refs from SPEC-HIERARCHY tree
+    hierarchy_refs = []
+    children_el = spec.find(_tag("reqif", "CHILDREN"))
+    if children_el is not None:
+        hierarchy_refs = _walk_hierarchy(children_el, NS)
 
-    return specifications
+    return {
+        "reqif_identifier": spec_id,
+        "long_name": long_name,
+        "last_change": last_change,
+        "type_ref": type_ref,
+        "hierarchy": hierarchy_refs,
+    }
 
 
 def _walk_hierarchy(parent_el, ns: dict, depth: int = 0) -> list:
@@ -675,10 +619,164 @@ def _map_doors_attributes(spec_object: dict, datatypes: dict,
     return spec_object
 
 
+# ===================================================================
+# Streaming pass
+# ===================================================================
+
+# REQ-IF-CONTENT sections read whole when they close; the elements of every
+# other section are handled (and released) one at a time.
+_TYPE_SECTIONS = ("DATATYPES", "SPEC-TYPES")
+
+
+class _ReqifScan:
+    """Everything one streaming pass collects from a ReqIF document."""
+
+    def __init__(self):
+        self.root_tag = ""
+        self.has_core = False
+        self.has_content = False
+        self.sections: set = set()
+        self.object_count = 0
+        self.spec_count = 0
+        self.header: dict = {}
+        self.datatypes: dict | None = None
+        self.spec_types: dict | None = None
+        self.requirements: list = []
+        self.relations: list = []
+        self.specifications: list = []
+        self.file_hash = ""
+
+
+def _extract_header(rh) -> dict:
+    """Extract the ``REQ-IF-HEADER`` attributes."""
+    return {
+        "identifier": rh.get("IDENTIFIER", ""),
+        "title": rh.get("TITLE", ""),
+        "creation_time": rh.get("CREATION-TIME", ""),
+        "comment": rh.get("COMMENT", ""),
+        "repository_id": rh.get("REPOSITORY-ID", ""),
+        "req_if_tool_id": rh.get("REQ-IF-TOOL-ID", ""),
+        "req_if_version": rh.get("REQ-IF-VERSION", ""),
+        "source_tool_id": rh.get("SOURCE-TOOL-ID", ""),
+    }
+
+
+def _scan_reqif(file_path: str, extract: bool = True) -> _ReqifScan:
+    """Read *file_path* in one streaming ``iterparse`` pass.
+
+    DATATYPES and SPEC-TYPES are indexed when they close; every SPEC-OBJECT,
+    SPEC-RELATION and SPECIFICATION is extracted as it closes and its subtree
+    released, so memory is bounded by the type definitions plus the largest
+    single object.  SPEC-OBJECTs that arrive before the type sections are
+    held until the end of the document.  With ``extract=False`` only the
+    structure needed for validation is recorded.
+
+    Raises ``ET.ParseError`` on malformed XML and ``FileNotFoundError`` when
+    *file_path* does not exist.
+    """
+    scan = _ReqifScan()
+    core_tag = _tag("reqif", "CORE-CONTENT")
+    content_tag = _tag("reqif", "REQ-IF-CONTENT")
+    header_tag = _tag("reqif", "THE-HEADER")
+    req_if_header_tag = _tag("reqif", "REQ-IF-HEADER")
+    objects_tag = _tag("reqif", "SPEC-OBJECTS")
+    specs_tag = _tag("reqif", "SPECIFICATIONS")
+    section_items = {
+        objects_tag: _tag("reqif", "SPEC-OBJECT"),
+        _tag("reqif", "SPEC-RELATIONS"): _tag("reqif", "SPEC-RELATION"),
+        specs_tag: _tag("reqif", "SPECIFICATION"),
+    }
+    pending_objects: list = []
+    enum_values: dict = {}
+    stream = XmlStream(file_path)
+    stack = stream.stack
+
+    def in_content() -> bool:
+        return (len(stack) >= 3 and stack[1].tag == core_tag
+                and stack[2].tag == content_tag)
+
+    for event, elem in stream:
+        if event == "start":
+            depth = len(stack)
+            if depth == 1:
+                scan.root_tag = elem.tag
+            elif depth == 2 and elem.tag == core_tag:
+                scan.has_core = True
+            elif depth == 3 and elem.tag == content_tag and stack[1].tag == core_tag:
+                scan.has_content = True
+            elif depth == 3 and elem.tag == req_if_header_tag and stack[1].tag == header_tag:
+                scan.header = _extract_header(elem)
+            elif depth == 4 and in_content():
+                scan.sections.add(local_name(elem.tag))
+            elif depth == 5 and in_content() and section_items.get(stack[3].tag) == elem.tag:
+                if stack[3].tag == objects_tag:
+                    scan.object_count += 1
+                elif stack[3].tag == specs_tag:
+                    scan.spec_count += 1
+            continue
+
+        depth = len(stack) + 1
+        if depth >= 4 and in_content():
+            section = local_name((stack[3] if depth > 4 else elem).tag)
+            if depth > (4 if section in _TYPE_SECTIONS else 5):
+                continue  # Part of an item that has not closed yet
+
+            if extract and depth == 4 and section == "DATATYPES" and scan.datatypes is None:
+                scan.datatypes = _extract_datatypes(elem)
+                enum_values = _enum_value_names(scan.datatypes)
+            elif extract and depth == 4 and section == "SPEC-TYPES" and scan.spec_types is None:
+                scan.spec_types = _extract_spec_types(elem)
+            elif extract and depth == 5 and section_items.get(stack[-1].tag) == elem.tag:
+                if section == "SPEC-OBJECTS":
+                    if pending_objects or scan.datatypes is None or scan.spec_types is None:
+                        pending_objects.append(elem)
+                        continue  # Resolved once the type sections are read
+                    scan.requirements.append(_extract_spec_object(
+                        elem, scan.datatypes, scan.spec_types, enum_values))
+                elif section == "SPEC-RELATIONS":
+                    scan.relations.append(_extract_spec_relation(elem))
+                else:
+                    scan.specifications.append(_extract_specification(elem))
+
+        if stack:
+            stream.release(elem)
+
+    if scan.datatypes is None:
+        scan.datatypes = {}
+    if scan.spec_types is None:
+        scan.spec_types = {}
+    if pending_objects:
+        enum_values = _enum_value_names(scan.datatypes)
+        for so in pending_objects:
+            scan.requirements.append(_extract_spec_object(
+                so, scan.datatypes, scan.spec_types, enum_values))
+
+    scan.file_hash = stream.file_hash
+    return scan
+
+
 # ===================================================================
 # Full parse
 # ===================================================================
 
+def _parse_result(file_path: str, scan: _ReqifScan) -> dict:
+    """Build the ``parse_reqif`` result from a finished extracting scan."""
+    metadata = {
+        "header": scan.header,
+        "specifications": scan.specifications,
+        "spec_types_count": len(scan.spec_types),
+        "datatype_count": len(scan.datatypes),
+        "file": str(file_path),
+    }
+
+    return {
+        "requirements": scan.requirements,
+        "relations": scan.relations,
+        "metadata": metadata,
+        "datatypes": scan.datatypes,
+    }
+
+
 def parse_reqif(file_path: str) -> dict:
     """Parse a ReqIF 1.2 XML file.
 
@@ -691,46 +789,7 @@ def parse_reqif(file_path: str) -> dict:
             "datatypes": {id: datatype def},
         }
     """
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-
-    # Header metadata
-    header_el = root.find(_tag("reqif", "THE-HEADER"))
-    header = {}
-    if header_el is not None:
-        rh = header_el.find(_tag("reqif", "REQ-IF-HEADER"))
-        if rh is not None:
-            header = {
-                "identifier": rh.get("IDENTIFIER", ""),
-                "title": rh.get("TITLE", ""),
-                "creation_time": rh.get("CREATION-TIME", ""),
-                "comment": rh.get("COMMENT", ""),
-                "repository_id": rh.get("REPOSITORY-ID", ""),
-                "req_if_tool_id": rh.get("REQ-IF-TOOL-ID", ""),
-                "req_if_version": rh.get("REQ-IF-VERSION", ""),
-                "source_tool_id": rh.get("SOURCE-TOOL-ID", ""),
-            }
-
-    datatypes = _extract_datatypes(root, NS)
-    spec_types = _extract_spec_types(root, NS)
-    requirements = _extract_spec_objects(root, NS, datatypes, spec_types)
-    relations = _extract_spec_relations(root, NS)
-    specifications = _extract_specifications(root, NS)
-
-    metadata = {
-        "header": header,
-        "specifications": specifications,
-        "spec_types_count": len(spec_types),
-        "datatype_count": len(datatypes),
-        "file": str(file_path),
-    }
-
-    return {
-        "requirements": requirements,
-        "relations": relations,
-        "metadata": metadata,
-        "datatypes": datatypes,
-    }
+    return _parse_result(file_path, _scan_reqif(file_path))
 
 
 # ===================================================================
@@ -763,8 +822,8 @@ def import_reqif(project_id: str, file_path: str,
     timestamp = _now()
     error_details: list[str] = []
 
-    # 1. Validate
-    validation = validate_reqif(file_path)
+    # 1. Validate (the same streaming pass also parses and hashes)
+    scan, validation = _scan_and_validate(file_path, extract=True)
     if not validation["valid"]:
         return {
             "import_id": None,
@@ -776,10 +835,10 @@ def import_reqif(project_id: str, file_path: str,
         }
 
     # 2. File hash
-    source_hash = _file_hash(file_path)
+    source_hash = scan.file_hash
 
     # 3. Parse
-    parsed = parse_reqif(file_path)
+    parsed = _parse_result(file_path, scan)
     requirements = parsed["requirements"]
     relations = parsed["relations"]
     specifications = parsed["metadata"].get("specifications", [])
@@ -821,6 +880,12 @@ def import_reqif(project_id: str, file_path: str,
                 parent_stack.append(obj_ref)
             prev_depth = depth
 
+    # reqif_identifier -> doors_id (ID index for parent and relation ends)
+    reqif_to_doors: dict[str, str] = {
+        req.get("reqif_identifier"): req.get("doors_id")
+        for req in requirements
+    }
+
     # 4. Store in DB
     conn = _get_connection(db_path)
     imported_count = 0
@@ -829,114 +894,106 @@ def import_reqif(project_id: str, file_path: str,
     try:
         cursor = conn.cursor()
 
+        req_rows = []
+        parent_rows = []
         for req in requirements:
-            try:
-                req_id = _new_id()
-                doors_id = req.get("doors_id", "")
-                if not doors_id:
-                    error_details.append(
-                        f"Skipped object '{req.get('reqif_identifier')}': "
-                        f"no DOORS ID"
-                    )
-                    continue
-
-                module_name = obj_to_module.get(
-                    req.get("reqif_identifier", ""), ""
-                )
-                parent_reqif_id = obj_to_parent.get(
-                    req.get("reqif_identifier"), None
-                )
-                # Resolve parent's doors_id
-                parent_req_db_id = None
-                if parent_reqif_id:
-                    # Lookup from already-stored rows
-                    cursor.execute(
-                        "SELECT id FROM doors_requirements "
-                        "WHERE project_id = ? AND doors_id = ?",
-                        (project_id, parent_reqif_id),
-                    )
-                    prow = cursor.fetchone()
-                    if prow:
-                        parent_req_db_id = prow["id"]
-
-                # UPSERT: insert or update on conflict(project_id, doors_id)
-                cursor.execute(
-                    """INSERT INTO doors_requirements
-                       (id, project_id, doors_id, module_name,
-                        requirement_type, title, description, priority,
-                        status, parent_req_id, source_file, source_hash,
-                        imported_at, updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active', ?, ?, ?, ?, ?)
-                       ON CONFLICT(project_id, doors_id) DO UPDATE SET
-                           module_name = excluded.module_name,
-                           requirement_type = excluded.requirement_type,
-                           title = excluded.title,
-                           description = excluded.description,
-                           priority = excluded.priority,
-                           parent_req_id = excluded.parent_req_id,
-                           source_file = excluded.source_file,
-                           source_hash = excluded.source_hash,
-                           updated_at = excluded.updated_at
-                    """,
-                    (
-                        req_id,
-                        project_id,
-                        doors_id,
-                        module_name,
-                        req.get("requirement_type"),
-                        req.get("title", ""),
-                        req.get("description", ""),
-                        req.get("priority"),
-                        parent_req_db_id,
-                        str(file_path),
-                        source_hash,
-                        timestamp,
-                        timestamp,
-                    ),
-                )
-                imported_count += 1
-            except Exception as exc:
+            doors_id = req.get("doors_id", "")
+            if not doors_id:
                 error_details.append(
-                    f"Error importing '{req.get('doors_id', '?')}': {exc}"
+                    f"Skipped object '{req.get('reqif_identifier')}': "
+                    f"no DOORS ID"
                 )
+                continue
+
+            module_name = obj_to_module.get(
+                req.get("reqif_identifier", ""), ""
+            )
+            req_rows.append((
+                _new_id(),
+                project_id,
+                doors_id,
+                module_name,
+                req.get("requirement_type"),
+                req.get("title", ""),
+                req.get("description", ""),
+                req.get("priority"),
+                str(file_path),
+                source_hash,
+                timestamp,
+                timestamp,
+            ))
+            parent_reqif_id = obj_to_parent.get(
+                req.get("reqif_identifier"), None
+            )
+            if parent_reqif_id:
+                parent_doors = reqif_to_doors.get(parent_reqif_id) or parent_reqif_id
+                parent_rows.append((project_id, parent_doors, project_id, doors_id))
+
+        # UPSERT: insert or update on conflict(project_id, doors_id)
+        imported_count = bulk_insert(
+            conn,
+            """INSERT INTO doors_requirements
+               (id, project_id, doors_id, module_name,
+                requirement_type, title, description, priority,
+                status, parent_req_id, source_file, source_hash,
+                imported_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active', NULL, ?, ?, ?, ?)
+               ON CONFLICT(project_id, doors_id) DO UPDATE SET
+                   module_name = excluded.module_name,
+                   requirement_type = excluded.requirement_type,
+                   title = excluded.title,
+                   description = excluded.description,
+                   priority = excluded.priority,
+                   parent_req_id = excluded.parent_req_id,
+                   source_file = excluded.source_file,
+                   source_hash = excluded.source_hash,
+                   updated_at = excluded.updated_at
+            """,
+            req_rows,
+            lambda row: f"Error importing '{row[2]}'",
+            error_details,
+        )
+
+        # Resolve parents once every row of this import is stored, so a
+        # child no longer depends on its parent appearing earlier in the file
+        if parent_rows:
+            cursor.executemany(
+                """UPDATE doors_requirements SET parent_req_id = (
+                       SELECT p.id FROM doors_requirements p
+                       WHERE p.project_id = ? AND p.doors_id = ?)
+                   WHERE project_id = ? AND doors_id = ?""",
+                parent_rows,
+            )
 
         # Store relations (informational — linked via reqif identifiers)
+        relation_rows = []
         for rel in relations:
-            try:
-                # Resolve source and target to doors_requirement IDs
-                src_ref = rel.get("source_ref", "")
-                tgt_ref = rel.get("target_ref", "")
-
-                # Find doors_id for source / target via the parsed objects
-                src_doors = None
-                tgt_doors = None
-                for req in requirements:
-                    if req.get("reqif_identifier") == src_ref:
-                        src_doors = req.get("doors_id")
-                    if req.get("reqif_identifier") == tgt_ref:
-                        tgt_doors = req.get("doors_id")
-
-                if src_doors and tgt_doors:
-                    # Store as a digital_thread_link
-                    cursor.execute(
-                        """INSERT OR IGNORE INTO digital_thread_links
-                           (project_id, source_type, source_id,
-                            target_type, target_id, link_type,
-                            confidence, evidence, created_by, created_at)
-                           VALUES (?, 'doors_requirement', ?, 'doors_requirement', ?,
-                                   'derives_from', 1.0, ?, 'reqif-parser', ?)
-                        """,
-                        (
-                            project_id,
-                            src_doors,
-                            tgt_doors,
-                            f"ReqIF relation {rel.get('reqif_identifier', '')}",
-                            timestamp,
-                        ),
-                    )
-                    relation_count += 1
-            except Exception as exc:
-                error_details.append(f"Error importing relation: {exc}")
+            # Resolve source and target to doors_requirement IDs
+            src_doors = reqif_to_doors.get(rel.get("source_ref", ""))
+            tgt_doors = reqif_to_doors.get(rel.get("target_ref", ""))
+            if src_doors and tgt_doors:
+                relation_rows.append((
+                    project_id,
+                    src_doors,
+                    tgt_doors,
+                    f"ReqIF relation {rel.get('reqif_identifier', '')}",
+                    timestamp,
+                ))
+
+        # Store as digital_thread_links
+        relation_count = bulk_insert(
+            conn,
+            """INSERT OR IGNORE INTO digital_thread_links
+               (project_id, source_type, source_id,
+                target_type, target_id, link_type,
+                confidence, evidence, created_by, created_at)
+               VALUES (?, 'doors_requirement', ?, 'doors_requirement', ?,
+                       'derives_from', 1.0, ?, 'reqif-parser', ?)
+            """,
+            relation_rows,
+            lambda row: "Error importing relation",
+            error_details,
+        )
 
         # 5. Record in model_imports
         status = "completed"
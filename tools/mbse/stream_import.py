@@ -0,0 +1,120 @@
+# [TEMPLATE: CUI // SP-CTI]
+#!/usr/bin/env python3
+"""Streaming helpers shared by the MBSE model importers.
+
+Cameo/MagicDraw XMI and DOORS NG ReqIF exports routinely run to hundreds of
+megabytes.  ``XmlStream`` walks such a document once with
+``ElementTree.iterparse``, hashing the bytes as they are read and letting the
+caller detach every finished subtree so peak memory is bounded by the largest
+element the caller chooses to keep, not by the document.
+
+``bulk_insert`` loads parsed rows with a single ``executemany`` inside a
+savepoint and only falls back to row-by-row inserts (to report which rows
+failed) when the batch is rejected.
+
+Uses only the Python standard library (air-gapped environment).
+"""
+
+import hashlib
+import sqlite3
+import xml.etree.ElementTree as ET
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+READ_CHUNK_BYTES = 1 << 16
+
+
+class _HashingReader:
+    """File wrapper that feeds every byte handed to the parser into SHA-256."""
+
+    def __init__(self, fh, digest):
+        self._fh = fh
+        self._digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fh.read(size)
+        self._digest.update(data)
+        return data
+
+
+class XmlStream:
+    """Single-pass ``iterparse`` walker with subtree release.
+
+    Iterating yields ``(event, element)`` pairs for ``"start"`` and ``"end"``
+    events.  ``stack`` holds the open ancestors of the current element (on a
+    ``"start"`` event it also includes the element itself).  After handling an
+    ``"end"`` event the caller may call :meth:`release` to detach the element
+    from its parent; anything not released stays attached to the tree.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self.stack: List[ET.Element] = []
+        self.namespace_uris: List[str] = []
+        self._digest = hashlib.sha256()
+
+    @property
+    def file_hash(self) -> str:
+        """SHA-256 of the bytes read so far (the whole file once exhausted)."""
+        return self._digest.hexdigest()
+
+    def __iter__(self) -> Iterator[Tuple[str, ET.Element]]:
+        with open(self.file_path, "rb") as raw:
+            reader = _HashingReader(raw, self._digest)
+            events = ET.iterparse(reader, events=("start-ns", "start", "end"))
+            for event, item in events:
+                if event == "start-ns":
+                    if item[1] not in self.namespace_uris:
+                        self.namespace_uris.append(item[1])
+                    continue
+                if event == "start":
+                    self.stack.append(item)
+                else:
+                    self.stack.pop()
+                yield event, item
+            # Trailing bytes after the root element still count toward the hash
+            while reader.read(READ_CHUNK_BYTES):
+                pass
+
+    def release(self, element: ET.Element) -> None:
+        """Detach a just-ended *element* from its parent and free its subtree."""
+        if self.stack:
+            self.stack[-1].remove(element)
+        element.clear()
+
+
+def local_name(tag: str) -> str:
+    """Strip a Clark-notation namespace from *tag*."""
+    return tag.rsplit("}", 1)[-1] if tag.startswith("{") else tag
+
+
+def bulk_insert(conn: sqlite3.Connection, sql: str, rows: Sequence[tuple],
+                describe: Callable[[tuple], str],
+                error_details: List[str]) -> int:
+    """Insert *rows* with one ``executemany`` and return how many were stored.
+
+    The batch runs inside a savepoint.  If SQLite rejects any row the batch
+    is rolled back and replayed one row at a time so that only the offending
+    rows are skipped; each failure is appended to *error_details* as
+    ``"<describe(row)>: <error>"``.
+    """
+    if not rows:
+        return 0
+    conn.execute("SAVEPOINT bulk_insert")
+    try:
+        conn.executemany(sql, rows)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO bulk_insert")
+        stored = 0
+        for row in rows:
+            try:
+                conn.execute(sql, row)
+                stored += 1
+            except sqlite3.Error as exc:
+                error_details.append(f"{describe(row)}: {exc}")
+        conn.execute("RELEASE bulk_insert")
+        return stored
+    conn.execute("RELEASE bulk_insert")
+    return len(rows)
+
+
+# [TEMPLATE: CUI // SP-CTI]
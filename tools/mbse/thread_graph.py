@@ -0,0 +1,218 @@
+# [TEMPLATE: CUI // SP-CTI]
+#!/usr/bin/env python3
+"""In-memory graph engine for the ICDEV digital thread.
+
+Loads a project's ``digital_thread_links`` once into forward and backward
+adjacency lists so traces, orphan/gap detection and integrity checks walk
+dicts instead of issuing one SQL query per visited node.
+
+Loaded graphs are cached per (database, project).  A cached graph is reused
+only while the project's link fingerprint (row count, max id, id sum) is
+unchanged, so links written by other tools (ReqIF import, model code
+generator, compliance bridge) are picked up on the next call.
+``digital_thread.create_link`` / ``delete_link`` also drop the entry
+explicitly via :func:`invalidate_graph`.
+
+Uses only the Python standard library (air-gapped environment).
+"""
+
+import sqlite3
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+NodeKey = Tuple[str, str]
+
+
+class ThreadLink(NamedTuple):
+    """One row of ``digital_thread_links``."""
+
+    id: int
+    source_type: str
+    source_id: str
+    target_type: str
+    target_id: str
+    link_type: str
+    confidence: float
+
+    @property
+    def source(self) -> NodeKey:
+        return (self.source_type, self.source_id)
+
+    @property
+    def target(self) -> NodeKey:
+        return (self.target_type, self.target_id)
+
+
+_FINGERPRINT_SQL = (
+    "SELECT COUNT(*), COALESCE(MAX(id), 0), TOTAL(id) "
+    "FROM digital_thread_links WHERE project_id = ?"
+)
+
+_LINKS_SQL = (
+    "SELECT id, source_type, source_id, target_type, target_id, link_type, confidence "
+    "FROM digital_thread_links WHERE project_id = ? ORDER BY id"
+)
+
+
+class ThreadGraph:
+    """Adjacency view of one project's digital thread links."""
+
+    def __init__(self, project_id: str, links: Iterable[ThreadLink],
+                 fingerprint: Tuple = ()):
+        self.project_id = project_id
+        self.fingerprint = fingerprint
+        self.links: List[ThreadLink] = list(links)
+        self.out: Dict[NodeKey, List[ThreadLink]] = {}
+        self.inc: Dict[NodeKey, List[ThreadLink]] = {}
+        for link in self.links:
+            self.out.setdefault(link.source, []).append(link)
+            self.inc.setdefault(link.target, []).append(link)
+
+    def __contains__(self, key: NodeKey) -> bool:
+        return key in self.out or key in self.inc
+
+    def outgoing(self, key: NodeKey, target_type: Optional[str] = None) -> List[ThreadLink]:
+        """Links leaving *key*, optionally restricted to one target type."""
+        links = self.out.get(key, ())
+        if target_type is None:
+            return list(links)
+        return [link for link in links if link.target_type == target_type]
+
+    def incoming(self, key: NodeKey, source_type: Optional[str] = None) -> List[ThreadLink]:
+        """Links arriving at *key*, optionally restricted to one source type."""
+        links = self.inc.get(key, ())
+        if source_type is None:
+            return list(links)
+        return [link for link in links if link.source_type == source_type]
+
+    def has_link(self, key: NodeKey, other_type: str) -> bool:
+        """True if *key* links to, or is linked from, any node of *other_type*."""
+        return (any(link.target_type == other_type for link in self.out.get(key, ()))
+                or any(link.source_type == other_type for link in self.inc.get(key, ())))
+
+    def node_ids(self, element_type: str) -> List[str]:
+        """Sorted IDs of every *element_type* node that appears in any link."""
+        ids = {k[1] for k in self.out if k[0] == element_type}
+        ids.update(k[1] for k in self.inc if k[0] == element_type)
+        return sorted(ids)
+
+    def links_of(self, source_type: str, target_type: str) -> List[ThreadLink]:
+        """All ``source_type -> target_type`` links in insertion (id) order."""
+        return [link for link in self.links
+                if link.source_type == source_type and link.target_type == target_type]
+
+    def trace(self, start: NodeKey, forward: bool = True,
+              max_depth: int = 10) -> Tuple[List[dict], List[Tuple[dict, NodeKey]]]:
+        """Breadth-first trace tree from *start*.
+
+        Returns ``(links, unnamed)`` where *links* is the nested tree used by
+        ``digital_thread.get_forward_trace`` / ``get_backward_trace`` and
+        *unnamed* pairs each node dict with its key so the caller can fill in
+        ``name`` with one batched lookup.  Every edge is reported; nodes
+        already visited are not expanded again.
+        """
+        end_key = "target" if forward else "source"
+        adjacency = self.out if forward else self.inc
+        root: List[dict] = []
+        unnamed: List[Tuple[dict, NodeKey]] = []
+        visited = {start}
+        queue = deque([(start, root, 0)])
+        while queue:
+            key, parent_links, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for link in adjacency.get(key, ()):
+                other = link.target if forward else link.source
+                endpoint = {"type": other[0], "id": other[1], "name": other[1]}
+                unnamed.append((endpoint, other))
+                children: List[dict] = []
+                parent_links.append({
+                    "link_type": link.link_type,
+                    "confidence": link.confidence,
+                    end_key: endpoint,
+                    "children": children,
+                })
+                if other not in visited:
+                    visited.add(other)
+                    queue.append((other, children, depth + 1))
+        return root, unnamed
+
+    def cycle_link_ids(self) -> List[int]:
+        """IDs of links that close a cycle during a depth-first walk.
+
+        Iterative so that long chains cannot exhaust the recursion limit.
+        """
+        visited = set()
+        in_stack = set()
+        cycle_links = set()
+        for root in self.out:
+            if root in visited:
+                continue
+            visited.add(root)
+            in_stack.add(root)
+            stack = [(root, iter(self.out.get(root, ())))]
+            while stack:
+                node, edges = stack[-1]
+                for link in edges:
+                    neighbor = link.target
+                    if neighbor in in_stack:
+                        cycle_links.add(link.id)
+                    elif neighbor not in visited:
+                        visited.add(neighbor)
+                        in_stack.add(neighbor)
+                        stack.append((neighbor, iter(self.out.get(neighbor, ()))))
+                        break
+                else:
+                    in_stack.discard(node)
+                    stack.pop()
+        return sorted(cycle_links)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+_graph_cache: Dict[Tuple[str, str], ThreadGraph] = {}
+_graph_cache_lock = threading.Lock()
+
+
+def _fingerprint(conn: sqlite3.Connection, project_id: str) -> Tuple:
+    return tuple(conn.execute(_FINGERPRINT_SQL, (project_id,)).fetchone())
+
+
+def load_graph(conn: sqlite3.Connection, project_id: str, db_path=None) -> ThreadGraph:
+    """Return the project's thread graph, reusing the cached copy if current.
+
+    *db_path* keys the cache; without it the graph is always loaded fresh.
+    """
+    fingerprint = _fingerprint(conn, project_id)
+    cache_key = (str(db_path), project_id) if db_path is not None else None
+    if cache_key is not None:
+        with _graph_cache_lock:
+            graph = _graph_cache.get(cache_key)
+        if graph is not None and graph.fingerprint == fingerprint:
+            return graph
+
+    rows = conn.execute(_LINKS_SQL, (project_id,)).fetchall()
+    graph = ThreadGraph(project_id, (ThreadLink(*tuple(r)) for r in rows), fingerprint)
+    if cache_key is not None:
+        with _graph_cache_lock:
+            _graph_cache[cache_key] = graph
+    return graph
+
+
+def invalidate_graph(db_path, project_id: Optional[str] = None) -> None:
+    """Drop cached graphs for *db_path* (one project, or all when omitted)."""
+    with _graph_cache_lock:
+        for key in list(_graph_cache):
+            if key[0] == str(db_path) and (project_id is None or key[1] == project_id):
+                del _graph_cache[key]
+
+
+def clear_graph_cache() -> None:
+    """Drop every cached graph."""
+    with _graph_cache_lock:
+        _graph_cache.clear()
+
+
+# [TEMPLATE: CUI // SP-CTI]
@@ -7,6 +7,13 @@ Parses MagicDraw/Cameo XMI files using Python stdlib xml.etree.ElementTree
 activities, requirements, state machines, use cases, and all relationship types
 (structural + SysML dependency stereotypes).
 
+The document is read in a single streaming ``iterparse`` pass: every
+``packagedElement`` is classified as it closes, its subtree is released
+immediately afterwards, and cross-references (stereotype applications,
+qualified-name parents, relationship ends) are resolved afterwards through
+xmi:id-keyed dictionaries.  Memory stays bounded by the largest single model
+element rather than the size of the export.
+
 Stores parsed elements into the ICDEV SQLite database (sysml_elements,
 sysml_relationships, model_imports tables) and records an immutable audit
 trail entry.
@@ -24,9 +31,11 @@ import sqlite3
 import sys
 import uuid
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # Path constants
@@ -34,6 +43,11 @@ from typing import Any, Dict, List, Optional, Tuple
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.mbse.stream_import import XmlStream, bulk_insert, local_name  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Audit logger — graceful fallback for standalone execution
 # ---------------------------------------------------------------------------
@@ -138,37 +152,11 @@ def _xmi_type(element: ET.Element, ns: Dict[str, str]) -> Optional[str]:
     return _attr(element, "type", ns)
 
 
-def _qualified_name(element: ET.Element, root: ET.Element) -> str:
-    """Build a colon-separated qualified name by walking up parent map."""
-    # ElementTree doesn't maintain parent references natively, so we build
-    # one if not yet cached on the root element.
-    parent_map = getattr(root, "_parent_map", None)
-    if parent_map is None:
-        parent_map = {c: p for p in root.iter() for c in p}
-        root._parent_map = parent_map  # type: ignore[attr-defined]
-    parts: List[str] = []
-    cur = element
-    while cur is not None:
-        name = cur.get("name")
-        if name:
-            parts.append(name)
-        cur = parent_map.get(cur)
-    parts.reverse()
-    return "::".join(parts) if parts else ""
-
-
-def _find_all_ns(root: ET.Element, tag_local: str, ns: Dict[str, str],
-                 ns_key: str = "uml") -> List[ET.Element]:
-    """Find all descendant elements matching *tag_local* under any known
-    namespace variant for *ns_key*.
-    """
-    results: List[ET.Element] = []
-    uri = ns.get(ns_key, "")
-    if uri:
-        results.extend(root.iter(f"{{{uri}}}{tag_local}"))
-    # Also try without namespace (some exports omit it)
-    results.extend(e for e in root.iter(tag_local) if e not in results)
-    return results
+def _qualified_name(ancestors: Iterable[ET.Element], element: ET.Element) -> str:
+    """Build a ``::``-separated qualified name from the open ancestor stack."""
+    parts = [a.get("name") for a in ancestors]
+    parts.append(element.get("name"))
+    return "::".join(p for p in parts if p)
 
 
 def _get_description(element: ET.Element, ns: Dict[str, str]) -> str:
@@ -196,43 +184,23 @@ def _get_description(element: ET.Element, ns: Dict[str, str]) -> str:
 # Namespace detection
 # ---------------------------------------------------------------------------
 
-def _detect_namespaces(root: ET.Element) -> Dict[str, str]:
-    """Detect XMI/UML/SysML/MagicDraw namespaces from the root element.
+def _match_namespaces(declared_uris: Iterable[str]) -> Dict[str, str]:
+    """Map XMI/UML/SysML/MagicDraw keys to the namespace URIs a document uses.
 
-    Inspects the root tag, registered namespace map, and tag prefixes across
-    all children.  Returns a dict mapping short keys ('xmi', 'uml', 'sysml',
-    'md') to their detected namespace URIs.
+    *declared_uris* are the URIs declared in the document (``start-ns``
+    events of the streaming parse).  Returns a dict mapping short keys
+    ('xmi', 'uml', 'sysml', 'md') to detected URIs, falling back to the
+    well-known defaults for anything not declared.
     """
+    declared = set(declared_uris)
     detected: Dict[str, str] = {}
 
-    # 1. Collect all namespace URIs declared in the document.
-    #    ElementTree exposes them through iterparse or the tag itself.
-    declared_uris: set = set()
-
-    # Root tag may carry a namespace: {uri}LocalName
-    root_tag = root.tag
-    if root_tag.startswith("{"):
-        uri = root_tag[1:root_tag.index("}")]
-        declared_uris.add(uri)
-
-    # Walk all elements for additional namespace URIs
-    for elem in root.iter():
-        tag = elem.tag
-        if tag.startswith("{"):
-            declared_uris.add(tag[1:tag.index("}")])
-        # Attributes may also carry namespace URIs
-        for attr_name in elem.attrib:
-            if attr_name.startswith("{"):
-                declared_uris.add(attr_name[1:attr_name.index("}")])
-
-    # 2. Match declared URIs to known namespace keys
     for key, alternatives in NAMESPACE_ALTERNATIVES.items():
         for alt_uri in alternatives:
-            if alt_uri in declared_uris:
+            if alt_uri in declared:
                 detected[key] = alt_uri
                 break
 
-    # 3. Fallback: use well-known defaults for anything not detected
     for key, default_uri in KNOWN_NAMESPACES.items():
         if key not in detected:
             detected[key] = default_uri
@@ -244,415 +212,316 @@ def _detect_namespaces(root: ET.Element) -> Dict[str, str]:
 # Stereotype resolution
 # ---------------------------------------------------------------------------
 
-def _build_stereotype_map(root: ET.Element, ns: Dict[str, str]) -> Dict[str, str]:
-    """Build a mapping from xmi:id → stereotype name.
+def _base_refs(element: ET.Element) -> List[str]:
+    """Return the ``base_*`` attribute values of a stereotype application.
 
     Cameo XMI exports stereotype applications as top-level elements whose tag
     contains the stereotype name and whose ``base_Class`` (or similar
     ``base_*``) attribute references the model element xmi:id.
-
-    Returns mapping ``{element_xmi_id: stereotype_name}``.
     """
-    stereo_map: Dict[str, str] = {}
-
-    ns.get("sysml", "")
-    ns.get("md", "")
-
-    # Iterate top-level children of root looking for stereotype applications
-    for child in root:
-        tag = child.tag
-        # Strip namespace to get local name
-        if "}" in tag:
-            local = tag.split("}", 1)[1]
-        else:
-            local = tag
-
-        # Common SysML stereotypes in Cameo exports
-        local.lower()
-        target_xmi_id: Optional[str] = None
-
-        # Look for base_Class, base_NamedElement, base_Abstraction, etc.
-        for attr_name, attr_val in child.attrib.items():
-            clean_attr = attr_name
-            if "}" in clean_attr:
-                clean_attr = clean_attr.split("}", 1)[1]
-            if clean_attr.startswith("base_"):
-                target_xmi_id = attr_val
-                break
-
-        if target_xmi_id:
-            stereo_map[target_xmi_id] = local
-
-    return stereo_map
+    return [val for name, val in element.attrib.items()
+            if local_name(name).startswith("base_")]
 
 
 # ---------------------------------------------------------------------------
-# Element extraction functions
+# Element records
 # ---------------------------------------------------------------------------
 
-def _extract_blocks(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract <<Block>> stereotyped classes from XMI.
-
-    Looks for ``packagedElement`` nodes with ``xmi:type="uml:Class"`` and
-    matches them against the stereotype map for 'Block'.
-    """
-    stereo_map = _build_stereotype_map(root, ns)
-    blocks: List[Dict[str, Any]] = []
-
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-        if xmi_t not in ("uml:Class", "Class"):
-            continue
-        xid = _xmi_id(elem, ns)
-        if not xid:
-            continue
+_CLASS_TYPES = ("uml:Class", "Class")
+_INTERFACE_TYPES = ("uml:Interface", "Interface")
+_ACTIVITY_TYPES = ("uml:Activity", "Activity")
+_STATE_MACHINE_TYPES = ("uml:StateMachine", "StateMachine")
+_USE_CASE_TYPES = ("uml:UseCase", "UseCase", "uml:Actor", "Actor")
+_SIMPLE_REL_TYPES = {
+    "uml:Dependency": "dependency", "Dependency": "dependency",
+    "uml:Realization": "realization", "Realization": "realization",
+    "uml:InterfaceRealization": "realization", "InterfaceRealization": "realization",
+    "uml:Usage": "usage", "Usage": "usage",
+}
+_ASSOCIATION_TYPES = ("uml:Association", "Association")
+_ABSTRACTION_TYPES = ("uml:Abstraction", "Abstraction")
 
-        stereo = stereo_map.get(xid, "")
-        if stereo.lower() not in ("block", "sysml::block", "sysml::blocks::block"):
-            # Also accept if no explicit stereotype but tag hints at block
-            if stereo:
-                continue  # Has a different stereotype
+# packagedElement types whose subtree is read when the element closes; the
+# subtree is kept in memory until then and released straight afterwards.
+_EXTRACTED_TYPES = frozenset(
+    _CLASS_TYPES + _INTERFACE_TYPES + _ACTIVITY_TYPES + _STATE_MACHINE_TYPES
+    + _USE_CASE_TYPES + _ASSOCIATION_TYPES + _ABSTRACTION_TYPES
+    + tuple(_SIMPLE_REL_TYPES)
+)
 
-        name = elem.get("name", "")
-        if not name:
-            continue
+_BLOCK_STEREOTYPES = ("block", "sysml::block", "sysml::blocks::block")
 
-        # Collect owned attributes (properties / value properties)
-        properties: List[Dict[str, str]] = []
-        for attr in elem.iter("ownedAttribute"):
-            prop_name = attr.get("name", "")
-            prop_type = _xmi_type(attr, ns) or ""
-            prop_id = _xmi_id(attr, ns) or ""
-            if prop_name:
-                properties.append({
-                    "name": prop_name,
-                    "type": prop_type,
-                    "xmi_id": prop_id,
-                    "visibility": attr.get("visibility", "public"),
-                })
 
-        # Collect ports
-        ports: List[Dict[str, str]] = []
-        for port in elem.iter("ownedPort"):
-            port_name = port.get("name", "")
-            port_id = _xmi_id(port, ns) or ""
-            if port_name or port_id:
-                ports.append({
-                    "name": port_name,
-                    "xmi_id": port_id,
-                    "type": _xmi_type(port, ns) or "port",
-                })
+def _class_summary(elem: ET.Element, ns: Dict[str, str], xid: str,
+                   qualified_name: str) -> Dict[str, Any]:
+    """Capture what block / interface block / requirement records need from a
+    uml:Class or uml:Interface.
 
-        blocks.append({
-            "id": _new_id(),
-            "xmi_id": xid,
-            "element_type": "block",
-            "name": name,
-            "qualified_name": _qualified_name(elem, root),
-            "stereotype": stereo or "Block",
-            "description": _get_description(elem, ns),
-            "properties": json.dumps({
-                "attributes": properties,
-                "ports": ports,
-            }),
-            "diagram_type": "bdd",
-        })
+    Stereotype applications follow the model in Cameo exports, so a class can
+    only be classified after the pass; this summary lets its subtree be
+    released in the meantime.
+    """
+    attributes: List[Dict[str, str]] = []
+    for attr in elem.iter("ownedAttribute"):
+        prop_name = attr.get("name", "")
+        if prop_name:
+            attributes.append({
+                "name": prop_name,
+                "type": _xmi_type(attr, ns) or "",
+                "xmi_id": _xmi_id(attr, ns) or "",
+                "visibility": attr.get("visibility", "public"),
+                "direction": attr.get("direction", "inout"),
+            })
 
-    return blocks
+    ports: List[Dict[str, str]] = []
+    for port in elem.iter("ownedPort"):
+        port_name = port.get("name", "")
+        port_id = _xmi_id(port, ns) or ""
+        if port_name or port_id:
+            ports.append({
+                "name": port_name,
+                "xmi_id": port_id,
+                "type": _xmi_type(port, ns) or "port",
+            })
 
+    return {
+        "xmi_type": _xmi_type(elem, ns),
+        "xmi_id": xid,
+        "name": elem.get("name", ""),
+        "qualified_name": qualified_name,
+        "description": _get_description(elem, ns),
+        "attributes": attributes,
+        "ports": ports,
+    }
 
-def _extract_interface_blocks(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract <<InterfaceBlock>> stereotyped classes from XMI."""
-    stereo_map = _build_stereotype_map(root, ns)
-    iblocks: List[Dict[str, Any]] = []
 
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-        if xmi_t not in ("uml:Class", "Class", "uml:Interface", "Interface"):
-            continue
-        xid = _xmi_id(elem, ns)
-        if not xid:
-            continue
+def _block_record(summary: Dict[str, Any], stereo: str) -> Dict[str, Any]:
+    """Build a <<Block>> element record from a class summary."""
+    return {
+        "id": _new_id(),
+        "xmi_id": summary["xmi_id"],
+        "element_type": "block",
+        "name": summary["name"],
+        "qualified_name": summary["qualified_name"],
+        "stereotype": stereo or "Block",
+        "description": summary["description"],
+        "properties": json.dumps({
+            "attributes": [
+                {k: a[k] for k in ("name", "type", "xmi_id", "visibility")}
+                for a in summary["attributes"]
+            ],
+            "ports": summary["ports"],
+        }),
+        "diagram_type": "bdd",
+    }
 
-        stereo = stereo_map.get(xid, "")
-        if "interfaceblock" not in stereo.lower() and "interface_block" not in stereo.lower():
-            continue
 
-        name = elem.get("name", "")
-        if not name:
-            continue
+def _interface_block_record(summary: Dict[str, Any], stereo: str) -> Dict[str, Any]:
+    """Build an <<InterfaceBlock>> element record from a class summary."""
+    return {
+        "id": _new_id(),
+        "xmi_id": summary["xmi_id"],
+        "element_type": "interface_block",
+        "name": summary["name"],
+        "qualified_name": summary["qualified_name"],
+        "stereotype": stereo or "InterfaceBlock",
+        "description": summary["description"],
+        "properties": json.dumps({
+            "flow_properties": [
+                {k: a[k] for k in ("name", "type", "xmi_id", "direction")}
+                for a in summary["attributes"]
+            ],
+        }),
+        "diagram_type": "bdd",
+    }
 
-        # Collect flow properties
-        flow_props: List[Dict[str, str]] = []
-        for attr in elem.iter("ownedAttribute"):
-            prop_name = attr.get("name", "")
-            if prop_name:
-                flow_props.append({
-                    "name": prop_name,
-                    "type": _xmi_type(attr, ns) or "",
-                    "xmi_id": _xmi_id(attr, ns) or "",
-                    "direction": attr.get("direction", "inout"),
-                })
 
-        iblocks.append({
-            "id": _new_id(),
-            "xmi_id": xid,
-            "element_type": "interface_block",
-            "name": name,
-            "qualified_name": _qualified_name(elem, root),
-            "stereotype": stereo or "InterfaceBlock",
-            "description": _get_description(elem, ns),
-            "properties": json.dumps({"flow_properties": flow_props}),
-            "diagram_type": "bdd",
-        })
+def _requirement_record(summary: Dict[str, Any], stereo: str,
+                        application: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Build a <<Requirement>> element record from a class summary.
 
-    return iblocks
+    The requirement ID and text live on the stereotype application when the
+    export has one; the class documentation is the fallback text.
+    """
+    xid = summary["xmi_id"]
+    req_id = application["id"] if application else ""
+    req_text = application["text"] if application else ""
+    if not req_text:
+        req_text = summary["description"]
 
+    return {
+        "id": _new_id(),
+        "xmi_id": xid,
+        "element_type": "requirement",
+        "name": summary["name"] or f"REQ-{xid[:8]}",
+        "qualified_name": summary["qualified_name"],
+        "stereotype": stereo or "Requirement",
+        "description": req_text,
+        "properties": json.dumps({
+            "requirement_id": req_id,
+            "text": req_text,
+        }),
+        "diagram_type": "req",
+    }
 
-def _extract_activities(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract Activity elements with actions, control flows, and object flows."""
-    activities: List[Dict[str, Any]] = []
 
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-        if xmi_t not in ("uml:Activity", "Activity"):
-            continue
-        xid = _xmi_id(elem, ns)
-        if not xid:
-            continue
+def _sysml_requirement_record(elem: ET.Element,
+                              ns: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Build a record for a ``Requirement`` element in the SysML namespace."""
+    xid = _xmi_id(elem, ns) or elem.get("base_Class", "")
+    if not xid:
+        return None
+    name = elem.get("name", "")
+    req_id = elem.get("id", elem.get("Id", ""))
+    req_text = elem.get("text", elem.get("Text", ""))
+    return {
+        "id": _new_id(),
+        "xmi_id": xid,
+        "element_type": "requirement",
+        "name": name or f"REQ-{xid[:8]}",
+        "qualified_name": "",
+        "stereotype": "Requirement",
+        "description": req_text or "",
+        "properties": json.dumps({
+            "requirement_id": req_id,
+            "text": req_text or "",
+        }),
+        "diagram_type": "req",
+    }
 
-        name = elem.get("name", "")
-        if not name:
-            name = f"Activity_{xid[:8]}"
-
-        # Collect actions
-        actions: List[Dict[str, str]] = []
-        for node_tag in ("node", "ownedNode", "group"):
-            for node in elem.iter(node_tag):
-                node_type = _xmi_type(node, ns) or ""
-                node_name = node.get("name", "")
-                node_id = _xmi_id(node, ns) or ""
-                if node_name or node_id:
-                    actions.append({
-                        "name": node_name,
-                        "type": node_type,
-                        "xmi_id": node_id,
-                    })
 
-        # Also look for OpaqueAction, CallBehaviorAction, etc.
-        for action_tag in ("ownedAction",):
-            for act in elem.iter(action_tag):
+def _activity_record(elem: ET.Element, ns: Dict[str, str], xid: str,
+                     qualified_name: str) -> Dict[str, Any]:
+    """Build an Activity record with actions, control flows, and object flows."""
+    name = elem.get("name", "")
+    if not name:
+        name = f"Activity_{xid[:8]}"
+
+    # Collect actions
+    actions: List[Dict[str, str]] = []
+    for node_tag in ("node", "ownedNode", "group"):
+        for node in elem.iter(node_tag):
+            node_type = _xmi_type(node, ns) or ""
+            node_name = node.get("name", "")
+            node_id = _xmi_id(node, ns) or ""
+            if node_name or node_id:
                 actions.append({
-                    "name": act.get("name", ""),
-                    "type": _xmi_type(act, ns) or "action",
-                    "xmi_id": _xmi_id(act, ns) or "",
+                    "name": node_name,
+                    "type": node_type,
+                    "xmi_id": node_id,
                 })
 
-        # Collect edges (control flow / object flow)
-        control_flows: List[Dict[str, str]] = []
-        object_flows: List[Dict[str, str]] = []
-        for edge_tag in ("edge", "ownedEdge"):
-            for edge in elem.iter(edge_tag):
-                edge_type = _xmi_type(edge, ns) or ""
-                edge_data = {
-                    "name": edge.get("name", ""),
-                    "xmi_id": _xmi_id(edge, ns) or "",
-                    "source": edge.get("source", ""),
-                    "target": edge.get("target", ""),
-                }
-                if "ObjectFlow" in edge_type:
-                    object_flows.append(edge_data)
-                else:
-                    control_flows.append(edge_data)
-
-        activities.append({
-            "id": _new_id(),
-            "xmi_id": xid,
-            "element_type": "activity",
-            "name": name,
-            "qualified_name": _qualified_name(elem, root),
-            "stereotype": "",
-            "description": _get_description(elem, ns),
-            "properties": json.dumps({
-                "actions": actions,
-                "control_flows": control_flows,
-                "object_flows": object_flows,
-            }),
-            "diagram_type": "act",
+    # Also look for OpaqueAction, CallBehaviorAction, etc.
+    for act in elem.iter("ownedAction"):
+        actions.append({
+            "name": act.get("name", ""),
+            "type": _xmi_type(act, ns) or "action",
+            "xmi_id": _xmi_id(act, ns) or "",
         })
 
-    return activities
-
-
-def _extract_requirements(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract <<Requirement>> stereotyped elements with text and ID.
+    # Collect edges (control flow / object flow)
+    control_flows: List[Dict[str, str]] = []
+    object_flows: List[Dict[str, str]] = []
+    for edge_tag in ("edge", "ownedEdge"):
+        for edge in elem.iter(edge_tag):
+            edge_type = _xmi_type(edge, ns) or ""
+            edge_data = {
+                "name": edge.get("name", ""),
+                "xmi_id": _xmi_id(edge, ns) or "",
+                "source": edge.get("source", ""),
+                "target": edge.get("target", ""),
+            }
+            if "ObjectFlow" in edge_type:
+                object_flows.append(edge_data)
+            else:
+                control_flows.append(edge_data)
 
-    SysML requirements may appear as stereotyped uml:Class elements or as
-    dedicated ``Requirement`` elements under the SysML namespace.
-    """
-    stereo_map = _build_stereotype_map(root, ns)
-    requirements: List[Dict[str, Any]] = []
+    return {
+        "id": _new_id(),
+        "xmi_id": xid,
+        "element_type": "activity",
+        "name": name,
+        "qualified_name": qualified_name,
+        "stereotype": "",
+        "description": _get_description(elem, ns),
+        "properties": json.dumps({
+            "actions": actions,
+            "control_flows": control_flows,
+            "object_flows": object_flows,
+        }),
+        "diagram_type": "act",
+    }
 
-    # Strategy 1: stereotyped classes
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-        if xmi_t not in ("uml:Class", "Class"):
-            continue
-        xid = _xmi_id(elem, ns)
-        if not xid:
-            continue
 
-        stereo = stereo_map.get(xid, "")
-        if "requirement" not in stereo.lower():
-            continue
-
-        name = elem.get("name", "")
-        req_id = ""
-        req_text = ""
-
-        # Requirement ID and text may be in the stereotype application
-        for child in root:
-            tag_local = child.tag.split("}", 1)[-1] if "}" in child.tag else child.tag
-            if "requirement" not in tag_local.lower():
-                continue
-            for attr_name, attr_val in child.attrib.items():
-                clean = attr_name.split("}", 1)[-1] if "}" in attr_name else attr_name
-                if clean.startswith("base_") and attr_val == xid:
-                    req_id = child.get("id", child.get("Id", ""))
-                    req_text = child.get("text", child.get("Text", ""))
-                    break
+def _transition_record(trans: ET.Element, ns: Dict[str, str]) -> Dict[str, str]:
+    """Describe one state machine transition."""
+    return {
+        "name": trans.get("name", ""),
+        "xmi_id": _xmi_id(trans, ns) or "",
+        "source": trans.get("source", ""),
+        "target": trans.get("target", ""),
+        "guard": _get_guard_text(trans),
+        "trigger": _get_trigger_name(trans),
+    }
 
-        if not req_text:
-            req_text = _get_description(elem, ns)
-
-        requirements.append({
-            "id": _new_id(),
-            "xmi_id": xid,
-            "element_type": "requirement",
-            "name": name or f"REQ-{xid[:8]}",
-            "qualified_name": _qualified_name(elem, root),
-            "stereotype": stereo or "Requirement",
-            "description": req_text,
-            "properties": json.dumps({
-                "requirement_id": req_id,
-                "text": req_text,
-            }),
-            "diagram_type": "req",
-        })
 
-    # Strategy 2: SysML namespace Requirement elements
-    sysml_uri = ns.get("sysml", "")
-    if sysml_uri:
-        for elem in root.iter(f"{{{sysml_uri}}}Requirement"):
-            xid = _xmi_id(elem, ns) or elem.get("base_Class", "")
-            if not xid:
-                continue
-            # Avoid duplicates
-            if any(r["xmi_id"] == xid for r in requirements):
-                continue
-            name = elem.get("name", "")
-            req_id = elem.get("id", elem.get("Id", ""))
-            req_text = elem.get("text", elem.get("Text", ""))
-            requirements.append({
-                "id": _new_id(),
-                "xmi_id": xid,
-                "element_type": "requirement",
-                "name": name or f"REQ-{xid[:8]}",
-                "qualified_name": "",
-                "stereotype": "Requirement",
-                "description": req_text or "",
-                "properties": json.dumps({
-                    "requirement_id": req_id,
-                    "text": req_text or "",
-                }),
-                "diagram_type": "req",
+def _state_machine_record(elem: ET.Element, ns: Dict[str, str], xid: str,
+                          qualified_name: str) -> Dict[str, Any]:
+    """Build a StateMachine record with states and transitions."""
+    name = elem.get("name", "")
+    if not name:
+        name = f"StateMachine_{xid[:8]}"
+
+    # Collect states
+    states: List[Dict[str, str]] = []
+    for region in elem.iter("region"):
+        for subvertex_tag in ("subvertex", "ownedState"):
+            for state in region.iter(subvertex_tag):
+                state_type = _xmi_type(state, ns) or ""
+                state_name = state.get("name", "")
+                state_id = _xmi_id(state, ns) or ""
+                kind = state.get("kind", "")
+                if state_name or state_id:
+                    states.append({
+                        "name": state_name,
+                        "type": state_type,
+                        "xmi_id": state_id,
+                        "kind": kind,
+                    })
+    # Fallback: look for State elements directly under StateMachine
+    if not states:
+        for state in elem.iter("subvertex"):
+            states.append({
+                "name": state.get("name", ""),
+                "type": _xmi_type(state, ns) or "",
+                "xmi_id": _xmi_id(state, ns) or "",
+                "kind": state.get("kind", ""),
             })
 
-    return requirements
-
-
-def _extract_state_machines(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract StateMachine elements with states and transitions."""
-    machines: List[Dict[str, Any]] = []
-
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-        if xmi_t not in ("uml:StateMachine", "StateMachine"):
-            continue
-        xid = _xmi_id(elem, ns)
-        if not xid:
-            continue
-
-        name = elem.get("name", "")
-        if not name:
-            name = f"StateMachine_{xid[:8]}"
-
-        # Collect states
-        states: List[Dict[str, str]] = []
-        for region in elem.iter("region"):
-            for subvertex_tag in ("subvertex", "ownedState"):
-                for state in region.iter(subvertex_tag):
-                    state_type = _xmi_type(state, ns) or ""
-                    state_name = state.get("name", "")
-                    state_id = _xmi_id(state, ns) or ""
-                    kind = state.get("kind", "")
-                    if state_name or state_id:
-                        states.append({
-                            "name": state_name,
-                            "type": state_type,
-                            "xmi_id": state_id,
-                            "kind": kind,
-                        })
-        # Fallback: look for State elements directly under StateMachine
-        if not states:
-            for state in elem.iter("subvertex"):
-                states.append({
-                    "name": state.get("name", ""),
-                    "type": _xmi_type(state, ns) or "",
-                    "xmi_id": _xmi_id(state, ns) or "",
-                    "kind": state.get("kind", ""),
-                })
-
-        # Collect transitions
-        transitions: List[Dict[str, str]] = []
-        for region in elem.iter("region"):
-            for trans in region.iter("transition"):
-                transitions.append({
-                    "name": trans.get("name", ""),
-                    "xmi_id": _xmi_id(trans, ns) or "",
-                    "source": trans.get("source", ""),
-                    "target": trans.get("target", ""),
-                    "guard": _get_guard_text(trans),
-                    "trigger": _get_trigger_name(trans),
-                })
-        # Fallback
-        if not transitions:
-            for trans in elem.iter("transition"):
-                transitions.append({
-                    "name": trans.get("name", ""),
-                    "xmi_id": _xmi_id(trans, ns) or "",
-                    "source": trans.get("source", ""),
-                    "target": trans.get("target", ""),
-                    "guard": _get_guard_text(trans),
-                    "trigger": _get_trigger_name(trans),
-                })
-
-        machines.append({
-            "id": _new_id(),
-            "xmi_id": xid,
-            "element_type": "state_machine",
-            "name": name,
-            "qualified_name": _qualified_name(elem, root),
-            "stereotype": "",
-            "description": _get_description(elem, ns),
-            "properties": json.dumps({
-                "states": states,
-                "transitions": transitions,
-            }),
-            "diagram_type": "stm",
-        })
+    # Collect transitions
+    transitions: List[Dict[str, str]] = []
+    for region in elem.iter("region"):
+        for trans in region.iter("transition"):
+            transitions.append(_transition_record(trans, ns))
+    # Fallback
+    if not transitions:
+        for trans in elem.iter("transition"):
+            transitions.append(_transition_record(trans, ns))
 
-    return machines
+    return {
+        "id": _new_id(),
+        "xmi_id": xid,
+        "element_type": "state_machine",
+        "name": name,
+        "qualified_name": qualified_name,
+        "stereotype": "",
+        "description": _get_description(elem, ns),
+        "properties": json.dumps({
+            "states": states,
+            "transitions": transitions,
+        }),
+        "diagram_type": "stm",
+    }
 
 
 def _get_guard_text(transition: ET.Element) -> str:
@@ -684,137 +553,72 @@ def _get_trigger_name(transition: ET.Element) -> str:
     return ""
 
 
-def _extract_use_cases(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract UseCase and Actor elements from XMI."""
-    use_cases: List[Dict[str, Any]] = []
-
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-        if xmi_t not in ("uml:UseCase", "UseCase", "uml:Actor", "Actor"):
-            continue
-        xid = _xmi_id(elem, ns)
-        if not xid:
-            continue
-
-        name = elem.get("name", "")
-        if not name:
-            continue
-
-        is_actor = "Actor" in (xmi_t or "")
-        element_type = "actor" if is_actor else "use_case"
-
-        # Collect extension points for use cases
-        ext_points: List[Dict[str, str]] = []
-        if not is_actor:
-            for ep in elem.iter("extensionPoint"):
-                ext_points.append({
-                    "name": ep.get("name", ""),
-                    "xmi_id": _xmi_id(ep, ns) or "",
-                })
+def _use_case_record(elem: ET.Element, ns: Dict[str, str], xid: str, xmi_t: str,
+                     qualified_name: str) -> Optional[Dict[str, Any]]:
+    """Build a UseCase or Actor record; unnamed elements are skipped."""
+    name = elem.get("name", "")
+    if not name:
+        return None
+
+    is_actor = "Actor" in (xmi_t or "")
+    element_type = "actor" if is_actor else "use_case"
+
+    # Collect extension points for use cases
+    ext_points: List[Dict[str, str]] = []
+    if not is_actor:
+        for ep in elem.iter("extensionPoint"):
+            ext_points.append({
+                "name": ep.get("name", ""),
+                "xmi_id": _xmi_id(ep, ns) or "",
+            })
 
-        # Collect included use cases
-        includes: List[str] = []
-        for inc in elem.iter("include"):
-            addition = inc.get("addition", "")
-            if addition:
-                includes.append(addition)
-
-        use_cases.append({
-            "id": _new_id(),
-            "xmi_id": xid,
-            "element_type": element_type,
-            "name": name,
-            "qualified_name": _qualified_name(elem, root),
-            "stereotype": "Actor" if is_actor else "",
-            "description": _get_description(elem, ns),
-            "properties": json.dumps({
-                "extension_points": ext_points,
-                "includes": includes,
-            }) if not is_actor else json.dumps({}),
-            "diagram_type": "uc",
-        })
+    # Collect included use cases
+    includes: List[str] = []
+    for inc in elem.iter("include"):
+        addition = inc.get("addition", "")
+        if addition:
+            includes.append(addition)
 
-    return use_cases
+    return {
+        "id": _new_id(),
+        "xmi_id": xid,
+        "element_type": element_type,
+        "name": name,
+        "qualified_name": qualified_name,
+        "stereotype": "Actor" if is_actor else "",
+        "description": _get_description(elem, ns),
+        "properties": json.dumps({
+            "extension_points": ext_points,
+            "includes": includes,
+        }) if not is_actor else json.dumps({}),
+        "diagram_type": "uc",
+    }
 
 
 # ---------------------------------------------------------------------------
 # Relationship extraction
 # ---------------------------------------------------------------------------
 
-def _extract_relationships(root: ET.Element, ns: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Extract all relationships from XMI.
-
-    Covers:
-    - Associations (including aggregation/composition)
-    - Generalizations
-    - Dependencies
-    - Realizations
-    - Usages
-    - SysML stereotype links: satisfy, derive, verify, refine, trace, allocate
-    """
-    relationships: List[Dict[str, Any]] = []
-
-    # --- Structural relationships inside packagedElements ---
-    for elem in root.iter("packagedElement"):
-        xmi_t = _xmi_type(elem, ns)
-
-        # Associations
-        if xmi_t in ("uml:Association", "Association"):
-            _parse_association(elem, ns, relationships)
-
-        # Dependencies
-        elif xmi_t in ("uml:Dependency", "Dependency"):
-            _parse_simple_rel(elem, ns, "dependency", relationships)
-
-        # Realizations
-        elif xmi_t in ("uml:Realization", "Realization",
-                        "uml:InterfaceRealization", "InterfaceRealization"):
-            _parse_simple_rel(elem, ns, "realization", relationships)
-
-        # Usages
-        elif xmi_t in ("uml:Usage", "Usage"):
-            _parse_simple_rel(elem, ns, "usage", relationships)
-
-        # Abstractions (may carry SysML stereotypes like «satisfy»)
-        elif xmi_t in ("uml:Abstraction", "Abstraction"):
-            _parse_abstraction(elem, ns, root, relationships)
-
-    # --- Generalizations (nested inside classes) ---
-    for gen in root.iter("generalization"):
-        general = gen.get("general", "")
-        if not general:
-            # May be a child element
-            gen_ref = gen.find("general")
-            if gen_ref is not None:
-                general = gen_ref.get("href", "") or _xmi_id(gen_ref, ns) or ""
-        # Parent class xmi:id
-        parent = gen.getparent() if hasattr(gen, "getparent") else None
-        source_id = ""
-        if parent is not None:
-            source_id = _xmi_id(parent, ns) or ""
-        if not source_id:
-            # Walk up via parent map
-            parent_map = getattr(root, "_parent_map", None)
-            if parent_map is None:
-                parent_map = {c: p for p in root.iter() for c in p}
-                root._parent_map = parent_map  # type: ignore[attr-defined]
-            p = parent_map.get(gen)
-            if p is not None:
-                source_id = _xmi_id(p, ns) or ""
-
-        if source_id and general:
-            relationships.append({
-                "source_xmi_id": source_id,
-                "target_xmi_id": general,
-                "relationship_type": "generalization",
-                "name": gen.get("name", ""),
-                "properties": json.dumps({}),
-            })
-
-    # --- SysML stereotype relationships (top-level in profile application) ---
-    _parse_sysml_stereo_rels(root, ns, relationships)
-
-    return relationships
+def _parse_generalization(gen: ET.Element, owner: Optional[ET.Element],
+                          ns: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Parse a ``generalization`` nested inside its specific classifier *owner*."""
+    general = gen.get("general", "")
+    if not general:
+        # May be a child element
+        gen_ref = gen.find("general")
+        if gen_ref is not None:
+            general = gen_ref.get("href", "") or _xmi_id(gen_ref, ns) or ""
+    source_id = (_xmi_id(owner, ns) or "") if owner is not None else ""
+
+    if not source_id or not general:
+        return None
+    return {
+        "source_xmi_id": source_id,
+        "target_xmi_id": general,
+        "relationship_type": "generalization",
+        "name": gen.get("name", ""),
+        "properties": json.dumps({}),
+    }
 
 
 def _parse_association(elem: ET.Element, ns: Dict[str, str],
@@ -898,14 +702,20 @@ def _parse_simple_rel(elem: ET.Element, ns: Dict[str, str],
             "relationship_type": rel_type,
             "name": name,
             "properties": json.dumps({}),
+            "_base_xmi_id": _xmi_id(elem, ns) or "",
         })
 
 
 def _parse_abstraction(elem: ET.Element, ns: Dict[str, str],
-                        root: ET.Element, rels: List[Dict[str, Any]]) -> None:
-    """Parse a UML Abstraction, checking for SysML stereotype overlay."""
+                        rels: List[Dict[str, Any]]) -> None:
+    """Parse a UML Abstraction.
+
+    A SysML stereotype (satisfy, derive, etc.) applied to the Abstraction is
+    only known once the stereotype applications have been read, so the record
+    starts out as a ``dependency`` and is retyped by ``_apply_stereotypes``.
+    """
     name = elem.get("name", "")
-    xid = _xmi_id(elem, ns)
+    xid = _xmi_id(elem, ns) or ""
 
     client = elem.get("client", "")
     supplier = elem.get("supplier", "")
@@ -921,82 +731,283 @@ def _parse_abstraction(elem: ET.Element, ns: Dict[str, str],
     if not client or not supplier:
         return
 
-    # Check if a SysML stereotype (satisfy, derive, etc.) applies to this Abstraction
-    rel_type = "dependency"
-    if xid:
-        stereo_map = _build_stereotype_map(root, ns)
-        stereo = stereo_map.get(xid, "").lower()
-        for kw in SYSML_REL_STEREOTYPES:
-            if kw in stereo:
-                rel_type = kw
-                break
-
     rels.append({
         "source_xmi_id": client,
         "target_xmi_id": supplier,
-        "relationship_type": rel_type,
+        "relationship_type": "dependency",
         "name": name,
         "properties": json.dumps({}),
+        "_base_xmi_id": xid,
+        "_abstraction": True,
     })
 
 
-def _parse_sysml_stereo_rels(root: ET.Element, ns: Dict[str, str],
-                              rels: List[Dict[str, Any]]) -> None:
-    """Parse SysML stereotype relationship applications at the top level.
+def _sysml_stereo_keyword(tag: str) -> Optional[str]:
+    """Return the SysML relationship keyword a stereotype application tag names.
 
     Cameo exports «satisfy», «derive», «verify», «refine», «trace», «allocate»
-    as top-level elements under the SysML profile namespace.  Each carries
-    ``base_Abstraction`` (or ``base_Dependency``) plus ``client``/``supplier``
-    attributes or nested sub-elements referencing the related model elements.
+    as top-level elements under the SysML profile namespace, each carrying
+    ``base_Abstraction`` (or ``base_Dependency``) that references the
+    relationship it applies to.
+    """
+    local_lower = local_name(tag).lower()
+    for kw in SYSML_REL_STEREOTYPES:
+        if kw == local_lower or local_lower.endswith(kw):
+            return kw
+    return None
+
+
+def _apply_stereotypes(rels: List[Dict[str, Any]], stereo_map: Dict[str, str],
+                       stereo_rels: List[Tuple[str, str]]) -> None:
+    """Retype relationships from stereotype applications read after the model.
+
+    Abstractions take the SysML keyword contained in their applied stereotype
+    name.  Each top-level SysML relationship application ``(keyword,
+    base_ref)`` then retypes the first relationship whose xmi:id (or source)
+    is *base_ref*; applications that match nothing carry no endpoints of their
+    own and are dropped.
     """
-    ns.get("sysml", "")
+    for rel in rels:
+        if rel.get("_abstraction") and rel["_base_xmi_id"]:
+            stereo = stereo_map.get(rel["_base_xmi_id"], "").lower()
+            for kw in SYSML_REL_STEREOTYPES:
+                if kw in stereo:
+                    rel["relationship_type"] = kw
+                    break
 
-    for child in root:
-        tag = child.tag
-        if "}" in tag:
-            local = tag.split("}", 1)[1]
+    if not stereo_rels:
+        return
+    first_by_ref: Dict[str, int] = {}
+    for index, rel in enumerate(rels):
+        for key in (rel.get("_base_xmi_id"), rel.get("source_xmi_id")):
+            if key:
+                first_by_ref.setdefault(key, index)
+    for keyword, base_ref in stereo_rels:
+        index = first_by_ref.get(base_ref)
+        if index is not None:
+            rels[index]["relationship_type"] = keyword
+
+
+# ---------------------------------------------------------------------------
+# Streaming pass
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _XmiScan:
+    """Everything one streaming pass collects from an XMI document.
+
+    Element and relationship lists hold ``(seq, record)`` pairs where *seq*
+    is the element's document (pre-order) position, so results come out in
+    the same order as a tree walk even though elements close child-first.
+    """
+    namespaces: Dict[str, str] = field(default_factory=dict)
+    root_tag: str = ""
+    xmi_version: Optional[str] = None
+    packaged_count: int = 0
+    found_uml: bool = False
+    file_hash: str = ""
+    classes: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    activities: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    state_machines: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    use_cases: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    sysml_requirements: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    relationships: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    generalizations: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    stereotypes: Dict[str, str] = field(default_factory=dict)
+    requirement_apps: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    stereo_rels: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def _is_uml_type(xmi_t: Optional[str]) -> bool:
+    """Whether *xmi_t* names a UML metaclass validation recognises."""
+    return bool(xmi_t) and ("uml:" in str(xmi_t) or xmi_t in (
+        "Class", "Activity", "StateMachine", "UseCase", "Actor",
+        "Association", "Package", "Interface"
+    ))
+
+
+def _root_version(root: ET.Element, ns: Dict[str, str]) -> Optional[str]:
+    """Read the xmi:version attribute from the document root."""
+    xmi_ns = ns.get("xmi", "")
+    for attr_name in (f"{{{xmi_ns}}}version", "xmi:version", "version"):
+        val = root.get(attr_name)
+        if val:
+            return val
+    return None
+
+
+def _collect_packaged(scan: _XmiScan, elem: ET.Element, xmi_t: str, seq: int,
+                      ancestors: List[ET.Element], ns: Dict[str, str]) -> None:
+    """Classify a closed ``packagedElement`` whose subtree is still attached."""
+    if xmi_t in _ASSOCIATION_TYPES or xmi_t in _SIMPLE_REL_TYPES or xmi_t in _ABSTRACTION_TYPES:
+        rels: List[Dict[str, Any]] = []
+        if xmi_t in _ASSOCIATION_TYPES:
+            _parse_association(elem, ns, rels)
+        elif xmi_t in _SIMPLE_REL_TYPES:
+            _parse_simple_rel(elem, ns, _SIMPLE_REL_TYPES[xmi_t], rels)
         else:
-            local = tag
+            _parse_abstraction(elem, ns, rels)
+        scan.relationships.extend((seq, rel) for rel in rels)
+        return
 
-        local_lower = local.lower()
-        matched_type: Optional[str] = None
-        for kw in SYSML_REL_STEREOTYPES:
-            if kw == local_lower or local_lower.endswith(kw):
-                matched_type = kw
-                break
+    xid = _xmi_id(elem, ns)
+    if not xid:
+        return
+    qualified_name = _qualified_name(ancestors, elem)
+
+    if xmi_t in _CLASS_TYPES or xmi_t in _INTERFACE_TYPES:
+        scan.classes.append((seq, _class_summary(elem, ns, xid, qualified_name)))
+    elif xmi_t in _ACTIVITY_TYPES:
+        scan.activities.append((seq, _activity_record(elem, ns, xid, qualified_name)))
+    elif xmi_t in _STATE_MACHINE_TYPES:
+        scan.state_machines.append(
+            (seq, _state_machine_record(elem, ns, xid, qualified_name)))
+    elif xmi_t in _USE_CASE_TYPES:
+        record = _use_case_record(elem, ns, xid, xmi_t, qualified_name)
+        if record:
+            scan.use_cases.append((seq, record))
+
+
+def _collect_application(scan: _XmiScan, child: ET.Element) -> None:
+    """Index a top-level stereotype application by the element it applies to."""
+    refs = _base_refs(child)
+    if not refs:
+        return
+    local = local_name(child.tag)
+    scan.stereotypes[refs[0]] = local
+
+    if "requirement" in local.lower():
+        application = {
+            "id": child.get("id", child.get("Id", "")),
+            "text": child.get("text", child.get("Text", "")),
+        }
+        for ref in refs:
+            scan.requirement_apps[ref] = application
+
+    keyword = _sysml_stereo_keyword(child.tag)
+    if keyword:
+        scan.stereo_rels.append((keyword, refs[0]))
 
-        if not matched_type:
+
+def _scan_xmi(file_path: Path, extract: bool = True) -> _XmiScan:
+    """Read *file_path* in one streaming pass.
+
+    With ``extract=False`` only the facts validation needs are gathered and
+    every element is released as soon as it closes.  Otherwise extracted
+    ``packagedElement`` subtrees (and ``generalization`` elements) are kept
+    until they close, classified, and then released.
+
+    Raises ``ET.ParseError`` on malformed XML.
+    """
+    scan = _XmiScan()
+    ns = scan.namespaces
+    stream = XmlStream(str(file_path))
+    frames: List[Tuple[int, bool]] = []
+    held = 0
+    seq = 0
+    known_uris = -1
+    sysml_requirement_tag = ""
+
+    for event, elem in stream:
+        if event == "start":
+            if len(stream.namespace_uris) != known_uris:
+                known_uris = len(stream.namespace_uris)
+                ns.update(_match_namespaces(stream.namespace_uris))
+                sysml_requirement_tag = f"{{{ns['sysml']}}}Requirement"
+            if len(stream.stack) == 1:
+                scan.root_tag = elem.tag
+                scan.xmi_version = _root_version(elem, ns)
+
+            holds = False
+            if elem.tag == "packagedElement":
+                scan.packaged_count += 1
+                xmi_t = _xmi_type(elem, ns)
+                if not scan.found_uml and _is_uml_type(xmi_t):
+                    scan.found_uml = True
+                holds = extract and xmi_t in _EXTRACTED_TYPES
+            elif extract and elem.tag == "generalization":
+                holds = True
+            frames.append((seq, holds))
+            held += holds
+            seq += 1
             continue
 
-        # Resolve the Abstraction/Dependency this stereotype applies to
-        base_ref = ""
-        for attr_name, attr_val in child.attrib.items():
-            clean = attr_name.split("}", 1)[-1] if "}" in attr_name else attr_name
-            if clean.startswith("base_"):
-                base_ref = attr_val
-                break
+        elem_seq, holds = frames.pop()
+        held -= holds
+        ancestors = stream.stack
+        if extract:
+            tag = elem.tag
+            if tag == "packagedElement":
+                xmi_t = _xmi_type(elem, ns)
+                if xmi_t in _EXTRACTED_TYPES:
+                    _collect_packaged(scan, elem, xmi_t, elem_seq, ancestors, ns)
+            elif tag == "generalization":
+                rel = _parse_generalization(
+                    elem, ancestors[-1] if ancestors else None, ns)
+                if rel:
+                    scan.generalizations.append((elem_seq, rel))
+            elif tag == sysml_requirement_tag:
+                record = _sysml_requirement_record(elem, ns)
+                if record:
+                    scan.sysml_requirements.append((elem_seq, record))
+            if len(ancestors) == 1:
+                _collect_application(scan, elem)
+
+        # Keep the subtree only while an enclosing extracted element needs it
+        if not held and ancestors:
+            stream.release(elem)
+
+    scan.file_hash = stream.file_hash
+    return scan
+
+
+def _in_order(pairs: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Return the records of ``(seq, record)`` pairs in document order."""
+    return [record for _, record in sorted(pairs, key=itemgetter(0))]
+
+
+def _assemble(scan: _XmiScan) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Turn a finished scan into element and relationship lists.
+
+    Classes are classified against the stereotype map here, once all
+    stereotype applications have been read.
+    """
+    blocks: List[Dict[str, Any]] = []
+    iblocks: List[Dict[str, Any]] = []
+    requirements: List[Dict[str, Any]] = []
 
-        # The actual source/target must come from the referenced Abstraction
-        # element, which we've already parsed.  Mark this relationship type
-        # override so we can merge later.
-        if base_ref:
-            # Try to find matching dependency/abstraction already in rels
-            found = False
-            for r in rels:
-                if r.get("_base_xmi_id") == base_ref or r.get("source_xmi_id") == base_ref:
-                    r["relationship_type"] = matched_type
-                    found = True
-                    break
-            if not found:
-                # Store as unresolved — will attempt resolution in _resolve step
-                rels.append({
-                    "source_xmi_id": base_ref,
-                    "target_xmi_id": "",
-                    "relationship_type": matched_type,
-                    "name": child.get("name", ""),
-                    "properties": json.dumps({"base_ref": base_ref}),
-                    "_unresolved": True,
-                })
+    for summary in _in_order(scan.classes):
+        xid = summary["xmi_id"]
+        stereo = scan.stereotypes.get(xid, "")
+        lowered = stereo.lower()
+        is_class = summary["xmi_type"] in _CLASS_TYPES
+        if is_class and summary["name"] and (not stereo or lowered in _BLOCK_STEREOTYPES):
+            blocks.append(_block_record(summary, stereo))
+        if summary["name"] and ("interfaceblock" in lowered or "interface_block" in lowered):
+            iblocks.append(_interface_block_record(summary, stereo))
+        if is_class and "requirement" in lowered:
+            requirements.append(
+                _requirement_record(summary, stereo, scan.requirement_apps.get(xid)))
+
+    # SysML namespace Requirement elements, skipping ones already extracted
+    seen = {r["xmi_id"] for r in requirements}
+    for record in _in_order(scan.sysml_requirements):
+        if record["xmi_id"] not in seen:
+            seen.add(record["xmi_id"])
+            requirements.append(record)
+
+    elements: List[Dict[str, Any]] = []
+    elements.extend(blocks)
+    elements.extend(iblocks)
+    elements.extend(_in_order(scan.activities))
+    elements.extend(requirements)
+    elements.extend(_in_order(scan.state_machines))
+    elements.extend(_in_order(scan.use_cases))
+
+    relationships = _in_order(scan.relationships) + _in_order(scan.generalizations)
+    _apply_stereotypes(relationships, scan.stereotypes, scan.stereo_rels)
+
+    return elements, relationships
 
 
 # ---------------------------------------------------------------------------
@@ -1019,15 +1030,18 @@ def _resolve_xmi_refs(elements: List[Dict[str, Any]],
     for el in elements:
         xmi_lookup[el["xmi_id"]] = el
 
+    # qualified_name → id of the first element carrying it
+    by_qualified_name: Dict[str, str] = {}
+    for el in elements:
+        by_qualified_name.setdefault(el.get("qualified_name", ""), el["id"])
+
     # Resolve parent_id (based on qualified_name nesting if present)
     for el in elements:
         qn = el.get("qualified_name", "")
         if "::" in qn:
-            parent_qn = "::".join(qn.split("::")[:-1])
-            for candidate in elements:
-                if candidate.get("qualified_name", "") == parent_qn and candidate["id"] != el["id"]:
-                    el["parent_id"] = candidate["id"]
-                    break
+            parent_id = by_qualified_name.get(qn.rsplit("::", 1)[0])
+            if parent_id:
+                el["parent_id"] = parent_id
 
     # Resolve relationships
     resolved_rels: List[Dict[str, Any]] = []
@@ -1072,25 +1086,18 @@ def _resolve_xmi_refs(elements: List[Dict[str, Any]],
 # Validation
 # ---------------------------------------------------------------------------
 
-def validate_xmi(file_path: str) -> Dict[str, Any]:
-    """Validate XMI structure before import.
+def _scan_and_validate(file_path: str, extract: bool) -> Tuple[
+        Optional[_XmiScan], Dict[str, Any]]:
+    """Run the streaming pass over *file_path* and validate what it saw.
 
-    Returns::
-
-        {
-            "valid": bool,
-            "errors": [...],
-            "namespaces": {...},
-            "element_count": int,
-        }
+    Returns ``(scan, validation)``; *scan* is ``None`` when the file is
+    missing or is not well-formed XML.
     """
     errors: List[str] = []
-    namespaces: Dict[str, str] = {}
-    element_count = 0
 
     fpath = Path(file_path)
     if not fpath.exists():
-        return {
+        return None, {
             "valid": False,
             "errors": [f"File not found: {file_path}"],
             "namespaces": {},
@@ -1102,21 +1109,17 @@ def validate_xmi(file_path: str) -> Dict[str, Any]:
 
     # Attempt parse
     try:
-        tree = ET.parse(str(fpath))
-        root = tree.getroot()
+        scan = _scan_xmi(fpath, extract=extract)
     except ET.ParseError as exc:
-        return {
+        return None, {
             "valid": False,
             "errors": [f"XML parse error: {exc}"],
             "namespaces": {},
             "element_count": 0,
         }
 
-    # Detect namespaces
-    namespaces = _detect_namespaces(root)
-
     # Verify root element is XMI
-    root_local = root.tag.split("}", 1)[-1] if "}" in root.tag else root.tag
+    root_local = local_name(scan.root_tag)
     if root_local.upper() != "XMI" and root_local != "Model":
         errors.append(
             f"Root element is <{root_local}>, expected <xmi:XMI> or <XMI>. "
@@ -1124,81 +1127,52 @@ def validate_xmi(file_path: str) -> Dict[str, Any]:
         )
 
     # Check for XMI version attribute
-    xmi_version = None
-    xmi_ns = namespaces.get("xmi", "")
-    for attr_name in (f"{{{xmi_ns}}}version", "xmi:version", "version"):
-        val = root.get(attr_name)
-        if val:
-            xmi_version = val
-            break
-    if not xmi_version:
+    if not scan.xmi_version:
         errors.append("Missing xmi:version attribute on root element.")
 
     # Count packagedElements
-    element_count = sum(1 for _ in root.iter("packagedElement"))
+    element_count = scan.packaged_count
     if element_count == 0:
         errors.append("No <packagedElement> nodes found. File may be empty or use non-standard structure.")
 
     # Check for at least one recognized UML type
-    found_uml = False
-    for pe in root.iter("packagedElement"):
-        xmi_t = _xmi_type(pe, namespaces)
-        if xmi_t and ("uml:" in str(xmi_t) or xmi_t in (
-            "Class", "Activity", "StateMachine", "UseCase", "Actor",
-            "Association", "Package", "Interface"
-        )):
-            found_uml = True
-            break
-    if not found_uml and element_count > 0:
+    if not scan.found_uml and element_count > 0:
         errors.append("No recognized UML-typed packagedElements found.")
 
-    return {
+    return scan, {
         "valid": len(errors) == 0,
         "errors": errors,
-        "namespaces": namespaces,
+        "namespaces": scan.namespaces,
         "element_count": element_count,
     }
 
 
-# ---------------------------------------------------------------------------
-# Full parse
-# ---------------------------------------------------------------------------
+def validate_xmi(file_path: str) -> Dict[str, Any]:
+    """Validate XMI structure before import.
 
-def parse_xmi(file_path: str) -> Dict[str, Any]:
-    """Parse an XMI file and return structured data.
+    Streams the document without extracting elements, so validating a large
+    export costs a single read and constant memory.
 
     Returns::
 
         {
-            "elements": [...],
-            "relationships": [...],
-            "metadata": {
-                "file": str,
-                "file_hash": str,
-                "namespaces": {...},
-                "element_count": int,
-                "relationship_count": int,
-                "parsed_at": str,
-            },
+            "valid": bool,
+            "errors": [...],
+            "namespaces": {...},
+            "element_count": int,
         }
     """
-    fpath = Path(file_path)
-    if not fpath.exists():
-        raise FileNotFoundError(f"XMI file not found: {file_path}")
+    return _scan_and_validate(file_path, extract=False)[1]
 
-    tree = ET.parse(str(fpath))
-    root = tree.getroot()
-    ns = _detect_namespaces(root)
-    source_hash = _file_hash(file_path)
 
-    # Extract all element types
-    elements: List[Dict[str, Any]] = []
-    elements.extend(_extract_blocks(root, ns))
-    elements.extend(_extract_interface_blocks(root, ns))
-    elements.extend(_extract_activities(root, ns))
-    elements.extend(_extract_requirements(root, ns))
-    elements.extend(_extract_state_machines(root, ns))
-    elements.extend(_extract_use_cases(root, ns))
+# ---------------------------------------------------------------------------
+# Full parse
+# ---------------------------------------------------------------------------
+
+def _parse_result(fpath: Path, scan: _XmiScan) -> Dict[str, Any]:
+    """Build the ``parse_xmi`` result from a finished extracting scan."""
+    source_hash = scan.file_hash
+    elements, relationships = _assemble(scan)
 
     # Tag every element with source info
     for el in elements:
@@ -1206,9 +1180,6 @@ def parse_xmi(file_path: str) -> Dict[str, Any]:
         el["source_hash"] = source_hash
         el.setdefault("parent_id", None)
 
-    # Extract relationships
-    relationships = _extract_relationships(root, ns)
-
     # Tag every relationship with source info
     for rel in relationships:
         rel["source_file"] = str(fpath.name)
@@ -1222,7 +1193,7 @@ def parse_xmi(file_path: str) -> Dict[str, Any]:
         "metadata": {
             "file": str(fpath),
             "file_hash": source_hash,
-            "namespaces": ns,
+            "namespaces": scan.namespaces,
             "element_count": len(elements),
             "relationship_count": len(relationships),
             "parsed_at": _ts(),
@@ -1230,6 +1201,31 @@ def parse_xmi(file_path: str) -> Dict[str, Any]:
     }
 
 
+def parse_xmi(file_path: str) -> Dict[str, Any]:
+    """Parse an XMI file and return structured data.
+
+    Returns::
+
+        {
+            "elements": [...],
+            "relationships": [...],
+            "metadata": {
+                "file": str,
+                "file_hash": str,
+                "namespaces": {...},
+                "element_count": int,
+                "relationship_count": int,
+                "parsed_at": str,
+            },
+        }
+    """
+    fpath = Path(file_path)
+    if not fpath.exists():
+        raise FileNotFoundError(f"XMI file not found: {file_path}")
+
+    return _parse_result(fpath, _scan_xmi(fpath))
+
+
 # ---------------------------------------------------------------------------
 # Database import
 # ---------------------------------------------------------------------------
@@ -1275,8 +1271,8 @@ def import_xmi(project_id: str, file_path: str,
     timestamp = _ts()
     error_details: List[str] = []
 
-    # Step 1 — Validate
-    validation = validate_xmi(file_path)
+    # Step 1 — Validate (the same streaming pass also extracts and hashes)
+    scan, validation = _scan_and_validate(file_path, extract=True)
     if not validation["valid"]:
         # Record failed import
         try:
@@ -1313,9 +1309,9 @@ def import_xmi(project_id: str, file_path: str,
             "status": "failed",
         }
 
-    # Step 2–3 — Parse
+    # Step 2–3 — Resolve the parsed elements and relationships
     try:
-        parsed = parse_xmi(file_path)
+        parsed = _parse_result(Path(file_path), scan)
     except Exception as exc:
         return {
             "import_id": -1,
@@ -1335,61 +1331,61 @@ def import_xmi(project_id: str, file_path: str,
     conn = _get_connection(db_path)
     cursor = conn.cursor()
 
-    elements_inserted = 0
-    rels_inserted = 0
-
-    # Insert elements
-    for el in elements:
-        try:
-            cursor.execute(
-                """INSERT OR REPLACE INTO sysml_elements
-                   (id, project_id, xmi_id, element_type, name, qualified_name,
-                    parent_id, stereotype, description, properties,
-                    diagram_type, source_file, source_hash, imported_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    el["id"],
-                    project_id,
-                    el["xmi_id"],
-                    el["element_type"],
-                    el["name"],
-                    el.get("qualified_name", ""),
-                    el.get("parent_id"),
-                    el.get("stereotype", ""),
-                    el.get("description", ""),
-                    el.get("properties", "{}"),
-                    el.get("diagram_type"),
-                    el.get("source_file", ""),
-                    el.get("source_hash", source_hash),
-                    timestamp,
-                    timestamp,
-                ),
-            )
-            elements_inserted += 1
-        except sqlite3.Error as exc:
-            error_details.append(f"Element '{el.get('name', '')}': {exc}")
+    # Parents before children so parent_id references already exist
+    element_rows = [
+        (
+            el["id"],
+            project_id,
+            el["xmi_id"],
+            el["element_type"],
+            el["name"],
+            el.get("qualified_name", ""),
+            el.get("parent_id"),
+            el.get("stereotype", ""),
+            el.get("description", ""),
+            el.get("properties", "{}"),
+            el.get("diagram_type"),
+            el.get("source_file", ""),
+            el.get("source_hash", source_hash),
+            timestamp,
+            timestamp,
+        )
+        for el in sorted(elements, key=lambda e: e.get("qualified_name", "").count("::"))
+    ]
+    elements_inserted = bulk_insert(
+        conn,
+        """INSERT OR REPLACE INTO sysml_elements
+           (id, project_id, xmi_id, element_type, name, qualified_name,
+            parent_id, stereotype, description, properties,
+            diagram_type, source_file, source_hash, imported_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        element_rows,
+        lambda row: f"Element '{row[4]}'",
+        error_details,
+    )
 
-    # Insert relationships
-    for rel in relationships:
-        try:
-            cursor.execute(
-                """INSERT OR REPLACE INTO sysml_relationships
-                   (project_id, source_element_id, target_element_id,
-                    relationship_type, name, properties, source_file)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    project_id,
-                    rel["source_element_id"],
-                    rel["target_element_id"],
-                    rel["relationship_type"],
-                    rel.get("name", ""),
-                    rel.get("properties", "{}"),
-                    rel.get("source_file", str(Path(file_path).name)),
-                ),
-            )
-            rels_inserted += 1
-        except sqlite3.Error as exc:
-            error_details.append(f"Relationship '{rel.get('name', '')}': {exc}")
+    rel_rows = [
+        (
+            project_id,
+            rel["source_element_id"],
+            rel["target_element_id"],
+            rel["relationship_type"],
+            rel.get("name", ""),
+            rel.get("properties", "{}"),
+            rel.get("source_file", str(Path(file_path).name)),
+        )
+        for rel in relationships
+    ]
+    rels_inserted = bulk_insert(
+        conn,
+        """INSERT OR REPLACE INTO sysml_relationships
+           (project_id, source_element_id, target_element_id,
+            relationship_type, name, properties, source_file)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        rel_rows,
+        lambda row: f"Relationship '{row[4]}'",
+        error_details,
+    )
 
     # Step 5 — Record import
     status = "completed" if not error_details else "partial"
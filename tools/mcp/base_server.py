@@ -7,13 +7,27 @@ Uses Content-Length framing (LSP-style):
 
 Reads requests from stdin, dispatches to registered handlers, writes responses to stdout.
 Notifications (methods starting with "notifications/") receive no response.
+
+tools/call dispatch is sequential by default. A server whose handlers are
+known to be thread-safe can opt in to a worker pool (``max_workers`` > 1,
+or ICDEV_MCP_WORKERS for the process) so a slow tool does not block
+tools/list, ping or other calls on the same channel. Responses are written
+as each call finishes (out of order, matched by JSON-RPC id) through a
+single locked writer. notifications/cancelled drops queued calls and
+suppresses the response of running ones; handlers can poll
+request_cancelled() to stop early. Tools listed in TOOL_CONCURRENCY
+(tools/mcp/tool_registry.py) are capped at that many concurrent calls.
 """
 
 import json
 import logging
+import os
 import sys
+import threading
 import traceback
-from typing import Any, Callable, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 # Configure logging to stderr so it does not interfere with the JSON-RPC stdio transport.
 logging.basicConfig(
@@ -25,11 +39,69 @@ logger = logging.getLogger("mcp.base")
 
 PROTOCOL_VERSION = "2024-11-05"
 
+# Worker threads for tools/call (ICDEV_MCP_WORKERS overrides; 1 = sequential).
+# Sequential until a server's handlers are audited for shared globals and
+# SQLite connection use across threads.
+DEFAULT_MAX_WORKERS = 1
+
+_request_state = threading.local()
+_registry_limits: Optional[Dict[str, int]] = None
+
+
+def request_cancelled() -> bool:
+    """Return True if the client cancelled the tools/call running on this thread.
+
+    Long-running handlers may poll this between steps and return early;
+    the response of a cancelled call is never sent.
+    """
+    call = getattr(_request_state, "call", None)
+    return call is not None and call.cancelled.is_set()
+
+
+def _tool_concurrency_limits() -> Dict[str, int]:
+    """Per-tool concurrency caps from the declarative tool registry (cached)."""
+    global _registry_limits
+    if _registry_limits is None:
+        try:
+            from tools.mcp.tool_registry import TOOL_CONCURRENCY
+            _registry_limits = dict(TOOL_CONCURRENCY)
+        except ImportError:
+            _registry_limits = {}
+    return _registry_limits
+
+
+def _default_max_workers() -> int:
+    try:
+        return int(os.environ.get("ICDEV_MCP_WORKERS", DEFAULT_MAX_WORKERS))
+    except ValueError:
+        return DEFAULT_MAX_WORKERS
+
+
+class RawJSON(str):
+    """Pre-serialized JSON text written verbatim as a response result."""
+
+
+class _ToolCall:
+    """An accepted tools/call request, from queueing until its response is written."""
+
+    __slots__ = ("request_id", "tool", "msg", "cancelled")
+
+    def __init__(self, request_id: Any, tool: str, msg: dict):
+        self.request_id = request_id
+        self.tool = tool
+        self.msg = msg
+        self.cancelled = threading.Event()
+
 
 class MCPServer:
     """Base MCP server with JSON-RPC 2.0 dispatch over stdio with Content-Length framing."""
 
-    def __init__(self, name: str = "icdev-mcp", version: str = "1.0.0"):
+    def __init__(
+        self,
+        name: str = "icdev-mcp",
+        version: str = "1.0.0",
+        max_workers: Optional[int] = None,
+    ):
         self.name = name
         self.version = version
 
@@ -45,6 +117,16 @@ class MCPServer:
         # Whether the client has completed initialization handshake
         self._initialized = False
 
+        # Concurrent tools/call dispatch (executor exists only while run() is active)
+        self.max_workers = max(1, max_workers if max_workers is not None else _default_max_workers())
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._write_lock = threading.Lock()
+        self._calls_lock = threading.Lock()
+        self._calls_idle = threading.Condition(self._calls_lock)
+        self._inflight: Dict[Any, _ToolCall] = {}
+        self._tool_active: Dict[str, int] = {}
+        self._tool_waiting: Dict[str, Deque[_ToolCall]] = {}
+
     # ------------------------------------------------------------------
     # Registration helpers
     # ------------------------------------------------------------------
@@ -55,6 +137,7 @@ class MCPServer:
         description: str,
         input_schema: dict,
         handler: Callable[[dict], Any],
+        max_concurrency: Optional[int] = None,
     ) -> None:
         """Register a tool that clients can invoke via tools/call.
 
@@ -63,11 +146,16 @@ class MCPServer:
             description: Human-readable description of the tool.
             input_schema: JSON Schema object describing the tool's input parameters.
             handler: Callable that receives the arguments dict and returns a result.
+            max_concurrency: Maximum simultaneous calls of this tool. Defaults to
+                the TOOL_CONCURRENCY entry in the tool registry (unlimited if absent).
         """
+        if max_concurrency is None:
+            max_concurrency = _tool_concurrency_limits().get(name)
         self._tools[name] = {
             "description": description,
             "input_schema": input_schema,
             "handler": handler,
+            "max_concurrency": max_concurrency,
         }
         logger.info("Registered tool: %s", name)
 
@@ -166,13 +254,24 @@ class MCPServer:
             return None
 
     def _write_message(self, obj: dict) -> None:
-        """Write a Content-Length-framed JSON-RPC message to stdout."""
-        body = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        """Write a Content-Length-framed JSON-RPC message to stdout.
+
+        Serialized so responses finishing on worker threads never interleave.
+        """
+        result = obj.get("result")
+        if isinstance(result, RawJSON):
+            # Splice pre-rendered payloads (e.g. a snapshot tools/list) without re-encoding
+            body = '{"jsonrpc":"2.0","id":%s,"result":%s}' % (
+                json.dumps(obj.get("id"), ensure_ascii=False), result,
+            )
+        else:
+            body = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
         body_bytes = body.encode("utf-8")
         header = f"Content-Length: {len(body_bytes)}\r\n\r\n"
-        sys.stdout.buffer.write(header.encode("utf-8"))
-        sys.stdout.buffer.write(body_bytes)
-        sys.stdout.buffer.flush()
+        with self._write_lock:
+            sys.stdout.buffer.write(header.encode("utf-8"))
+            sys.stdout.buffer.write(body_bytes)
+            sys.stdout.buffer.flush()
 
     # ------------------------------------------------------------------
     # JSON-RPC helpers
@@ -238,6 +337,10 @@ class MCPServer:
             self._initialized = True
             return None  # notification, no response needed
 
+        if method == "notifications/cancelled":
+            self._handle_cancelled(params or {})
+            return None
+
         # ----- Tools -----
         if method == "tools/list":
             return self._handle_tools_list(params)
@@ -490,6 +593,108 @@ class MCPServer:
             ],
         }
 
+    # ------------------------------------------------------------------
+    # Concurrent tools/call dispatch
+    # ------------------------------------------------------------------
+
+    def _submit_tool_call(self, msg: dict) -> None:
+        """Queue a tools/call on the worker pool, honoring the tool's concurrency cap."""
+        request_id = msg["id"]
+        params = msg.get("params") or {}
+        call = _ToolCall(request_id, params.get("name", ""), msg)
+
+        with self._calls_lock:
+            if request_id in self._inflight:
+                duplicate = True
+            else:
+                duplicate = False
+                self._inflight[request_id] = call
+                limit = self._tools.get(call.tool, {}).get("max_concurrency")
+                active = self._tool_active.get(call.tool, 0)
+                if limit and active >= limit:
+                    # Parked until a running call of the same tool finishes
+                    self._tool_waiting.setdefault(call.tool, deque()).append(call)
+                    return
+                self._tool_active[call.tool] = active + 1
+
+        if duplicate:
+            self._write_message(self._make_error(
+                request_id, self.INVALID_REQUEST,
+                f"Request id {request_id!r} is already in progress",
+            ))
+            return
+        self._executor.submit(self._run_tool_call, call)
+
+    def _run_tool_call(self, call: _ToolCall) -> None:
+        """Worker body: execute one tools/call and write its response unless cancelled."""
+        try:
+            if call.cancelled.is_set():
+                return
+            _request_state.call = call
+            try:
+                response = self._dispatch(call.msg)
+            finally:
+                _request_state.call = None
+            if response is not None and not call.cancelled.is_set():
+                self._write_message(response)
+        except Exception as exc:
+            logger.error("Failed to complete tools/call %s: %s", call.request_id, exc)
+        finally:
+            self._finish_tool_call(call)
+
+    def _finish_tool_call(self, call: _ToolCall) -> None:
+        """Release the call's slot, handing it to the next parked call of the same tool."""
+        next_call = None
+        with self._calls_lock:
+            self._inflight.pop(call.request_id, None)
+            waiting = self._tool_waiting.get(call.tool)
+            if waiting:
+                next_call = waiting.popleft()
+            else:
+                remaining = self._tool_active.get(call.tool, 1) - 1
+                if remaining > 0:
+                    self._tool_active[call.tool] = remaining
+                else:
+                    self._tool_active.pop(call.tool, None)
+            self._calls_idle.notify_all()
+        executor = self._executor
+        if next_call is not None and executor is not None:
+            executor.submit(self._run_tool_call, next_call)
+
+    def _handle_cancelled(self, params: dict) -> None:
+        """Handle notifications/cancelled for an in-flight tools/call.
+
+        Parked calls are dropped immediately. Queued or running calls are
+        flagged: they are skipped if not yet started, otherwise their
+        response is discarded. Unknown or finished ids are ignored.
+        """
+        request_id = params.get("requestId")
+        with self._calls_lock:
+            call = self._inflight.get(request_id) if _is_request_id(request_id) else None
+            if call is None:
+                return
+            call.cancelled.set()
+            waiting = self._tool_waiting.get(call.tool)
+            if waiting and call in waiting:
+                waiting.remove(call)
+                self._inflight.pop(request_id, None)
+                self._calls_idle.notify_all()
+        logger.info("Cancelled tools/call %s (%s): %s",
+                    request_id, call.tool, params.get("reason", "no reason given"))
+
+    def _wait_for_tool_calls(self, timeout: Optional[float] = None) -> bool:
+        """Block until every accepted tools/call has finished. Returns False on timeout."""
+        with self._calls_lock:
+            return self._calls_idle.wait_for(lambda: not self._inflight, timeout)
+
+    def _is_concurrent_call(self, msg: dict) -> bool:
+        return (
+            self._executor is not None
+            and msg.get("method") == "tools/call"
+            and "id" in msg
+            and _is_request_id(msg["id"])
+        )
+
     # ------------------------------------------------------------------
     # Main loop
     # ------------------------------------------------------------------
@@ -501,11 +706,26 @@ class MCPServer:
         """
         logger.info("MCP server '%s' v%s starting (protocol %s)", self.name, self.version, PROTOCOL_VERSION)
 
+        # Batch audit writes off the tool-call path for the server's lifetime
+        try:
+            from tools.audit.audit_logger import disable_group_commit, enable_group_commit
+            enable_group_commit(server=True)
+        except ImportError:
+            disable_group_commit = None
+
+        if self.max_workers > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f"{self.name}-call",
+            )
+        interrupted = False
+
         try:
             while True:
                 msg = self._read_message()
                 if msg is None:
                     logger.info("EOF on stdin, shutting down.")
+                    # Let accepted calls finish and write their responses
+                    self._wait_for_tool_calls()
                     break
 
                 # Validate basic JSON-RPC shape
@@ -519,15 +739,37 @@ class MCPServer:
                         self._write_message(response)
                     continue
 
+                if self._is_concurrent_call(msg):
+                    self._submit_tool_call(msg)
+                    continue
+
                 response = self._dispatch(msg)
                 if response is not None:
                     self._write_message(response)
 
         except KeyboardInterrupt:
             logger.info("Interrupted, shutting down.")
+            interrupted = True
         except Exception as exc:
             logger.critical("Fatal error in main loop: %s\n%s", exc, traceback.format_exc())
+            interrupted = True
             sys.exit(1)
+        finally:
+            if self._executor is not None:
+                if interrupted:
+                    with self._calls_lock:
+                        self._tool_waiting.clear()
+                        for call in self._inflight.values():
+                            call.cancelled.set()
+                self._executor.shutdown(wait=not interrupted)
+                self._executor = None
+            if disable_group_commit is not None:
+                disable_group_commit()  # Durable flush of queued audit events
+
+
+def _is_request_id(value: Any) -> bool:
+    # JSON-RPC ids are strings or numbers; anything else is dispatched inline
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
 
 
 class _MethodNotFound(Exception):
@@ -42,6 +42,32 @@ SERVER_MODULES = [
     ("observability", "tools.mcp.observability_server"),
 ]
 
+# Per-tool concurrency caps emitted as TOOL_CONCURRENCY (read by base_server)
+TOOL_CONCURRENCY = {
+    "ssp_generate": 2,
+    "stig_check": 2,
+    "sbom_generate": 2,
+    "run_tests": 1,
+    "terraform_plan": 1,
+    "terraform_apply": 1,
+    "ansible_run": 1,
+    "k8s_deploy": 1,
+    "rollback": 1,
+    "self_heal": 1,
+    "scan_dependencies": 2,
+    "run_maintenance_audit": 1,
+    "remediate": 1,
+    "run_simulation": 2,
+    "run_monte_carlo": 2,
+    "scan_web": 1,
+    "run_pipeline": 1,
+    "translate_code": 1,
+    "run_atlas_red_team": 1,
+    "production_audit": 1,
+    "production_remediate": 1,
+    "run_e2e_tests": 1,
+}
+
 # New tools from gap_handlers.py (these don't exist in any server yet)
 GAP_HANDLER_TOOLS = {
     # ---- Translation (Phase 43) ----
@@ -568,6 +594,8 @@ def main():
         lines.append(f'    {cat} ({count})')
     lines.append(f'')
     lines.append(f'Total: {len(all_tools)} tools, {len(all_resources)} resources')
+    lines.append('')
+    lines.append('TOOL_CONCURRENCY caps concurrent calls of long-running or mutating tools.')
     lines.append('"""')
     lines.append('')
     lines.append('')
@@ -610,12 +638,24 @@ def main():
 
     lines.append('}')
     lines.append('')
+    lines.append('')
+    lines.append('# Maximum simultaneous tools/call executions per tool (base_server worker pool).')
+    lines.append('# Infrastructure mutations are serialized; heavy generators and scanners are')
+    lines.append('# capped so they cannot occupy every worker. Unlisted tools are unlimited.')
+    lines.append('TOOL_CONCURRENCY = {')
+    for tool_name, limit in TOOL_CONCURRENCY.items():
+        if tool_name in all_tools:
+            lines.append(f'    "{tool_name}": {limit},')
+    lines.append('}')
+    lines.append('')
 
     with open(output_path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
 
     print(f"\nGenerated: {output_path}", file=sys.stderr)
     print(f"  {len(all_tools)} tools, {len(all_resources)} resources", file=sys.stderr)
+    print("  Rebuild the startup snapshot: python tools/mcp/registry_snapshot.py --build",
+          file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Precompiled snapshot of the unified MCP tool registry (D301 startup path).
+
+The unified server otherwise imports the 160 KB tool_registry.py module and
+re-serializes every input schema on each tools/list. The snapshot is a
+build artifact holding the validated dispatch table (module, handler,
+description, concurrency cap) and the tools/list payload pre-rendered as
+JSON text, keyed to the SHA-256 of tool_registry.py so a stale snapshot is
+ignored rather than served.
+
+Also provides most_called_tools(), which ranks tools by recorded
+mcp.tool_call spans (D284) for the unified server's warm-import thread.
+
+Usage:
+    python tools/mcp/registry_snapshot.py --build
+    python tools/mcp/registry_snapshot.py --check --json
+    python tools/mcp/registry_snapshot.py --top 10 --json
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+logger = logging.getLogger("mcp.registry_snapshot")
+
+REGISTRY_SOURCE = Path(__file__).resolve().parent / "tool_registry.py"
+DEFAULT_SNAPSHOT_PATH = BASE_DIR / "data" / "mcp_registry_snapshot.json"
+DB_PATH = Path(os.environ.get("ICDEV_DB_PATH", str(BASE_DIR / "data" / "icdev.db")))
+SNAPSHOT_FORMAT = 1
+
+_DOTTED_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def snapshot_path() -> Path:
+    """Snapshot location (ICDEV_MCP_REGISTRY_SNAPSHOT overrides the default)."""
+    return Path(os.environ.get("ICDEV_MCP_REGISTRY_SNAPSHOT", str(DEFAULT_SNAPSHOT_PATH)))
+
+
+def registry_digest(source: Optional[Path] = None) -> str:
+    """SHA-256 of tool_registry.py, used to detect stale snapshots."""
+    return hashlib.sha256(Path(source or REGISTRY_SOURCE).read_bytes()).hexdigest()
+
+
+def validate_registry(tools: Dict[str, dict], resources: Dict[str, dict],
+                      concurrency: Dict[str, int]) -> List[str]:
+    """Return a list of problems that would break dispatch or tools/list."""
+    problems = []
+    for name, entry in tools.items():
+        for key in ("category", "module", "handler", "description", "input_schema"):
+            if key not in entry:
+                problems.append(f"{name}: missing '{key}'")
+        if not _DOTTED_NAME.match(entry.get("module", "")):
+            problems.append(f"{name}: invalid module path {entry.get('module')!r}")
+        if not _IDENTIFIER.match(entry.get("handler", "")):
+            problems.append(f"{name}: invalid handler name {entry.get('handler')!r}")
+        schema = entry.get("input_schema")
+        if not isinstance(schema, dict) or schema.get("type") != "object":
+            problems.append(f"{name}: input_schema must be a JSON Schema object")
+        else:
+            try:
+                json.dumps(schema)
+            except (TypeError, ValueError) as exc:
+                problems.append(f"{name}: input_schema not JSON-serializable ({exc})")
+    for uri, entry in resources.items():
+        for key in ("name", "description", "module", "handler"):
+            if key not in entry:
+                problems.append(f"{uri}: missing '{key}'")
+    for name, limit in concurrency.items():
+        if name not in tools:
+            problems.append(f"TOOL_CONCURRENCY: unknown tool {name!r}")
+        if not isinstance(limit, int) or limit < 1:
+            problems.append(f"TOOL_CONCURRENCY: {name} limit must be a positive int")
+    return problems
+
+
+def build_snapshot(output: Optional[Path] = None) -> dict:
+    """Validate the tool registry and write the snapshot file.
+
+    Raises:
+        ValueError: If the registry fails validation (nothing is written).
+    """
+    from datetime import datetime, timezone
+
+    from tools.mcp.tool_registry import RESOURCE_REGISTRY, TOOL_CONCURRENCY, TOOL_REGISTRY
+
+    problems = validate_registry(TOOL_REGISTRY, RESOURCE_REGISTRY, TOOL_CONCURRENCY)
+    if problems:
+        raise ValueError("Tool registry failed validation:\n  " + "\n  ".join(problems))
+
+    tools_list = {"tools": [
+        {"name": name, "description": entry["description"], "inputSchema": entry["input_schema"]}
+        for name, entry in TOOL_REGISTRY.items()
+    ]}
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "source_sha256": registry_digest(),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "tools": {
+            name: {
+                "category": entry["category"],
+                "module": entry["module"],
+                "handler": entry["handler"],
+                "description": entry["description"],
+                "max_concurrency": TOOL_CONCURRENCY.get(name),
+            }
+            for name, entry in TOOL_REGISTRY.items()
+        },
+        "resources": RESOURCE_REGISTRY,
+        "tools_list": json.dumps(tools_list, separators=(",", ":"), ensure_ascii=False),
+    }
+
+    output = Path(output or snapshot_path())
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    tmp.write_text(json.dumps(snapshot, separators=(",", ":"), ensure_ascii=False),
+                   encoding="utf-8")
+    os.replace(tmp, output)  # Atomic: a starting server never reads a partial file
+    return {
+        "path": str(output),
+        "tools": len(snapshot["tools"]),
+        "resources": len(snapshot["resources"]),
+        "bytes": output.stat().st_size,
+        "source_sha256": snapshot["source_sha256"],
+    }
+
+
+def load_snapshot(path: Optional[Path] = None) -> Optional[dict]:
+    """Load the snapshot if present and built from the current tool_registry.py.
+
+    Returns None (caller falls back to importing the registry) when the
+    file is missing, unreadable, of another format, or stale.
+    """
+    path = Path(path or snapshot_path())
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable registry snapshot %s: %s", path, exc)
+        return None
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        logger.info("Registry snapshot %s has format %s; rebuilding required",
+                    path, snapshot.get("format"))
+        return None
+    try:
+        current = registry_digest()
+    except OSError:
+        current = None  # Source not shipped (e.g. bytecode-only install): trust snapshot
+    if current is not None and snapshot.get("source_sha256") != current:
+        logger.info("Registry snapshot %s is stale; run registry_snapshot.py --build", path)
+        return None
+    return snapshot
+
+
+def most_called_tools(limit: int = 10, db_path: Optional[Path] = None,
+                      days: int = 30) -> List[str]:
+    """Rank tools by mcp.tool_call spans recorded in the last ``days`` days."""
+    import sqlite3
+
+    db_path = Path(db_path or DB_PATH)
+    if limit <= 0 or not db_path.exists():
+        return []
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
+        try:
+            rows = conn.execute(
+                """SELECT json_extract(attributes, '$."mcp.tool.name"') AS tool, COUNT(*) AS calls
+                   FROM otel_spans
+                   WHERE name = 'mcp.tool_call'
+                     AND start_time >= datetime('now', ?)
+                   GROUP BY tool
+                   HAVING tool IS NOT NULL
+                   ORDER BY calls DESC, tool
+                   LIMIT ?""",
+                (f"-{int(days)} days", limit),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        logger.debug("Tool usage unavailable: %s", exc)
+        return []
+    return [row[0] for row in rows]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or check the MCP tool registry snapshot")
+    parser.add_argument("--build", action="store_true", help="Validate registry and write snapshot")
+    parser.add_argument("--check", action="store_true", help="Report whether the snapshot is current")
+    parser.add_argument("--top", type=int, metavar="N", help="Show the N most-called tools")
+    parser.add_argument("--output", type=Path, help="Snapshot path (default: data/mcp_registry_snapshot.json)")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.build:
+        try:
+            result = build_snapshot(args.output)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            sys.exit(1)
+    elif args.check:
+        path = args.output or snapshot_path()
+        current = load_snapshot(path) is not None
+        result = {"path": str(path), "exists": Path(path).exists(), "current": current}
+    elif args.top:
+        result = {"tools": most_called_tools(args.top)}
+    else:
+        parser.print_help()
+        return
+
+    result["classification"] = "CUI // SP-CTI"
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print(f"{key}: {value}")
+    if args.check and not result["current"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,8 @@ Categories:
     misc (8)
 
 Total: 230 tools, 6 resources
+
+TOOL_CONCURRENCY caps concurrent calls of long-running or mutating tools.
 """
 
 
@@ -2006,3 +2008,32 @@ RESOURCE_REGISTRY = {
         "mime_type": "application/json",
     },
 }
+
+
+# Maximum simultaneous tools/call executions per tool (base_server worker pool).
+# Infrastructure mutations are serialized; heavy generators and scanners are
+# capped so they cannot occupy every worker. Unlisted tools are unlimited.
+TOOL_CONCURRENCY = {
+    "ssp_generate": 2,
+    "stig_check": 2,
+    "sbom_generate": 2,
+    "run_tests": 1,
+    "terraform_plan": 1,
+    "terraform_apply": 1,
+    "ansible_run": 1,
+    "k8s_deploy": 1,
+    "rollback": 1,
+    "self_heal": 1,
+    "scan_dependencies": 2,
+    "run_maintenance_audit": 1,
+    "remediate": 1,
+    "run_simulation": 2,
+    "run_monte_carlo": 2,
+    "scan_web": 1,
+    "run_pipeline": 1,
+    "translate_code": 1,
+    "run_atlas_red_team": 1,
+    "production_audit": 1,
+    "production_remediate": 1,
+    "run_e2e_tests": 1,
+}
@@ -22,14 +22,24 @@ Architecture Decision D301:
     tool name -> (module, handler, schema).  Handlers imported via
     importlib.import_module() on first call, cached thereafter.
     All tools inherit D284 auto-instrumentation from base_server.py.
+
+Startup:
+    If data/mcp_registry_snapshot.json (built by registry_snapshot.py --build)
+    matches the current tool_registry.py, tools are registered from it and
+    tools/list is answered with its pre-rendered payload; otherwise the
+    registry module is imported as before. While serving, a background
+    thread pre-imports the handlers of the ICDEV_MCP_WARM_TOP (default 10)
+    most-called tools so their first call does not pay the import cost.
 """
 
 import importlib
+import json
 import logging
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -37,18 +47,24 @@ from typing import Any, Callable, Dict
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from tools.mcp.base_server import MCPServer  # noqa: E402
+from tools.mcp.base_server import MCPServer, RawJSON  # noqa: E402
 
 logger = logging.getLogger("mcp.unified")
 
+# Handlers pre-imported in the background after startup (0 disables)
+DEFAULT_WARM_TOP = 10
+
 
 class UnifiedMCPServer(MCPServer):
     """Unified MCP server with lazy-loaded tool handlers from declarative registry."""
 
-    def __init__(self):
+    def __init__(self, snapshot_path: Optional[Path] = None, use_snapshot: bool = True):
         super().__init__(name="icdev-unified", version="1.0.0")
         self._handler_cache: Dict[str, Callable] = {}
-        self._register_all()
+        self._entries: Dict[str, dict] = {}
+        self._tools_list_json: Optional[RawJSON] = None
+        self._warm_thread: Optional[threading.Thread] = None
+        self._register_all(snapshot_path, use_snapshot)
 
     # ------------------------------------------------------------------
     # Lazy loading
@@ -88,8 +104,15 @@ class UnifiedMCPServer(MCPServer):
     # Registry loading
     # ------------------------------------------------------------------
 
-    def _register_all(self) -> None:
-        """Register all tools and resources from the declarative registry."""
+    def _register_all(self, snapshot_path: Optional[Path] = None, use_snapshot: bool = True) -> None:
+        """Register all tools and resources, from the snapshot when it is current."""
+        if use_snapshot:
+            from tools.mcp.registry_snapshot import load_snapshot
+            snapshot = load_snapshot(snapshot_path)
+            if snapshot is not None:
+                self._register_from_snapshot(snapshot)
+                return
+
         from tools.mcp.tool_registry import TOOL_REGISTRY, RESOURCE_REGISTRY
 
         # Register tools with lazy dispatch closures
@@ -104,23 +127,108 @@ class UnifiedMCPServer(MCPServer):
 
         logger.info("Registered %d resources from unified registry", len(RESOURCE_REGISTRY))
 
-    def _register_lazy_tool(self, tool_name: str, entry: dict) -> None:
-        """Register a single tool with a lazy-loading handler closure."""
+    def _register_from_snapshot(self, snapshot: dict) -> None:
+        """Populate the dispatch table from a validated registry snapshot.
 
-        def _make_handler(name: str, ent: dict) -> Callable:
-            def lazy_handler(args: dict) -> Any:
-                handler = self._resolve_handler(name, ent)
-                return handler(args)
+        Schemas stay serialized inside the pre-rendered tools/list payload;
+        input_schema is only decoded if another tool is registered later.
+        """
+        for tool_name, entry in snapshot["tools"].items():
+            self._entries[tool_name] = entry
+            self._tools[tool_name] = {
+                "description": entry["description"],
+                "input_schema": None,
+                "handler": self._make_lazy_handler(tool_name, entry),
+                "max_concurrency": entry.get("max_concurrency"),
+            }
+        self._tools_list_json = RawJSON(snapshot["tools_list"])
+
+        for uri, entry in snapshot["resources"].items():
+            self._register_lazy_resource(uri, entry)
+
+        logger.info("Registered %d tools and %d resources from registry snapshot",
+                    len(snapshot["tools"]), len(snapshot["resources"]))
+
+    def _make_lazy_handler(self, name: str, ent: dict) -> Callable:
+        def lazy_handler(args: dict) -> Any:
+            handler = self._resolve_handler(name, ent)
+            return handler(args)
 
-            return lazy_handler
+        return lazy_handler
 
+    def _register_lazy_tool(self, tool_name: str, entry: dict) -> None:
+        """Register a single tool with a lazy-loading handler closure."""
+        self._entries[tool_name] = entry
         self.register_tool(
             name=tool_name,
             description=entry["description"],
             input_schema=entry["input_schema"],
-            handler=_make_handler(tool_name, entry),
+            handler=self._make_lazy_handler(tool_name, entry),
         )
 
+    def register_tool(self, name: str, *args: Any, **kwargs: Any) -> None:
+        """Register a tool, first decoding snapshot schemas so tools/list stays complete."""
+        if self._tools_list_json is not None:
+            schemas = {t["name"]: t["inputSchema"] for t in json.loads(self._tools_list_json)["tools"]}
+            for tool_name, info in self._tools.items():
+                if info.get("input_schema") is None and tool_name in schemas:
+                    info["input_schema"] = schemas[tool_name]
+            self._tools_list_json = None
+        super().register_tool(name, *args, **kwargs)
+
+    def _handle_tools_list(self, params: dict) -> Any:
+        """Serve the pre-rendered snapshot payload when available."""
+        if self._tools_list_json is not None:
+            return self._tools_list_json
+        return super()._handle_tools_list(params)
+
+    # ------------------------------------------------------------------
+    # Warm imports
+    # ------------------------------------------------------------------
+
+    def warm_handlers(self, tool_names: Optional[List[str]] = None, limit: Optional[int] = None) -> List[str]:
+        """Import handlers ahead of their first call.
+
+        Args:
+            tool_names: Tools to warm; defaults to the most-called tools from
+                recorded mcp.tool_call spans.
+            limit: How many most-called tools to warm (ICDEV_MCP_WARM_TOP).
+
+        Returns:
+            The tool names whose handlers were resolved.
+        """
+        if tool_names is None:
+            from tools.mcp.registry_snapshot import most_called_tools
+            if limit is None:
+                limit = _warm_top()
+            tool_names = most_called_tools(limit)
+
+        warmed = []
+        for name in tool_names:
+            entry = self._entries.get(name)
+            if entry is None or name in self._handler_cache:
+                continue
+            self._resolve_handler(name, entry)
+            warmed.append(name)
+        if warmed:
+            logger.info("Warmed %d tool handlers: %s", len(warmed), ", ".join(warmed))
+        return warmed
+
+    def run(self) -> None:
+        """Serve requests, warming the most-called handlers on a background thread."""
+        if _warm_top() > 0:
+            self._warm_thread = threading.Thread(
+                target=self._warm_safely, name="icdev-unified-warm", daemon=True,
+            )
+            self._warm_thread.start()
+        super().run()
+
+    def _warm_safely(self) -> None:
+        try:
+            self.warm_handlers()
+        except Exception as exc:  # Warming is an optimization; never take the server down
+            logger.warning("Handler warm-up failed: %s", exc)
+
     def _register_lazy_resource(self, uri: str, entry: dict) -> None:
         """Register a single resource with a lazy-loading handler closure."""
 
@@ -144,6 +252,13 @@ class UnifiedMCPServer(MCPServer):
         )
 
 
+def _warm_top() -> int:
+    try:
+        return int(os.environ.get("ICDEV_MCP_WARM_TOP", DEFAULT_WARM_TOP))
+    except ValueError:
+        return DEFAULT_WARM_TOP
+
+
 def create_server() -> UnifiedMCPServer:
     """Factory function for the unified MCP gateway server."""
     return UnifiedMCPServer()
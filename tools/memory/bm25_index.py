@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Incremental BM25 inverted index stored in memory.db.
+
+Replaces rebuilding a ``BM25Okapi`` model over every memory entry per query.
+Postings (term -> entry, tf), document lengths and corpus totals live in
+three tables next to ``memory_entries``; writers update them in the same
+transaction as the entry itself, and scoring reads only the postings of the
+query terms.
+
+Tables:
+    memory_bm25_postings (term, entry_id, tf)      WITHOUT ROWID, PK(term, entry_id)
+    memory_bm25_docs     (entry_id, length)
+    memory_bm25_stats    (key, value)               doc_count, total_length, id_sum
+
+Tokenization matches the previous ``content.lower().split()`` so rankings
+stay comparable.  IDF uses the non-negative form
+``ln(1 + (N - n + 0.5) / (n + 0.5))`` so common terms never subtract score.
+Air-gap safe, stdlib only.
+
+CLI:
+    python tools/memory/bm25_index.py --rebuild --json
+    python tools/memory/bm25_index.py --query "stig findings" --json
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = BASE_DIR / "data" / "memory.db"
+
+sys.path.insert(0, str(BASE_DIR))
+
+# rank_bm25.BM25Okapi defaults
+K1 = 1.5
+B = 0.75
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS memory_bm25_postings (
+        term TEXT NOT NULL,
+        entry_id INTEGER NOT NULL,
+        tf INTEGER NOT NULL,
+        PRIMARY KEY (term, entry_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_bm25_postings_entry ON memory_bm25_postings(entry_id)",
+    """CREATE TABLE IF NOT EXISTS memory_bm25_docs (
+        entry_id INTEGER PRIMARY KEY,
+        length INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS memory_bm25_stats (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )""",
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenize exactly like the legacy hybrid_search BM25 path."""
+    return (text or "").lower().split()
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Create the BM25 tables if they do not exist (idempotent).
+
+    Uses plain ``execute`` (not ``executescript``) so an open writer
+    transaction is not committed early.
+    """
+    for statement in _SCHEMA:
+        conn.execute(statement)
+
+
+def _get_stats(conn) -> Dict[str, int]:
+    stats = {"doc_count": 0, "total_length": 0, "id_sum": 0}
+    for key, value in conn.execute("SELECT key, value FROM memory_bm25_stats"):
+        stats[key] = value
+    return stats
+
+
+def _bump_stats(conn, docs: int, length: int, id_sum: int) -> None:
+    for key, delta in (("doc_count", docs), ("total_length", length), ("id_sum", id_sum)):
+        conn.execute(
+            "INSERT INTO memory_bm25_stats (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, delta),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Maintenance (called inside the writer's transaction — caller commits)
+# ---------------------------------------------------------------------------
+
+def remove_entry(conn: sqlite3.Connection, entry_id: int) -> bool:
+    """Drop an entry's postings. Returns False if it was not indexed."""
+    row = conn.execute(
+        "SELECT length FROM memory_bm25_docs WHERE entry_id = ?", (entry_id,)
+    ).fetchone()
+    if row is None:
+        return False
+    conn.execute("DELETE FROM memory_bm25_postings WHERE entry_id = ?", (entry_id,))
+    conn.execute("DELETE FROM memory_bm25_docs WHERE entry_id = ?", (entry_id,))
+    _bump_stats(conn, -1, -row[0], -entry_id)
+    return True
+
+
+def index_entry(conn: sqlite3.Connection, entry_id: int, content: str) -> int:
+    """Index (or re-index) one entry. Returns the document length in tokens.
+
+    Requires :func:`ensure_schema` to have run on *conn*.
+    """
+    remove_entry(conn, entry_id)
+    tokens = tokenize(content)
+    conn.executemany(
+        "INSERT INTO memory_bm25_postings (term, entry_id, tf) VALUES (?, ?, ?)",
+        [(term, entry_id, tf) for term, tf in Counter(tokens).items()],
+    )
+    conn.execute(
+        "INSERT INTO memory_bm25_docs (entry_id, length) VALUES (?, ?)",
+        (entry_id, len(tokens)),
+    )
+    _bump_stats(conn, 1, len(tokens), entry_id)
+    return len(tokens)
+
+
+def try_index_entry(conn: sqlite3.Connection, entry_id: int, content: str) -> bool:
+    """Best-effort :func:`index_entry` for writers.
+
+    Runs inside a SAVEPOINT so a failure rolls back any partial postings
+    without touching the caller's own pending writes.  Entries skipped here
+    are picked up by the next :func:`sync`.
+    """
+    try:
+        ensure_schema(conn)
+        conn.execute("SAVEPOINT bm25_index")
+    except sqlite3.Error:
+        return False
+    try:
+        index_entry(conn, entry_id, content)
+        conn.execute("RELEASE SAVEPOINT bm25_index")
+        return True
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO SAVEPOINT bm25_index")
+        conn.execute("RELEASE SAVEPOINT bm25_index")
+        return False
+
+
+def index_entries(conn: sqlite3.Connection, rows: Iterable[Tuple[int, str]]) -> int:
+    """Index many ``(entry_id, content)`` rows. Returns the count indexed."""
+    count = 0
+    for entry_id, content in rows:
+        index_entry(conn, entry_id, content)
+        count += 1
+    return count
+
+
+def sync(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Reconcile the index with memory_entries.
+
+    One aggregate query when nothing changed; otherwise only the id columns
+    are diffed and only missing rows' content is read.  Content edited in
+    place by a writer that does not call :func:`index_entry` is not
+    detected — such writers must re-index explicitly.
+    """
+    ensure_schema(conn)
+    stats = _get_stats(conn)
+    count, id_sum = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(id), 0) FROM memory_entries"
+    ).fetchone()
+    if (count, id_sum) == (stats["doc_count"], stats["id_sum"]):
+        return {"added": 0, "removed": 0}
+
+    entry_ids = {r[0] for r in conn.execute("SELECT id FROM memory_entries")}
+    indexed_ids = {r[0] for r in conn.execute("SELECT entry_id FROM memory_bm25_docs")}
+    stale = indexed_ids - entry_ids
+    missing = sorted(entry_ids - indexed_ids)
+
+    for entry_id in stale:
+        remove_entry(conn, entry_id)
+    added = 0
+    for start in range(0, len(missing), 500):
+        chunk = missing[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT id, content FROM memory_entries WHERE id IN ({placeholders})", chunk
+        ).fetchall()
+        added += index_entries(conn, rows)
+    conn.commit()
+    return {"added": added, "removed": len(stale)}
+
+
+def rebuild(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Drop and rebuild the whole index from memory_entries."""
+    ensure_schema(conn)
+    conn.execute("DELETE FROM memory_bm25_postings")
+    conn.execute("DELETE FROM memory_bm25_docs")
+    conn.execute("DELETE FROM memory_bm25_stats")
+    count = index_entries(conn, conn.execute("SELECT id, content FROM memory_entries").fetchall())
+    conn.commit()
+    return {"indexed": count}
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def score(conn: sqlite3.Connection, query: str,
+          entry_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+    """BM25 scores for entries matching any query term.
+
+    Args:
+        conn: memory.db connection (index must exist; see :func:`sync`).
+        query: Free-text query.
+        entry_ids: Optional restriction (e.g. user/tenant-scoped ids).
+
+    Returns:
+        {entry_id: raw BM25 score} — entries with no matching term are absent.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return {}
+    stats = _get_stats(conn)
+    n_docs = stats["doc_count"]
+    if n_docs <= 0:
+        return {}
+    avgdl = (stats["total_length"] / n_docs) or 1.0
+    allowed = set(entry_ids) if entry_ids is not None else None
+
+    query_tf = Counter(terms)
+    placeholders = ",".join("?" * len(query_tf))
+    postings: Dict[str, List[Tuple[int, int, int]]] = {}
+    for term, entry_id, tf, length in conn.execute(
+        f"SELECT p.term, p.entry_id, p.tf, d.length "
+        f"FROM memory_bm25_postings p JOIN memory_bm25_docs d ON d.entry_id = p.entry_id "
+        f"WHERE p.term IN ({placeholders})",
+        list(query_tf),
+    ):
+        postings.setdefault(term, []).append((entry_id, tf, length))
+
+    scores: Dict[int, float] = {}
+    for term, plist in postings.items():
+        df = len(plist)
+        idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        weight = idf * query_tf[term]
+        for entry_id, tf, length in plist:
+            if allowed is not None and entry_id not in allowed:
+                continue
+            denom = tf + K1 * (1.0 - B + B * length / avgdl)
+            scores[entry_id] = scores.get(entry_id, 0.0) + weight * tf * (K1 + 1.0) / denom
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory BM25 inverted index")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild index from memory_entries")
+    parser.add_argument("--sync", action="store_true", help="Index new entries, drop deleted ones")
+    parser.add_argument("--query", help="Score a query against the index")
+    parser.add_argument("--limit", type=int, default=10, help="Max results for --query")
+    parser.add_argument("--db-path", help="Override memory.db path")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(str(args.db_path or DB_PATH))
+    result: Dict = {"classification": "CUI // SP-CTI"}
+    try:
+        if args.rebuild:
+            result.update(rebuild(conn))
+        elif args.sync:
+            result.update(sync(conn))
+        if args.query:
+            sync(conn)
+            ranked = sorted(score(conn, args.query).items(), key=lambda kv: kv[1], reverse=True)
+            result["results"] = [
+                {"id": entry_id, "score": round(s, 4)} for entry_id, s in ranked[: args.limit]
+            ]
+        ensure_schema(conn)
+        result["stats"] = _get_stats(conn)
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        stats = result["stats"]
+        print(f"BM25 index: {stats['doc_count']} docs, {stats['total_length']} tokens")
+        for item in result.get("results", []):
+            print(f"  [#{item['id']}] {item['score']}")
+
+
+if __name__ == "__main__":
+    main()
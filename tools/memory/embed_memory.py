@@ -3,17 +3,72 @@
 """Generate embeddings for memory entries that don't have them yet.
 
 Uses vendor-agnostic LLM provider abstraction (D72) with OpenAI fallback.
+
+Backfill pipeline:
+  - Rows are read in keyset pages (``id > last_id``), never all at once.
+  - Each batch is one ``embed_batch()`` call sized per provider
+    (``embedding_backfill.batch_sizes`` in args/memory_config.yaml).
+  - Up to ``max_workers`` batches are in flight on a thread pool; results
+    are written in id order with ``executemany`` on the main thread.
+  - A failed batch is retried with backoff, then recorded and skipped —
+    it does not abort the run.
+  - Progress is checkpointed in ``memory_embed_checkpoints`` in the same
+    commit as the embeddings, so ``--resume`` continues an interrupted
+    run after its last committed row.
+
+Usage:
+    python tools/memory/embed_memory.py --all --json
+    python tools/memory/embed_memory.py --all --resume --workers 8 --json
 """
 
 import argparse
 import json
+import logging
 import sqlite3
 import struct
 import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "memory.db"
+CONFIG_PATH = BASE_DIR / "args" / "memory_config.yaml"
+
+logger = logging.getLogger("icdev.memory.embed")
+
+DEFAULT_CONFIG = {
+    "max_workers": 4,
+    "max_retries": 3,
+    "retry_base_delay": 1.0,
+    "page_size": 2000,
+    "batch_sizes": {
+        "openai": 256,
+        "local": 32,
+        "azure_openai": 256,
+        "gemini": 100,
+        "bedrock": 16,       # Titan has no batch API; keeps per-call latency bounded
+        "oci_genai": 96,
+        "ibm_watsonx": 256,
+        "default": 20,
+    },
+}
+
+_CHECKPOINT_SCHEMA = """CREATE TABLE IF NOT EXISTS memory_embed_checkpoints (
+    run_id TEXT PRIMARY KEY,
+    provider TEXT,
+    user_id TEXT,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    embedded INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    failed_ids TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL DEFAULT 'running',
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)"""
 
 
 def get_embedding_client():
@@ -51,104 +106,335 @@ def embedding_to_blob(embedding):
     return struct.pack(f"{len(embedding)}f", *embedding)
 
 
-def embed_all(user_id=None, json_output=False):
-    client, provider_name = get_embedding_client()
-    if not client:
-        if json_output:
-            print(json.dumps({"error": "no_provider", "embedded": 0}))
-        return
+def load_backfill_config():
+    """Load the embedding_backfill section of memory_config.yaml."""
+    config = {**DEFAULT_CONFIG, "batch_sizes": dict(DEFAULT_CONFIG["batch_sizes"])}
+    try:
+        import yaml
+        if CONFIG_PATH.exists():
+            with open(CONFIG_PATH, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            section = data.get("embedding_backfill", {}) or {}
+            for key, value in section.items():
+                if key == "batch_sizes" and isinstance(value, dict):
+                    config["batch_sizes"].update(value)
+                else:
+                    config[key] = value
+    except (ImportError, Exception):
+        pass
+    return config
 
-    conn = sqlite3.connect(str(DB_PATH))
-    c = conn.cursor()
 
-    sql = "SELECT id, content FROM memory_entries WHERE embedding IS NULL"
-    params = []
-    if user_id:
-        sql += " AND user_id = ?"
-        params.append(user_id)
+def batch_size_for(client, config=None):
+    """Provider-specific batch size (falls back to ``batch_sizes.default``)."""
+    sizes = (config or load_backfill_config())["batch_sizes"]
+    name = getattr(client, "provider_name", None)
+    if name is None and not hasattr(client, "embed"):
+        name = "openai"  # Direct OpenAI client
+    return max(1, int(sizes.get(name, sizes.get("default", 20))))
 
-    c.execute(sql, params)
-    rows = c.fetchall()
 
-    if not rows:
-        if json_output:
-            print(json.dumps({"classification": "CUI // SP-CTI", "embedded": 0,
-                              "status": "all_embedded", "provider": provider_name}))
+def _update_vector_index(rows, db_path=None):
+    """Append committed embeddings to the persistent vector index."""
+    try:
+        from tools.memory.vector_index import record_embeddings
+        record_embeddings(rows, db_path=db_path or DB_PATH)
+    except ImportError:
+        pass
+
+
+def _embed_texts(client, texts):
+    """One batched embedding call. Returns a vector (or None) per text."""
+    if hasattr(client, "embed_batch"):
+        vectors = list(client.embed_batch(texts))
+    elif hasattr(client, "embed"):
+        vectors = [client.embed(text) for text in texts]
+    else:
+        # Direct OpenAI client (fallback)
+        response = client.embeddings.create(input=texts, model="text-embedding-3-small")
+        vectors = [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+    if len(vectors) != len(texts):
+        raise ValueError(f"provider returned {len(vectors)} embeddings for {len(texts)} texts")
+    if texts and all(not v for v in vectors):
+        # Azure/OCI/watsonx providers swallow errors and return [None] * n
+        raise RuntimeError("provider returned no embeddings for batch")
+    return vectors
+
+
+def _embed_with_retry(client, texts, max_retries, base_delay):
+    """Call :func:`_embed_texts` with exponential backoff between attempts."""
+    from tools.resilience.retry import backoff_delay
+    for attempt in range(max_retries + 1):
+        try:
+            return _embed_texts(client, texts)
+        except Exception as exc:
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, base_delay=base_delay) if base_delay else 0
+            logger.warning("Embedding batch failed (attempt %d/%d): %s — retrying in %.1fs",
+                           attempt + 1, max_retries + 1, exc, delay)
+            if delay:
+                time.sleep(delay)
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _start_run(conn, provider_name, user_id, resume):
+    """Return (run_id, last_id, embedded, failed, failed_ids) for this run."""
+    conn.execute(_CHECKPOINT_SCHEMA)
+    if resume:
+        row = conn.execute(
+            "SELECT run_id, last_id, embedded, failed, failed_ids FROM memory_embed_checkpoints "
+            "WHERE status != 'completed' AND user_id IS ? ORDER BY started_at DESC LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE memory_embed_checkpoints SET status = 'running', provider = ?, updated_at = ? "
+                "WHERE run_id = ?",
+                (provider_name, _now(), row[0]),
+            )
+            conn.commit()
+            return row[0], row[1], row[2], row[3], json.loads(row[4] or "[]")
+    run_id = uuid.uuid4().hex
+    now = _now()
+    conn.execute(
+        "INSERT INTO memory_embed_checkpoints (run_id, provider, user_id, started_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (run_id, provider_name, user_id, now, now),
+    )
+    conn.commit()
+    return run_id, 0, 0, 0, []
+
+
+def _save_checkpoint(conn, run_id, last_id, embedded, failed, failed_ids, status="running"):
+    conn.execute(
+        "UPDATE memory_embed_checkpoints SET last_id = ?, embedded = ?, failed = ?, "
+        "failed_ids = ?, status = ?, updated_at = ? WHERE run_id = ?",
+        (last_id, embedded, failed, json.dumps(failed_ids), status, _now(), run_id),
+    )
+
+
+def get_checkpoint(db_path=None, run_id=None):
+    """Return the given (or most recent) backfill checkpoint as a dict, or None."""
+    conn = sqlite3.connect(str(db_path or DB_PATH))
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute(_CHECKPOINT_SCHEMA)
+        if run_id:
+            row = conn.execute("SELECT * FROM memory_embed_checkpoints WHERE run_id = ?",
+                               (run_id,)).fetchone()
         else:
-            print("All entries already have embeddings.")
+            row = conn.execute("SELECT * FROM memory_embed_checkpoints "
+                               "ORDER BY started_at DESC LIMIT 1").fetchone()
+    finally:
         conn.close()
-        return
+    if row is None:
+        return None
+    result = dict(row)
+    result["failed_ids"] = json.loads(result["failed_ids"] or "[]")
+    return result
 
-    if not json_output:
-        print(f"Generating embeddings for {len(rows)} entries (provider: {provider_name})...")
 
-    # Batch in groups of 20
-    batch_size = 20
-    total = 0
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+def _pages(conn, after_id, user_id, page_size):
+    """Yield pages of (id, content, user_id, tenant_id) needing embeddings."""
+    sql = ("SELECT id, content, user_id, tenant_id FROM memory_entries "
+           "WHERE embedding IS NULL AND id > ?")
+    if user_id:
+        sql += " AND user_id = ?"
+    sql += " ORDER BY id LIMIT ?"
+    while True:
+        params = [after_id] + ([user_id] if user_id else []) + [page_size]
+        rows = conn.execute(sql, params).fetchall()
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1][0]
+
+
+def _batches(conn, after_id, user_id, page_size, batch_size):
+    """Regroup pages into full batches (rows carry over page boundaries)."""
+    pending = []
+    for page in _pages(conn, after_id, user_id, page_size):
+        pending.extend(page)
+        while len(pending) >= batch_size:
+            yield pending[:batch_size]
+            pending = pending[batch_size:]
+    if pending:
+        yield pending
+
+
+def backfill(db_path=None, user_id=None, resume=False, client=None, provider_name=None,
+             max_workers=None, batch_size=None, progress=None):
+    """Embed every entry missing an embedding.
+
+    Args:
+        db_path: memory.db path (default data/memory.db).
+        user_id: Only embed this user's entries (D180).
+        resume: Continue the latest unfinished run from its checkpoint.
+        client: Embedding provider / OpenAI client (default: get_embedding_client()).
+        provider_name: Label recorded with the run.
+        max_workers: Concurrent embedding requests (config ``max_workers``).
+        batch_size: Texts per request (default: provider-specific).
+        progress: Optional callable(embedded, failed) after each committed batch.
+
+    Returns:
+        Dict with run_id, embedded, errors (failed batches), failed (rows),
+        total_unembedded and provider.
+    """
+    path = db_path or DB_PATH
+    if client is None:
+        client, provider_name = get_embedding_client()
+        if not client:
+            return {"error": "no_provider", "embedded": 0}
+    provider_name = provider_name or getattr(client, "provider_name", "unknown")
+
+    config = load_backfill_config()
+    workers = max(1, int(max_workers or config["max_workers"]))
+    size = max(1, int(batch_size or batch_size_for(client, config)))
+    max_retries = int(config["max_retries"])
+    base_delay = float(config["retry_base_delay"])
+
+    conn = sqlite3.connect(str(path))
+    run_id, last_id, embedded, failed, failed_ids = _start_run(conn, provider_name, user_id, resume)
+
+    count_sql = "SELECT COUNT(*) FROM memory_entries WHERE embedding IS NULL AND id > ?"
+    count_params = [last_id]
+    if user_id:
+        count_sql += " AND user_id = ?"
+        count_params.append(user_id)
+    remaining = conn.execute(count_sql, count_params).fetchone()[0]
+
     errors = 0
+    committed = (last_id, embedded, failed, len(failed_ids))
+    batches = _batches(conn, last_id, user_id, int(config["page_size"]), size)
+    in_flight = deque()
+    status = "failed"
+    try:
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="icdev-embed") as pool:
+            def submit_next():
+                batch = next(batches, None)
+                if batch is None:
+                    return False
+                texts = [row[1] for row in batch]
+                in_flight.append((batch, pool.submit(_embed_with_retry, client, texts,
+                                                     max_retries, base_delay)))
+                return True
 
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i : i + batch_size]
-        texts = [row[1] for row in batch]
-        ids = [row[0] for row in batch]
+            # Keep the pool saturated with a bounded backlog
+            while len(in_flight) < workers * 2 and submit_next():
+                pass
 
-        try:
-            if hasattr(client, "embed"):
-                # LLM provider interface (D72)
-                for j, text in enumerate(texts):
-                    emb = client.embed(text)
-                    blob = embedding_to_blob(emb)
-                    c.execute(
-                        "UPDATE memory_entries SET embedding = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                        (blob, ids[j]),
-                    )
-                    total += 1
-            else:
-                # Direct OpenAI client (fallback)
-                response = client.embeddings.create(
-                    input=texts, model="text-embedding-3-small"
+            while in_flight:
+                # Commit in submission order so last_id is a true watermark
+                batch, future = in_flight.popleft()
+                try:
+                    vectors = future.result()
+                except Exception as exc:
+                    vectors = [None] * len(batch)
+                    errors += 1
+                    logger.error("Embedding batch %d-%d failed: %s", batch[0][0], batch[-1][0], exc)
+
+                updates, indexed = [], []
+                for row, vector in zip(batch, vectors):
+                    if vector:
+                        updates.append((embedding_to_blob(vector), row[0]))
+                        indexed.append((row[0], vector, row[2], row[3]))
+                    else:
+                        failed_ids.append(row[0])
+                conn.executemany(
+                    "UPDATE memory_entries SET embedding = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    updates,
                 )
-                for j, emb_data in enumerate(response.data):
-                    blob = embedding_to_blob(emb_data.embedding)
-                    c.execute(
-                        "UPDATE memory_entries SET embedding = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                        (blob, ids[j]),
-                    )
-                    total += 1
+                embedded += len(updates)
+                failed += len(batch) - len(updates)
+                last_id = batch[-1][0]
+                _save_checkpoint(conn, run_id, last_id, embedded, failed, failed_ids)
+                conn.commit()
+                committed = (last_id, embedded, failed, len(failed_ids))
+                _update_vector_index(indexed, db_path=path)
+                if progress:
+                    progress(embedded, failed)
+                submit_next()
+        status = "completed"
+    except KeyboardInterrupt:
+        status = "interrupted"
+        raise
+    finally:
+        if status != "completed":
+            # Drop any half-written batch; the checkpoint keeps the last commit
+            conn.rollback()
+            last_id, embedded, failed, n_failed = committed
+            del failed_ids[n_failed:]
+        _save_checkpoint(conn, run_id, last_id, embedded, failed, failed_ids, status)
+        conn.commit()
+        conn.close()
+
+    return {
+        "run_id": run_id,
+        "embedded": embedded,
+        "errors": errors,
+        "failed": failed,
+        "total_unembedded": remaining,
+        "provider": provider_name,
+        "batch_size": size,
+        "workers": workers,
+    }
 
-            conn.commit()
-            if not json_output:
-                print(f"  Embedded {total}/{len(rows)} entries...")
 
-        except Exception as e:
-            errors += 1
-            if not json_output:
-                print(f"Error embedding batch starting at index {i}: {e}")
-            break
+def embed_all(user_id=None, json_output=False, resume=False, max_workers=None, batch_size=None):
+    client, provider_name = get_embedding_client()
+    if not client:
+        if json_output:
+            print(json.dumps({"error": "no_provider", "embedded": 0}))
+        return
+
+    def report(embedded, failed):
+        print(f"  Embedded {embedded} entries ({failed} failed)...")
+
+    if not json_output:
+        print(f"Generating embeddings (provider: {provider_name})...")
 
-    conn.close()
+    result = backfill(user_id=user_id, resume=resume, client=client, provider_name=provider_name,
+                      max_workers=max_workers, batch_size=batch_size,
+                      progress=None if json_output else report)
 
     if json_output:
-        print(json.dumps({
-            "classification": "CUI // SP-CTI",
-            "embedded": total,
-            "errors": errors,
-            "total_unembedded": len(rows),
-            "provider": provider_name,
-        }, indent=2))
+        if result["total_unembedded"] == 0:
+            result["status"] = "all_embedded"
+        print(json.dumps({"classification": "CUI // SP-CTI", **result}, indent=2))
+    elif result["total_unembedded"] == 0:
+        print("All entries already have embeddings.")
     else:
-        print(f"Done. {total} entries embedded via {provider_name}.")
+        print(f"Done. {result['embedded']} entries embedded via {provider_name} "
+              f"({result['failed']} failed, run {result['run_id']}).")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate embeddings for memory entries")
     parser.add_argument("--all", action="store_true", help="Embed all entries missing embeddings")
     parser.add_argument("--user-id", help="Only embed entries for this user (D180)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the latest unfinished backfill from its checkpoint")
+    parser.add_argument("--workers", type=int, help="Concurrent embedding requests")
+    parser.add_argument("--batch-size", type=int, help="Texts per request (default: per provider)")
     parser.add_argument("--json", action="store_true", help="JSON output")
     args = parser.parse_args()
 
     if args.all:
-        embed_all(user_id=args.user_id, json_output=args.json)
+        embed_all(user_id=args.user_id, json_output=args.json, resume=args.resume,
+                  max_workers=args.workers, batch_size=args.batch_size)
     else:
         print("Use --all to embed all entries missing embeddings.")
 
@@ -9,17 +9,37 @@ import argparse
 import json
 import sqlite3
 import struct
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "memory.db"
 
+sys.path.insert(0, str(BASE_DIR))
 
-def get_all_entries(user_id=None, tenant_id=None):
-    conn = sqlite3.connect(str(DB_PATH))
+
+def _get_vector_index(db_path=None):
+    """Return the synced vector index, or None to fall back to BLOB scanning."""
+    try:
+        from tools.memory import vector_index
+        if not vector_index.is_enabled():
+            return None
+        return vector_index.get_index(db_path or DB_PATH)
+    except Exception:
+        return None
+
+
+def get_all_entries(user_id=None, tenant_id=None, include_embeddings=True, db_path=None):
+    """Load candidate entries as (id, content, type, importance, embedding, created_at).
+
+    With ``include_embeddings=False`` the embedding column is returned as
+    NULL, for callers that score through the vector index instead.
+    """
+    conn = sqlite3.connect(str(db_path or DB_PATH))
     c = conn.cursor()
 
-    sql = "SELECT id, content, type, importance, embedding, created_at FROM memory_entries WHERE 1=1"
+    emb_col = "embedding" if include_embeddings else "NULL"
+    sql = f"SELECT id, content, type, importance, {emb_col}, created_at FROM memory_entries WHERE 1=1"
     params = []
 
     if user_id:
@@ -35,8 +55,36 @@ def get_all_entries(user_id=None, tenant_id=None):
     return rows
 
 
-def bm25_search(query, entries):
-    """BM25 keyword ranking with fallback to simple term frequency."""
+def _indexed_bm25_scores(query, entries, db_path=None):
+    """Score via the persistent BM25 inverted index; None when unavailable."""
+    path = Path(db_path or DB_PATH)
+    if not path.exists():
+        return None
+    try:
+        from tools.memory import bm25_index
+        conn = sqlite3.connect(str(path))
+        try:
+            bm25_index.sync(conn)
+            scores = bm25_index.score(conn, query)
+        finally:
+            conn.close()
+    except (ImportError, sqlite3.Error):
+        return None
+    return [scores.get(entry[0], 0.0) for entry in entries]
+
+
+def bm25_search(query, entries, use_index=True, db_path=None):
+    """BM25 keyword ranking with fallback to simple term frequency.
+
+    Uses the persistent inverted index of the memory.db *entries* came from
+    (only the query terms' postings are read) and falls back to rebuilding
+    a model over *entries* without it.
+    """
+    scores = _indexed_bm25_scores(query, entries, db_path) if use_index else None
+    if scores is not None:
+        max_score = max(scores) if scores and max(scores) > 0 else 1.0
+        return [s / max_score for s in scores]
+
     documents = [entry[1] for entry in entries]
 
     try:
@@ -58,13 +106,20 @@ def bm25_search(query, entries):
     return [s / max_score for s in scores]
 
 
-def semantic_search(query, entries):
-    """Semantic similarity using embeddings (vendor-agnostic via LLM provider)."""
+def semantic_search(query, entries, index=None, provider=None):
+    """Semantic similarity using embeddings (vendor-agnostic via LLM provider).
+
+    When a vector index is supplied, all similarities come from one
+    vectorized pass over its matrix instead of unpacking each BLOB.
+    A pre-resolved *provider* (e.g. held warm by the memory daemon) skips
+    provider lookup.
+    """
     # Try LLM provider system first (supports OpenAI, Ollama, Bedrock Titan)
     query_emb = None
     try:
-        from tools.llm import get_embedding_provider
-        provider = get_embedding_provider()
+        if provider is None:
+            from tools.llm import get_embedding_provider
+            provider = get_embedding_provider()
         query_emb = provider.embed(query)
     except Exception:
         pass
@@ -93,6 +148,16 @@ def semantic_search(query, entries):
     if query_emb is None:
         return None
 
+    if index is not None:
+        try:
+            scores = index.similarities(query_emb, [e[0] for e in entries])
+            max_score = max(scores) if scores and max(scores) > 0 else 1.0
+            return [s / max_score for s in scores]
+        except Exception:
+            # Entries were loaded without BLOBs when an index was available,
+            # so per-row scoring would be all zeros; report it unavailable.
+            return None
+
     scores = []
     for entry in entries:
         emb_blob = entry[4]
@@ -156,6 +221,80 @@ def hybrid_rank(entries, bm25_scores, semantic_scores, bm25_weight, semantic_wei
     return results
 
 
+def run_search(query, limit=10, bm25_weight=0.7, semantic_weight=0.3, time_decay=False,
+               user_id=None, tenant_id=None, entries=None, index=None, provider=None,
+               decay_config=None, db_path=None, log_fn=None):
+    """Run a hybrid search and return the CLI's JSON payload.
+
+    The memory daemon passes its warm *entries*, *index*, *provider* and
+    *decay_config* (and a *log_fn* writing the access log on its own
+    connection); the CLI passes nothing and everything is loaded here.
+    Human-readable warnings are returned under ``notices``.
+    """
+    path = Path(db_path) if db_path else DB_PATH
+    notices = []
+
+    if index is None:
+        index = _get_vector_index(path)
+    if entries is None:
+        entries = get_all_entries(user_id=user_id, tenant_id=tenant_id,
+                                  include_embeddings=index is None, db_path=path)
+    if not entries:
+        return {"classification": "CUI // SP-CTI", "count": 0, "entries": [],
+                "notices": ["No memory entries found."]}
+
+    bm25_scores = bm25_search(query, entries, db_path=path)
+    semantic_scores = semantic_search(query, entries, index=index, provider=provider)
+
+    if semantic_scores is None:
+        notices.append("(Semantic search unavailable — using keyword search only)")
+
+    # D147: Load time-decay config if enabled
+    if time_decay and decay_config is None:
+        try:
+            from tools.memory.time_decay import load_decay_config
+            decay_config = load_decay_config()
+        except (ImportError, Exception):
+            notices.append("(Time-decay module unavailable — using standard ranking)")
+
+    results = hybrid_rank(entries, bm25_scores, semantic_scores, bm25_weight, semantic_weight,
+                          time_decay_enabled=time_decay, decay_config=decay_config)
+
+    # Log access
+    search_type = "hybrid_time_decay" if time_decay else "hybrid"
+    if log_fn is not None:
+        log_fn(query, min(limit, len(results)), search_type)
+    else:
+        conn = sqlite3.connect(str(path))
+        c = conn.cursor()
+        c.execute(
+            "INSERT INTO memory_access_log (query, results_count, search_type) VALUES (?, ?, ?)",
+            (query, min(limit, len(results)), search_type),
+        )
+        conn.commit()
+        conn.close()
+
+    output_entries = []
+    for score, id_, content, type_, importance, created_at in results[:limit]:
+        if score > 0:
+            output_entries.append({
+                "id": id_,
+                "score": round(score, 4),
+                "content": content,
+                "type": type_,
+                "importance": importance,
+                "created_at": created_at,
+            })
+    return {
+        "classification": "CUI // SP-CTI",
+        "count": len(output_entries),
+        "search_type": search_type,
+        "semantic_available": semantic_scores is not None,
+        "entries": output_entries,
+        "notices": notices,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(description="Hybrid search (BM25 + semantic)")
     parser.add_argument("--query", required=True, help="Search query")
@@ -165,70 +304,43 @@ def main():
     parser.add_argument("--time-decay", action="store_true", help="Enable time-decay scoring (D147)")
     parser.add_argument("--user-id", help="Filter by user ID (D180)")
     parser.add_argument("--tenant-id", help="Filter by tenant ID (D180)")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Search in-process even if the memory daemon is running")
     parser.add_argument("--json", action="store_true", help="JSON output")
     args = parser.parse_args()
 
-    entries = get_all_entries(user_id=args.user_id, tenant_id=args.tenant_id)
-    if not entries:
-        if args.json:
-            print(json.dumps({"classification": "CUI // SP-CTI", "count": 0, "entries": []}))
-        else:
-            print("No memory entries found.")
-        return
-
-    bm25_scores = bm25_search(args.query, entries)
-    semantic_scores = semantic_search(args.query, entries)
-
-    if semantic_scores is None and not args.json:
-        print("(Semantic search unavailable — using keyword search only)")
-
-    # D147: Load time-decay config if enabled
-    decay_config = None
-    if args.time_decay:
+    params = {
+        "query": args.query,
+        "limit": args.limit,
+        "bm25_weight": args.bm25_weight,
+        "semantic_weight": args.semantic_weight,
+        "time_decay": args.time_decay,
+        "user_id": args.user_id,
+        "tenant_id": args.tenant_id,
+    }
+
+    # Prefer the resident memory daemon (warm caches); fall back in-process
+    payload = None
+    if not args.no_daemon:
         try:
-            from tools.memory.time_decay import load_decay_config
-            decay_config = load_decay_config()
-        except (ImportError, Exception):
-            if not args.json:
-                print("(Time-decay module unavailable — using standard ranking)")
-
-    results = hybrid_rank(entries, bm25_scores, semantic_scores, args.bm25_weight, args.semantic_weight,
-                          time_decay_enabled=args.time_decay, decay_config=decay_config)
-
-    # Log access
-    search_type = "hybrid_time_decay" if args.time_decay else "hybrid"
-    conn = sqlite3.connect(str(DB_PATH))
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO memory_access_log (query, results_count, search_type) VALUES (?, ?, ?)",
-        (args.query, min(args.limit, len(results)), search_type),
-    )
-    conn.commit()
-    conn.close()
+            from tools.memory.memory_daemon import query_daemon
+            payload = query_daemon("search", params)
+        except ImportError:
+            payload = None
+    if payload is None:
+        payload = run_search(**params)
 
+    notices = payload.pop("notices", [])
     if args.json:
-        output_entries = []
-        for score, id_, content, type_, importance, created_at in results[: args.limit]:
-            if score > 0:
-                output_entries.append({
-                    "id": id_,
-                    "score": round(score, 4),
-                    "content": content,
-                    "type": type_,
-                    "importance": importance,
-                    "created_at": created_at,
-                })
-        print(json.dumps({
-            "classification": "CUI // SP-CTI",
-            "count": len(output_entries),
-            "search_type": search_type,
-            "semantic_available": semantic_scores is not None,
-            "entries": output_entries,
-        }, indent=2))
+        if not payload["entries"] and "search_type" not in payload:
+            payload = {"classification": "CUI // SP-CTI", "count": 0, "entries": []}
+        print(json.dumps(payload, indent=2))
     else:
-        for score, id_, content, type_, importance, created_at in results[: args.limit]:
-            if score > 0:
-                print(f"[#{id_}] (score:{score:.3f}, {type_}, importance:{importance}) {content}  — {created_at}")
+        for notice in notices:
+            print(notice)
+        for item in payload["entries"]:
+            print(f"[#{item['id']}] (score:{item['score']:.3f}, {item['type']}, "
+                  f"importance:{item['importance']}) {item['content']}  — {item['created_at']}")
 
 
 if __name__ == "__main__":
@@ -19,7 +19,6 @@ Usage:
 import argparse
 import json
 import sqlite3
-import struct
 import sys
 import time
 from datetime import datetime, timezone
@@ -39,7 +38,7 @@ def _load_config():
         "prune_stale_days": 180,
         "prune_min_importance": 3,
         "prune_types": ["event", "thinking"],
-        "embed_batch_size": 20,
+        "embed_batch_size": None,  # None = provider-specific (embedding_backfill)
         "backup_before_prune": True,
     }
     try:
@@ -66,15 +65,18 @@ def flush_buffer(db_path=None):
 
 
 def embed_unembedded(db_path=None):
-    """Generate embeddings for entries missing them (D72 compliant)."""
+    """Generate embeddings for entries missing them (D72 compliant).
+
+    Delegates to the batched, checkpointed backfill in embed_memory.
+    """
     path = db_path or DB_PATH
     conn = sqlite3.connect(str(path))
-    c = conn.cursor()
-    c.execute("SELECT id, content FROM memory_entries WHERE embedding IS NULL")
-    rows = c.fetchall()
+    pending = conn.execute(
+        "SELECT COUNT(*) FROM memory_entries WHERE embedding IS NULL"
+    ).fetchone()[0]
+    conn.close()
 
-    if not rows:
-        conn.close()
+    if not pending:
         return {"embedded": 0, "status": "all_embedded"}
 
     # Use LLM provider abstraction (D72)
@@ -106,52 +108,20 @@ def embed_unembedded(db_path=None):
                 pass
 
     if provider is None:
-        conn.close()
-        return {"embedded": 0, "status": "no_provider", "total_unembedded": len(rows)}
-
-    cfg = _load_config()
-    batch_size = cfg.get("embed_batch_size", 20)
-    embedded = 0
-    errors = 0
-
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i + batch_size]
-        texts = [row[1] for row in batch]
-        ids = [row[0] for row in batch]
+        return {"embedded": 0, "status": "no_provider", "total_unembedded": pending}
 
-        try:
-            if hasattr(provider, "embed"):
-                # LLM provider interface
-                for j, text in enumerate(texts):
-                    emb = provider.embed(text)
-                    blob = struct.pack(f"{len(emb)}f", *emb)
-                    c.execute(
-                        "UPDATE memory_entries SET embedding = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                        (blob, ids[j]),
-                    )
-                    embedded += 1
-            else:
-                # Direct OpenAI client
-                response = provider.embeddings.create(
-                    input=texts, model="text-embedding-3-small"
-                )
-                for j, emb_data in enumerate(response.data):
-                    blob = struct.pack(f"{len(emb_data.embedding)}f", *emb_data.embedding)
-                    c.execute(
-                        "UPDATE memory_entries SET embedding = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                        (blob, ids[j]),
-                    )
-                    embedded += 1
-            conn.commit()
-        except Exception:
-            errors += 1
+    from tools.memory.embed_memory import backfill
 
-    conn.close()
+    cfg = _load_config()
+    result = backfill(db_path=path, client=provider, provider_name=provider_name,
+                      batch_size=cfg.get("embed_batch_size"))
     return {
-        "embedded": embedded,
-        "errors": errors,
-        "total_unembedded": len(rows),
+        "embedded": result["embedded"],
+        "errors": result["errors"],
+        "failed": result["failed"],
+        "total_unembedded": pending,
         "provider": provider_name,
+        "run_id": result["run_id"],
     }
 
 
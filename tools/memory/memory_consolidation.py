@@ -37,6 +37,15 @@ JACCARD_REPLACE_THRESHOLD = 0.80
 JACCARD_KEEP_THRESHOLD = 0.75
 
 
+def _reindex_keywords(conn: sqlite3.Connection, entry_id: int, content: str) -> None:
+    """Refresh the BM25 postings of a rewritten entry (same transaction)."""
+    try:
+        from tools.memory.bm25_index import try_index_entry
+        try_index_entry(conn, entry_id, content)
+    except ImportError:
+        pass
+
+
 class MemoryConsolidator:
     """Check and consolidate similar memory entries.
 
@@ -311,6 +320,7 @@ Respond as JSON: {{"action": "ACTION", "target_id": <id_or_null>, "merged_conten
                     "UPDATE memory_entries SET content = ?, updated_at = ? WHERE id = ?",
                     (new_content, datetime.now(timezone.utc).isoformat(), target_id),
                 )
+                _reindex_keywords(conn, target_id, new_content)
                 conn.commit()
                 conn.close()
                 return {"status": "replaced", "action": action, "target_id": target_id}
@@ -324,6 +334,7 @@ Respond as JSON: {{"action": "ACTION", "target_id": <id_or_null>, "merged_conten
                     "UPDATE memory_entries SET content = ?, updated_at = ? WHERE id = ?",
                     (merged_content, datetime.now(timezone.utc).isoformat(), target_id),
                 )
+                _reindex_keywords(conn, target_id, merged_content)
                 conn.commit()
                 conn.close()
                 return {"status": "merged", "action": action, "target_id": target_id}
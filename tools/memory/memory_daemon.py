@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Resident memory query daemon with warm caches.
+
+Every ``hybrid_search.py`` invocation used to pay full cold-start cost:
+importing the LLM provider stack, reading llm_config.yaml, opening
+memory.db, loading every row and rebuilding its indexes.  This daemon pays
+that once per deploy and keeps warm:
+
+  - the memory entry list (refreshed only when memory.db changes,
+    detected with ``PRAGMA data_version``)
+  - the vector index (tools/memory/vector_index.py)
+  - the BM25 inverted index (tools/memory/bm25_index.py, synced on change)
+  - the embedding provider (D72)
+  - the time-decay config from ``time_decay.load_decay_config()`` (D147)
+
+It listens on loopback HTTP (portable across Linux/macOS/Windows, D145)
+and only ever binds to a loopback address.  Loopback is not a trust
+boundary, so every request must also carry the shared secret the daemon
+writes to an owner-only (0600) token file at startup, must name a loopback
+``Host`` (DNS-rebinding guard) and POSTs must be ``application/json`` (no
+cross-site "simple" requests).  ``hybrid_search.py`` calls
+:func:`query_daemon` first and silently falls back to in-process search
+when the daemon is not running or its token file is unreadable.
+
+Usage:
+    python tools/memory/memory_daemon.py                 # Run daemon (foreground)
+    python tools/memory/memory_daemon.py --status --json # Health + cache stats
+    python tools/memory/memory_daemon.py --reload        # Drop warm caches
+    python tools/memory/memory_daemon.py --stop          # Graceful shutdown
+"""
+
+import argparse
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import secrets
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = BASE_DIR / "data" / "memory.db"
+TOKEN_PATH = BASE_DIR / "data" / ".memory_daemon.token"
+
+sys.path.insert(0, str(BASE_DIR))
+
+logger = logging.getLogger("icdev.memory.daemon")
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+TOKEN_HEADER = "X-ICDEV-Daemon-Token"
+SEARCH_PARAMS = (
+    "query", "limit", "bm25_weight", "semantic_weight", "time_decay",
+    "user_id", "tenant_id",
+)
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "host": "127.0.0.1",
+    "port": 8765,
+    "client_timeout_seconds": 30,
+    "connect_timeout_seconds": 0.25,
+    "token_file": None,
+}
+
+
+def load_daemon_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Load the ``daemon`` section of memory_config.yaml (defaults on failure)."""
+    path = config_path or (BASE_DIR / "args" / "memory_config.yaml")
+    config = dict(DEFAULT_CONFIG)
+    try:
+        import yaml
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            config.update(data.get("daemon", {}) or {})
+    except (ImportError, Exception):
+        pass
+    return config
+
+
+def _is_loopback(host: Optional[str]) -> bool:
+    if not host:
+        return False
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+def _daemon_url(config: Dict[str, Any]) -> str:
+    env_url = os.environ.get("ICDEV_MEMORY_DAEMON_URL")
+    if env_url:
+        parts = urlsplit(env_url)
+        if parts.scheme == "http" and _is_loopback(parts.hostname):
+            return env_url.rstrip("/")
+        logger.warning("Ignoring non-loopback ICDEV_MEMORY_DAEMON_URL %r", env_url)
+    return f"http://{config['host']}:{config['port']}"
+
+
+def _token_path(config: Dict[str, Any]) -> Path:
+    return Path(config.get("token_file") or TOKEN_PATH)
+
+
+def write_token_file(path: Path) -> str:
+    """Generate a fresh shared secret and store it owner-only (0600)."""
+    token = secrets.token_urlsafe(32)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def read_token_file(path: Path) -> Optional[str]:
+    """Read the daemon secret; None when missing or unreadable."""
+    try:
+        return path.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Warm query service
+# ---------------------------------------------------------------------------
+class MemoryQueryService:
+    """Holds warm search state for one memory.db.
+
+    Args:
+        db_path: memory.db to serve (default ``data/memory.db``).
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or DB_PATH)
+        self._lock = threading.Lock()
+        # Long-lived connection: PRAGMA data_version on it changes only when
+        # *another* connection commits, so our own access-log writes go here.
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._data_version: Optional[int] = None
+        self._entries: List[tuple] = []
+        self._index = None
+        self._provider = None
+        self._provider_resolved = False
+        self._decay_config: Optional[Dict[str, Any]] = None
+        self.stats: Dict[str, Any] = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "queries": 0,
+            "refreshes": 0,
+            "last_refresh_ms": 0,
+        }
+
+    # -- cache management ---------------------------------------------------
+    def reload(self) -> None:
+        """Drop every warm cache; the next query reloads from scratch."""
+        with self._lock:
+            self._data_version = None
+            self._entries = []
+            self._index = None
+            self._provider = None
+            self._provider_resolved = False
+            self._decay_config = None
+            try:
+                from tools.memory import vector_index
+                for index in vector_index._indexes.values():
+                    index.close()
+                vector_index._indexes.clear()
+            except ImportError:
+                pass
+
+    def _refresh_if_changed(self) -> None:
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version and self._entries:
+            return
+        start = time.monotonic()
+        from tools.memory import hybrid_search
+
+        try:
+            from tools.memory import bm25_index
+            bm25_index.sync(self._conn)
+        except Exception as exc:
+            logger.warning("BM25 index sync failed: %s", exc)
+        self._index = hybrid_search._get_vector_index(self.db_path)
+        self._entries = self._conn.execute(
+            "SELECT id, content, type, importance, NULL, created_at, user_id, tenant_id "
+            "FROM memory_entries"
+        ).fetchall()
+        # Record the version read *before* loading: a commit that lands while
+        # we refresh must still trigger the next refresh.  Our own writes on
+        # self._conn never move data_version, so no re-read is needed.
+        self._data_version = version
+        self.stats["refreshes"] += 1
+        self.stats["last_refresh_ms"] = int((time.monotonic() - start) * 1000)
+
+    def _warm_provider(self):
+        if not self._provider_resolved:
+            try:
+                from tools.llm import get_embedding_provider
+                self._provider = get_embedding_provider()
+            except Exception as exc:
+                logger.info("Embedding provider unavailable: %s", exc)
+                self._provider = None
+            self._provider_resolved = True
+        return self._provider
+
+    def _warm_decay_config(self):
+        if self._decay_config is None:
+            from tools.memory.time_decay import load_decay_config
+            self._decay_config = load_decay_config()
+        return self._decay_config
+
+    def warm(self) -> None:
+        """Load all caches up front so the first query is already warm."""
+        with self._lock:
+            self._refresh_if_changed()
+            self._warm_provider()
+            self._warm_decay_config()
+
+    def _scoped(self, user_id: Optional[str], tenant_id: Optional[str]) -> List[tuple]:
+        return [
+            e[:6] for e in self._entries
+            if (not user_id or e[6] in (None, user_id))
+            and (not tenant_id or e[7] in (None, tenant_id))
+        ]
+
+    def _log_access(self, query: str, count: int, search_type: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO memory_access_log (query, results_count, search_type) "
+                "VALUES (?, ?, ?)",
+                (query, count, search_type),
+            )
+            self._conn.commit()
+
+    # -- queries ------------------------------------------------------------
+    def search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a hybrid search with warm state; same payload as the CLI."""
+        from tools.memory.hybrid_search import run_search
+
+        kwargs = {k: params[k] for k in SEARCH_PARAMS if k in params}
+        if not kwargs.get("query"):
+            raise ValueError("query is required")
+        with self._lock:
+            self._refresh_if_changed()
+            entries = self._scoped(kwargs.get("user_id"), kwargs.get("tenant_id"))
+            index = self._index
+            provider = self._warm_provider()
+            decay_config = self._warm_decay_config() if kwargs.get("time_decay") else None
+            self.stats["queries"] += 1
+        return run_search(
+            entries=entries, index=index, provider=provider, decay_config=decay_config,
+            db_path=self.db_path, log_fn=self._log_access, **kwargs,
+        )
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "classification": "CUI // SP-CTI",
+            "status": "ok",
+            "db_path": str(self.db_path),
+            "entries_cached": len(self._entries),
+            "vector_index": self._index.status() if self._index is not None else None,
+            "provider": getattr(self._provider, "provider_name", None),
+            **self.stats,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# HTTP transport
+# ---------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    service: MemoryQueryService = None  # set by make_server
+    token: str = ""  # set by make_server
+    server_version = "ICDEVMemoryDaemon/1.0"
+
+    def log_message(self, fmt, *args):  # route to logging, not stderr
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        """Token, loopback Host and (for POST) JSON content type are all required."""
+        try:
+            host = urlsplit("//" + (self.headers.get("Host") or "").strip()).hostname
+        except ValueError:
+            host = None
+        if not _is_loopback(host):
+            self._send(403, {"error": "forbidden_host"})
+            return False
+        supplied = self.headers.get(TOKEN_HEADER) or ""
+        if not (self.token and hmac.compare_digest(supplied.encode(), self.token.encode())):
+            self._send(401, {"error": "unauthorized"})
+            return False
+        if self.command == "POST":
+            ctype = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip()
+            if ctype.lower() != "application/json":
+                self._send(415, {"error": "unsupported_media_type"})
+                return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        else:
+            self._send(404, {"error": "not_found"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, {"error": "invalid_json"})
+            return
+
+        if self.path == "/search":
+            try:
+                self._send(200, self.service.search(params))
+            except ValueError as exc:
+                self._send(400, {"error": str(exc)})
+            except Exception as exc:
+                logger.exception("Search failed")
+                self._send(500, {"error": str(exc)})
+        elif self.path == "/reload":
+            self.service.reload()
+            self._send(200, {"status": "reloaded"})
+        elif self.path == "/shutdown":
+            self._send(200, {"status": "shutting_down"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._send(404, {"error": "not_found"})
+
+
+def make_server(service: MemoryQueryService, token: str, host: str = "127.0.0.1",
+                port: int = 8765) -> ThreadingHTTPServer:
+    """Build (but do not start) the daemon's HTTP server.
+
+    Args:
+        service: Warm query service to expose.
+        token: Shared secret every request must present in ``X-ICDEV-Daemon-Token``.
+        host: Loopback bind address.
+        port: Bind port (0 picks a free one).
+    """
+    if host not in LOOPBACK_HOSTS:
+        raise ValueError(f"Memory daemon must bind to loopback, not {host!r}")
+    if not token:
+        raise ValueError("Memory daemon requires a shared-secret token")
+    handler = type("MemoryDaemonHandler", (_Handler,), {"service": service, "token": token})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Thin client
+# ---------------------------------------------------------------------------
+def query_daemon(action: str, params: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Call the running daemon. Returns None when it is unreachable or disabled.
+
+    Args:
+        action: ``search``, ``reload``, ``shutdown`` (POST) or ``health`` (GET).
+        params: JSON body for POST actions.
+        timeout: Read timeout in seconds (default from config).
+    """
+    config = load_daemon_config()
+    if not config.get("enabled", True) or os.environ.get("ICDEV_MEMORY_DAEMON") == "off":
+        return None
+    token = read_token_file(_token_path(config))
+    if not token:
+        return None
+    url = f"{_daemon_url(config)}/{action}"
+    if action == "health":
+        req = urllib.request.Request(url, method="GET", headers={TOKEN_HEADER: token})
+    else:
+        req = urllib.request.Request(
+            url, data=json.dumps(params or {}).encode("utf-8"), method="POST",
+            headers={"Content-Type": "application/json", TOKEN_HEADER: token},
+        )
+    # Short connect probe so a missing daemon costs ~nothing
+    try:
+        import socket
+        host, _, port = _daemon_url(config).split("://", 1)[1].rpartition(":")
+        with socket.create_connection((host.strip("[]"), int(port)),
+                                      timeout=float(config["connect_timeout_seconds"])):
+            pass
+    except (OSError, ValueError):
+        return None
+    try:
+        with urllib.request.urlopen(
+            req, timeout=timeout or float(config["client_timeout_seconds"])
+        ) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError, json.JSONDecodeError) as exc:
+        logger.debug("Memory daemon unavailable: %s", exc)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="ICDEV resident memory query daemon")
+    parser.add_argument("--status", action="store_true", help="Show daemon health")
+    parser.add_argument("--reload", action="store_true", help="Drop daemon caches")
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    parser.add_argument("--host", help="Bind address (loopback only)")
+    parser.add_argument("--port", type=int, help="Bind port")
+    parser.add_argument("--db-path", type=Path, help="Override memory.db path")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    action = "health" if args.status else "reload" if args.reload else \
+        "shutdown" if args.stop else None
+    if action:
+        result = query_daemon(action) or {"status": "not_running"}
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            print(f"Memory daemon: {result.get('status')}")
+            if "entries_cached" in result:
+                print(f"  entries cached: {result['entries_cached']}, "
+                      f"queries: {result['queries']}, refreshes: {result['refreshes']}")
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    config = load_daemon_config()
+    host = args.host or config["host"]
+    port = args.port or int(config["port"])
+
+    service = MemoryQueryService(db_path=args.db_path)
+    start = time.monotonic()
+    service.warm()
+    token = write_token_file(_token_path(config))
+    server = make_server(service, token, host=host, port=port)
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    print("CUI // SP-CTI")
+    print(f"Memory daemon listening on http://{host}:{port} "
+          f"(warm in {int((time.monotonic() - start) * 1000)} ms, "
+          f"{service.health()['entries_cached']} entries)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.close()
+        try:
+            _token_path(config).unlink()
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import argparse
 import hashlib
 import json
 import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime
 
@@ -18,6 +19,8 @@ MEMORY_FILE = BASE_DIR / "memory" / "MEMORY.md"
 LOGS_DIR = BASE_DIR / "memory" / "logs"
 DB_PATH = BASE_DIR / "data" / "memory.db"
 
+sys.path.insert(0, str(BASE_DIR))
+
 VALID_TYPES = ("fact", "preference", "event", "insight", "task", "relationship", "thinking")
 VALID_SOURCES = ("manual", "hook", "thinking", "auto")
 MEMORY_SECTIONS = (
@@ -66,12 +69,22 @@ def write_to_db(content, entry_type, importance, user_id=None, tenant_id=None, s
         "VALUES (?, ?, ?, ?, ?, ?, ?)",
         (content, entry_type, importance, content_hash, user_id, tenant_id, source),
     )
-    conn.commit()
     entry_id = c.lastrowid
+    _index_keywords(conn, entry_id, content)
+    conn.commit()
     conn.close()
     return entry_id, False
 
 
+def _index_keywords(conn, entry_id, content):
+    """Add the new entry to the BM25 inverted index in the same transaction."""
+    try:
+        from tools.memory.bm25_index import try_index_entry
+        try_index_entry(conn, entry_id, content)
+    except ImportError:
+        pass
+
+
 def write_to_daily_log(content):
     today = datetime.now().date().isoformat()
     log_file = LOGS_DIR / f"{today}.md"
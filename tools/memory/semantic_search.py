@@ -5,11 +5,14 @@
 import argparse
 import sqlite3
 import struct
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "memory.db"
 
+sys.path.insert(0, str(BASE_DIR))
+
 
 def get_openai_client():
     """Get an embedding client (tries LLM provider system first, then direct OpenAI)."""
@@ -76,16 +79,36 @@ def embedding_to_blob(embedding):
     return struct.pack(f"{len(embedding)}f", *embedding)
 
 
-def search(query, limit=10, user_id=None, tenant_id=None):
-    client = get_openai_client()
-    if not client:
+def _index_search(cursor, query_embedding, limit, user_id=None, tenant_id=None):
+    """Top-k via the persistent vector index; None when it is unavailable."""
+    try:
+        from tools.memory import vector_index
+        if not vector_index.is_enabled():
+            return None
+        hits = vector_index.get_index(DB_PATH).search(
+            query_embedding, limit=limit, user_id=user_id, tenant_id=tenant_id,
+        )
+    except Exception:
+        return None
+    if not hits:
         return []
 
-    query_embedding = get_embedding(client, query)
+    ids = [id_ for _, id_ in hits]
+    placeholders = ",".join("?" * len(ids))
+    cursor.execute(
+        f"SELECT id, content, type, importance, created_at FROM memory_entries WHERE id IN ({placeholders})",
+        ids,
+    )
+    rows = {row[0]: row for row in cursor.fetchall()}
+    return [
+        (score, id_, *rows[id_][1:])
+        for score, id_ in hits
+        if id_ in rows
+    ]
 
-    conn = sqlite3.connect(str(DB_PATH))
-    c = conn.cursor()
 
+def _scan_search(cursor, query_embedding, user_id=None, tenant_id=None):
+    """Brute-force scan over every stored embedding (index fallback)."""
     sql = "SELECT id, content, type, importance, embedding, created_at FROM memory_entries WHERE embedding IS NOT NULL"
     params = []
     if user_id:
@@ -94,8 +117,8 @@ def search(query, limit=10, user_id=None, tenant_id=None):
     if tenant_id:
         sql += " AND (tenant_id = ? OR tenant_id IS NULL)"
         params.append(tenant_id)
-    c.execute(sql, params)
-    rows = c.fetchall()
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
 
     results = []
     for id_, content, type_, importance, emb_blob, created_at in rows:
@@ -104,6 +127,22 @@ def search(query, limit=10, user_id=None, tenant_id=None):
         results.append((score, id_, content, type_, importance, created_at))
 
     results.sort(reverse=True, key=lambda x: x[0])
+    return results
+
+
+def search(query, limit=10, user_id=None, tenant_id=None):
+    client = get_openai_client()
+    if not client:
+        return []
+
+    query_embedding = get_embedding(client, query)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    c = conn.cursor()
+
+    results = _index_search(c, query_embedding, limit, user_id=user_id, tenant_id=tenant_id)
+    if results is None:
+        results = _scan_search(c, query_embedding, user_id=user_id, tenant_id=tenant_id)
 
     # Log access
     c.execute(
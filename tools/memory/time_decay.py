@@ -294,7 +294,7 @@ def rank_with_decay(
     try:
         sys.path.insert(0, str(BASE_DIR))
         from tools.memory.hybrid_search import bm25_search
-        bm25_scores = bm25_search(query, entries)
+        bm25_scores = bm25_search(query, entries, db_path=db_path or DB_PATH)
     except (ImportError, Exception):
         # Fallback: simple term frequency
         query_terms = query.lower().split()
@@ -0,0 +1,755 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Persistent in-process vector index for memory.db semantic search.
+
+Keeps every memory embedding as a unit-normalized float32 row in one
+contiguous matrix so a query is a single matrix-vector product instead of
+unpacking every BLOB row by row.  When ``hnswlib`` is installed and the
+index is large, an HNSW graph answers top-k queries without touching every
+row.  Without NumPy the index degrades to pre-normalized ``array('f')``
+rows (stdlib only, air-gap safe).
+
+Persistence lives next to memory.db:
+    memory.vecidx       Snapshot (header JSON + float32 matrix)
+    memory.vecidx.log   Append-only delta log (add/remove records)
+    memory.vecidx.hnsw  Optional HNSW graph (hnswlib)
+
+Writers (embed_memory, maintenance_cron) append to the delta log; readers
+replay it on load and reconcile against memory.db by (row count, id sum) so
+rows removed by pruning or written by other tools are picked up.  That
+aggregate only runs after ``PRAGMA data_version`` on a kept connection shows
+another connection has committed, so an unchanged DB costs one pragma.
+
+CLI:
+    python tools/memory/vector_index.py --rebuild --json
+    python tools/memory/vector_index.py --status --json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sqlite3
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = BASE_DIR / "data" / "memory.db"
+
+sys.path.insert(0, str(BASE_DIR))
+
+logger = logging.getLogger("icdev.memory.vector_index")
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    hnswlib = None
+    HAS_HNSWLIB = False
+
+SNAPSHOT_MAGIC = b"ICDVIDX1"
+_LOG_HEADER = struct.Struct("<cqI")  # op, entry_id, payload length
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "hnsw_min_items": 20000,      # Build HNSW graph above this many rows
+    "hnsw_m": 16,
+    "hnsw_ef_construction": 200,
+    "hnsw_ef_search": 64,
+    "compact_log_bytes": 8 * 1024 * 1024,  # Fold delta log into snapshot past this
+}
+
+
+def load_index_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Load vector_index settings from memory_config.yaml (defaults on failure)."""
+    path = config_path or (BASE_DIR / "args" / "memory_config.yaml")
+    config = dict(DEFAULT_CONFIG)
+    try:
+        import yaml
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            config.update(data.get("vector_index", {}) or {})
+    except (ImportError, Exception):
+        pass
+    return config
+
+
+def index_path_for(db_path: Path) -> Path:
+    """Return the snapshot path stored alongside *db_path*."""
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.stem + ".vecidx")
+
+
+def blob_to_vector(blob: bytes) -> array:
+    """Decode an embedding BLOB (packed float32) without a Python list."""
+    vec = array("f")
+    vec.frombytes(bytes(blob))
+    if sys.byteorder != "little":
+        vec.byteswap()
+    return vec
+
+
+def _normalize(vec: Sequence[float]) -> array:
+    if HAS_NUMPY:
+        arr = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(arr))
+        out = array("f")
+        out.frombytes((arr / norm if norm else arr).astype(np.float32).tobytes())
+        return out
+    norm = math.sqrt(sum(x * x for x in vec))
+    if norm == 0:
+        return array("f", vec)
+    return array("f", (x / norm for x in vec))
+
+
+class VectorIndex:
+    """Unit-normalized embedding matrix with optional HNSW acceleration.
+
+    Args:
+        db_path: memory.db location (default ``data/memory.db``).
+        index_path: Snapshot location (default ``<db stem>.vecidx`` beside the DB).
+        config: Override for the ``vector_index`` config section.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None,
+                 index_path: Optional[Path] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.db_path = Path(db_path or DB_PATH)
+        self.index_path = Path(index_path) if index_path else index_path_for(self.db_path)
+        self.log_path = self.index_path.with_name(self.index_path.name + ".log")
+        self.hnsw_path = self.index_path.with_name(self.index_path.name + ".hnsw")
+        self.config = {**DEFAULT_CONFIG, **(config or load_index_config())}
+
+        self._lock = threading.RLock()
+        self.dims = 0
+        self._ids: List[int] = []
+        self._users: List[Optional[str]] = []
+        self._tenants: List[Optional[str]] = []
+        self._pos: Dict[int, int] = {}
+        self._rows: List[array] = []          # stdlib storage
+        self._matrix = None                   # numpy storage (n, dims) float32
+        self._pending: List[array] = []       # numpy rows not yet stacked
+        self._free: List[int] = []            # tombstoned slots
+        self._hnsw = None
+        self._id_sum = 0
+        self._version = 0
+        self._scope_cache: Tuple[int, Any] = (-1, None)
+        self._loaded = False
+        self._conn: Optional[sqlite3.Connection] = None  # kept for data_version
+        self._synced_data_version: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    @property
+    def size(self) -> int:
+        """Number of live vectors in the index."""
+        return len(self._pos)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return entry_id in self._pos
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "db_path": str(self.db_path),
+            "index_path": str(self.index_path),
+            "size": self.size,
+            "dims": self.dims,
+            "backend": "numpy" if HAS_NUMPY else "stdlib",
+            "hnsw": self._hnsw is not None,
+            "log_bytes": self.log_path.stat().st_size if self.log_path.exists() else 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def add(self, entry_id: int, embedding, user_id: Optional[str] = None,
+            tenant_id: Optional[str] = None, persist: bool = True) -> None:
+        """Insert or replace the vector for *entry_id*.
+
+        *embedding* may be a float sequence or a packed float32 BLOB.
+        """
+        if isinstance(embedding, (bytes, bytearray, memoryview)):
+            embedding = blob_to_vector(embedding)
+        vec = _normalize(embedding)
+        with self._lock:
+            if not self.dims:
+                self.dims = len(vec)
+            if len(vec) != self.dims:
+                raise ValueError(
+                    f"Embedding dimension {len(vec)} does not match index dimension {self.dims}"
+                )
+            if entry_id in self._pos:
+                self._drop(entry_id)
+            self._put(entry_id, vec, user_id, tenant_id)
+            if persist:
+                self._append_log([_add_record(entry_id, vec, user_id, tenant_id)])
+
+    def add_many(self, rows: Iterable[Tuple[int, Any, Optional[str], Optional[str]]],
+                 persist: bool = True) -> int:
+        """Add ``(entry_id, embedding, user_id, tenant_id)`` rows; returns count.
+
+        The delta log is appended in one write for the whole batch.
+        """
+        count = 0
+        records = []
+        with self._lock:
+            for entry_id, embedding, user_id, tenant_id in rows:
+                self.add(entry_id, embedding, user_id, tenant_id, persist=False)
+                if persist:
+                    records.append(_add_record(entry_id, self._row(self._pos[entry_id]),
+                                               user_id, tenant_id))
+                count += 1
+            if records:
+                self._append_log(records)
+        return count
+
+    def remove(self, entry_id: int, persist: bool = True) -> bool:
+        """Remove *entry_id* from the index. Returns False if it was absent."""
+        with self._lock:
+            if entry_id not in self._pos:
+                return False
+            self._drop(entry_id)
+            if persist:
+                self._append_log([_LOG_HEADER.pack(b"D", entry_id, 0)])
+            return True
+
+    def _put(self, entry_id, vec, user_id, tenant_id):
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = entry_id
+            self._users[slot] = user_id
+            self._tenants[slot] = tenant_id
+            self._set_row(slot, vec)
+        else:
+            slot = len(self._ids)
+            self._ids.append(entry_id)
+            self._users.append(user_id)
+            self._tenants.append(tenant_id)
+            if HAS_NUMPY:
+                self._pending.append(vec)
+            else:
+                self._rows.append(vec)
+        self._pos[entry_id] = slot
+        self._id_sum += entry_id
+        self._version += 1
+        if self._hnsw is not None:
+            self._hnsw_add([entry_id], [vec])
+
+    def _drop(self, entry_id):
+        slot = self._pos.pop(entry_id)
+        self._id_sum -= entry_id
+        self._version += 1
+        self._ids[slot] = -1
+        self._users[slot] = None
+        self._tenants[slot] = None
+        self._free.append(slot)
+        if self._hnsw is not None:
+            try:
+                self._hnsw.mark_deleted(entry_id)
+            except RuntimeError:
+                pass
+
+    def _row(self, slot) -> array:
+        if not HAS_NUMPY:
+            return self._rows[slot]
+        stacked = 0 if self._matrix is None else self._matrix.shape[0]
+        if slot >= stacked:
+            return self._pending[slot - stacked]
+        return array("f", self._matrix[slot].tobytes())
+
+    def _set_row(self, slot, vec):
+        if not HAS_NUMPY:
+            self._rows[slot] = vec
+            return
+        stacked = 0 if self._matrix is None else self._matrix.shape[0]
+        if slot < stacked:
+            if not self._matrix.flags.writeable:
+                self._matrix = np.array(self._matrix)
+            self._matrix[slot] = np.frombuffer(vec.tobytes(), dtype=np.float32)
+        else:
+            self._pending[slot - stacked] = vec
+
+    def _stacked(self):
+        """Return the (n, dims) numpy matrix, folding in pending rows."""
+        if self._pending:
+            new = np.frombuffer(b"".join(v.tobytes() for v in self._pending),
+                                dtype=np.float32).reshape(len(self._pending), self.dims)
+            self._matrix = new if self._matrix is None else np.vstack([self._matrix, new])
+            self._pending = []
+        if self._matrix is None:
+            return np.zeros((0, self.dims or 1), dtype=np.float32)
+        return self._matrix
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def search(self, query_embedding: Sequence[float], limit: int = 10,
+               user_id: Optional[str] = None,
+               tenant_id: Optional[str] = None) -> List[Tuple[float, int]]:
+        """Return the top *limit* ``(cosine_score, entry_id)`` pairs.
+
+        Scoping follows D180: an entry matches a user/tenant filter when its
+        own user_id/tenant_id equals the filter or is NULL.
+        """
+        with self._lock:
+            if not self._pos or limit <= 0:
+                return []
+            q = _normalize(query_embedding)
+            if len(q) != self.dims:
+                return []
+            if self._hnsw is None and self._wants_hnsw():
+                self._build_hnsw()
+            if self._hnsw is not None:
+                hits = self._hnsw_search(q, limit, user_id, tenant_id)
+                if hits is not None:
+                    return hits
+            return self._exact_search(q, limit, user_id, tenant_id)
+
+    def similarities(self, query_embedding: Sequence[float],
+                     entry_ids: Sequence[int]) -> List[float]:
+        """Cosine similarity of the query against each of *entry_ids*.
+
+        Entries missing from the index score 0.0.  Order matches *entry_ids*.
+        """
+        with self._lock:
+            q = _normalize(query_embedding)
+            if not self._pos or len(q) != self.dims:
+                return [0.0] * len(entry_ids)
+            slots = [self._pos.get(i, -1) for i in entry_ids]
+            if HAS_NUMPY:
+                matrix = self._stacked()
+                idx = np.array([s if s >= 0 else 0 for s in slots], dtype=np.int64)
+                scores = matrix[idx] @ np.frombuffer(q.tobytes(), dtype=np.float32)
+                scores[np.array([s < 0 for s in slots], dtype=bool)] = 0.0
+                return scores.astype(float).tolist()
+            return [_dot(self._rows[s], q) if s >= 0 else 0.0 for s in slots]
+
+    def _scope_ok(self, slot, user_id, tenant_id):
+        if self._ids[slot] < 0:
+            return False
+        if user_id and self._users[slot] not in (None, user_id):
+            return False
+        if tenant_id and self._tenants[slot] not in (None, tenant_id):
+            return False
+        return True
+
+    def _scope_mask(self, user_id, tenant_id):
+        """Boolean numpy mask of live slots visible to the user/tenant scope."""
+        version, arrays = self._scope_cache
+        if version != self._version:
+            arrays = (
+                np.array(self._ids, dtype=np.int64) >= 0,
+                np.array(self._users, dtype=object),
+                np.array(self._tenants, dtype=object),
+            )
+            self._scope_cache = (self._version, arrays)
+        live, users, tenants = arrays
+        mask = live.copy()
+        if user_id:
+            mask &= (users == user_id) | np.equal(users, None)
+        if tenant_id:
+            mask &= (tenants == tenant_id) | np.equal(tenants, None)
+        return mask
+
+    def _exact_search(self, q, limit, user_id, tenant_id):
+        if HAS_NUMPY:
+            matrix = self._stacked()
+            scores = matrix @ np.frombuffer(q.tobytes(), dtype=np.float32)
+            if user_id or tenant_id or self._free:
+                mask = self._scope_mask(user_id, tenant_id)
+                scores = np.where(mask, scores, -np.inf)
+                k = min(limit, int(mask.sum()))
+            else:
+                k = min(limit, len(self._ids))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[s]), self._ids[s]) for s in top]
+
+        import heapq
+        scored = (
+            (_dot(row, q), self._ids[s])
+            for s, row in enumerate(self._rows)
+            if self._scope_ok(s, user_id, tenant_id)
+        )
+        return heapq.nlargest(limit, scored)
+
+    # ------------------------------------------------------------------
+    # HNSW (optional)
+    # ------------------------------------------------------------------
+    def _wants_hnsw(self):
+        return HAS_HNSWLIB and HAS_NUMPY and self.size >= int(self.config["hnsw_min_items"])
+
+    def _new_hnsw(self):
+        graph = hnswlib.Index(space="ip", dim=self.dims)
+        graph.init_index(max_elements=max(self.size * 2, 1024),
+                         ef_construction=int(self.config["hnsw_ef_construction"]),
+                         M=int(self.config["hnsw_m"]), allow_replace_deleted=True)
+        graph.set_ef(int(self.config["hnsw_ef_search"]))
+        return graph
+
+    def _build_hnsw(self):
+        graph = self._new_hnsw()
+        matrix = self._stacked()
+        live = [s for s, i in enumerate(self._ids) if i >= 0]
+        graph.add_items(matrix[live], [self._ids[s] for s in live])
+        self._hnsw = graph
+
+    def _load_hnsw(self, count):
+        """Load the graph saved with the snapshot; log replay then keeps it current."""
+        if not (HAS_HNSWLIB and HAS_NUMPY and self.hnsw_path.exists()):
+            return
+        try:
+            graph = hnswlib.Index(space="ip", dim=self.dims)
+            graph.load_index(str(self.hnsw_path), max_elements=max(count * 2, 1024),
+                             allow_replace_deleted=True)
+            graph.set_ef(int(self.config["hnsw_ef_search"]))
+            self._hnsw = graph
+        except Exception as exc:
+            logger.warning("Ignoring unreadable HNSW graph %s: %s", self.hnsw_path, exc)
+
+    def _hnsw_add(self, ids, vecs):
+        graph = self._hnsw
+        if graph.get_current_count() + len(ids) > graph.get_max_elements():
+            graph.resize_index(max(graph.get_max_elements() * 2, 1024))
+        data = np.frombuffer(b"".join(v.tobytes() for v in vecs),
+                             dtype=np.float32).reshape(len(vecs), self.dims)
+        graph.add_items(data, ids, replace_deleted=True)
+
+    def _hnsw_search(self, q, limit, user_id, tenant_id):
+        k = min(limit, self.size)
+        query = np.frombuffer(q.tobytes(), dtype=np.float32).reshape(1, self.dims)
+        kwargs = {}
+        if user_id or tenant_id:
+            def _visible(label):
+                slot = self._pos.get(int(label))
+                return slot is not None and self._scope_ok(slot, user_id, tenant_id)
+            kwargs["filter"] = _visible
+        try:
+            labels, distances = self._hnsw.knn_query(query, k=k, **kwargs)
+        except (TypeError, RuntimeError):
+            return None  # Old hnswlib without filter support, or too few matches
+        # space="ip" distance is 1 - <a, b>
+        return [(1.0 - float(d), int(label)) for label, d in zip(labels[0], distances[0])]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def load(self) -> bool:
+        """Load snapshot and replay the delta log. Returns False if no snapshot."""
+        with self._lock:
+            self._reset()
+            found = self.index_path.exists()
+            if found:
+                self._read_snapshot()
+            if self.log_path.exists():
+                self._replay_log()
+            self._loaded = True
+            return found
+
+    def save(self) -> None:
+        """Write a fresh snapshot and truncate the delta log."""
+        with self._lock:
+            # Re-pack so slots are dense after tombstones
+            self._compact_slots()
+            header = json.dumps({
+                "dims": self.dims,
+                "count": len(self._ids),
+                "ids": self._ids,
+                "user_ids": self._users,
+                "tenant_ids": self._tenants,
+                "hnsw": self._hnsw is not None,
+            }).encode("utf-8")
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(SNAPSHOT_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                if HAS_NUMPY:
+                    f.write(self._stacked().astype("<f4").tobytes())
+                else:
+                    for row in self._rows:
+                        f.write(_le_bytes(row))
+            os.replace(tmp, self.index_path)
+            if self.log_path.exists():
+                self.log_path.unlink()
+            if self._hnsw is not None:
+                self._hnsw.save_index(str(self.hnsw_path))
+            elif self.hnsw_path.exists():
+                self.hnsw_path.unlink()
+
+    def _compact_slots(self):
+        live = [s for s, i in enumerate(self._ids) if i >= 0]
+        if HAS_NUMPY:
+            # Fancy indexing copies, which also releases any snapshot memmap
+            self._matrix = self._stacked()[live] if live else None
+        else:
+            self._rows = [self._rows[s] for s in live]
+        self._ids = [self._ids[s] for s in live]
+        self._users = [self._users[s] for s in live]
+        self._tenants = [self._tenants[s] for s in live]
+        self._pos = {i: s for s, i in enumerate(self._ids)}
+        self._free = []
+        self._version += 1
+
+    def _reset(self):
+        self.dims = 0
+        self._ids, self._users, self._tenants = [], [], []
+        self._pos, self._rows, self._pending, self._free = {}, [], [], []
+        self._matrix = None
+        self._hnsw = None
+        self._id_sum = 0
+        self._version += 1
+        self._synced_data_version = None
+
+    def _read_snapshot(self):
+        with open(self.index_path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a vector index snapshot: {self.index_path}")
+            (hlen,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(hlen).decode("utf-8"))
+            offset = len(SNAPSHOT_MAGIC) + 4 + hlen
+            self.dims = header["dims"]
+            self._ids = list(header["ids"])
+            self._users = list(header["user_ids"])
+            self._tenants = list(header["tenant_ids"])
+            self._pos = {i: s for s, i in enumerate(self._ids)}
+            self._id_sum = sum(self._ids)
+            count = header["count"]
+            if HAS_NUMPY:
+                if count:
+                    # Memory-map: load cost is independent of row count
+                    self._matrix = np.memmap(self.index_path, dtype="<f4", mode="r",
+                                             offset=offset, shape=(count, self.dims))
+            else:
+                width = self.dims * 4
+                for _ in range(count):
+                    self._rows.append(blob_to_vector(f.read(width)))
+            if header.get("hnsw"):
+                self._load_hnsw(count)
+
+    def _append_log(self, records: List[bytes]):
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "ab") as f:
+            f.write(b"".join(records))
+
+    def _replay_log(self):
+        with open(self.log_path, "rb") as f:
+            while True:
+                head = f.read(_LOG_HEADER.size)
+                if len(head) < _LOG_HEADER.size:
+                    break  # Torn trailing write — ignore
+                op, entry_id, length = _LOG_HEADER.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length:
+                    break
+                if op == b"D":
+                    self.remove(entry_id, persist=False)
+                elif op == b"A":
+                    meta, _, raw = payload.partition(b"\0")
+                    user_id, tenant_id = json.loads(meta.decode("utf-8"))
+                    self.add(entry_id, blob_to_vector(raw), user_id, tenant_id, persist=False)
+
+    def maybe_compact(self) -> bool:
+        """Fold the delta log into the snapshot once it passes the threshold."""
+        if self.log_path.exists() and \
+                self.log_path.stat().st_size >= int(self.config["compact_log_bytes"]):
+            self.save()
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # memory.db reconciliation
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _db_fingerprint(conn) -> Tuple[int, int]:
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(id), 0) FROM memory_entries "
+            "WHERE embedding IS NOT NULL"
+        ).fetchone()
+        return int(row[0]), int(row[1])
+
+    def sync(self) -> Dict[str, int]:
+        """Reconcile the index with memory.db.
+
+        Cheap when nothing changed: one ``PRAGMA data_version`` on a kept
+        connection, which moves only when another connection commits.  When
+        it has moved, an aggregate fingerprint is compared; only on mismatch
+        is the id column diffed and only missing rows' BLOBs are read.
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            if self._conn is None:
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn = self._conn
+            # Read before diffing so a commit racing the diff triggers a re-sync
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._synced_data_version:
+                return {"added": 0, "removed": 0}
+            if self._db_fingerprint(conn) == (self.size, self._id_sum):
+                self._synced_data_version = data_version
+                return {"added": 0, "removed": 0}
+            db_ids = {r[0] for r in conn.execute(
+                "SELECT id FROM memory_entries WHERE embedding IS NOT NULL")}
+            stale = [i for i in self._pos if i not in db_ids]
+            missing = [i for i in db_ids if i not in self._pos]
+            for entry_id in stale:
+                self.remove(entry_id, persist=True)
+            added = 0
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT id, embedding, user_id, tenant_id FROM memory_entries "
+                    f"WHERE id IN ({placeholders})", chunk)
+                added += self.add_many(rows, persist=True)
+            self._synced_data_version = data_version
+            if stale or added:
+                self.maybe_compact()
+            return {"added": added, "removed": len(stale)}
+
+    def close(self) -> None:
+        """Release the kept memory.db connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._synced_data_version = None
+
+    def rebuild(self) -> Dict[str, int]:
+        """Discard persisted state and rebuild from memory.db."""
+        with self._lock:
+            for path in (self.log_path, self.hnsw_path):
+                if path.exists():
+                    path.unlink()
+            self._reset()
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                rows = conn.execute(
+                    "SELECT id, embedding, user_id, tenant_id FROM memory_entries "
+                    "WHERE embedding IS NOT NULL ORDER BY id")
+                count = self.add_many(rows, persist=False)
+            finally:
+                conn.close()
+            self._loaded = True
+            if self._wants_hnsw():
+                self._build_hnsw()
+            self.save()
+            return {"indexed": count}
+
+
+def _add_record(entry_id: int, vec: array, user_id, tenant_id) -> bytes:
+    payload = json.dumps([user_id, tenant_id]).encode("utf-8") + b"\0" + _le_bytes(vec)
+    return _LOG_HEADER.pack(b"A", entry_id, len(payload)) + payload
+
+
+def _dot(a, b) -> float:
+    return float(sum(x * y for x, y in zip(a, b)))
+
+
+def _le_bytes(vec: array) -> bytes:
+    if sys.byteorder == "little":
+        return vec.tobytes()
+    swapped = array("f", vec)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache
+# ---------------------------------------------------------------------------
+_indexes: Dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _cached_index(db_path: Optional[Path] = None) -> VectorIndex:
+    key = str(Path(db_path or DB_PATH).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = VectorIndex(db_path=Path(key))
+            _indexes[key] = index
+    return index
+
+
+def get_index(db_path: Optional[Path] = None) -> VectorIndex:
+    """Return the synced, process-wide index for *db_path*."""
+    index = _cached_index(db_path)
+    index.sync()
+    return index
+
+
+def is_enabled() -> bool:
+    """Whether the vector index is enabled in memory_config.yaml."""
+    return bool(load_index_config().get("enabled", True))
+
+
+def record_embeddings(rows: Iterable[Tuple[int, Any, Optional[str], Optional[str]]],
+                      db_path: Optional[Path] = None) -> int:
+    """Append freshly written embeddings to the persisted index.
+
+    Called by embedding writers so readers do not have to re-read BLOBs.
+    Failures are logged, never raised — memory.db stays the source of truth.
+    """
+    try:
+        # Keep the index warm across calls: a backfill records one batch at a
+        # time and must not re-read the whole persisted index per batch.
+        index = _cached_index(db_path)
+        with index._lock:
+            if not index._loaded:
+                index.load()
+        count = index.add_many(rows, persist=True)
+        index.maybe_compact()
+        return count
+    except Exception as exc:
+        logger.warning("Vector index update skipped: %s", exc)
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory vector index maintenance")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild index from memory.db")
+    parser.add_argument("--sync", action="store_true", help="Reconcile index with memory.db")
+    parser.add_argument("--status", action="store_true", help="Show index status")
+    parser.add_argument("--db-path", help="Override memory.db path")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    index = VectorIndex(db_path=Path(args.db_path) if args.db_path else None)
+    result: Dict[str, Any] = {"classification": "CUI // SP-CTI"}
+    if args.rebuild:
+        result.update(index.rebuild())
+    elif args.sync:
+        result.update(index.sync())
+    else:
+        index.load()
+    result["status"] = index.status()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        st = result["status"]
+        print(f"Vector index: {st['size']} vectors, dims={st['dims']}, "
+              f"backend={st['backend']}, hnsw={st['hnsw']}")
+        print(f"  snapshot: {st['index_path']}")
+
+
+if __name__ == "__main__":
+    main()
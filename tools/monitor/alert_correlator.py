@@ -2,9 +2,14 @@
 # CUI // SP-CTI
 """Alert correlation engine. Groups related alerts by service and time window,
 deduplicates alerts from multiple sources (ELK, Splunk, Prometheus),
-and escalates incidents when necessary."""
+and escalates incidents when necessary.
+
+Correlation is incremental: StreamingCorrelator indexes the incidents open
+in the current time window, so alerts can be correlated as they arrive and
+a burst of alerts is not compared pairwise."""
 
 import argparse
+import heapq
 import json
 import re
 import sqlite3
@@ -67,128 +72,259 @@ def _similarity(a: str, b: str) -> float:
 # ---------------------------------------------------------------------------
 # Correlation
 # ---------------------------------------------------------------------------
-def correlate(alerts: list, time_window: timedelta = None) -> list:
-    """Group related alerts by service and time window.
-
-    Correlation rules:
-    1. Same service within time window -> grouped
-    2. Similar alert title (>40% word overlap) within time window -> grouped
-    3. Same root cause label -> grouped
-
-    Returns:
-        List of incident groups, each containing correlated alerts.
-    """
-    if time_window is None:
-        time_window = timedelta(minutes=5)
-
-    normalized = [_normalize_alert(a) for a in alerts]
-
-    # Parse timestamps
-    for alert in normalized:
-        ts = alert["timestamp"]
-        if isinstance(ts, str) and ts:
-            try:
-                alert["_dt"] = datetime.fromisoformat(
-                    ts.replace("Z", "+00:00").replace("+00:00", "")
-                )
-            except ValueError:
-                alert["_dt"] = datetime.now(timezone.utc)
-        else:
-            alert["_dt"] = datetime.now(timezone.utc)
-
-    # Sort by timestamp
-    normalized.sort(key=lambda a: a["_dt"])
-
-    # Group into incidents
-    incidents = []
-    used = set()
+SEVERITY_RANK = {"critical": 4, "high": 3, "warning": 2, "low": 1, "info": 0}
+
+TITLE_SIMILARITY = 0.4
+DESCRIPTION_SIMILARITY = 0.5
+MIN_SHARED_LABELS = 2
+
+
+def _parse_alert_time(alert: dict) -> datetime:
+    """Parse a normalized alert's timestamp; missing or invalid means now."""
+    ts = alert["timestamp"]
+    if isinstance(ts, str) and ts:
+        try:
+            return datetime.fromisoformat(
+                ts.replace("Z", "+00:00").replace("+00:00", "")
+            )
+        except ValueError:
+            return datetime.now(timezone.utc)
+    return datetime.now(timezone.utc)
+
+
+def _words(text: str) -> frozenset:
+    """Word set used by _similarity()."""
+    return frozenset(text.lower().split()) if text else frozenset()
+
+
+def _public_alert(alert: dict) -> dict:
+    return {k: v for k, v in alert.items() if k not in ("_dt", "raw")}
+
+
+class _Incident:
+    """Mutable state of one incident: its primary alert and what joined it."""
+
+    def __init__(self, seq: int, primary: dict):
+        self.seq = seq
+        self.primary = primary
+        self.related = []
+        self.services = {primary["service"]}
+        self.sources = {primary["source"]}
+        self.start_time = primary["_dt"]
+        self.end_time = primary["_dt"]
+        self.max_severity = primary["severity"]
+        self.title_words = _words(primary["title"])
+        self.description_words = _words(primary["description"])
+        self.label_items = frozenset((primary.get("labels") or {}).items())
+
+    @property
+    def incident_id(self) -> str:
+        return f"INC-{self.seq + 1:04d}"
+
+    def __lt__(self, other: "_Incident") -> bool:
+        return self.seq < other.seq
+
+    def absorb(self, alert: dict) -> None:
+        self.related.append(alert)
+        self.services.add(alert["service"])
+        self.sources.add(alert["source"])
+        if alert["_dt"] > self.end_time:
+            self.end_time = alert["_dt"]
+        if alert["_dt"] < self.start_time:
+            self.start_time = alert["_dt"]
+        if SEVERITY_RANK.get(alert["severity"], 0) > SEVERITY_RANK.get(self.max_severity, 0):
+            self.max_severity = alert["severity"]
+
+    def to_dict(self) -> dict:
+        return {
+            "incident_id": self.incident_id,
+            "title": self.primary["title"],
+            "severity": self.max_severity,
+            "services": list(self.services),
+            "sources": list(self.sources),
+            "alert_count": 1 + len(self.related),
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat(),
+            "duration_seconds": (self.end_time - self.start_time).total_seconds(),
+            "primary_alert": _public_alert(self.primary),
+            "related_alerts": [_public_alert(a) for a in self.related],
+        }
 
-    for i, alert in enumerate(normalized):
-        if i in used:
-            continue
 
-        group = {
-            "primary_alert": alert,
-            "related_alerts": [],
-            "services": {alert["service"]},
-            "sources": {alert["source"]},
-            "start_time": alert["_dt"],
-            "end_time": alert["_dt"],
-            "max_severity": alert["severity"],
-        }
-        used.add(i)
+class StreamingCorrelator:
+    """Correlate alerts one at a time as they arrive (DB polling, webhooks).
 
-        severity_rank = {"critical": 4, "high": 3, "warning": 2, "low": 1, "info": 0}
+    Every incident is anchored on its primary alert, the first alert that no
+    earlier incident claimed.  A new alert joins the earliest open incident
+    whose primary is within the time window and is related to it by any of
+    the correlate() rules; otherwise it opens a new incident.
 
-        for j, other in enumerate(normalized):
-            if j in used:
-                continue
+    Only primaries are indexed, in hash buckets keyed by service, by title
+    word, by description word and by label item, and only while they are in
+    the sliding window (a heap ordered by time).  Candidates are gathered
+    from those buckets and the word-overlap similarity is computed from the
+    shared-word counts, so an alert is never compared with the whole
+    history.  Fed in timestamp order this produces exactly the incidents of
+    the original pairwise scan; an alert arriving later than the window
+    behind the newest alert seen can only open its own incident.
+    """
 
-            time_diff = abs((other["_dt"] - alert["_dt"]).total_seconds())
-            if time_diff > time_window.total_seconds():
-                continue
+    def __init__(self, time_window: timedelta = None):
+        self.time_window = time_window if time_window is not None else timedelta(minutes=5)
+        self._window_seconds = self.time_window.total_seconds()
+        self._seq = 0
+        self._newest = None
+        self._incidents = {}
+        self._closed = []
+        self._open = []
+        self._by_service = {}
+        self._by_title_word = {}
+        self._by_description_word = {}
+        self._by_label = {}
+        self.candidates_checked = 0
+
+    # -- window ----------------------------------------------------------------
+    def _buckets(self, incident: _Incident):
+        yield self._by_service, (incident.primary["service"],)
+        yield self._by_title_word, incident.title_words
+        yield self._by_description_word, incident.description_words
+        yield self._by_label, incident.label_items
+
+    def _open_incident(self, incident: _Incident) -> None:
+        self._incidents[incident.seq] = incident
+        heapq.heappush(self._open, (incident.primary["_dt"], incident))
+        for index, keys in self._buckets(incident):
+            for key in keys:
+                index.setdefault(key, {})[incident.seq] = incident
+
+    def _expire(self, now: datetime) -> None:
+        if self._newest is None or now > self._newest:
+            self._newest = now
+        while self._open and (
+            (self._newest - self._open[0][0]).total_seconds() > self._window_seconds
+        ):
+            _, incident = heapq.heappop(self._open)
+            for index, keys in self._buckets(incident):
+                for key in keys:
+                    bucket = index[key]
+                    del bucket[incident.seq]
+                    if not bucket:
+                        del index[key]
+            self._closed.append(incident)
+
+    # -- matching --------------------------------------------------------------
+    def _in_window(self, incident: _Incident, alert: dict) -> bool:
+        diff = abs((alert["_dt"] - incident.primary["_dt"]).total_seconds())
+        return diff <= self._window_seconds
+
+    @staticmethod
+    def _shared_counts(index: dict, keys) -> dict:
+        counts = {}
+        for key in keys:
+            for seq in index.get(key, ()):
+                counts[seq] = counts.get(seq, 0) + 1
+        return counts
+
+    def _match(self, alert: dict):
+        """Earliest open incident the alert belongs to, or None."""
+        related = set(self._by_service.get(alert["service"], ()))
+
+        title_words = _words(alert["title"])
+        for seq, shared in self._shared_counts(self._by_title_word, title_words).items():
+            other = len(self._incidents[seq].title_words)
+            if shared / (len(title_words) + other - shared) > TITLE_SIMILARITY:
+                related.add(seq)
+
+        description_words = _words(alert["description"])
+        counts = self._shared_counts(self._by_description_word, description_words)
+        for seq, shared in counts.items():
+            other = len(self._incidents[seq].description_words)
+            if shared / (len(description_words) + other - shared) > DESCRIPTION_SIMILARITY:
+                related.add(seq)
+
+        labels = (alert.get("labels") or {}).items()
+        for seq, shared in self._shared_counts(self._by_label, set(labels)).items():
+            if shared >= MIN_SHARED_LABELS:
+                related.add(seq)
+
+        for seq in sorted(related):
+            self.candidates_checked += 1
+            incident = self._incidents[seq]
+            if self._in_window(incident, alert):
+                return incident
+        return None
+
+    # -- public API ------------------------------------------------------------
+    def add_normalized(self, alert: dict) -> str:
+        """Correlate an alert already passed through _normalize_alert()."""
+        if "_dt" not in alert:
+            alert["_dt"] = _parse_alert_time(alert)
+        self._expire(alert["_dt"])
+        incident = self._match(alert)
+        if incident is None:
+            incident = _Incident(self._seq, alert)
+            self._open_incident(incident)
+        else:
+            incident.absorb(alert)
+        self._seq += 1
+        return incident.incident_id
+
+    def add(self, alert: dict) -> str:
+        """Correlate one raw alert; returns the id of the incident it joined."""
+        return self.add_normalized(_normalize_alert(alert))
+
+    def add_many(self, alerts) -> None:
+        for alert in alerts:
+            self.add(alert)
+
+    def incidents(self) -> list:
+        """Every retained incident, most severe and largest first."""
+        incidents = [i.to_dict() for i in self._incidents.values()]
+        incidents.sort(
+            key=lambda x: (SEVERITY_RANK.get(x["severity"], 0), x["alert_count"]),
+            reverse=True,
+        )
+        return incidents
 
-            is_related = False
+    def pop_closed(self) -> list:
+        """Incidents whose window has passed, oldest first; they are forgotten.
 
-            # Same service
-            if other["service"] == alert["service"]:
-                is_related = True
+        Long-running consumers call this periodically to bound memory.
+        """
+        closed = sorted(self._closed)
+        self._closed = []
+        for incident in closed:
+            self._incidents.pop(incident.seq, None)
+        return [i.to_dict() for i in closed]
 
-            # Similar title
-            if _similarity(other["title"], alert["title"]) > 0.4:
-                is_related = True
+    def open_count(self) -> int:
+        """Number of incidents that can still absorb alerts."""
+        return len(self._open)
 
-            # Same description keywords
-            if _similarity(other["description"], alert["description"]) > 0.5:
-                is_related = True
 
-            # Matching labels (e.g., same pod, same namespace)
-            shared_labels = set(alert.get("labels", {}).items()) & set(other.get("labels", {}).items())
-            if len(shared_labels) >= 2:
-                is_related = True
+def correlate(alerts: list, time_window: timedelta = None) -> list:
+    """Group related alerts by service and time window.
 
-            if is_related:
-                group["related_alerts"].append(other)
-                group["services"].add(other["service"])
-                group["sources"].add(other["source"])
-                used.add(j)
+    Correlation rules:
+    1. Same service within time window -> grouped
+    2. Similar alert title (>40% word overlap) within time window -> grouped
+    3. Similar description (>50% word overlap) within time window -> grouped
+    4. Same root cause labels (2+ shared label values) within time window -> grouped
 
-                if other["_dt"] > group["end_time"]:
-                    group["end_time"] = other["_dt"]
-                if other["_dt"] < group["start_time"]:
-                    group["start_time"] = other["_dt"]
-
-                # Track max severity
-                if severity_rank.get(other["severity"], 0) > severity_rank.get(group["max_severity"], 0):
-                    group["max_severity"] = other["severity"]
-
-        incidents.append({
-            "incident_id": f"INC-{i+1:04d}",
-            "title": alert["title"],
-            "severity": group["max_severity"],
-            "services": list(group["services"]),
-            "sources": list(group["sources"]),
-            "alert_count": 1 + len(group["related_alerts"]),
-            "start_time": group["start_time"].isoformat(),
-            "end_time": group["end_time"].isoformat(),
-            "duration_seconds": (group["end_time"] - group["start_time"]).total_seconds(),
-            "primary_alert": {
-                k: v for k, v in alert.items() if k not in ("_dt", "raw")
-            },
-            "related_alerts": [
-                {k: v for k, v in a.items() if k not in ("_dt", "raw")}
-                for a in group["related_alerts"]
-            ],
-        })
+    Alerts are sorted by timestamp and fed through a StreamingCorrelator.
 
-    # Sort by severity then by alert count
-    severity_rank = {"critical": 4, "high": 3, "warning": 2, "low": 1, "info": 0}
-    incidents.sort(
-        key=lambda x: (severity_rank.get(x["severity"], 0), x["alert_count"]),
-        reverse=True,
-    )
+    Returns:
+        List of incident groups, each containing correlated alerts.
+    """
+    normalized = [_normalize_alert(a) for a in alerts]
+    for alert in normalized:
+        alert["_dt"] = _parse_alert_time(alert)
+    normalized.sort(key=lambda a: a["_dt"])
 
-    return incidents
+    correlator = StreamingCorrelator(time_window)
+    for alert in normalized:
+        correlator.add_normalized(alert)
+    return correlator.incidents()
 
 
 # ---------------------------------------------------------------------------
@@ -204,19 +340,13 @@ def deduplicate(alerts: list) -> list:
         Deduplicated list of alerts with source tracking.
     """
     normalized = [_normalize_alert(a) for a in alerts]
-
-    # Parse timestamps
     for alert in normalized:
-        ts = alert["timestamp"]
-        if isinstance(ts, str) and ts:
-            try:
-                alert["_dt"] = datetime.fromisoformat(
-                    ts.replace("Z", "+00:00").replace("+00:00", "")
-                )
-            except ValueError:
-                alert["_dt"] = datetime.now(timezone.utc)
-        else:
-            alert["_dt"] = datetime.now(timezone.utc)
+        alert["_dt"] = _parse_alert_time(alert)
+
+    # Duplicates always share a service, so only compare within its bucket
+    by_service = {}
+    for idx, alert in enumerate(normalized):
+        by_service.setdefault(alert["service"], []).append(idx)
 
     deduped = []
     used = set()
@@ -229,9 +359,10 @@ def deduplicate(alerts: list) -> list:
         merged["duplicate_sources"] = [alert["source"]]
         merged["duplicate_count"] = 1
 
-        for j, other in enumerate(normalized):
+        for j in by_service[alert["service"]]:
             if j in used or j == i:
                 continue
+            other = normalized[j]
 
             # Check time proximity (2 minutes)
             time_diff = abs((other["_dt"] - alert["_dt"]).total_seconds())
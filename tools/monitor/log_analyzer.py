@@ -9,18 +9,29 @@
 """Log Analyzer — queries ELK and Splunk for log data, detects error patterns,
 counts occurrences, and records findings in the metric_snapshots table.
 
+Records are streamed (Elasticsearch pages, the Splunk export stream, or a
+local plain-text/JSONL/.gz export) through a LogStreamAnalyzer that keeps
+only bounded samples and counters, so multi-GB exports are analyzed in
+constant memory.  All error patterns are evaluated in one pass per record by
+a precompiled LogPatternMatcher.
+
 Functions:
     analyze_logs(source, query, time_range, db_path)  -> analysis results dict
     search_patterns(log_data, patterns)                -> matched patterns list
+    iter_log_file(path)                                -> log record generator
 
 CLI:
     python tools/monitor/log_analyzer.py --source elk|splunk --query "error" --time-range 24h
+    python tools/monitor/log_analyzer.py --source file --log-file export.jsonl.gz
 """
 
 import argparse
+import gzip
 import json
 import re
 import sqlite3
+import sys
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -31,6 +42,11 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.security.injection_scan_engine import extract_anchors  # noqa: E402
+
 # Default endpoints — override via CLI args or environment
 DEFAULT_ELK_URL = "http://localhost:9200"
 DEFAULT_SPLUNK_URL = "https://localhost:8089"
@@ -49,6 +65,13 @@ DEFAULT_PATTERNS = [
     {"name": "DatabaseError", "regex": r"deadlock|lock timeout|connection pool|database is locked"},
 ]
 
+# Bounds that keep streaming analysis independent of the number of records
+SAMPLE_LIMIT = 5
+TOP_MESSAGE_CAPACITY = 1000
+MATCHER_CACHE_SIZE = 32
+
+_DIGITS = re.compile(r"\d+")
+
 
 def _get_db(db_path: Path = None) -> sqlite3.Connection:
     """Open a connection to the ICDEV database."""
@@ -85,6 +108,80 @@ def _parse_time_range(time_range: str) -> dict:
 # ---------------------------------------------------------------------------
 # Source queries
 # ---------------------------------------------------------------------------
+def _elk_search_body(query_str: str, time_range: str, size: int) -> dict:
+    tr = _parse_time_range(time_range)
+    return {
+        "query": {
+            "bool": {
+                "must": [{"query_string": {"query": query_str}}] if query_str else [{"match_all": {}}],
+                "filter": [
+                    {"range": {"@timestamp": {"gte": tr["elk_format"], "lte": "now"}}}
+                ],
+            }
+        },
+        "size": size,
+        # _doc breaks timestamp ties so search_after pages do not skip hits
+        "sort": [{"@timestamp": {"order": "desc"}}, {"_doc": {"order": "asc"}}],
+    }
+
+
+def iter_elk_hits(index: str, query_str: str, time_range: str,
+                  elk_url: str = None, page_size: int = 500,
+                  max_records: int = None, status: dict = None):
+    """Yield Elasticsearch hits (``_source`` dicts) page by page.
+
+    Pages are fetched with ``search_after``, so only one page is held in
+    memory at a time.
+
+    Args:
+        index: Elasticsearch index pattern (e.g., 'app-logs-*').
+        query_str: Query string (Lucene syntax).
+        time_range: Time range string (e.g., '24h').
+        elk_url: Elasticsearch base URL.
+        page_size: Hits per request.
+        max_records: Stop after this many hits (None for all).
+        status: Optional dict filled with total_hits, took_ms and error.
+    """
+    status = status if status is not None else {}
+    status.setdefault("total_hits", 0)
+    status.setdefault("took_ms", 0)
+    endpoint = f"{elk_url or DEFAULT_ELK_URL}/{index}/_search"
+    remaining = max_records
+    search_after = None
+
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        body = _elk_search_body(query_str, time_range, size)
+        if search_after is not None:
+            body["search_after"] = search_after
+        try:
+            req = urllib.request.Request(
+                endpoint, data=json.dumps(body).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                result = json.loads(resp.read().decode("utf-8"))
+        except urllib.error.URLError as exc:
+            status["error"] = f"Connection failed: {exc}"
+            return
+        except Exception as exc:
+            status["error"] = str(exc)
+            return
+
+        hits = result.get("hits", {}).get("hits", [])
+        if search_after is None:
+            status["total_hits"] = result.get("hits", {}).get("total", {}).get("value", 0)
+        status["took_ms"] += result.get("took", 0)
+        for hit in hits:
+            yield hit.get("_source", {})
+        if remaining is not None:
+            remaining -= len(hits)
+        if len(hits) < size or not hits[-1].get("sort"):
+            return
+        search_after = hits[-1]["sort"]
+
+
 def _query_elk(index: str, query_str: str, time_range: str,
                elk_url: str = None, size: int = 500) -> dict:
     """Execute a search query against Elasticsearch.
@@ -99,68 +196,45 @@ def _query_elk(index: str, query_str: str, time_range: str,
     Returns:
         Dict with source, total_hits, hits, and optional error.
     """
-    url = elk_url or DEFAULT_ELK_URL
-    tr = _parse_time_range(time_range)
-
-    body = {
-        "query": {
-            "bool": {
-                "must": [{"query_string": {"query": query_str}}] if query_str else [{"match_all": {}}],
-                "filter": [
-                    {"range": {"@timestamp": {"gte": tr["elk_format"], "lte": "now"}}}
-                ],
-            }
-        },
-        "size": size,
-        "sort": [{"@timestamp": {"order": "desc"}}],
+    status = {}
+    hits = list(iter_elk_hits(index, query_str, time_range, elk_url,
+                              page_size=size, max_records=size, status=status))
+    if status.get("error"):
+        return {"source": "elk", "error": status["error"], "index": index,
+                "total_hits": 0, "hits": []}
+    return {
+        "source": "elk",
+        "index": index,
+        "total_hits": status["total_hits"],
+        "hits": hits,
+        "took_ms": status["took_ms"],
     }
 
-    endpoint = f"{url}/{index}/_search"
-    data = json.dumps(body).encode("utf-8")
 
-    try:
-        req = urllib.request.Request(
-            endpoint, data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            return {
-                "source": "elk",
-                "index": index,
-                "total_hits": result.get("hits", {}).get("total", {}).get("value", 0),
-                "hits": [h.get("_source", {}) for h in result.get("hits", {}).get("hits", [])],
-                "took_ms": result.get("took", 0),
-            }
-    except urllib.error.URLError as exc:
-        return {"source": "elk", "error": f"Connection failed: {exc}", "index": index,
-                "total_hits": 0, "hits": []}
-    except Exception as exc:
-        return {"source": "elk", "error": str(exc), "index": index,
-                "total_hits": 0, "hits": []}
+def iter_splunk_results(search_query: str, time_range: str,
+                        splunk_url: str = None, splunk_token: str = None,
+                        max_results: int = 500, status: dict = None):
+    """Yield Splunk export results as the response streams in.
 
-
-def _query_splunk(search_query: str, time_range: str,
-                  splunk_url: str = None, splunk_token: str = None,
-                  max_results: int = 500) -> dict:
-    """Execute a search against the Splunk REST API.
+    The export endpoint returns one JSON object per line; lines are decoded
+    as they are read instead of buffering the whole response.
 
     Args:
         search_query: Splunk SPL query.
         time_range: Time range string.
         splunk_url: Splunk management URL.
         splunk_token: Bearer token for authentication.
-        max_results: Maximum results to return.
-
-    Returns:
-        Dict with source, total_hits, hits, and optional error.
+        max_results: Maximum results to return (0 for Splunk's maximum).
+        status: Optional dict filled with query, total_hits and error.
     """
+    status = status if status is not None else {}
     url = splunk_url or DEFAULT_SPLUNK_URL
     tr = _parse_time_range(time_range)
 
     if not search_query.strip().startswith("search"):
         search_query = f"search {search_query}"
+    status["query"] = search_query
+    status["total_hits"] = 0
 
     endpoint = f"{url}/services/search/jobs/export"
     params = {
@@ -168,7 +242,7 @@ def _query_splunk(search_query: str, time_range: str,
         "earliest_time": tr["splunk_format"],
         "latest_time": "now",
         "output_mode": "json",
-        "count": max_results,
+        "count": max_results or 0,
     }
     data = urllib.parse.urlencode(params).encode("utf-8")
 
@@ -184,68 +258,329 @@ def _query_splunk(search_query: str, time_range: str,
 
         req = urllib.request.Request(endpoint, data=data, headers=headers, method="POST")
         with urllib.request.urlopen(req, timeout=30, context=ctx) as resp:
-            raw = resp.read().decode("utf-8")
-            results = []
-            for line in raw.strip().split("\n"):
-                if line.strip():
-                    try:
-                        obj = json.loads(line)
-                        if "result" in obj:
-                            results.append(obj["result"])
-                    except json.JSONDecodeError:
-                        continue
-            return {"source": "splunk", "query": search_query,
-                    "total_hits": len(results), "hits": results}
+            for raw in resp:
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "result" in obj:
+                    status["total_hits"] += 1
+                    yield obj["result"]
     except urllib.error.URLError as exc:
-        return {"source": "splunk", "error": f"Connection failed: {exc}",
-                "query": search_query, "total_hits": 0, "hits": []}
+        status["error"] = f"Connection failed: {exc}"
     except Exception as exc:
-        return {"source": "splunk", "error": str(exc),
-                "query": search_query, "total_hits": 0, "hits": []}
+        status["error"] = str(exc)
+
+
+def _query_splunk(search_query: str, time_range: str,
+                  splunk_url: str = None, splunk_token: str = None,
+                  max_results: int = 500) -> dict:
+    """Execute a search against the Splunk REST API.
+
+    Args:
+        search_query: Splunk SPL query.
+        time_range: Time range string.
+        splunk_url: Splunk management URL.
+        splunk_token: Bearer token for authentication.
+        max_results: Maximum results to return.
+
+    Returns:
+        Dict with source, total_hits, hits, and optional error.
+    """
+    status = {}
+    hits = list(iter_splunk_results(search_query, time_range, splunk_url,
+                                    splunk_token, max_results, status))
+    if status.get("error"):
+        return {"source": "splunk", "error": status["error"],
+                "query": status["query"], "total_hits": 0, "hits": []}
+    return {"source": "splunk", "query": status["query"],
+            "total_hits": len(hits), "hits": hits}
+
+
+def iter_log_file(path, encoding: str = "utf-8"):
+    """Yield log records from a local export, one line at a time.
+
+    Handles plain-text logs, JSONL exports (Splunk ``{"result": ...}`` and
+    Elasticsearch ``{"_source": ...}`` wrappers are unwrapped) and either
+    of those gzip-compressed (``.gz``).  Plain-text lines become
+    ``{"message": line}``.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding=encoding, errors="replace") as fh:
+        for line in fh:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if line.lstrip().startswith("{"):
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    obj = None
+                if isinstance(obj, dict):
+                    for wrapper in ("result", "_source"):
+                        if isinstance(obj.get(wrapper), dict):
+                            obj = obj[wrapper]
+                            break
+                    yield obj
+                    continue
+            yield {"message": line}
 
 
 # ---------------------------------------------------------------------------
 # Pattern search
 # ---------------------------------------------------------------------------
-def search_patterns(log_data: list, patterns: list = None) -> list:
+def _entry_message(entry: dict) -> str:
+    return entry.get("message") or entry.get("msg") or entry.get("_raw") or ""
+
+
+class LogPatternMatcher:
+    """All error patterns compiled once and evaluated in one pass per record.
+
+    Each regex is compiled case-insensitively together with its literal
+    anchors (see injection_scan_engine.extract_anchors): strings one of which
+    every match must contain.  For an ASCII message the anchors of all
+    patterns are looked up in the lower-cased message first, and only the
+    patterns with an anchor present (plus any pattern without anchors) run
+    their regex.  Non-ASCII messages run every regex.
+    """
+
+    def __init__(self, patterns: list):
+        self.patterns = []
+        self._anchor_owners = {}
+        self._unanchored = []
+        for pattern in patterns:
+            regex = pattern.get("regex", "")
+            if not regex:
+                continue
+            position = len(self.patterns)
+            self.patterns.append((pattern.get("name", "unknown"), regex,
+                                  re.compile(regex, re.IGNORECASE)))
+            anchors = extract_anchors(regex)
+            if not anchors or not all(a.isascii() for a in anchors):
+                self._unanchored.append(position)
+                continue
+            for anchor in anchors:
+                self._anchor_owners.setdefault(anchor, []).append(position)
+        self._anchor_items = list(self._anchor_owners.items())
+        self._all = list(range(len(self.patterns)))
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def matches(self, message: str) -> list:
+        """Positions (in pattern order) of the patterns found in *message*."""
+        if not message:
+            return []
+        if message.isascii():
+            lowered = message.lower()
+            active = set(self._unanchored)
+            for anchor, owners in self._anchor_items:
+                if anchor in lowered:
+                    active.update(owners)
+            if not active:
+                return []
+            candidates = sorted(active)
+        else:
+            candidates = self._all
+        patterns = self.patterns
+        return [i for i in candidates if patterns[i][2].search(message)]
+
+    def results(self, counts: list, samples: list) -> list:
+        """search_patterns() output for per-pattern *counts* and *samples*."""
+        results = [
+            {"name": name, "regex": regex, "count": counts[i], "sample_messages": samples[i]}
+            for i, (name, regex, _) in enumerate(self.patterns)
+            if counts[i]
+        ]
+        results.sort(key=lambda r: r["count"], reverse=True)
+        return results
+
+
+_matcher_cache = {}
+_matcher_cache_lock = threading.Lock()
+
+
+def get_pattern_matcher(patterns: list = None) -> LogPatternMatcher:
+    """Shared compiled matcher for a pattern list (DEFAULT_PATTERNS if None)."""
+    if patterns is None:
+        patterns = DEFAULT_PATTERNS
+    key = tuple((p.get("name", "unknown"), p.get("regex", "")) for p in patterns)
+    with _matcher_cache_lock:
+        matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = LogPatternMatcher(patterns)
+        with _matcher_cache_lock:
+            if len(_matcher_cache) >= MATCHER_CACHE_SIZE:
+                _matcher_cache.clear()
+            _matcher_cache[key] = matcher
+    return matcher
+
+
+def search_patterns(log_data, patterns: list = None) -> list:
     """Search log entries for known error patterns.
 
     Args:
-        log_data: List of log entry dicts. Each should have a 'message' field.
+        log_data: Iterable of log entry dicts (a list or a generator such as
+                  iter_log_file()). Each should have a 'message' field.
         patterns: List of pattern dicts with 'name' and 'regex' keys.
                   Defaults to DEFAULT_PATTERNS if not provided.
 
     Returns:
         List of dicts: [{name, regex, count, sample_messages}].
     """
-    if patterns is None:
-        patterns = DEFAULT_PATTERNS
+    matcher = get_pattern_matcher(patterns)
+    counts = [0] * len(matcher)
+    samples = [[] for _ in range(len(matcher))]
+    for entry in log_data:
+        msg = _entry_message(entry)
+        for i in matcher.matches(msg):
+            counts[i] += 1
+            if len(samples[i]) < SAMPLE_LIMIT:
+                samples[i].append(msg[:200])
+    return matcher.results(counts, samples)
+
+
+# ---------------------------------------------------------------------------
+# Streaming analysis
+# ---------------------------------------------------------------------------
+class _TopCounter:
+    """Most frequent keys in bounded memory.
 
-    results = []
-    for pattern in patterns:
-        name = pattern.get("name", "unknown")
-        regex = pattern.get("regex", "")
-        if not regex:
-            continue
-
-        compiled = re.compile(regex, re.IGNORECASE)
-        matches = []
-        for entry in log_data:
-            msg = entry.get("message") or entry.get("msg") or entry.get("_raw") or ""
-            if compiled.search(msg):
-                matches.append(msg[:200])
-
-        if matches:
-            results.append({
-                "name": name,
-                "regex": regex,
-                "count": len(matches),
-                "sample_messages": matches[:5],
-            })
-
-    # Sort by count descending
-    results.sort(key=lambda r: r["count"], reverse=True)
-    return results
+    Exact while there are at most *capacity* distinct keys.  Beyond that the
+    table is pruned back to its *capacity* most frequent keys whenever it
+    reaches twice that size, so rare keys are forgotten and counts of keys
+    that were pruned and came back are under-reported.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = Counter()
+        self.pruned = False
+
+    def add(self, key: str) -> None:
+        self.counts[key] += 1
+        if len(self.counts) >= 2 * self.capacity:
+            self.counts = Counter(dict(self.counts.most_common(self.capacity)))
+            self.pruned = True
+
+    def most_common(self, n: int) -> list:
+        return self.counts.most_common(n)
+
+
+def _severity_of(entry: dict) -> str:
+    level = (entry.get("level") or entry.get("log_level")
+             or entry.get("severity") or entry.get("status") or "unknown")
+    if not isinstance(level, str):
+        return "unknown"
+    level_lower = level.lower()
+    if level_lower in ("error", "err", "fatal", "critical", "crit"):
+        return "error"
+    if level_lower in ("warning", "warn"):
+        return "warning"
+    return "info"
+
+
+class LogStreamAnalyzer:
+    """Single-pass log analysis in memory independent of the record count.
+
+    Records are consumed one at a time (add() / add_many() accept any
+    iterable, e.g. iter_log_file(), iter_elk_hits() or
+    iter_splunk_results()).  The analyzer keeps only counters, at most
+    *sample_limit* sample messages per pattern, a bounded table of
+    normalized messages (_TopCounter) and one counter per 5-minute bucket.
+    """
+
+    def __init__(self, patterns: list = None, sample_limit: int = SAMPLE_LIMIT,
+                 top_capacity: int = TOP_MESSAGE_CAPACITY):
+        self._matcher = get_pattern_matcher(patterns)
+        self.sample_limit = sample_limit
+        self.total = 0
+        self.severity_counts = Counter()
+        self._pattern_counts = [0] * len(self._matcher)
+        self._samples = [[] for _ in range(len(self._matcher))]
+        self._messages = _TopCounter(top_capacity)
+        self._buckets = defaultdict(int)
+
+    def add(self, entry: dict) -> None:
+        """Fold one log record into the running analysis."""
+        self.total += 1
+        self.severity_counts[_severity_of(entry)] += 1
+
+        msg = _entry_message(entry)
+        for i in self._matcher.matches(msg):
+            self._pattern_counts[i] += 1
+            if len(self._samples[i]) < self.sample_limit:
+                self._samples[i].append(msg[:200])
+
+        msg = entry.get("message") or entry.get("msg") or ""
+        if msg:
+            self._messages.add(_DIGITS.sub("N", msg[:120]))
+
+        ts = entry.get("@timestamp") or entry.get("timestamp") or entry.get("_time")
+        if ts and isinstance(ts, str):
+            try:
+                dt = datetime.fromisoformat(ts.replace("Z", "+00:00").replace("+00:00", ""))
+            except (ValueError, AttributeError):
+                return
+            bucket_key = dt.replace(minute=(dt.minute // 5) * 5, second=0, microsecond=0)
+            self._buckets[bucket_key] += 1
+
+    def add_many(self, entries) -> "LogStreamAnalyzer":
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    @property
+    def bucket_count(self) -> int:
+        """Number of 5-minute buckets seen so far."""
+        return len(self._buckets)
+
+    def matched_patterns(self) -> list:
+        return self._matcher.results(self._pattern_counts, self._samples)
+
+    def top_messages(self, limit: int = 10) -> list:
+        return [
+            {"message": msg, "count": count}
+            for msg, count in self._messages.most_common(limit)
+            if count > 1
+        ]
+
+    def frequency_anomalies(self) -> list:
+        """5-minute buckets more than two standard deviations above the mean."""
+        anomalies = []
+        if len(self._buckets) < 2:
+            return anomalies
+        counts = list(self._buckets.values())
+        mean = sum(counts) / len(counts)
+        variance = sum((c - mean) ** 2 for c in counts) / len(counts)
+        std_dev = variance ** 0.5
+        for bucket_time in sorted(self._buckets):
+            count = self._buckets[bucket_time]
+            if std_dev > 0 and (count - mean) / std_dev > 2.0:
+                anomalies.append({
+                    "bucket": bucket_time.isoformat(),
+                    "count": count,
+                    "mean": round(mean, 1),
+                    "z_score": round((count - mean) / std_dev, 2),
+                })
+        return anomalies
+
+    def summary(self) -> dict:
+        """Totals, error rate, patterns, top messages and anomalies."""
+        errors = self.severity_counts.get("error", 0)
+        error_rate = round(errors / self.total, 4) if self.total > 0 else 0.0
+        return {
+            "total_logs": self.total,
+            "severity_counts": dict(self.severity_counts),
+            "error_rate": error_rate,
+            "error_rate_is_spike": error_rate > 0.10,
+            "matched_patterns": self.matched_patterns(),
+            "top_messages": self.top_messages(),
+            "frequency_anomalies": self.frequency_anomalies(),
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -254,14 +589,16 @@ def search_patterns(log_data: list, patterns: list = None) -> list:
 def analyze_logs(source: str, query: str, time_range: str,
                  db_path: Path = None, project_id: str = None,
                  elk_url: str = None, splunk_url: str = None,
-                 splunk_token: str = None) -> dict:
-    """Analyze logs from ELK or Splunk.
+                 splunk_token: str = None, log_file: str = None,
+                 max_records: int = 500) -> dict:
+    """Analyze logs from ELK, Splunk or a local log export.
 
-    Queries the specified source, extracts error patterns, counts occurrences,
-    and records findings in the metric_snapshots table.
+    Streams records from the specified source through a LogStreamAnalyzer,
+    extracts error patterns, counts occurrences, and records findings in
+    the metric_snapshots table.
 
     Args:
-        source: Log source — 'elk', 'splunk', or 'both'.
+        source: Log source — 'elk', 'splunk', 'both', or 'file'.
         query: Search query string.
         time_range: Time range (e.g., '24h', '1h', '7d').
         db_path: Optional override for database path.
@@ -269,107 +606,52 @@ def analyze_logs(source: str, query: str, time_range: str,
         elk_url: Elasticsearch URL override.
         splunk_url: Splunk URL override.
         splunk_token: Splunk authentication token.
+        log_file: Plain-text, JSONL or .gz export to read when source is 'file'.
+        max_records: Maximum records per backend (None or 0 for all).
 
     Returns:
         Dict with analysis results including error patterns, severity counts,
         anomalies, and top messages.
     """
-    all_logs = []
+    analyzer = LogStreamAnalyzer()
     source_results = {}
+    limit = max_records or None
 
     # ---------- Query ELK ----------
     if source in ("elk", "both"):
         index = f"{project_id}-*" if project_id else "*"
-        elk_result = _query_elk(index, query, time_range, elk_url)
-        all_logs.extend(elk_result.get("hits", []))
+        status = {}
+        analyzer.add_many(iter_elk_hits(index, query, time_range, elk_url,
+                                        page_size=min(limit or 500, 500),
+                                        max_records=limit, status=status))
         source_results["elk"] = {
-            "total_hits": elk_result.get("total_hits", 0),
-            "error": elk_result.get("error"),
+            "total_hits": status.get("total_hits", 0),
+            "error": status.get("error"),
         }
 
     # ---------- Query Splunk ----------
     if source in ("splunk", "both"):
         splunk_query = query or (f'index="{project_id}" level=ERROR OR level=WARN'
                                  if project_id else "level=ERROR OR level=WARN")
-        splunk_result = _query_splunk(splunk_query, time_range, splunk_url, splunk_token)
-        all_logs.extend(splunk_result.get("hits", []))
+        status = {}
+        analyzer.add_many(iter_splunk_results(splunk_query, time_range, splunk_url,
+                                              splunk_token, limit or 0, status))
         source_results["splunk"] = {
-            "total_hits": splunk_result.get("total_hits", 0),
-            "error": splunk_result.get("error"),
+            "total_hits": status.get("total_hits", 0),
+            "error": status.get("error"),
         }
 
-    # ---------- Extract severity counts ----------
-    severity_counts = Counter()
-    for entry in all_logs:
-        level = (entry.get("level") or entry.get("log_level")
-                 or entry.get("severity") or entry.get("status") or "unknown")
-        if isinstance(level, str):
-            level_lower = level.lower()
-            if level_lower in ("error", "err", "fatal", "critical", "crit"):
-                severity_counts["error"] += 1
-            elif level_lower in ("warning", "warn"):
-                severity_counts["warning"] += 1
-            else:
-                severity_counts["info"] += 1
-        else:
-            severity_counts["unknown"] += 1
-
-    # ---------- Detect error patterns ----------
-    matched_patterns = search_patterns(all_logs)
+    # ---------- Local export ----------
+    if source == "file":
+        before = analyzer.total
+        try:
+            analyzer.add_many(iter_log_file(log_file))
+            error = None
+        except (OSError, EOFError, TypeError) as exc:
+            error = str(exc)
+        source_results["file"] = {"total_hits": analyzer.total - before, "error": error}
 
-    # ---------- Top repeated messages ----------
-    message_counter = Counter()
-    for entry in all_logs:
-        msg = entry.get("message") or entry.get("msg") or ""
-        if msg:
-            normalized = re.sub(r"\d+", "N", msg[:120])
-            message_counter[normalized] += 1
-
-    top_messages = [
-        {"message": msg, "count": count}
-        for msg, count in message_counter.most_common(10)
-        if count > 1
-    ]
-
-    # ---------- Time-bucket anomaly detection (5-minute buckets) ----------
-    frequency_anomalies = []
-    timestamps = []
-    for entry in all_logs:
-        ts = entry.get("@timestamp") or entry.get("timestamp") or entry.get("_time")
-        if ts and isinstance(ts, str):
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00").replace("+00:00", ""))
-                timestamps.append(dt)
-            except (ValueError, AttributeError):
-                pass
-
-    if timestamps:
-        timestamps.sort()
-        buckets = defaultdict(int)
-        for ts_val in timestamps:
-            bucket_key = ts_val.replace(minute=(ts_val.minute // 5) * 5, second=0, microsecond=0)
-            buckets[bucket_key] += 1
-
-        if len(buckets) >= 2:
-            counts = list(buckets.values())
-            mean = sum(counts) / len(counts)
-            variance = sum((c - mean) ** 2 for c in counts) / len(counts)
-            std_dev = variance ** 0.5
-
-            for bucket_time, count in buckets.items():
-                if std_dev > 0 and (count - mean) / std_dev > 2.0:
-                    frequency_anomalies.append({
-                        "bucket": bucket_time.isoformat(),
-                        "count": count,
-                        "mean": round(mean, 1),
-                        "z_score": round((count - mean) / std_dev, 2),
-                    })
-
-    # ---------- Error rate ----------
-    total = len(all_logs)
-    errors = severity_counts.get("error", 0)
-    error_rate = round(errors / total, 4) if total > 0 else 0.0
-    is_spike = error_rate > 0.10
+    summary = analyzer.summary()
 
     # ---------- Build result ----------
     result = {
@@ -378,13 +660,13 @@ def analyze_logs(source: str, query: str, time_range: str,
         "query": query,
         "time_range": time_range,
         "analyzed_at": datetime.now(timezone.utc).isoformat() + "Z",
-        "total_logs": total,
-        "severity_counts": dict(severity_counts),
-        "error_rate": error_rate,
-        "error_rate_is_spike": is_spike,
-        "matched_patterns": matched_patterns,
-        "top_messages": top_messages,
-        "frequency_anomalies": frequency_anomalies,
+        "total_logs": summary["total_logs"],
+        "severity_counts": summary["severity_counts"],
+        "error_rate": summary["error_rate"],
+        "error_rate_is_spike": summary["error_rate_is_spike"],
+        "matched_patterns": summary["matched_patterns"],
+        "top_messages": summary["top_messages"],
+        "frequency_anomalies": summary["frequency_anomalies"],
         "source_results": source_results,
     }
 
@@ -434,8 +716,12 @@ def main():
     parser = argparse.ArgumentParser(
         description="Log Analyzer — queries ELK/Splunk, detects error patterns, records findings"
     )
-    parser.add_argument("--source", choices=["elk", "splunk", "both"], default="elk",
+    parser.add_argument("--source", choices=["elk", "splunk", "both", "file"], default="elk",
                         help="Log source to query (default: elk)")
+    parser.add_argument("--log-file",
+                        help="Plain-text, JSONL or .gz log export (with --source file)")
+    parser.add_argument("--max-records", type=int, default=500,
+                        help="Maximum records per backend, 0 for all (default: 500)")
     parser.add_argument("--query", default="level:ERROR OR level:WARN",
                         help='Search query string (default: "level:ERROR OR level:WARN")')
     parser.add_argument("--time-range", default="24h",
@@ -451,6 +737,8 @@ def main():
     args = parser.parse_args()
 
     db_path = Path(args.db_path) if args.db_path else None
+    if args.source == "file" and not args.log_file:
+        parser.error("--source file requires --log-file")
 
     result = analyze_logs(
         source=args.source,
@@ -461,6 +749,8 @@ def main():
         elk_url=args.elk_url,
         splunk_url=args.splunk_url,
         splunk_token=args.splunk_token,
+        log_file=args.log_file,
+        max_records=args.max_records,
     )
 
     if args.format == "json":
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Benchmark for log_analyzer pattern search on synthetic log exports.
+
+Generates a JSONL log export of N records (a mix of routine request logs and
+the error messages DEFAULT_PATTERNS look for) and analyzes it two ways:
+
+  legacy     load every record into a list, compile each pattern and scan
+             the whole list once per pattern, then one more pass each for
+             severities, repeated messages and time buckets (the
+             pre-streaming analyze_logs() behaviour)
+  streaming  iter_log_file() -> LogStreamAnalyzer, one pass, all patterns
+             evaluated per record by the precompiled LogPatternMatcher
+
+Reports wall time, records per second and (from a second, traced run) peak
+memory for each, and checks both produced the same pattern counts, severity
+counts, top messages and bucket count.
+
+CLI:
+    python tools/monitor/log_benchmark.py --records 200000
+    python tools/monitor/log_benchmark.py --records 1000000 --skip-legacy --json
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.monitor.log_analyzer import (  # noqa: E402
+    DEFAULT_PATTERNS,
+    LogStreamAnalyzer,
+    iter_log_file,
+)
+
+_ROUTINE_WORDS = (
+    "request served user session cache miss hit upstream worker started completed "
+    "GET POST PUT path /api/v1/items /api/v1/orders /healthz latency ms status ok"
+).split()
+
+_ERROR_MESSAGES = [
+    "Connection refused by upstream 10.0.3.17:5432",
+    "request timed out after 30s waiting for response",
+    "NullPointerException in OrderHandler.process",
+    "HTTP 429 too many requests from client",
+    "database is locked, retrying transaction",
+    "certificate verify failed: unable to get local issuer",
+    "worker killed: OOM, memory limit exceeded",
+    "No space left on device while writing /var/log/app.log",
+    "authentication failed for service account",
+    "Name or service not known: metrics.internal",
+]
+
+
+def generate_synthetic_logs(path, records: int, error_ratio: float = 0.05,
+                            seed: int = 1337) -> Path:
+    """Write *records* synthetic JSONL log lines to *path*."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(records):
+            words = " ".join(rng.choice(_ROUTINE_WORDS) for _ in range(rng.randint(8, 20)))
+            message = f"{words} id={rng.randint(0, 99999)}"
+            level = "INFO"
+            if rng.random() < error_ratio:
+                message = f"{message} {rng.choice(_ERROR_MESSAGES)}"
+                level = rng.choice(("ERROR", "WARN"))
+            ts = start + timedelta(seconds=i * 86400 / max(records, 1))
+            fh.write(json.dumps({
+                "@timestamp": ts.isoformat() + "Z",
+                "level": level,
+                "message": message,
+            }) + "\n")
+    return path
+
+
+def _legacy_analysis(path) -> dict:
+    """Pre-streaming behaviour: materialize every record, one scan per pattern,
+    then separate passes for severities, repeated messages and time buckets."""
+    with open(path, "r", encoding="utf-8") as fh:
+        log_data = [json.loads(line) for line in fh if line.strip()]
+
+    patterns = {}
+    for pattern in DEFAULT_PATTERNS:
+        compiled = re.compile(pattern["regex"], re.IGNORECASE)
+        matches = []
+        for entry in log_data:
+            msg = entry.get("message") or entry.get("msg") or entry.get("_raw") or ""
+            if compiled.search(msg):
+                matches.append(msg[:200])
+        if matches:
+            patterns[pattern["name"]] = len(matches)
+
+    severity_counts = Counter()
+    for entry in log_data:
+        level = entry.get("level") or "unknown"
+        if level.lower() in ("error", "err", "fatal", "critical", "crit"):
+            severity_counts["error"] += 1
+        elif level.lower() in ("warning", "warn"):
+            severity_counts["warning"] += 1
+        else:
+            severity_counts["info"] += 1
+
+    message_counter = Counter()
+    for entry in log_data:
+        msg = entry.get("message") or entry.get("msg") or ""
+        if msg:
+            message_counter[re.sub(r"\d+", "N", msg[:120])] += 1
+
+    timestamps = []
+    for entry in log_data:
+        ts = entry.get("@timestamp")
+        if ts:
+            timestamps.append(datetime.fromisoformat(ts.replace("Z", "")))
+    timestamps.sort()
+    buckets = Counter(
+        t.replace(minute=(t.minute // 5) * 5, second=0, microsecond=0) for t in timestamps
+    )
+    return {
+        "pattern_counts": patterns,
+        "severity_counts": dict(severity_counts),
+        "top_messages": [m for m, c in message_counter.most_common(10) if c > 1],
+        "buckets": len(buckets),
+    }
+
+
+def _streaming_analysis(path) -> dict:
+    analyzer = LogStreamAnalyzer().add_many(iter_log_file(path))
+    summary = analyzer.summary()
+    return {
+        "pattern_counts": {p["name"]: p["count"] for p in summary["matched_patterns"]},
+        "severity_counts": summary["severity_counts"],
+        "top_messages": [m["message"] for m in summary["top_messages"]],
+        "buckets": analyzer.bucket_count,
+    }
+
+
+def _measure(fn, path, records: int, trace_memory: bool) -> dict:
+    started = time.perf_counter()
+    analysis = fn(path)
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        # Separate traced run: tracemalloc slows allocation-heavy code a lot
+        tracemalloc.start()
+        fn(path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(records / elapsed) if elapsed > 0 else None,
+        "peak_memory_mb": round(peak / (1024 * 1024), 1) if peak is not None else None,
+        "analysis": analysis,
+    }
+
+
+def run_benchmark(records: int = 200000, error_ratio: float = 0.05,
+                  log_file: str = None, skip_legacy: bool = False,
+                  trace_memory: bool = True) -> dict:
+    """Generate (or reuse) a log export and time both analysis paths."""
+    with tempfile.TemporaryDirectory(prefix="icdev-log-bench-") as tmp:
+        path = Path(log_file) if log_file else Path(tmp) / "synthetic.jsonl"
+        if not log_file:
+            generate_synthetic_logs(path, records, error_ratio)
+        result = {
+            "records": records,
+            "file_mb": round(path.stat().st_size / (1024 * 1024), 1),
+            "streaming": _measure(_streaming_analysis, path, records, trace_memory),
+        }
+        if not skip_legacy:
+            legacy = _measure(_legacy_analysis, path, records, trace_memory)
+            result["legacy"] = legacy
+            result["results_match"] = legacy["analysis"] == result["streaming"]["analysis"]
+            if result["streaming"]["seconds"] > 0:
+                result["speedup"] = round(legacy["seconds"] / result["streaming"]["seconds"], 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming log pattern search")
+    parser.add_argument("--records", type=int, default=200000,
+                        help="Synthetic records to generate (default: 200000)")
+    parser.add_argument("--error-ratio", type=float, default=0.05,
+                        help="Share of records carrying an error message (default: 0.05)")
+    parser.add_argument("--log-file", help="Benchmark an existing JSONL export instead")
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="Only time the streaming path (for exports too large to load)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip tracemalloc (faster, no peak memory figures)")
+    parser.add_argument("--json", action="store_true", dest="json_output", help="JSON output")
+    args = parser.parse_args()
+
+    records = args.records
+    if args.log_file:
+        with open(args.log_file, "r", encoding="utf-8", errors="replace") as fh:
+            records = sum(1 for line in fh if line.strip())
+
+    result = run_benchmark(records, args.error_ratio, args.log_file,
+                           args.skip_legacy, not args.no_memory)
+    if args.json_output:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"[log-benchmark] {result['records']} records, {result['file_mb']} MB")
+    for name in ("legacy", "streaming"):
+        run = result.get(name)
+        if run is None:
+            continue
+        memory = f", peak {run['peak_memory_mb']} MB" if run["peak_memory_mb"] is not None else ""
+        print(f"  {name:>9s}: {run['seconds']:.2f}s ({run['records_per_second']} records/s{memory})")
+    if "speedup" in result:
+        print(f"  speedup: {result['speedup']}x | results match: {result['results_match']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
 #!/usr/bin/env python3
 """ICDEV SaaS — API Key Authentication.
 CUI // SP-CTI
+
+Validated principals are cached in-process by key hash (bounded LRU with a
+TTL), and unknown keys are negatively cached for a shorter TTL, so repeat
+requests skip the platform DB. tenant_manager and the key-revocation route
+call the invalidate_* helpers; other processes converge within the TTL.
+
+Environment:
+    ICDEV_AUTH_CACHE_TTL           positive TTL seconds (default 60, 0 disables)
+    ICDEV_AUTH_CACHE_NEGATIVE_TTL  unknown-key TTL seconds (default 10)
+    ICDEV_AUTH_CACHE_SIZE          max cached keys (default 10000)
 """
 import hashlib
 import logging
 import os
 import sqlite3
 import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -32,9 +45,133 @@ def _hash_key(key: str) -> str:
     return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
 
+class PrincipalCache:
+    """Bounded LRU of validated principals keyed by API key hash.
+
+    Entries hold a principal dict (positive) or None (unknown key,
+    negative). Positive entries also record key_id and expires_at so a key
+    expiring mid-TTL is rejected without a DB read.
+    """
+
+    def __init__(self, ttl: float = 60.0, negative_ttl: float = 10.0,
+                 max_entries: int = 10000):
+        self.ttl = float(ttl)
+        self.negative_ttl = float(negative_ttl)
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key_hash: str):
+        """Return (found, principal). principal is None for a cached unknown key."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key_hash]
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key_hash)
+            principal = entry[1]
+            if principal is None:
+                self.stats["negative_hits"] += 1
+                return True, None
+        expires_at = principal.get("_expires_at")
+        if expires_at and expires_at < datetime.now(timezone.utc):
+            self.invalidate(key_hashes=[key_hash])
+            return True, None
+        with self._lock:
+            self.stats["hits"] += 1
+        return True, principal
+
+    def put(self, key_hash: str, principal: Optional[dict]) -> None:
+        ttl = self.ttl if principal is not None else self.negative_ttl
+        if ttl <= 0 or not self.enabled:
+            return
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + ttl, principal)
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key_hashes=None, key_id: Optional[str] = None,
+                   tenant_id: Optional[str] = None,
+                   user_id: Optional[str] = None) -> int:
+        """Drop matching entries. Returns how many were removed."""
+        with self._lock:
+            doomed = [h for h in (key_hashes or []) if h in self._entries]
+            if key_id or tenant_id or user_id:
+                for h, (_, principal) in self._entries.items():
+                    if principal is None:
+                        continue
+                    if ((key_id and principal.get("_key_id") == key_id)
+                            or (tenant_id and principal["tenant_id"] == tenant_id
+                                and (not user_id or principal["user_id"] == user_id))
+                            or (user_id and not tenant_id and principal["user_id"] == user_id)):
+                        doomed.append(h)
+            for h in doomed:
+                self._entries.pop(h, None)
+            self.stats["invalidations"] += len(doomed)
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+_cache = PrincipalCache(
+    ttl=_env_float("ICDEV_AUTH_CACHE_TTL", 60.0),
+    negative_ttl=_env_float("ICDEV_AUTH_CACHE_NEGATIVE_TTL", 10.0),
+    max_entries=int(_env_float("ICDEV_AUTH_CACHE_SIZE", 10000)),
+)
+
+
+def get_principal_cache() -> PrincipalCache:
+    """The process-wide principal cache."""
+    return _cache
+
+
+def invalidate_api_key(key_id: Optional[str] = None, key: Optional[str] = None) -> int:
+    """Evict a key from the principal cache (call on revocation/rotation)."""
+    return _cache.invalidate(key_hashes=[_hash_key(key)] if key else None, key_id=key_id)
+
+
+def invalidate_tenant(tenant_id: str) -> int:
+    """Evict every cached principal of a tenant (suspension, deletion)."""
+    return _cache.invalidate(tenant_id=tenant_id)
+
+
+def invalidate_user(user_id: str, tenant_id: Optional[str] = None) -> int:
+    """Evict every cached principal of a user (deactivation, role change)."""
+    return _cache.invalidate(user_id=user_id, tenant_id=tenant_id)
+
+
+def _public_principal(principal: dict) -> dict:
+    """Copy without the cache's private bookkeeping fields."""
+    return {k: v for k, v in principal.items() if not k.startswith("_")}
+
+
 def validate_api_key(key: str) -> Optional[dict]:
     """Validate an API key and return user/tenant info if valid.
 
+    Served from the principal cache when possible; a miss reads the
+    platform DB and caches the outcome (unknown keys negatively).
+
     Returns dict with: tenant_id, user_id, role, scopes, tenant_status, tenant_tier
     Returns None if invalid.
     """
@@ -42,7 +179,19 @@ def validate_api_key(key: str) -> Optional[dict]:
         return None
 
     key_hash = _hash_key(key)
+    found, principal = _cache.get(key_hash)
+    if found:
+        return _public_principal(principal) if principal else None
+
+    principal = _load_principal(key, key_hash)
+    if principal is not None:
+        _cache.put(key_hash, principal)
+        return _public_principal(principal)
+    return None
+
 
+def _load_principal(key: str, key_hash: str) -> Optional[dict]:
+    """Read and check a key from the platform DB (the cache-miss path)."""
     try:
         conn = _get_platform_conn()
         row = conn.execute("""
@@ -59,6 +208,8 @@ def validate_api_key(key: str) -> Optional[dict]:
 
         if not row:
             logger.warning("API key not found: prefix=%s", key[:12])
+            conn.close()
+            _cache.put(key_hash, None)
             return None
 
         row = dict(row)
@@ -69,8 +220,11 @@ def validate_api_key(key: str) -> Optional[dict]:
             return None
 
         # Check expiry
+        expires = None
         if row["expires_at"]:
             expires = datetime.fromisoformat(row["expires_at"])
+            if expires.tzinfo is None:
+                expires = expires.replace(tzinfo=timezone.utc)
             if expires < datetime.now(timezone.utc):
                 logger.warning("API key %s expired at %s", key[:12], row["expires_at"])
                 return None
@@ -85,7 +239,7 @@ def validate_api_key(key: str) -> Optional[dict]:
             logger.warning("Tenant %s is %s", row["tenant_id"], row["tenant_status"])
             return None
 
-        # Update last_used_at
+        # Update last_used_at (at most once per cache TTL per key)
         try:
             conn.execute("UPDATE api_keys SET last_used_at = ? WHERE id = ?",
                         (datetime.now(timezone.utc).isoformat(), row["key_id"]))
@@ -115,6 +269,8 @@ def validate_api_key(key: str) -> Optional[dict]:
             "impact_level": row["impact_level"],
             "tenant_slug": row["tenant_slug"],
             "auth_method": "api_key",
+            "_key_id": row["key_id"],
+            "_expires_at": expires,
         }
     except Exception as e:
         logger.error("API key validation error: %s", e)
@@ -9,14 +9,21 @@ Flask before_request middleware that:
 4. Checks RBAC permissions
 5. Returns 401/403 for auth failures
 
+Auth failure events are buffered and written to audit_platform in batches
+(one connection and transaction per flush) so a burst of bad credentials
+does not become a burst of SQLite writes.
+
 Usage:
     from tools.saas.auth.middleware import register_auth_middleware
     register_auth_middleware(app)
 """
+import atexit
 import json
 import logging
 import os
+import sqlite3
 import sys
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -130,29 +137,93 @@ def _validate_credentials(creds: dict) -> Optional[dict]:
     return None
 
 
-def _log_auth_event(tenant_id: Optional[str], user_id: Optional[str],
-                    event_type: str, details: dict, ip_address: str):
-    """Log authentication event to platform audit trail."""
-    try:
-        import sqlite3
+_AUDIT_INSERT_SQL = """
+    INSERT INTO audit_platform (tenant_id, user_id, event_type, action, details, ip_address, recorded_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class AuthEventBuffer:
+    """Coalesces auth audit rows into batched audit_platform inserts.
+
+    Rows are flushed by a background thread every ``flush_interval``
+    seconds, immediately once ``batch_size`` rows are pending, and at
+    interpreter exit. If more than ``max_pending`` rows pile up (DB
+    unavailable), the oldest are dropped with a warning, matching the
+    best-effort semantics of the previous per-event writes.
+    """
+
+    def __init__(self, flush_interval: float = 0.5, batch_size: int = 100,
+                 max_pending: int = 10000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: list = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, row: tuple) -> None:
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) > self.max_pending:
+                dropped = len(self._pending) - self.max_pending
+                del self._pending[:dropped]
+                logger.warning("Dropped %d buffered auth audit events", dropped)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="saas-auth-audit",
+                                                daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def flush(self) -> int:
+        """Write all pending rows now. Returns the number written."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
         platform_db = Path(os.environ.get(
             "PLATFORM_DB_PATH", str(BASE_DIR / "data" / "platform.db")
         ))
         if not platform_db.exists():
-            return
-        conn = sqlite3.connect(str(platform_db))
-        conn.execute("""
-            INSERT INTO audit_platform (tenant_id, user_id, event_type, action, details, ip_address, recorded_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            tenant_id, user_id, event_type, details.get("action", event_type),
-            json.dumps(details), ip_address,
-            datetime.now(timezone.utc).isoformat()
-        ))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.debug("Could not log auth event: %s", e)
+            return 0
+        try:
+            conn = sqlite3.connect(str(platform_db))
+            try:
+                conn.executemany(_AUDIT_INSERT_SQL, rows)
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.debug("Could not log %d auth events: %s", len(rows), e)
+            return 0
+        return len(rows)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+_auth_events = AuthEventBuffer()
+atexit.register(_auth_events.flush)
+
+
+def flush_auth_events() -> int:
+    """Write buffered auth audit events immediately (tests, shutdown)."""
+    return _auth_events.flush()
+
+
+def _log_auth_event(tenant_id: Optional[str], user_id: Optional[str],
+                    event_type: str, details: dict, ip_address: str):
+    """Queue an authentication event for the platform audit trail."""
+    _auth_events.add((
+        tenant_id, user_id, event_type, details.get("action", event_type),
+        json.dumps(details), ip_address,
+        datetime.now(timezone.utc).isoformat()
+    ))
 
 
 def register_auth_middleware(app):
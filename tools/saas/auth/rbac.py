@@ -110,14 +110,20 @@ ENDPOINT_CATEGORY_MAP = {
 }
 
 
+# (normalized prefix, category), longest pattern first; built once per map
+_CATEGORY_PREFIXES = [
+    (pattern.replace("{id}", "").rstrip("/"), category)
+    for pattern, category in sorted(ENDPOINT_CATEGORY_MAP.items(),
+                                    key=lambda item: len(item[0]), reverse=True)
+]
+
+
 def get_endpoint_category(path: str) -> str:
     """Resolve the permission category for a request path."""
     # Try exact match first, then prefix match (longest first)
-    for pattern in sorted(ENDPOINT_CATEGORY_MAP.keys(), key=len, reverse=True):
-        # Normalize pattern: replace {id} with wildcard matching
-        normalized = pattern.replace("{id}", "")
-        if path.startswith(normalized.rstrip("/")):
-            return ENDPOINT_CATEGORY_MAP[pattern]
+    for prefix, category in _CATEGORY_PREFIXES:
+        if path.startswith(prefix):
+            return category
     return "projects"  # default
 
 
@@ -5,9 +5,9 @@
 CUI // SP-CTI
 
 Tracks Bedrock LLM token usage per tenant for billing, rate enforcement,
-and cost allocation.  Records are stored in the platform.db
-``usage_records`` table with endpoint='bedrock_proxy' and token counts
-in the ``tokens_used`` column.
+and cost allocation.  Usage is recorded through the buffered usage meter
+(endpoint='bedrock_proxy'); reports and budget checks read the per-minute
+``usage_rollups`` table plus samples still buffered in this process.
 
 Budget enforcement reads from the tenant's subscription tier limits
 (stored in ``subscriptions`` table) or from ``bedrock_config`` overrides.
@@ -29,6 +29,7 @@ Usage (CLI):
 import argparse
 import json
 import logging
+import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -41,6 +42,7 @@ if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
 from tools.saas.platform_db import get_platform_connection  # noqa: E402
+from tools.saas.usage_meter import get_usage_meter  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -92,10 +94,10 @@ def _get_period_filter(period: str) -> str:
 def record_token_usage(tenant_id: str, user_id: str,
                        model_id: str, input_tokens: int,
                        output_tokens: int, endpoint: str = "bedrock_proxy"):
-    """Record a Bedrock token usage event in platform.db.
+    """Record a Bedrock token usage event via the usage meter.
 
-    Writes to the ``usage_records`` table with total tokens (input + output)
-    and model details in metadata.
+    Counts total tokens (input + output) into the minute rollup and keeps
+    a raw ``usage_records`` sample with model details in metadata.
 
     Args:
         tenant_id:     Platform tenant identifier.
@@ -106,32 +108,24 @@ def record_token_usage(tenant_id: str, user_id: str,
         endpoint:      API endpoint label (default 'bedrock_proxy').
     """
     total_tokens = input_tokens + output_tokens
-    metadata = json.dumps({
+    metadata = {
         "model_id": model_id,
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
-    })
+    }
 
-    conn = get_platform_connection()
     try:
-        conn.execute(
-            """INSERT INTO usage_records
-               (tenant_id, user_id, endpoint, method, tokens_used,
-                status_code, duration_ms, metadata, recorded_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (tenant_id, user_id, endpoint, "BEDROCK",
-             total_tokens, 200, 0, metadata, _utcnow()),
+        get_usage_meter().record(
+            tenant_id, user_id, endpoint, "BEDROCK", 200, 0,
+            tokens_used=total_tokens, input_tokens=input_tokens,
+            output_tokens=output_tokens, metadata=metadata,
         )
-        conn.commit()
         logger.debug(
             "Recorded %d tokens for tenant %s (model=%s)",
             total_tokens, tenant_id, model_id)
     except Exception as exc:
-        conn.rollback()
         logger.error("Failed to record token usage: %s", exc)
         raise
-    finally:
-        conn.close()
 
 
 def get_token_usage(tenant_id: str, period: str = "day") -> dict:
@@ -149,40 +143,29 @@ def get_token_usage(tenant_id: str, period: str = "day") -> dict:
 
     conn = get_platform_connection()
     try:
-        # Get total tokens and request count
-        row = conn.execute(
-            """SELECT COALESCE(SUM(tokens_used), 0) as total_tokens,
-                      COUNT(*) as total_requests
-               FROM usage_records
-               WHERE tenant_id = ?
-                 AND endpoint = 'bedrock_proxy'
-                 AND recorded_at LIKE ?""",
-            (tenant_id, period_prefix + "%"),
-        ).fetchone()
-
-        total_tokens = row[0] if isinstance(row, (list, tuple)) else row["total_tokens"]
-        total_requests = row[1] if isinstance(row, (list, tuple)) else row["total_requests"]
-
-        # Get breakdown from metadata
-        detail_rows = conn.execute(
-            """SELECT metadata FROM usage_records
-               WHERE tenant_id = ?
-                 AND endpoint = 'bedrock_proxy'
-                 AND recorded_at LIKE ?""",
-            (tenant_id, period_prefix + "%"),
-        ).fetchall()
-
-        total_input = 0
-        total_output = 0
-        for dr in detail_rows:
-            raw = dr[0] if isinstance(dr, (list, tuple)) else dr["metadata"]
-            if raw and isinstance(raw, str):
-                try:
-                    meta = json.loads(raw)
-                    total_input += meta.get("input_tokens", 0)
-                    total_output += meta.get("output_tokens", 0)
-                except json.JSONDecodeError:
-                    pass
+        # Minute rollups: one indexed range read instead of every raw row
+        try:
+            row = conn.execute(
+                """SELECT COALESCE(SUM(tokens_used), 0) as total_tokens,
+                          COALESCE(SUM(request_count), 0) as total_requests,
+                          COALESCE(SUM(input_tokens), 0) as input_tokens,
+                          COALESCE(SUM(output_tokens), 0) as output_tokens
+                   FROM usage_rollups
+                   WHERE tenant_id = ?
+                     AND endpoint = 'bedrock_proxy'
+                     AND minute LIKE ?""",
+                (tenant_id, period_prefix + "%"),
+            ).fetchone()
+            totals = list(row) if row else [0, 0, 0, 0]
+        except sqlite3.OperationalError:
+            totals = [0, 0, 0, 0]  # Rollups not created yet: nothing flushed
+
+        pending = get_usage_meter().pending_usage(
+            tenant_id, endpoint="bedrock_proxy", since_prefix=period_prefix)
+        total_tokens = totals[0] + pending["tokens_used"]
+        total_requests = totals[1] + pending["request_count"]
+        total_input = totals[2] + pending["input_tokens"]
+        total_output = totals[3] + pending["output_tokens"]
 
         return {
             "tenant_id": tenant_id,
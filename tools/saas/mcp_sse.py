@@ -29,7 +29,7 @@ import sys
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Dict, List
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -40,6 +40,8 @@ if str(BASE_DIR) not in sys.path:
 
 from flask import Blueprint, Response, g, jsonify, request
 
+from tools.saas.tenant_db_adapter import ToolDispatchTable
+
 logger = logging.getLogger("saas.mcp_sse")
 
 # ---------------------------------------------------------------------------
@@ -274,21 +276,19 @@ TOOL_REGISTRY = [
 # Build lookup dict
 _TOOL_MAP: Dict[str, dict] = {t["name"]: t for t in TOOL_REGISTRY}
 
+# Compiled dispatch table: functions and db_path injection resolved once per tool
+_DISPATCH_TABLE = ToolDispatchTable(TOOL_REGISTRY)
+
 
 # ---------------------------------------------------------------------------
 # Tool dispatch
 # ---------------------------------------------------------------------------
-def _load_tool_func(tool_entry: dict) -> Callable:
-    """Dynamically import and return the tool function."""
-    import importlib
-    mod = importlib.import_module(tool_entry["module"])
-    return getattr(mod, tool_entry["function"])
-
-
 def _dispatch_tool(name: str, arguments: dict, tenant_id: str) -> Any:
     """Route an MCP tool call to the corresponding Python function.
 
-    Injects db_path for tenant isolation via the tenant_db_adapter.
+    Injects db_path for tenant isolation via the tenant_db_adapter's
+    compiled dispatch table.  Arguments are checked against the tool's
+    signature before it runs, so a bad call fails without side effects.
 
     Args:
         name: MCP tool name from the registry.
@@ -299,23 +299,10 @@ def _dispatch_tool(name: str, arguments: dict, tenant_id: str) -> Any:
         Tool result (dict or list).
 
     Raises:
-        ValueError: If the tool is not found.
+        ValueError: If the tool is not found, the tenant is inactive, or
+            the arguments do not match the tool's signature.
     """
-    entry = _TOOL_MAP.get(name)
-    if not entry:
-        raise ValueError("Unknown tool: {}".format(name))
-
-    tool_func = _load_tool_func(entry)
-
-    # Use tenant_db_adapter for tools that need DB isolation
-    from tools.saas.tenant_db_adapter import call_tool_with_tenant_db
-    try:
-        result = call_tool_with_tenant_db(tool_func, tenant_id, **arguments)
-    except TypeError:
-        # Some tools (like sast_runner) don't accept db_path
-        result = tool_func(**arguments)
-
-    return result
+    return _DISPATCH_TABLE.call(name, arguments, tenant_id)
 
 
 # ---------------------------------------------------------------------------
@@ -173,7 +173,10 @@ class _FallbackGauge(GaugeBase):
 class _FallbackHistogram(HistogramBase):
     """In-process histogram that renders Prometheus text format."""
 
-    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: Optional[tuple] = None):
         self._name = name
         self._documentation = documentation
         self._labelnames = labelnames
@@ -182,7 +185,7 @@ class _FallbackHistogram(HistogramBase):
         self._observations: Dict[frozenset, List[float]] = {}
         self._label_values: Dict[frozenset, Dict[str, str]] = {}
         self._current_labels: Optional[frozenset] = None
-        self._buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+        self._buckets = tuple(buckets) if buckets else self.DEFAULT_BUCKETS
 
     def labels(self, **kwargs: str) -> "_FallbackHistogram":
         key = frozenset(kwargs.items())
@@ -247,6 +250,10 @@ class _FallbackHistogram(HistogramBase):
 # MetricsCollector — singleton dual-backend collector
 # ---------------------------------------------------------------------------
 
+# Prompt injection scans run per LLM call and are sub-millisecond when cached
+SCAN_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                        0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
 
 class MetricsCollector:
     """Collects ICDEV SaaS platform metrics.
@@ -318,6 +325,11 @@ class MetricsCollector:
             "Total tenants on the platform",
             ["status"],
         )
+        self.prompt_injection_scan_duration = Histogram(
+            "icdev_prompt_injection_scan_seconds",
+            "Prompt injection scan latency per call in seconds",
+            buckets=SCAN_LATENCY_BUCKETS,
+        )
 
     def _create_fallback_metrics(self) -> None:
         self.http_requests_total = _FallbackCounter(
@@ -358,6 +370,11 @@ class MetricsCollector:
             "Total tenants on the platform",
             ("status",),
         )
+        self.prompt_injection_scan_duration = _FallbackHistogram(
+            "icdev_prompt_injection_scan_seconds",
+            "Prompt injection scan latency per call in seconds",
+            buckets=SCAN_LATENCY_BUCKETS,
+        )
         self._fallback_metrics = [
             self.http_requests_total,
             self.http_request_duration,
@@ -367,6 +384,7 @@ class MetricsCollector:
             self.circuit_breaker_state,
             self.gateway_uptime,
             self.platform_tenants,
+            self.prompt_injection_scan_duration,
         ]
 
     # -- Flask middleware ----------------------------------------------------
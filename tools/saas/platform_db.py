@@ -116,6 +116,23 @@ CREATE TABLE IF NOT EXISTS usage_records (
 CREATE INDEX IF NOT EXISTS idx_usage_tenant_time ON usage_records(tenant_id, recorded_at);
 CREATE INDEX IF NOT EXISTS idx_usage_recorded ON usage_records(recorded_at);
 
+CREATE TABLE IF NOT EXISTS usage_rollups (
+    tenant_id UUID NOT NULL, endpoint VARCHAR(256) NOT NULL, method VARCHAR(8) NOT NULL,
+    minute TIMESTAMPTZ NOT NULL,
+    request_count BIGINT NOT NULL DEFAULT 0, error_count BIGINT NOT NULL DEFAULT 0,
+    tokens_used BIGINT NOT NULL DEFAULT 0, input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    duration_ms_total BIGINT NOT NULL DEFAULT 0, duration_ms_max INTEGER NOT NULL DEFAULT 0,
+    raw_rows BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, endpoint, method, minute)
+);
+CREATE INDEX IF NOT EXISTS idx_usage_rollups_tenant_minute ON usage_rollups(tenant_id, minute);
+
+CREATE TABLE IF NOT EXISTS usage_spill_applied (
+    spill_id VARCHAR(64) PRIMARY KEY, samples INTEGER NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 CREATE TABLE IF NOT EXISTS audit_platform (
     id BIGSERIAL PRIMARY KEY, tenant_id UUID, user_id UUID,
     event_type VARCHAR(64) NOT NULL, action TEXT NOT NULL,
@@ -236,6 +253,23 @@ CREATE TABLE IF NOT EXISTS usage_records (
 CREATE INDEX IF NOT EXISTS idx_usage_tenant_time ON usage_records(tenant_id, recorded_at);
 CREATE INDEX IF NOT EXISTS idx_usage_recorded ON usage_records(recorded_at);
 
+CREATE TABLE IF NOT EXISTS usage_rollups (
+    tenant_id TEXT NOT NULL, endpoint TEXT NOT NULL, method TEXT NOT NULL,
+    minute TEXT NOT NULL,
+    request_count INTEGER NOT NULL DEFAULT 0, error_count INTEGER NOT NULL DEFAULT 0,
+    tokens_used INTEGER NOT NULL DEFAULT 0, input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    duration_ms_total INTEGER NOT NULL DEFAULT 0, duration_ms_max INTEGER NOT NULL DEFAULT 0,
+    raw_rows INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, endpoint, method, minute)
+);
+CREATE INDEX IF NOT EXISTS idx_usage_rollups_tenant_minute ON usage_rollups(tenant_id, minute);
+
+CREATE TABLE IF NOT EXISTS usage_spill_applied (
+    spill_id TEXT PRIMARY KEY, samples INTEGER NOT NULL,
+    applied_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+
 CREATE TABLE IF NOT EXISTS audit_platform (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     tenant_id TEXT, user_id TEXT,
@@ -291,7 +325,7 @@ CREATE INDEX IF NOT EXISTS idx_tenant_llm_keys_provider ON tenant_llm_keys(tenan
 EXPECTED_TABLES = [
     "tenants", "users", "api_keys", "subscriptions",
     "usage_records", "audit_platform", "rate_limits",
-    "tenant_llm_keys",
+    "tenant_llm_keys", "usage_rollups", "usage_spill_applied",
 ]
 
 
@@ -457,8 +491,8 @@ def _split_sql_statements(sql):
 def _drop_all_tables(cursor, backend):
     """Drop all platform tables (for --force reinit)."""
     drop_order = [
-        "rate_limits", "audit_platform", "usage_records",
-        "subscriptions", "api_keys", "users", "tenants",
+        "rate_limits", "audit_platform", "usage_spill_applied", "usage_rollups",
+        "usage_records", "subscriptions", "api_keys", "users", "tenants",
     ]
     if backend == "postgresql":
         cursor.execute("DROP TRIGGER IF EXISTS trg_audit_no_update ON audit_platform")
@@ -758,28 +758,15 @@ def usage():
 
     conn = _get_platform_conn()
     try:
-        # Total API calls
-        row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM usage_records WHERE tenant_id = ?",
-            (tenant_id,),
-        ).fetchone()
-        usage_data["total_api_calls"] = row["cnt"] if row else 0
-
-        # Total tokens
-        row = conn.execute(
-            "SELECT COALESCE(SUM(tokens_used), 0) as total FROM usage_records WHERE tenant_id = ?",
-            (tenant_id,),
-        ).fetchone()
-        usage_data["total_tokens"] = row["total"] if row else 0
-
-        # Top endpoints
-        rows = conn.execute(
-            """SELECT endpoint, COUNT(*) as cnt
-               FROM usage_records WHERE tenant_id = ?
-               GROUP BY endpoint ORDER BY cnt DESC LIMIT 10""",
-            (tenant_id,),
-        ).fetchall()
-        usage_data["top_endpoints"] = [dict(r) for r in rows]
+        # Totals and top endpoints from the usage meter's minute rollups
+        from tools.saas.usage_meter import summarize_usage
+        summary = summarize_usage(conn, tenant_id, top=10)
+        usage_data["total_api_calls"] = summary["total_calls"]
+        usage_data["total_tokens"] = summary["total_tokens"]
+        usage_data["top_endpoints"] = [
+            {"endpoint": e["endpoint"], "cnt": e["call_count"]}
+            for e in summary["top_endpoints"]
+        ]
     except Exception:
         pass
     finally:
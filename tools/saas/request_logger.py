@@ -3,22 +3,19 @@
 
 CUI // SP-CTI
 
-Logs every API request to the usage_records and audit_platform tables
-in the platform database.  Registers as Flask before_request / after_request
-middleware so timing is automatic.
+Meters every API request into the platform database via the buffered
+usage meter (tools/saas/usage_meter.py): per-minute rollups plus raw
+usage_records samples, written in batches off the request path.  Registers
+as Flask before_request / after_request middleware so timing is automatic.
 
 Usage:
     from tools.saas.request_logger import register_request_logger
     register_request_logger(app)
 """
 
-import json
 import logging
-import os
-import sqlite3
 import sys
 import time
-from datetime import datetime, timezone
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -28,11 +25,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-logger = logging.getLogger("saas.request_logger")
+from tools.saas.usage_meter import PLATFORM_DB_PATH, get_usage_meter  # noqa: E402,F401
 
-PLATFORM_DB_PATH = Path(
-    os.environ.get("PLATFORM_DB_PATH", str(BASE_DIR / "data" / "platform.db"))
-)
+logger = logging.getLogger("saas.request_logger")
 
 
 # ---------------------------------------------------------------------------
@@ -48,7 +43,7 @@ def log_request(
     tokens_used=0,
     metadata=None,
 ):
-    """Log an API request to the usage_records table.
+    """Meter an API request (buffered; committed by the usage meter).
 
     Args:
         tenant_id:   Tenant UUID.
@@ -61,26 +56,10 @@ def log_request(
         metadata:    Optional dict of extra context.
     """
     try:
-        conn = sqlite3.connect(str(PLATFORM_DB_PATH))
-        conn.execute(
-            """INSERT INTO usage_records
-               (tenant_id, user_id, endpoint, method, tokens_used,
-                status_code, duration_ms, metadata, recorded_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                tenant_id,
-                user_id,
-                endpoint,
-                method,
-                tokens_used,
-                status_code,
-                duration_ms,
-                json.dumps(metadata) if metadata else "{}",
-                datetime.now(timezone.utc).isoformat(),
-            ),
+        get_usage_meter().record(
+            tenant_id, user_id, endpoint, method, status_code, duration_ms,
+            tokens_used=tokens_used, metadata=metadata,
         )
-        conn.commit()
-        conn.close()
         logger.debug(
             "Logged request: tenant=%s endpoint=%s status=%s duration=%dms",
             tenant_id, endpoint, status_code, duration_ms,
@@ -248,6 +248,9 @@ def update_user(user_id):
             values,
         )
         conn.commit()
+        if "role" in updates:
+            from tools.saas.auth.api_key_auth import invalidate_user
+            invalidate_user(user_id, tenant_id=g.tenant_id)
 
         row = conn.execute(
             """SELECT id, email, display_name, role, auth_method,
@@ -478,6 +481,9 @@ def revoke_api_key(key_id):
         conn.commit()
         conn.close()
 
+        from tools.saas.auth.api_key_auth import invalidate_api_key
+        invalidate_api_key(key_id=key_id)
+
         return jsonify({"result": {"id": key_id, "status": "revoked"}})
     except Exception as exc:
         logger.error("revoke_api_key error: %s", exc)
@@ -1101,29 +1107,11 @@ def get_usage():
             params_base.append(cutoff)
         where_clause = " AND ".join(where_parts)
 
-        # Summary statistics
-        summary_row = conn.execute(
-            """SELECT COUNT(*) as total_calls,
-                      COALESCE(SUM(tokens_used), 0) as total_tokens,
-                      COALESCE(AVG(duration_ms), 0) as avg_duration_ms
-               FROM usage_records
-               WHERE {}""".format(where_clause),
-            params_base,
-        ).fetchone()
-
-        # Top endpoints
-        top_endpoints = conn.execute(
-            """SELECT endpoint, COUNT(*) as call_count,
-                      COALESCE(AVG(duration_ms), 0) as avg_ms
-               FROM usage_records
-               WHERE {}
-               GROUP BY endpoint
-               ORDER BY call_count DESC
-               LIMIT 10""".format(where_clause),
-            params_base,
-        ).fetchall()
+        # Summary statistics and top endpoints (exact, from minute rollups)
+        from tools.saas.usage_meter import summarize_usage
+        summary = summarize_usage(conn, g.tenant_id, since=cutoff, top=10)
 
-        # Recent records
+        # Recent records (raw samples)
         recent = conn.execute(
             """SELECT endpoint, method, status_code, duration_ms,
                       tokens_used, recorded_at
@@ -1141,12 +1129,11 @@ def get_usage():
                 "tenant_id": g.tenant_id,
                 "period": period or "all",
                 "summary": {
-                    "total_api_calls": summary_row["total_calls"] if summary_row else 0,
-                    "total_tokens": summary_row["total_tokens"] if summary_row else 0,
-                    "avg_duration_ms": round(
-                        summary_row["avg_duration_ms"], 1) if summary_row else 0,
+                    "total_api_calls": summary["total_calls"],
+                    "total_tokens": summary["total_tokens"],
+                    "avg_duration_ms": round(summary["avg_duration_ms"], 1),
                 },
-                "top_endpoints": [dict(r) for r in top_endpoints],
+                "top_endpoints": summary["top_endpoints"],
                 "recent": [dict(r) for r in recent],
             }
         })
@@ -14,6 +14,11 @@ schema (prod).  Existing tools were written for a single-tenant icdev.db.
 This adapter transparently redirects their DB access so the same tool code
 works unmodified in a multi-tenant context.
 
+Tool calls go through a ToolDispatchTable: each tool's function and its
+db-path injection plan are resolved once, arguments are checked against the
+signature before the tool runs, and the tenant's DB path is cached with its
+config until the tenant changes (invalidate_tenant).
+
 Usage:
     from tools.saas.tenant_db_adapter import (
         get_tenant_db_path,
@@ -21,17 +26,25 @@ Usage:
         call_tool_with_tenant_db,
         verify_project_belongs_to_tenant,
     )
+
+CLI:
+    python tools/saas/tenant_db_adapter.py --benchmark --iterations 20000 --json
 """
 
+import argparse
+import importlib
 import inspect
+import json
 import logging
 import os
 import sqlite3
 import sys
+import tempfile
 import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -50,34 +63,46 @@ TENANTS_DATA_DIR = BASE_DIR / "data" / "tenants"
 # ---------------------------------------------------------------------------
 # In-memory slug cache with TTL
 # ---------------------------------------------------------------------------
-_slug_cache: Dict[str, Tuple[dict, float]] = {}
+# tenant_id -> (config, resolved SQLite path, cached_at)
+_slug_cache: Dict[str, Tuple[dict, str, float]] = {}
 _slug_cache_lock = threading.Lock()
 _CACHE_TTL_SECONDS = 300  # 5 minutes
 
 
-def _cache_get(tenant_id: str) -> Optional[dict]:
-    """Retrieve a tenant config from the in-memory TTL cache."""
+def _resolve_db_path(config: dict) -> str:
+    """Return the SQLite path for a tenant config (data/tenants/<db_name>)."""
+    db_name = config.get("db_name") or "{}.db".format(config["slug"])
+    return str(TENANTS_DATA_DIR / db_name)
+
+
+def _cache_entry(tenant_id: str) -> Optional[Tuple[dict, str, float]]:
     with _slug_cache_lock:
         entry = _slug_cache.get(tenant_id)
         if entry is None:
             return None
-        config, ts = entry
-        if time.time() - ts > _CACHE_TTL_SECONDS:
+        if time.time() - entry[2] > _CACHE_TTL_SECONDS:
             del _slug_cache[tenant_id]
             return None
-        return config
+        return entry
+
+
+def _cache_get(tenant_id: str) -> Optional[dict]:
+    """Retrieve a tenant config from the in-memory TTL cache."""
+    entry = _cache_entry(tenant_id)
+    return entry[0] if entry else None
 
 
 def _cache_set(tenant_id: str, config: dict) -> None:
-    """Store a tenant config in the in-memory TTL cache."""
+    """Store a tenant config (and its resolved DB path) in the TTL cache."""
     with _slug_cache_lock:
-        _slug_cache[tenant_id] = (config, time.time())
+        _slug_cache[tenant_id] = (config, _resolve_db_path(config), time.time())
 
 
-def _cache_invalidate(tenant_id: str) -> None:
-    """Remove a specific tenant from the cache."""
+def _cache_invalidate(tenant_id: str) -> Optional[str]:
+    """Remove a specific tenant from the cache; returns its cached DB path."""
     with _slug_cache_lock:
-        _slug_cache.pop(tenant_id, None)
+        entry = _slug_cache.pop(tenant_id, None)
+    return entry[1] if entry else None
 
 
 def _cache_clear() -> None:
@@ -86,6 +111,18 @@ def _cache_clear() -> None:
         _slug_cache.clear()
 
 
+def invalidate_tenant(tenant_id: str) -> None:
+    """Drop a tenant's cached config, DB path, and pooled connections.
+
+    Call after anything that changes the tenant's status or database
+    location (suspend, delete, re-provision).
+    """
+    db_path = _cache_invalidate(tenant_id)
+    if db_path:
+        from tools.compat.db_utils import close_pool
+        close_pool(db_path)
+
+
 # ---------------------------------------------------------------------------
 # SQLite vs PostgreSQL detection
 # ---------------------------------------------------------------------------
@@ -256,9 +293,179 @@ def get_tenant_db_connection(tenant_id: str) -> sqlite3.Connection:
     return conn
 
 
+def resolve_tenant_db_path(tenant_id: str) -> str:
+    """Return the tenant's SQLite path, cached alongside its config.
+
+    Unlike get_tenant_db_path() this does not touch the filesystem, so it
+    is cheap enough to call on every tool invocation.
+
+    Raises:
+        ValueError: If the tenant is not found or not active.
+    """
+    entry = _cache_entry(tenant_id)
+    if entry is not None:
+        return entry[1]
+    config = _get_tenant_config(tenant_id)
+    if not config:
+        raise ValueError("Tenant {} not found or not active".format(tenant_id))
+    return _resolve_db_path(config)
+
+
+@contextmanager
+def tenant_connection(tenant_id: str) -> Iterator[Any]:
+    """Borrow a connection to the tenant's database.
+
+    SQLite tenants share a per-tenant connection pool (dropped by
+    invalidate_tenant); PostgreSQL tenants get a fresh connection that is
+    closed on exit.  The caller commits its own work.
+    """
+    config = _get_tenant_config(tenant_id)
+    if not config:
+        raise ValueError("Tenant {} not found or not active".format(tenant_id))
+    if not _is_sqlite_host(config.get("db_host") or ""):
+        conn = get_tenant_db_connection(tenant_id)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    db_path = resolve_tenant_db_path(tenant_id)
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(
+            "Tenant database not found: {}. "
+            "Provision the tenant first.".format(db_path)
+        )
+    from tools.compat.db_utils import pooled_connection
+    with pooled_connection(db_path) as conn:
+        yield conn
+
+
 # ---------------------------------------------------------------------------
 # Tool adapter
 # ---------------------------------------------------------------------------
+# Parameter names that receive the tenant DB path, in priority order
+DB_PARAM_NAMES = ("db_path", "db", "database")
+
+
+class ToolArgumentError(ValueError):
+    """Tool arguments do not match the tool function's signature."""
+
+
+class ToolBinding:
+    """A tool function with its signature analysed once.
+
+    Holds the parameter that receives the tenant DB path (if any), the
+    accepted and required argument names, so each call only needs a dict
+    copy and a couple of set operations.
+    """
+
+    __slots__ = ("name", "func", "db_param", "accepted", "required", "var_kwargs")
+
+    def __init__(self, func: Callable[..., Any], name: Optional[str] = None):
+        self.func = func
+        self.name = name or getattr(func, "__name__", repr(func))
+        params = inspect.signature(func).parameters
+        keyword = {
+            p.name: p for p in params.values()
+            if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+        }
+        self.var_kwargs = any(p.kind == p.VAR_KEYWORD for p in params.values())
+        self.db_param = next((n for n in DB_PARAM_NAMES if n in keyword), None)
+        self.accepted = frozenset(keyword)
+        self.required = frozenset(
+            n for n, p in keyword.items()
+            if p.default is p.empty and n != self.db_param
+        )
+
+    def check_arguments(self, arguments: Dict[str, Any]) -> None:
+        """Raise ToolArgumentError if ``arguments`` cannot bind to the tool."""
+        missing = self.required.difference(arguments)
+        unexpected = () if self.var_kwargs else set(arguments).difference(self.accepted)
+        if missing or unexpected:
+            problems = []
+            if missing:
+                problems.append("missing {}".format(", ".join(sorted(missing))))
+            if unexpected:
+                problems.append("unexpected {}".format(", ".join(sorted(unexpected))))
+            raise ToolArgumentError("Invalid arguments for tool {}: {}".format(
+                self.name, "; ".join(problems)))
+
+    def call(self, tenant_id: str, arguments: Dict[str, Any]) -> Any:
+        """Validate, inject the tenant DB path, and run the tool once."""
+        self.check_arguments(arguments)
+        db_path = resolve_tenant_db_path(tenant_id)
+        kwargs = dict(arguments)
+        if self.db_param:
+            # Always overrides a caller-supplied path (tenant isolation)
+            kwargs[self.db_param] = db_path
+        return self.func(**kwargs)
+
+
+_bindings: Dict[Callable[..., Any], ToolBinding] = {}
+_bindings_lock = threading.Lock()
+
+
+def get_tool_binding(tool_func: Callable[..., Any]) -> ToolBinding:
+    """Return the cached ToolBinding for a function, building it once."""
+    binding = _bindings.get(tool_func)
+    if binding is None:
+        binding = ToolBinding(tool_func)
+        with _bindings_lock:
+            binding = _bindings.setdefault(tool_func, binding)
+    return binding
+
+
+class ToolDispatchTable:
+    """Compiled MCP tool table for the SaaS transports.
+
+    Each registry entry's module is imported and its function bound on
+    first use (or up front via warm()); later calls go straight to the
+    cached ToolBinding.  A failed import is not cached, so a fixed module
+    is picked up on the next call.
+    """
+
+    def __init__(self, registry: Iterable[dict]):
+        self._entries: Dict[str, dict] = {t["name"]: t for t in registry}
+        self._bindings: Dict[str, ToolBinding] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def binding(self, name: str) -> ToolBinding:
+        """Return the compiled binding for a tool name.
+
+        Raises:
+            ValueError: If the tool is not in the registry.
+        """
+        binding = self._bindings.get(name)
+        if binding is not None:
+            return binding
+        entry = self._entries.get(name)
+        if entry is None:
+            raise ValueError("Unknown tool: {}".format(name))
+        mod = importlib.import_module(entry["module"])
+        binding = ToolBinding(getattr(mod, entry["function"]), name=name)
+        with self._lock:
+            return self._bindings.setdefault(name, binding)
+
+    def call(self, name: str, arguments: Optional[Dict[str, Any]], tenant_id: str) -> Any:
+        """Run a tool for a tenant; arguments are validated before execution."""
+        return self.binding(name).call(tenant_id, arguments or {})
+
+    def warm(self) -> Dict[str, str]:
+        """Compile every tool now; returns {name: error} for those that failed."""
+        failed = {}
+        for name in self._entries:
+            try:
+                self.binding(name)
+            except Exception as exc:
+                failed[name] = str(exc)
+                logger.warning("Could not compile tool %s: %s", name, exc)
+        return failed
+
+
 def call_tool_with_tenant_db(
     tool_func: Callable[..., Any],
     tenant_id: str,
@@ -268,10 +475,10 @@ def call_tool_with_tenant_db(
 
     Most ICDEV tools accept a ``db_path`` parameter.  This adapter:
 
-    1. Resolves the tenant DB path from the platform database.
-    2. Inspects the tool function signature.
-    3. Injects ``db_path``, ``db``, or ``database`` into kwargs.
-    4. Calls the tool and returns its result.
+    1. Resolves the tenant DB path (cached with the tenant config).
+    2. Looks up the tool's cached signature analysis (ToolBinding).
+    3. Validates kwargs, then injects ``db_path``, ``db``, or ``database``.
+    4. Calls the tool once and returns its result.
 
     Args:
         tool_func: The ICDEV tool function to call.
@@ -283,30 +490,9 @@ def call_tool_with_tenant_db(
 
     Raises:
         ValueError: If the tenant is not found or not active.
+        ToolArgumentError: If kwargs do not match the tool's signature.
     """
-    config = _get_tenant_config(tenant_id)
-    if not config:
-        raise ValueError("Tenant {} not found or not active".format(tenant_id))
-
-    slug = config["slug"]
-    db_name = config.get("db_name")
-    if db_name:
-        db_path = str(TENANTS_DATA_DIR / db_name)
-    else:
-        db_path = str(TENANTS_DATA_DIR / "{}.db".format(slug))
-
-    # Inspect the function signature and inject DB path
-    sig = inspect.signature(tool_func)
-    params = sig.parameters
-
-    if "db_path" in params:
-        kwargs["db_path"] = db_path
-    elif "db" in params:
-        kwargs["db"] = db_path
-    elif "database" in params:
-        kwargs["database"] = db_path
-
-    return tool_func(**kwargs)
+    return get_tool_binding(tool_func).call(tenant_id, kwargs)
 
 
 # ---------------------------------------------------------------------------
@@ -319,11 +505,10 @@ def verify_project_belongs_to_tenant(tenant_id: str, project_id: str) -> bool:
     database belongs to the tenant.  This is an extra safety check.
     """
     try:
-        conn = get_tenant_db_connection(tenant_id)
-        row = conn.execute(
-            "SELECT id FROM projects WHERE id = ?", (project_id,)
-        ).fetchone()
-        conn.close()
+        with tenant_connection(tenant_id) as conn:
+            row = conn.execute(
+                "SELECT id FROM projects WHERE id = ?", (project_id,)
+            ).fetchone()
         return row is not None
     except Exception:
         return False
@@ -339,3 +524,117 @@ def get_tenant_tier(tenant_id: str) -> Optional[str]:
     """Return the subscription tier for a tenant."""
     config = _get_tenant_config(tenant_id)
     return config["tier"] if config else None
+
+
+# ---------------------------------------------------------------------------
+# Dispatch benchmark
+# ---------------------------------------------------------------------------
+def _benchmark_tool(project_id: str, detail: bool = False,
+                    db_path: Optional[str] = None) -> dict:
+    """No-op tool used to measure dispatch overhead."""
+    return {"project_id": project_id, "db_path": db_path}
+
+
+_BENCHMARK_REGISTRY = [{
+    "name": "benchmark_noop",
+    "module": "tools.saas.tenant_db_adapter",
+    "function": "_benchmark_tool",
+}]
+
+
+def _legacy_dispatch(entry: dict, tenant_id: str, arguments: dict) -> Any:
+    """The pre-table dispatch path: import, config lookup, signature per call."""
+    mod = importlib.import_module(entry["module"])
+    tool_func = getattr(mod, entry["function"])
+    config = _get_tenant_config(tenant_id)
+    if not config:
+        raise ValueError("Tenant {} not found or not active".format(tenant_id))
+    kwargs = dict(arguments)
+    params = inspect.signature(tool_func).parameters
+    for name in DB_PARAM_NAMES:
+        if name in params:
+            kwargs[name] = _resolve_db_path(config)
+            break
+    return tool_func(**kwargs)
+
+
+def run_benchmark(iterations: int = 20000) -> dict:
+    """Measure per-call dispatch overhead, legacy path vs ToolDispatchTable.
+
+    Uses a throwaway platform DB with one tenant and a no-op tool, so the
+    numbers are pure adapter overhead.
+    """
+    global PLATFORM_DB_PATH, TENANTS_DATA_DIR
+    saved = (PLATFORM_DB_PATH, TENANTS_DATA_DIR)
+    arguments = {"project_id": "proj-1", "detail": True}
+    with tempfile.TemporaryDirectory() as tmp:
+        PLATFORM_DB_PATH = Path(tmp) / "platform.db"
+        TENANTS_DATA_DIR = Path(tmp) / "tenants"
+        conn = sqlite3.connect(str(PLATFORM_DB_PATH))
+        conn.execute(
+            """CREATE TABLE tenants (id TEXT PRIMARY KEY, slug TEXT, db_host TEXT,
+               db_name TEXT, db_port INTEGER, status TEXT, impact_level TEXT,
+               tier TEXT)""")
+        conn.execute(
+            "INSERT INTO tenants VALUES ('bench-tenant', 'bench', 'localhost-sqlite', "
+            "'bench.db', NULL, 'active', 'IL4', 'professional')")
+        conn.commit()
+        conn.close()
+        _cache_clear()
+        try:
+            table = ToolDispatchTable(_BENCHMARK_REGISTRY)
+            entry = _BENCHMARK_REGISTRY[0]
+            results = {}
+            for label, fn in (
+                ("legacy", lambda: _legacy_dispatch(entry, "bench-tenant", arguments)),
+                ("compiled", lambda: table.call("benchmark_noop", arguments, "bench-tenant")),
+            ):
+                fn()  # Warm caches and imports
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    fn()
+                elapsed = time.perf_counter() - start
+                results[label] = {
+                    "total_seconds": round(elapsed, 4),
+                    "per_call_us": round(elapsed / iterations * 1e6, 3),
+                }
+        finally:
+            PLATFORM_DB_PATH, TENANTS_DATA_DIR = saved
+            _cache_clear()
+
+    compiled_us = results["compiled"]["per_call_us"]
+    return {
+        "iterations": iterations,
+        "legacy": results["legacy"],
+        "compiled": results["compiled"],
+        "speedup": round(results["legacy"]["per_call_us"] / compiled_us, 2)
+        if compiled_us else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="ICDEV SaaS tenant database adapter")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Measure per-call tool dispatch overhead")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        parser.print_help()
+        return 1
+
+    result = run_benchmark(max(1, args.iterations))
+    if args.json:
+        print(json.dumps({"classification": "CUI // SP-CTI", **result}, indent=2))
+    else:
+        print("Tool dispatch overhead ({} calls)".format(result["iterations"]))
+        for label in ("legacy", "compiled"):
+            print("  {:<9} {:>9.3f} us/call".format(label, result[label]["per_call_us"]))
+        print("  speedup   {}x".format(result["speedup"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
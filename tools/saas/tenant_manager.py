@@ -138,6 +138,29 @@ def _audit_platform(conn, tenant_id, actor, action, resource_type,
     )
 
 
+def _invalidate_auth_cache(tenant_id=None, user_id=None, key_id=None):
+    """Evict cached API-key principals after a revocation or suspension."""
+    try:
+        from tools.saas.auth import api_key_auth
+    except ImportError:
+        return
+    if key_id:
+        api_key_auth.invalidate_api_key(key_id=key_id)
+    if user_id:
+        api_key_auth.invalidate_user(user_id, tenant_id=tenant_id)
+    elif tenant_id:
+        api_key_auth.invalidate_tenant(tenant_id)
+
+
+def _invalidate_tenant_db(tenant_id):
+    """Drop the adapter's cached DB path and pooled connections for a tenant."""
+    try:
+        from tools.saas import tenant_db_adapter
+    except ImportError:
+        return
+    tenant_db_adapter.invalidate_tenant(tenant_id)
+
+
 def _tier_limits(tier_key):
     """Look up TIER_LIMITS by string key, handling enum-keyed dict."""
     for enum_key, limits in TIER_LIMITS.items():
@@ -329,6 +352,7 @@ def provision_tenant(tenant_id):
                 "impact_level": il})
 
         conn.commit()
+        _invalidate_tenant_db(tenant_id)
         return {
             "id": tenant_id, "slug": slug,
             "status": TenantStatus.ACTIVE.value,
@@ -548,6 +572,8 @@ def suspend_tenant(tenant_id):
             tenant_id, details={"previous_status": row[1]})
 
         conn.commit()
+        _invalidate_auth_cache(tenant_id=tenant_id)
+        _invalidate_tenant_db(tenant_id)
         return {
             "id": tenant_id,
             "status": TenantStatus.SUSPENDED.value,
@@ -592,6 +618,8 @@ def delete_tenant(tenant_id):
             details={"previous_status": row[1], "soft_delete": True})
 
         conn.commit()
+        _invalidate_auth_cache(tenant_id=tenant_id)
+        _invalidate_tenant_db(tenant_id)
         return {
             "id": tenant_id,
             "status": TenantStatus.DELETED.value,
@@ -674,6 +702,7 @@ def rotate_api_key(key_id, user_id):
             details={"old_key_id": key_id, "new_key_prefix": key_prefix})
 
         conn.commit()
+        _invalidate_auth_cache(key_id=key_id)
         return {
             "id": new_key_id, "key": full_key, "prefix": key_prefix,
             "revoked_key_id": key_id,
@@ -840,6 +869,7 @@ def remove_user(tenant_id, user_id):
             details={"email": row[1], "role": row[2]})
 
         conn.commit()
+        _invalidate_auth_cache(tenant_id=tenant_id, user_id=user_id)
         return {
             "id": user_id, "email": row[1],
             "status": "deactivated", "deactivated_at": now}
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""ICDEV SaaS -- Buffered Usage Metering.
+
+CUI // SP-CTI
+
+Replaces the per-request INSERT into usage_records with an in-process
+buffer that is flushed in one transaction per interval:
+
+- usage_rollups holds exact per-tenant/endpoint/method/minute counters
+  (requests, errors, tokens, latency). Billing, usage reports and Bedrock
+  token budgets read these.
+- usage_records keeps raw samples. Once a tenant exceeds
+  ICDEV_USAGE_RAW_THRESHOLD requests in a minute, only every Nth
+  successful request is kept raw (metadata.sample_weight = N); errors are
+  always kept.
+- Every sample is appended to a spill file before it is acknowledged. A
+  flush commits the batch together with the spill file's ID in
+  usage_spill_applied, then deletes the file, so spill files left by a
+  crashed worker are replayed exactly once on the next flush.
+
+Environment:
+    ICDEV_USAGE_FLUSH_INTERVAL   seconds between flushes (default 1.0)
+    ICDEV_USAGE_BUFFER_SIZE      samples that force an inline flush (default 5000)
+    ICDEV_USAGE_RAW_THRESHOLD    per-tenant requests/minute kept raw (default 600, 0 = all)
+    ICDEV_USAGE_RAW_SAMPLE_EVERY keep 1 in N raw rows above the threshold (default 10)
+    ICDEV_USAGE_SPILL_DIR        spill directory (default data/usage_spill)
+
+Usage:
+    from tools.saas.usage_meter import get_usage_meter
+    get_usage_meter().record(tenant_id, user_id, "/api/v1/projects", "GET", 200, 12)
+
+    python tools/saas/usage_meter.py --flush --json
+    python tools/saas/usage_meter.py --backfill --json
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# ---------------------------------------------------------------------------
+# Path setup
+# ---------------------------------------------------------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+logger = logging.getLogger("saas.usage_meter")
+
+PLATFORM_DB_PATH = Path(
+    os.environ.get("PLATFORM_DB_PATH", str(BASE_DIR / "data" / "platform.db"))
+)
+DEFAULT_SPILL_DIR = BASE_DIR / "data" / "usage_spill"
+
+_ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_rollups (
+    tenant_id TEXT NOT NULL, endpoint TEXT NOT NULL, method TEXT NOT NULL,
+    minute TEXT NOT NULL,
+    request_count INTEGER NOT NULL DEFAULT 0, error_count INTEGER NOT NULL DEFAULT 0,
+    tokens_used INTEGER NOT NULL DEFAULT 0, input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    duration_ms_total INTEGER NOT NULL DEFAULT 0, duration_ms_max INTEGER NOT NULL DEFAULT 0,
+    raw_rows INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, endpoint, method, minute)
+);
+CREATE INDEX IF NOT EXISTS idx_usage_rollups_tenant_minute ON usage_rollups(tenant_id, minute);
+CREATE TABLE IF NOT EXISTS usage_spill_applied (
+    spill_id TEXT PRIMARY KEY, samples INTEGER NOT NULL,
+    applied_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+"""
+
+_RAW_INSERT_SQL = """INSERT INTO usage_records
+    (tenant_id, user_id, endpoint, method, tokens_used,
+     status_code, duration_ms, metadata, recorded_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_ROLLUP_UPSERT_SQL = """INSERT INTO usage_rollups
+    (tenant_id, endpoint, method, minute, request_count, error_count,
+     tokens_used, input_tokens, output_tokens, duration_ms_total,
+     duration_ms_max, raw_rows)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tenant_id, endpoint, method, minute) DO UPDATE SET
+        request_count = request_count + excluded.request_count,
+        error_count = error_count + excluded.error_count,
+        tokens_used = tokens_used + excluded.tokens_used,
+        input_tokens = input_tokens + excluded.input_tokens,
+        output_tokens = output_tokens + excluded.output_tokens,
+        duration_ms_total = duration_ms_total + excluded.duration_ms_total,
+        duration_ms_max = MAX(duration_ms_max, excluded.duration_ms_max),
+        raw_rows = raw_rows + excluded.raw_rows"""
+
+# usage_spill_applied only guards the commit-then-delete window
+_APPLIED_RETENTION = timedelta(days=2)
+# usage_spill_applied marker: history folded into rollups (never pruned)
+_BACKFILL_MARKER = "backfill"
+
+
+def _env_number(name, default, cast=float):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _minute_of(recorded_at: str) -> str:
+    """Rollup bucket for an ISO timestamp: 'YYYY-MM-DDTHH:MM:00Z'."""
+    return recorded_at[:16] + ":00Z"
+
+
+def _pid_alive_windows(pid: int) -> bool:
+    """OpenProcess/GetExitCodeProcess probe (os.kill would terminate the process)."""
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ERROR_ACCESS_DENIED = 5
+    STILL_ACTIVE = 259
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied means the process exists but belongs to someone else
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether another process still owns a spill file."""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        try:
+            return _pid_alive_windows(pid)
+        except (OSError, AttributeError):
+            return True  # Probe unavailable: never steal a live writer's file
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class UsageMeter:
+    """Thread-safe buffered writer for usage samples and minute rollups."""
+
+    def __init__(self, db_path=None, spill_dir=None, flush_interval=None,
+                 buffer_size=None, raw_threshold=None, raw_sample_every=None):
+        self.db_path = Path(db_path or PLATFORM_DB_PATH)
+        self.spill_dir = Path(spill_dir or os.environ.get(
+            "ICDEV_USAGE_SPILL_DIR", str(DEFAULT_SPILL_DIR)))
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else _env_number("ICDEV_USAGE_FLUSH_INTERVAL", 1.0))
+        self.buffer_size = max(1, buffer_size if buffer_size is not None
+                               else _env_number("ICDEV_USAGE_BUFFER_SIZE", 5000, int))
+        self.raw_threshold = (raw_threshold if raw_threshold is not None
+                              else _env_number("ICDEV_USAGE_RAW_THRESHOLD", 600, int))
+        self.raw_sample_every = max(1, raw_sample_every if raw_sample_every is not None
+                                    else _env_number("ICDEV_USAGE_RAW_SAMPLE_EVERY", 10, int))
+
+        self._lock = threading.Lock()          # buffer, counters, spill handle
+        self._flush_lock = threading.Lock()    # one flush at a time
+        self._buffer: List[tuple] = []
+        self._tenant_minute: Dict[str, list] = {}  # tenant -> [minute, count]
+        self._spill = None
+        self._spill_path: Optional[Path] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._schema_ready = False
+        self._last_prune = 0.0
+        self.metrics = {"recorded": 0, "raw": 0, "flushes": 0, "flushed": 0,
+                        "replayed": 0, "errors": 0, "inline_flushes": 0}
+
+    # -- recording ---------------------------------------------------------
+    def record(self, tenant_id, user_id, endpoint, method, status_code,
+               duration_ms, tokens_used=0, input_tokens=0, output_tokens=0,
+               metadata=None) -> None:
+        """Buffer one usage sample (durable in the spill file on return)."""
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        minute = _minute_of(recorded_at)
+        inline_flush = False
+        with self._lock:
+            weight = self._raw_weight(tenant_id, minute, status_code)
+            # Field order is also the spill-file line layout (see _commit)
+            sample = (tenant_id, user_id, endpoint, method, status_code,
+                      int(duration_ms or 0), int(tokens_used or 0),
+                      int(input_tokens or 0), int(output_tokens or 0),
+                      metadata or None, recorded_at, minute, weight)
+            self._spill_write(sample)
+            self._buffer.append(sample)
+            self.metrics["recorded"] += 1
+            inline_flush = len(self._buffer) >= self.buffer_size
+            if inline_flush:
+                self.metrics["inline_flushes"] += 1
+            else:
+                self._ensure_thread()
+        if inline_flush:
+            # Backpressure: the caller pays for one batched commit
+            self.flush()
+
+    def _raw_weight(self, tenant_id, minute, status_code) -> int:
+        """0 = rollup only; N = keep raw, representing N requests. Holds lock."""
+        counter = self._tenant_minute.get(tenant_id)
+        if counter is None or counter[0] != minute:
+            counter = self._tenant_minute[tenant_id] = [minute, 0]
+        counter[1] += 1
+        if not self.raw_threshold or counter[1] <= self.raw_threshold:
+            return 1
+        if status_code and int(status_code) >= 400:
+            return 1
+        over = counter[1] - self.raw_threshold
+        return self.raw_sample_every if over % self.raw_sample_every == 0 else 0
+
+    def _spill_write(self, sample) -> None:
+        """Append a sample to the active spill file. Holds lock."""
+        try:
+            if self._spill is None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                self._spill_path = self.spill_dir / "usage-{}-{}.jsonl".format(
+                    os.getpid(), uuid.uuid4().hex[:12])
+                self._spill = open(self._spill_path, "a", encoding="utf-8")
+            self._spill.write(json.dumps(sample, separators=(",", ":"), default=str) + "\n")
+            self._spill.flush()  # In the OS page cache: survives a worker crash
+        except OSError as exc:
+            logger.warning("Usage spill write failed (%s); sample held in memory only", exc)
+
+    def _ensure_thread(self) -> None:
+        if self.flush_interval and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="saas-usage-meter",
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as exc:  # Keep the flusher alive
+                logger.warning("Usage flush failed: %s", exc)
+
+    # -- flushing ----------------------------------------------------------
+    def flush(self) -> int:
+        """Commit buffered samples and replay orphaned spill files.
+
+        Returns:
+            Number of samples committed (including replayed ones).
+        """
+        with self._flush_lock:
+            committed = self._replay_orphans()
+            with self._lock:
+                samples, self._buffer = self._buffer, []
+                spill, spill_path = self._spill, self._spill_path
+                self._spill = self._spill_path = None
+            if spill is not None:
+                spill.close()
+            if not samples:
+                if spill_path is not None:
+                    spill_path.unlink(missing_ok=True)
+                return committed
+            spill_id = spill_path.stem if spill_path else "mem-" + uuid.uuid4().hex
+            try:
+                self._commit(samples, spill_id)
+            except Exception as exc:
+                self.metrics["errors"] += 1
+                if spill_path is None:
+                    # No spill file to replay from: keep the samples buffered
+                    with self._lock:
+                        self._buffer[:0] = samples
+                logger.warning("Usage flush of %d samples failed (%s); will retry",
+                               len(samples), exc)
+                return committed
+            if spill_path is not None:
+                spill_path.unlink(missing_ok=True)
+            self.metrics["flushes"] += 1
+            self.metrics["flushed"] += len(samples)
+            return committed + len(samples)
+
+    def _replay_orphans(self) -> int:
+        """Commit spill files not owned by a live writer, then delete them."""
+        if not self.spill_dir.is_dir():
+            return 0
+        with self._lock:
+            active = self._spill_path
+        replayed = 0
+        for path in sorted(self.spill_dir.glob("usage-*.jsonl")):
+            if path == active:
+                continue
+            try:
+                pid = int(path.stem.split("-")[1])
+            except (IndexError, ValueError):
+                continue
+            if pid != os.getpid() and _pid_alive(pid):
+                continue
+            samples = []
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        samples.append(tuple(json.loads(line)))
+                    except ValueError:
+                        continue  # Torn final line from a crash
+            try:
+                if samples:
+                    self._commit(samples, path.stem)
+            except Exception as exc:
+                logger.warning("Replay of %s failed (%s); will retry", path.name, exc)
+                continue
+            path.unlink(missing_ok=True)
+            replayed += len(samples)
+            self.metrics["replayed"] += len(samples)
+        if replayed:
+            logger.info("Replayed %d usage samples from spill files", replayed)
+        return replayed
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            backfill_rollups(self.db_path)  # Creates the tables; one-time history fold
+            self._schema_ready = True
+        return sqlite3.connect(str(self.db_path), timeout=30)
+
+    def _commit(self, samples, spill_id: str) -> None:
+        """Write raw rows and rollup deltas for a batch in one transaction."""
+        raw_rows = []
+        rollups: Dict[tuple, list] = {}
+        for s in samples:
+            (tenant_id, user_id, endpoint, method, status_code, duration_ms,
+             tokens_used, input_tokens, output_tokens, metadata, recorded_at,
+             minute, weight) = s
+            key = (tenant_id, endpoint, method, minute)
+            agg = rollups.get(key)
+            if agg is None:
+                agg = rollups[key] = [0, 0, 0, 0, 0, 0, 0, 0]
+            agg[0] += 1
+            agg[1] += 1 if status_code and int(status_code) >= 400 else 0
+            agg[2] += tokens_used
+            agg[3] += input_tokens
+            agg[4] += output_tokens
+            agg[5] += duration_ms
+            agg[6] = max(agg[6], duration_ms)
+            if weight:
+                agg[7] += 1
+                meta = dict(metadata or {})
+                if weight > 1:
+                    meta["sample_weight"] = weight
+                raw_rows.append((tenant_id, user_id, endpoint, method, tokens_used,
+                                 status_code, duration_ms, json.dumps(meta), recorded_at))
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM usage_spill_applied WHERE spill_id = ?",
+                            (spill_id,)).fetchone():
+                conn.rollback()
+                return  # Committed before a crash, file not yet deleted
+            conn.executemany(_RAW_INSERT_SQL, raw_rows)
+            conn.executemany(_ROLLUP_UPSERT_SQL, [k + tuple(v) for k, v in rollups.items()])
+            conn.execute("INSERT INTO usage_spill_applied (spill_id, samples) VALUES (?, ?)",
+                         (spill_id, len(samples)))
+            if time.monotonic() - self._last_prune > 600:
+                cutoff = (datetime.now(timezone.utc) - _APPLIED_RETENTION).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ")
+                conn.execute("DELETE FROM usage_spill_applied WHERE applied_at < ? "
+                             "AND spill_id != ?", (cutoff, _BACKFILL_MARKER))
+                self._last_prune = time.monotonic()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self.metrics["raw"] += len(raw_rows)
+
+    # -- reads -------------------------------------------------------------
+    def pending_usage(self, tenant_id, endpoint=None, since_prefix="") -> dict:
+        """Totals of samples still buffered in this process (not yet in rollups)."""
+        totals = {"request_count": 0, "tokens_used": 0, "input_tokens": 0, "output_tokens": 0}
+        with self._lock:
+            for s in self._buffer:
+                if s[0] != tenant_id or (endpoint and s[2] != endpoint):
+                    continue
+                if since_prefix and not s[10].startswith(since_prefix):
+                    continue
+                totals["request_count"] += 1
+                totals["tokens_used"] += s[6]
+                totals["input_tokens"] += s[7]
+                totals["output_tokens"] += s[8]
+        return totals
+
+    def close(self) -> None:
+        """Stop the flusher thread and flush what is buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+def backfill_rollups(db_path=None) -> dict:
+    """Aggregate pre-rollup usage_records history into usage_rollups.
+
+    Runs once per database (guarded by a usage_spill_applied marker) and
+    only folds rows older than the earliest existing rollup minute, so
+    nothing is counted twice.
+    """
+    conn = sqlite3.connect(str(db_path or PLATFORM_DB_PATH), timeout=30)
+    try:
+        conn.executescript(_ROLLUP_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM usage_spill_applied WHERE spill_id = ?",
+                        (_BACKFILL_MARKER,)).fetchone():
+            conn.rollback()
+            return {"rollup_rows": 0, "skipped": True}
+        has_raw = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usage_records'"
+        ).fetchone()
+        if not has_raw:
+            conn.rollback()
+            return {"rollup_rows": 0, "skipped": True}
+        first = conn.execute("SELECT MIN(minute) FROM usage_rollups").fetchone()[0]
+        where, params = "", []
+        if first:
+            where, params = "WHERE substr(recorded_at, 1, 16) || ':00Z' < ?", [first]
+        cur = conn.execute(
+            """INSERT INTO usage_rollups
+               (tenant_id, endpoint, method, minute, request_count, error_count,
+                tokens_used, input_tokens, output_tokens, duration_ms_total,
+                duration_ms_max, raw_rows)
+               SELECT tenant_id, endpoint, method, substr(recorded_at, 1, 16) || ':00Z',
+                      COUNT(*), SUM(CASE WHEN status_code >= 400 THEN 1 ELSE 0 END),
+                      COALESCE(SUM(tokens_used), 0),
+                      COALESCE(SUM(json_extract(metadata, '$.input_tokens')), 0),
+                      COALESCE(SUM(json_extract(metadata, '$.output_tokens')), 0),
+                      COALESCE(SUM(duration_ms), 0), COALESCE(MAX(duration_ms), 0), COUNT(*)
+               FROM usage_records {}
+               GROUP BY 1, 2, 3, 4""".format(where),
+            params,
+        )
+        conn.execute("INSERT INTO usage_spill_applied (spill_id, samples) VALUES (?, ?)",
+                     (_BACKFILL_MARKER, max(cur.rowcount, 0)))
+        conn.commit()
+        return {"rollup_rows": cur.rowcount, "before": first, "skipped": False}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def summarize_usage(conn, tenant_id, since=None, top=10) -> dict:
+    """Usage totals and top endpoints for a tenant, from the minute rollups.
+
+    Falls back to scanning usage_records on databases that predate the
+    rollup table.
+
+    Args:
+        conn:      sqlite3 connection to platform.db.
+        tenant_id: Tenant to summarize.
+        since:     Optional ISO-8601 UTC cutoff ('YYYY-MM-DDTHH:MM:SSZ').
+        top:       Number of endpoints to return.
+
+    Returns:
+        dict with total_calls, total_tokens, avg_duration_ms, top_endpoints.
+    """
+    has_rollups = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usage_rollups'"
+    ).fetchone()
+    if has_rollups:
+        table, calls, tokens, duration = (
+            "usage_rollups", "SUM(request_count)", "SUM(tokens_used)", "SUM(duration_ms_total)")
+        where, params = "tenant_id = ?", [tenant_id]
+        if since:
+            where += " AND minute >= ?"
+            params.append(_minute_of(since))
+    else:
+        table, calls, tokens, duration = (
+            "usage_records", "COUNT(*)", "SUM(tokens_used)", "SUM(duration_ms)")
+        where, params = "tenant_id = ?", [tenant_id]
+        if since:
+            where += " AND recorded_at >= ?"
+            params.append(since)
+
+    row = conn.execute(
+        """SELECT COALESCE({calls}, 0), COALESCE({tokens}, 0),
+                  COALESCE({duration} * 1.0 / NULLIF({calls}, 0), 0)
+           FROM {table} WHERE {where}""".format(
+            calls=calls, tokens=tokens, duration=duration, table=table, where=where),
+        params,
+    ).fetchone()
+    endpoints = conn.execute(
+        """SELECT endpoint, {calls} as call_count,
+                  COALESCE({duration} * 1.0 / NULLIF({calls}, 0), 0) as avg_ms
+           FROM {table} WHERE {where}
+           GROUP BY endpoint
+           ORDER BY call_count DESC
+           LIMIT ?""".format(calls=calls, duration=duration, table=table, where=where),
+        params + [top],
+    ).fetchall()
+    return {
+        "total_calls": row[0],
+        "total_tokens": row[1],
+        "avg_duration_ms": row[2],
+        "top_endpoints": [
+            {"endpoint": r[0], "call_count": r[1], "avg_ms": r[2]} for r in endpoints
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide meter
+# ---------------------------------------------------------------------------
+_meter: Optional[UsageMeter] = None
+_meter_lock = threading.Lock()
+
+
+def get_usage_meter() -> UsageMeter:
+    """Return the process-wide meter, creating it on first use."""
+    global _meter
+    if _meter is None:
+        with _meter_lock:
+            if _meter is None:
+                _meter = UsageMeter()
+    return _meter
+
+
+def flush_usage() -> int:
+    """Flush the process-wide meter (no-op if never used)."""
+    return _meter.flush() if _meter is not None else 0
+
+
+atexit.register(flush_usage)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CUI // SP-CTI -- ICDEV usage metering")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--flush", action="store_true",
+                        help="Replay orphaned spill files into platform.db")
+    action.add_argument("--backfill", action="store_true",
+                        help="Fold pre-rollup usage_records history into usage_rollups")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="JSON output")
+    args = parser.parse_args()
+
+    if args.flush:
+        result = {"committed": get_usage_meter().flush()}
+    else:
+        result = backfill_rollups()
+    result["classification"] = "CUI // SP-CTI"
+    if args.as_json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print("  {}: {}".format(key, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Precompiled multi-pattern scanning engine for prompt injection detection.
+
+Backs PromptInjectionDetector and the LLM router hot path (D217):
+
+  - Patterns are compiled once per engine; the detector shares one engine
+    per pattern set, so constructing a detector no longer recompiles.
+  - Literal-anchor prefilter: for each pattern the engine extracts a set of
+    literal strings, one of which every match must contain (e.g. ``inst``
+    for ``\\[/?INST\\]``).  On ASCII text a pattern whose anchors are all
+    absent is skipped without running its regex.  Patterns with no anchor
+    (character-class payloads such as Base64 or homoglyphs) always run.
+  - Results are cached by SHA-256 of the scanned text.  For a message list
+    the key is the hash of each joined prefix, so when a multi-turn
+    conversation grows the engine resumes from the longest cached prefix:
+    matches ending at least ``seam_chars`` before the end of that prefix
+    are kept, and each pattern's ``finditer`` restarts on the joined text
+    from there.  Findings (match text, position, context) are the same as
+    a scan of the joined text for any match shorter than ``seam_chars``,
+    however many messages it spans.
+  - Scan latency is recorded on the engine and, when the SaaS metrics
+    collector is importable, exported as the
+    ``icdev_prompt_injection_scan_seconds`` histogram.
+
+Uses only the Python standard library (air-gapped environment).
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from re import _constants as _sre_constants
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parse
+
+# Characters of context kept either side of a match (matches the detector)
+CONTEXT_CHARS = 30
+
+# Chars before the end of a cached prefix rescanned when a conversation grows
+SEAM_CHARS = 512
+
+DEFAULT_CACHE_SIZE = 4096
+
+_LITERAL = _sre_constants.LITERAL
+_ZERO_WIDTH = {_sre_constants.AT, _sre_constants.ASSERT, _sre_constants.ASSERT_NOT}
+_REPEATS = {
+    _sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT,
+    getattr(_sre_constants, "POSSESSIVE_REPEAT", _sre_constants.MAX_REPEAT),
+}
+_ATOMIC_GROUP = getattr(_sre_constants, "ATOMIC_GROUP", None)
+
+
+# ---------------------------------------------------------------------------
+# Literal-anchor extraction
+# ---------------------------------------------------------------------------
+def _better(candidate: FrozenSet[str], best: Optional[FrozenSet[str]]) -> bool:
+    """Prefer anchor sets whose shortest literal is longest, then fewer literals."""
+    if best is None:
+        return True
+    shortest = min(len(s) for s in candidate)
+    best_shortest = min(len(s) for s in best)
+    if shortest != best_shortest:
+        return shortest > best_shortest
+    return len(candidate) < len(best)
+
+
+def _required_literals(items) -> Optional[FrozenSet[str]]:
+    """Literals of which every match of the parsed *items* contains one.
+
+    Returns None when no such guarantee can be derived.
+    """
+    best: Optional[FrozenSet[str]] = None
+    run: List[str] = []
+
+    def flush():
+        nonlocal best
+        if run:
+            candidate = frozenset(["".join(run).lower()])
+            if _better(candidate, best):
+                best = candidate
+            run.clear()
+
+    for op, av in items:
+        if op is _LITERAL:
+            run.append(chr(av))
+            continue
+        if op in _ZERO_WIDTH:
+            continue  # consumes nothing, so adjacent literals stay adjacent
+        flush()
+        sub = None
+        if op is _sre_constants.SUBPATTERN:
+            sub = _required_literals(av[-1])
+        elif op is _ATOMIC_GROUP:
+            sub = _required_literals(av)
+        elif op is _sre_constants.BRANCH:
+            alternatives = [_required_literals(alt) for alt in av[1]]
+            if all(alt is not None for alt in alternatives):
+                sub = frozenset().union(*alternatives)
+        elif op in _REPEATS:
+            low, _high, item = av
+            if low >= 1:
+                sub = _required_literals(item)
+        if sub is not None and _better(sub, best):
+            best = sub
+    flush()
+    return best
+
+
+def extract_anchors(pattern: str) -> Optional[FrozenSet[str]]:
+    """Lower-cased literal anchors for *pattern*, or None if it has none."""
+    try:
+        return _required_literals(_sre_parse.parse(pattern))
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+class CompiledPattern(NamedTuple):
+    """One injection pattern compiled for the engine."""
+
+    name: str
+    regex: "re.Pattern"
+    category: str
+    severity: str
+    confidence: float
+    description: str
+    anchors: Optional[FrozenSet[str]]
+
+
+# (pattern index, start, end, matched text[:100]) relative to a segment
+_RawMatch = Tuple[int, int, int, str]
+
+
+def _observe_latency(seconds: float) -> None:
+    """Export scan latency to the SaaS metrics collector when available."""
+    try:
+        from tools.saas.metrics import get_collector
+        get_collector().prompt_injection_scan_duration.observe(seconds)
+    except Exception:
+        pass
+
+
+class InjectionScanEngine:
+    """Compiled, cached multi-pattern scanner over plain text or message lists."""
+
+    def __init__(self, patterns: Sequence[Dict], cache_size: int = DEFAULT_CACHE_SIZE,
+                 seam_chars: int = SEAM_CHARS):
+        self.patterns: List[CompiledPattern] = [
+            CompiledPattern(
+                name=p["name"],
+                regex=re.compile(p["pattern"]),
+                category=p["category"],
+                severity=p["severity"],
+                confidence=p["confidence"],
+                description=p["description"],
+                anchors=extract_anchors(p["pattern"]),
+            )
+            for p in patterns
+        ]
+        self._unanchored = [i for i, p in enumerate(self.patterns) if p.anchors is None]
+        self._anchor_owners: Dict[str, List[int]] = {}
+        for i, p in enumerate(self.patterns):
+            for anchor in p.anchors or ():
+                self._anchor_owners.setdefault(anchor, []).append(i)
+        self._cache_size = cache_size
+        self._seam_chars = seam_chars
+        self._cache: "OrderedDict[bytes, Tuple[_RawMatch, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "scans": 0,
+            "segments_scanned": 0,
+            "cache_hits": 0,
+            "patterns_skipped": 0,
+            "total_ms": 0.0,
+            "last_ms": 0.0,
+        }
+
+    # -- matching ------------------------------------------------------------
+    def _candidate_patterns(self, text: str) -> List[int]:
+        """Indexes of patterns that can match *text* (all of them off ASCII)."""
+        if not text.isascii():
+            return list(range(len(self.patterns)))
+        lowered = text.lower()
+        active = set(self._unanchored)
+        for anchor, owners in self._anchor_owners.items():
+            if anchor in lowered:
+                active.update(owners)
+        return sorted(active)
+
+    def _prefix_keys(self, messages: Sequence[str], separator: str) -> List[Tuple[bytes, int]]:
+        """(SHA-256 of the joined prefix, its length) for each message prefix."""
+        digest = hashlib.sha256()
+        sep = separator.encode("utf-8", "surrogatepass")
+        keys: List[Tuple[bytes, int]] = []
+        length = 0
+        for i, message in enumerate(messages):
+            if i:
+                digest.update(sep)
+                length += len(separator)
+            digest.update(message.encode("utf-8", "surrogatepass"))
+            length += len(message)
+            keys.append((digest.copy().digest(), length))
+        return keys or [(digest.digest(), 0)]
+
+    def _scan(self, text: str, base: Tuple[_RawMatch, ...] = (),
+              base_end: int = 0) -> Tuple[_RawMatch, ...]:
+        """``finditer`` of every pattern over *text*, resuming from *base*.
+
+        *base* holds the matches of ``text[:base_end]``.  Per pattern, the
+        matches ending by ``base_end - seam_chars`` are kept and ``finditer``
+        restarts at that point, or earlier at the first dropped match, so a
+        match near the old end can grow into the new text.
+        """
+        rescan = max(0, base_end - self._seam_chars)
+        kept: List[_RawMatch] = []
+        resume: Dict[int, int] = {}
+        for raw in sorted(base, key=lambda m: (m[0], m[1])):
+            index, start, end, _matched = raw
+            if index in resume:
+                continue
+            if end < rescan or (end == rescan and start < end):
+                kept.append(raw)
+            else:
+                resume[index] = min(rescan, start)
+        tail_start = min(resume.values(), default=rescan)
+        candidates = self._candidate_patterns(text[tail_start:])
+        matches = kept
+        for index in candidates:
+            regex = self.patterns[index].regex
+            for match in regex.finditer(text, resume.get(index, rescan)):
+                matches.append((index, match.start(), match.end(), match.group()[:100]))
+        with self._lock:
+            self._stats["segments_scanned"] += 1
+            self._stats["patterns_skipped"] += len(self.patterns) - len(candidates)
+        return tuple(matches)
+
+    def _matches(self, messages: Sequence[str], separator: str) -> Tuple[str, Tuple[_RawMatch, ...]]:
+        """Joined text and its matches, resuming from the longest cached prefix."""
+        combined = separator.join(messages)
+        keys = self._prefix_keys(messages, separator)
+        base: Tuple[_RawMatch, ...] = ()
+        base_end = 0
+        with self._lock:
+            for k in range(len(keys) - 1, -1, -1):
+                key, length = keys[k]
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._stats["cache_hits"] += 1
+                    if k == len(keys) - 1:
+                        return combined, cached
+                    base, base_end = cached, length
+                    break
+        matches = self._scan(combined, base, base_end)
+        with self._lock:
+            self._cache[keys[-1][0]] = matches
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return combined, matches
+
+    def _finding(self, raw: _RawMatch, offset: int, text: str) -> Dict:
+        index, start, end, matched = raw
+        pat = self.patterns[index]
+        start += offset
+        end += offset
+        ctx_start = max(0, start - CONTEXT_CHARS)
+        ctx_end = min(len(text), end + CONTEXT_CHARS)
+        return {
+            "pattern_name": pat.name,
+            "category": pat.category,
+            "severity": pat.severity,
+            "confidence": pat.confidence,
+            "match": matched,
+            "position": start,
+            "context": text[ctx_start:ctx_end].replace("\n", " ")[:200],
+            "description": pat.description,
+        }
+
+    # -- public API ----------------------------------------------------------
+    def find(self, text: str) -> List[Dict]:
+        """All pattern matches in *text*, ordered by pattern then position."""
+        started = time.perf_counter()
+        _, matches = self._matches([text], "")
+        raw = sorted(matches, key=lambda m: (m[0], m[1]))
+        findings = [self._finding(m, 0, text) for m in raw]
+        self._record(started)
+        return findings
+
+    def find_messages(self, messages: Sequence[str], separator: str = "\n") -> Tuple[List[Dict], str]:
+        """Scan messages as if joined by *separator*; returns (findings, joined text).
+
+        Results are cached per joined prefix, so appending a turn to a
+        conversation only rescans the new messages plus ``seam_chars`` before
+        them, and a match may span any number of messages.
+        """
+        started = time.perf_counter()
+        combined, matches = self._matches(messages, separator)
+        raw = sorted(matches, key=lambda m: (m[0], m[1]))
+        findings = [self._finding(m, 0, combined) for m in raw]
+        self._record(started)
+        return findings, combined
+
+    def _record(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats["scans"] += 1
+            self._stats["last_ms"] = elapsed * 1000
+            self._stats["total_ms"] += elapsed * 1000
+        _observe_latency(elapsed)
+
+    def stats(self) -> Dict:
+        """Scan counters and latency (milliseconds) since the engine was built."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_segments"] = len(self._cache)
+        stats["avg_ms"] = round(stats["total_ms"] / stats["scans"], 4) if stats["scans"] else 0.0
+        return stats
+
+    def clear_cache(self) -> None:
+        """Drop all cached scan results."""
+        with self._lock:
+            self._cache.clear()
@@ -24,14 +24,21 @@ import hashlib
 import json
 import re
 import sqlite3
+import sys
+import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.security.injection_scan_engine import InjectionScanEngine  # noqa: E402
+
 # ============================================================
 # INJECTION PATTERNS — 5 categories per REQ-37-021
 # ============================================================
@@ -234,25 +241,46 @@ SKIP_DIRS = {
 }
 
 
+_BASE64_BLOCK = re.compile(
+    r"(?:[A-Za-z0-9+/]{4}){10,}(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?"
+)
+
+_engine: Optional[InjectionScanEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_scan_engine() -> InjectionScanEngine:
+    """Shared engine for INJECTION_PATTERNS, compiled on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = InjectionScanEngine(INJECTION_PATTERNS)
+    return _engine
+
+
 class PromptInjectionDetector:
     """Detect prompt injection attacks in text and files.
 
     Uses regex + heuristic pattern matching (D217 — air-gap safe,
     no LLM dependency). Logs detections to append-only DB table.
+    Patterns are compiled once and shared by every detector instance
+    through get_scan_engine().
     """
 
     def __init__(self, db_path: Optional[Path] = None):
         self._db_path = db_path or DB_PATH
+        self._engine = get_scan_engine()
         self._compiled_patterns = [
             {
-                "name": p["name"],
-                "regex": re.compile(p["pattern"]),
-                "category": p["category"],
-                "severity": p["severity"],
-                "confidence": p["confidence"],
-                "description": p["description"],
+                "name": p.name,
+                "regex": p.regex,
+                "category": p.category,
+                "severity": p.severity,
+                "confidence": p.confidence,
+                "description": p.description,
             }
-            for p in INJECTION_PATTERNS
+            for p in self._engine.patterns
         ]
 
     # ---------------------------------------------------------------
@@ -269,26 +297,25 @@ class PromptInjectionDetector:
             Dict with keys: detected, confidence, findings, action, source,
             text_hash, scanned_at.
         """
-        findings = []
-        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        findings = self._engine.find(text)
+        return self._build_result(findings, text, source)
+
+    def scan_messages(self, messages: Sequence[str], source: str = "unknown") -> Dict:
+        """Scan a conversation as its newline-joined text.
 
-        for pat in self._compiled_patterns:
-            for match in pat["regex"].finditer(text):
-                # Context: surrounding text for human review
-                start = max(0, match.start() - 30)
-                end = min(len(text), match.end() + 30)
-                context_snippet = text[start:end].replace("\n", " ")
-
-                findings.append({
-                    "pattern_name": pat["name"],
-                    "category": pat["category"],
-                    "severity": pat["severity"],
-                    "confidence": pat["confidence"],
-                    "match": match.group()[:100],
-                    "position": match.start(),
-                    "context": context_snippet[:200],
-                    "description": pat["description"],
-                })
+        Earlier turns are served from the engine's content-hash cache of the
+        joined prefix, so a growing conversation only scans the new messages
+        (plus a short overlap before them).
+
+        Returns:
+            Dict matching scan_text output for the joined messages.
+        """
+        findings, combined = self._engine.find_messages(messages)
+        return self._build_result(findings, combined, source)
+
+    def _build_result(self, findings: List[Dict], text: str, source: str) -> Dict:
+        """Deduplicate findings and compute the confidence/action verdict."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
 
         # Deduplicate overlapping matches of same category
         findings = self._deduplicate_findings(findings)
@@ -584,12 +611,9 @@ class PromptInjectionDetector:
 
         Returns list of findings from decoded payloads.
         """
-        b64_pattern = re.compile(
-            r"(?:[A-Za-z0-9+/]{4}){10,}(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?"
-        )
         deep_findings = []
 
-        for match in b64_pattern.finditer(text):
+        for match in _BASE64_BLOCK.finditer(text):
             try:
                 decoded = base64.b64decode(match.group()).decode("utf-8", errors="ignore")
                 if len(decoded) > 10:
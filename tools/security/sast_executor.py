@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# CUI // SP-CTI
+"""Parallel, incremental SAST executor for polyglot projects.
+
+Backs sast_runner.run_sast():
+
+- one job per SAST tool (JavaScript and TypeScript share the eslint job),
+  dispatched on a ThreadPoolExecutor (D36).  Every runner executes its
+  scanner as a subprocess, so the scanners themselves run as parallel
+  processes, each under its own timeout.
+- tool availability comes from sast_runner.probe_tool, which is cached, so
+  a run no longer spawns a ``--version`` subprocess per runner.
+- findings are cached per scan unit, keyed by the tool version, the hash of
+  the tool's config files and the content hash of the unit.  Units are
+  files for bandit and eslint, packages (directories) for gosec, and the
+  whole project for the build-based scanners (SpotBugs, clippy,
+  SecurityCodeScan).  Only changed units are rescanned; if most units
+  changed, the tool rescans the project as before.
+- findings from all tools are merged and de-duplicated.
+
+The cache is a JSON file per project under .tmp/sast_cache
+(ICDEV_SAST_CACHE_DIR).  File hashes are reused while a file's size and
+mtime are unchanged.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.security import sast_runner  # noqa: E402
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("ICDEV_SAST_CACHE_DIR", str(BASE_DIR / ".tmp" / "sast_cache"))
+)
+CACHE_VERSION = 1
+
+# A tool rescans the whole project instead of a target list when more than
+# this share of its units changed, or more than MAX_TARGETS units changed
+FULL_RESCAN_RATIO = 0.5
+MAX_TARGETS = 500
+
+# Directories no scanner's results are attributed to
+PRUNE_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", "venv", ".venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".tmp", "target", "bin", "obj",
+})
+
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+
+@dataclass(frozen=True)
+class SastTool:
+    """How one sast_runner runner is scheduled, scoped and cached.
+
+    Attributes:
+        name: Tool key used in results, probes and the cache ("bandit").
+        runner: Name of the sast_runner function that runs the tool.
+        extensions: Source suffixes whose content decides cache validity.
+        granularity: "file" or "package" (rescan only changed files or
+            directories) or "project" (rescan everything on any change).
+        config_files: File name globs whose content invalidates every
+            cached result of the tool when it changes.
+        exclude_dirs: Extra directory names the tool itself skips.
+        source_dir: Sub-directory the tool scans instead of the root when
+            it exists.
+        probe_in_project: Probe availability from the project directory.
+    """
+
+    name: str
+    runner: str
+    extensions: Tuple[str, ...]
+    granularity: str = "project"
+    config_files: Tuple[str, ...] = ()
+    exclude_dirs: FrozenSet[str] = frozenset()
+    source_dir: Optional[str] = None
+    probe_in_project: bool = False
+
+
+SAST_TOOLS: Dict[str, SastTool] = {
+    tool.runner: tool for tool in (
+        SastTool("bandit", "run_bandit", (".py",), "file",
+                 config_files=(".bandit",),
+                 exclude_dirs=frozenset({"build", "dist", "tests"})),
+        SastTool("spotbugs", "run_spotbugs", (".java",), "project",
+                 config_files=("pom.xml", "build.gradle", "build.gradle.kts")),
+        SastTool("gosec", "run_gosec", (".go",), "package",
+                 config_files=("go.mod", "go.sum"),
+                 exclude_dirs=frozenset({"vendor", "testdata"})),
+        SastTool("cargo-clippy-security", "run_cargo_audit_sast", (".rs",), "project",
+                 config_files=("Cargo.toml", "Cargo.lock", "clippy.toml")),
+        SastTool("security-code-scan", "run_security_code_scan", (".cs",), "project",
+                 config_files=("*.csproj", "*.sln", "Directory.Build.props")),
+        SastTool("eslint-security", "run_eslint_security", (".js", ".ts", ".jsx", ".tsx"), "file",
+                 config_files=("package.json", ".eslintrc*", "eslint.config.*", ".eslintignore"),
+                 source_dir="src", probe_in_project=True),
+    )
+}
+
+
+def default_cache_path(project_path) -> Path:
+    """Per-project cache file under .tmp/sast_cache (ICDEV_SAST_CACHE_DIR)."""
+    key = hashlib.sha256(str(Path(project_path).resolve()).encode()).hexdigest()[:16]
+    return DEFAULT_CACHE_DIR / f"sast-{key}.json"
+
+
+def summarize(findings: List[Dict]) -> Dict:
+    """Severity counts in the shape every runner reports."""
+    counts = {sev: 0 for sev in SEVERITIES}
+    for f in findings:
+        sev = f.get("severity", "LOW").upper()
+        if sev in counts:
+            counts[sev] += 1
+    return {"total": len(findings), **counts}
+
+
+def merge_findings(findings: List[Dict]) -> List[Dict]:
+    """Drop findings that repeat another's file, line, rule and message."""
+    seen = set()
+    merged = []
+    for f in findings:
+        key = (
+            os.path.normpath(str(f.get("file", ""))),
+            f.get("line", 0),
+            f.get("test_id") or f.get("cwe") or "",
+            f.get("issue_text") or f.get("message") or "",
+        )
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(f)
+    return merged
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sha256_items(items) -> str:
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(repr(item).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _ProjectSnapshot:
+    """Content hashes of every file any of *tools* cares about, in one walk."""
+
+    def __init__(self, root: Path, tools: List[SastTool], stat_cache: Dict):
+        self.root = root
+        self.sources: Dict[str, Dict[str, str]] = {t.name: {} for t in tools}
+        self.configs: Dict[str, Dict[str, str]] = {t.name: {} for t in tools}
+        self.stat_cache: Dict[str, list] = {}
+        self.files_hashed = 0
+        self._previous = stat_cache
+        self._walk(tools)
+
+    def _hash(self, rel: str, path: Path) -> Optional[str]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        known = self._previous.get(rel)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            digest = known[2]
+        else:
+            try:
+                digest = _sha256_file(path)
+            except OSError:
+                return None
+            self.files_hashed += 1
+        self.stat_cache[rel] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def _walk(self, tools: List[SastTool]) -> None:
+        source_roots = {}
+        for tool in tools:
+            if tool.source_dir and (self.root / tool.source_dir).is_dir():
+                source_roots[tool.name] = tool.source_dir + "/"
+
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS)
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+            parts = () if rel_dir == "." else tuple(rel_dir.split("/"))
+            for name in sorted(filenames):
+                rel = name if not parts else f"{rel_dir}/{name}"
+                suffix = os.path.splitext(name)[1].lower()
+                digest = None
+                for tool in tools:
+                    is_config = any(fnmatch.fnmatch(name, g) for g in tool.config_files)
+                    is_source = suffix in tool.extensions
+                    if not (is_config or is_source):
+                        continue
+                    if digest is None:
+                        digest = self._hash(rel, Path(dirpath) / name)
+                        if digest is None:
+                            break
+                    if is_config:
+                        self.configs[tool.name][rel] = digest
+                    if (is_source and not tool.exclude_dirs.intersection(parts)
+                            and rel.startswith(source_roots.get(tool.name, ""))):
+                        self.sources[tool.name][rel] = digest
+
+    def units(self, tool: SastTool) -> Dict[str, str]:
+        """Map of scan unit -> content hash for *tool*."""
+        sources = self.sources[tool.name]
+        if tool.granularity == "file":
+            return dict(sources)
+        grouped: Dict[str, List[Tuple[str, str]]] = {}
+        for rel, digest in sources.items():
+            unit = "." if tool.granularity == "project" else (os.path.dirname(rel) or ".")
+            grouped.setdefault(unit, []).append((rel, digest))
+        if tool.granularity == "project":
+            grouped.setdefault(".", [])
+        return {unit: _sha256_items(sorted(files)) for unit, files in grouped.items()}
+
+
+class SastExecutor:
+    """Run every detected language's SAST tool concurrently with cached results."""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 timeouts: Optional[Dict[str, int]] = None,
+                 use_cache: bool = True, cache_path: Optional[str] = None):
+        self.max_workers = max_workers
+        self.timeouts = dict(timeouts or {})
+        self.use_cache = use_cache
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    # -- cache ---------------------------------------------------------------
+    def _load_cache(self, path: Optional[Path]) -> Dict:
+        empty = {"tools": {}, "files": {}}
+        if path is None or not path.exists():
+            return empty
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if data.get("version") != CACHE_VERSION:
+            return empty
+        return {"tools": data.get("tools", {}), "files": data.get("files", {})}
+
+    @staticmethod
+    def _save_cache(path: Path, data: Dict) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, **data}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: Could not write SAST cache {path}: {e}", file=sys.stderr)
+
+    # -- one tool ------------------------------------------------------------
+    @staticmethod
+    def _unit_of(tool: SastTool, root: Path, file_path: str) -> Optional[str]:
+        if tool.granularity == "project":
+            return "."
+        if not file_path:
+            return None
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = root / path
+        try:
+            rel = os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+        except ValueError:
+            return None
+        if rel.startswith("../"):
+            return None
+        return rel if tool.granularity == "file" else (os.path.dirname(rel) or ".")
+
+    @staticmethod
+    def _targets(tool: SastTool, root: Path, units: List[str]) -> List[str]:
+        if tool.granularity == "package":
+            return ["./" if u == "." else f"./{u}" for u in units]
+        return [str(root / u) for u in units]
+
+    def _run_tool(self, tool: SastTool, root: Path, snapshot: _ProjectSnapshot,
+                  cached: Dict) -> Tuple[Dict, Optional[Dict]]:
+        """Run (or reuse) one tool; returns (result, cache entry or None)."""
+        started = time.perf_counter()
+        runner = getattr(sast_runner, tool.runner)
+        timeout = self.timeouts.get(tool.name, sast_runner.DEFAULT_TIMEOUT)
+        probe = sast_runner.probe_tool(
+            tool.name, cwd=str(root) if tool.probe_in_project else None)
+        if not probe["available"]:
+            result = runner(str(root), output_file=None, timeout=timeout)
+            result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+            return result, None
+
+        tool_key = _sha256_items([
+            CACHE_VERSION, tool.name, probe["version"],
+            sorted(snapshot.configs[tool.name].items()),
+        ])
+        units = snapshot.units(tool)
+        previous = cached.get("units", {}) if cached.get("key") == tool_key else {}
+        changed = [u for u, h in sorted(units.items())
+                   if previous.get(u, {}).get("hash") != h]
+
+        mode = "cached"
+        result = {"tool": tool.name, "success": True, "findings": [], "raw_output": ""}
+        if changed:
+            full = (tool.granularity == "project" or not previous
+                    or len(changed) > MAX_TARGETS
+                    or len(changed) > FULL_RESCAN_RATIO * len(units))
+            mode = "full" if full else "incremental"
+            if full:
+                changed = sorted(units)
+                result = runner(str(root), output_file=None, timeout=timeout)
+            else:
+                result = runner(str(root), output_file=None, timeout=timeout,
+                                targets=self._targets(tool, root, changed))
+            if not result.get("success", False):
+                result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+                return result, None
+
+        fresh: Dict[str, List[Dict]] = {u: [] for u in changed}
+        unattributed = []
+        for f in result.get("findings", []):
+            unit = self._unit_of(tool, root, f.get("file", ""))
+            if unit in fresh:
+                fresh[unit].append(f)
+            else:
+                unattributed.append(f)
+
+        entry_units = {}
+        findings = []
+        for unit in sorted(units):
+            unit_findings = fresh[unit] if unit in fresh else previous[unit]["findings"]
+            entry_units[unit] = {"hash": units[unit], "findings": unit_findings}
+            findings.extend(unit_findings)
+        findings.extend(unattributed)
+
+        result["findings"] = findings
+        result["summary"] = summarize(findings)
+        result["cache"] = {
+            "mode": mode,
+            "units": len(units),
+            "rescanned": len(changed),
+            "reused": len(units) - len(changed),
+        }
+        result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        # Findings outside every known unit cannot be invalidated precisely
+        entry = None if unattributed else {"key": tool_key, "units": entry_units}
+        return result, entry
+
+    # -- public API ----------------------------------------------------------
+    def run(self, project_path: str, languages: List[str]) -> Dict:
+        """Scan *project_path* for *languages*; returns the run_sast() report."""
+        started = time.perf_counter()
+        root = Path(project_path).resolve()
+        combined = {
+            "project_path": project_path,
+            "languages_detected": languages,
+            "results": {},
+            "all_findings": [],
+            "summary": summarize([]),
+            "overall_success": True,
+            "tools": {},
+        }
+
+        tools: Dict[str, SastTool] = {}
+        tool_languages: Dict[str, List[str]] = {}
+        for lang in languages:
+            runner_fn = sast_runner.SAST_RUNNERS.get(lang)
+            if runner_fn is None:
+                continue
+            tool = SAST_TOOLS[runner_fn.__name__]
+            tools.setdefault(tool.name, tool)
+            tool_languages.setdefault(tool.name, []).append(lang)
+
+        cache_path = None
+        if self.use_cache:
+            cache_path = self.cache_path or default_cache_path(root)
+        cache = self._load_cache(cache_path)
+        snapshot = _ProjectSnapshot(root, list(tools.values()), cache["files"])
+
+        outcomes: Dict[str, Tuple[Dict, Optional[Dict]]] = {}
+        if tools:
+            workers = self.max_workers or len(tools)
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="sast") as pool:
+                futures = {
+                    name: pool.submit(self._run_tool, tool, root, snapshot,
+                                      cache["tools"].get(name, {}))
+                    for name, tool in tools.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        outcomes[name] = future.result()
+                    except Exception as e:
+                        outcomes[name] = ({
+                            "tool": name, "success": False, "findings": [],
+                            "summary": summarize([]),
+                            "raw_output": f"Error running {name}: {e}",
+                        }, None)
+
+        findings = []
+        for name, (result, entry) in outcomes.items():
+            for lang in tool_languages[name]:
+                combined["results"][lang] = result
+            findings.extend(result.get("findings", []))
+            if not result.get("success", False):
+                combined["overall_success"] = False
+            combined["tools"][name] = {
+                "languages": tool_languages[name],
+                "success": result.get("success", False),
+                "elapsed_seconds": result.get("elapsed_seconds", 0.0),
+                "cache": result.get("cache", {}),
+            }
+            if entry is not None:
+                cache["tools"][name] = entry
+            elif result.get("success", False):
+                cache["tools"].pop(name, None)
+
+        combined["all_findings"] = merge_findings(findings)
+        combined["summary"] = summarize(combined["all_findings"])
+
+        if cache_path is not None:
+            self._save_cache(cache_path, {"tools": cache["tools"],
+                                          "files": snapshot.stat_cache})
+        combined["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return combined
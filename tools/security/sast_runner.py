@@ -5,21 +5,31 @@
 Implements:
 - run_bandit(project_path) -> subprocess bandit, parse JSON output
 - parse_report(report_path) -> parse bandit JSON report into structured findings
+- run_sast(project_path) -> all detected languages in parallel with cached,
+  incremental results (see tools/security/sast_executor.py)
 - evaluate_gate(findings, thresholds) -> check against security_gates.yaml
 - CLI: python tools/security/sast_runner.py --project-path PATH [--report REPORT_PATH] [--gate]
+       [--all-languages] [--no-cache]
 """
 
 import argparse
 import json
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
 GATES_PATH = BASE_DIR / "args" / "security_gates.yaml"
 
+DEFAULT_TIMEOUT = 300
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
 # Language support (Phase 16)
 try:
     import importlib.util as _ilu
@@ -35,6 +45,87 @@ except Exception:
     detect_languages = None
 
 
+# Availability probes per tool: (version command, timeout, message when missing).
+# Results are cached per (tool, cwd) for PROBE_TTL_SECONDS so repeated scans
+# do not spawn a --version subprocess for every runner call.
+TOOL_PROBES = {
+    "bandit": (
+        [sys.executable, "-m", "bandit", "--version"], 10,
+        "bandit not installed. Install with: pip install bandit",
+    ),
+    "spotbugs": (
+        ["mvn", "--version"], 10,
+        "Maven not found. Install Maven and SpotBugs plugin.",
+    ),
+    "gosec": (
+        ["gosec", "--version"], 10,
+        "gosec not found. Install with: go install github.com/securego/gosec/v2/cmd/gosec@latest",
+    ),
+    "cargo-clippy-security": (
+        ["cargo", "--version"], 10,
+        "cargo not found. Install Rust toolchain from https://rustup.rs",
+    ),
+    "security-code-scan": (
+        ["dotnet", "--version"], 10,
+        "dotnet not found. Install .NET SDK from https://dotnet.microsoft.com",
+    ),
+    "eslint-security": (
+        ["npx", "eslint", "--version"], 30,
+        "eslint not found. Install with: npm install eslint eslint-plugin-security",
+    ),
+}
+PROBE_TTL_SECONDS = 600
+
+_probe_cache: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+_probe_lock = threading.Lock()
+
+
+def probe_tool(tool: str, cwd: Optional[str] = None) -> Dict:
+    """Check whether a SAST tool is installed, caching the answer.
+
+    Args:
+        tool: Key in TOOL_PROBES (e.g. "bandit").
+        cwd: Directory to probe from (npx resolves project-local eslint).
+
+    Returns:
+        Dict with keys: available, version (first line of the version
+        output), message (install hint when unavailable).
+    """
+    key = (tool, str(cwd or ""))
+    now = time.monotonic()
+    with _probe_lock:
+        hit = _probe_cache.get(key)
+        if hit is not None and now - hit[0] < PROBE_TTL_SECONDS:
+            return hit[1]
+
+    cmd, timeout, missing = TOOL_PROBES[tool]
+    probe = {"available": False, "version": "", "message": missing}
+    try:
+        proc = subprocess.run(
+            cmd, capture_output=True, text=True, timeout=timeout,
+            cwd=str(cwd) if cwd else None,
+        )
+        if proc.returncode == 0:
+            output = (proc.stdout or proc.stderr).strip()
+            probe = {
+                "available": True,
+                "version": output.splitlines()[0] if output else "",
+                "message": "",
+            }
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        pass
+
+    with _probe_lock:
+        _probe_cache[key] = (now, probe)
+    return probe
+
+
+def clear_probe_cache() -> None:
+    """Forget cached tool availability (e.g. after installing a scanner)."""
+    with _probe_lock:
+        _probe_cache.clear()
+
+
 def _load_thresholds() -> Dict:
     """Load security gate thresholds from args/security_gates.yaml."""
     defaults = {
@@ -78,6 +169,8 @@ def run_bandit(
     output_file: Optional[str] = None,
     severity_level: str = "low",
     confidence_level: str = "low",
+    targets: Optional[List[str]] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict:
     """Run Bandit SAST scanner on a Python project.
 
@@ -86,6 +179,8 @@ def run_bandit(
         output_file: Optional path to write JSON report.
         severity_level: Minimum severity to report (low, medium, high).
         confidence_level: Minimum confidence to report (low, medium, high).
+        targets: Scan only these files instead of the whole project.
+        timeout: Seconds before the scan is abandoned.
 
     Returns:
         Dict with keys: success, findings, summary, raw_output.
@@ -99,34 +194,30 @@ def run_bandit(
         "raw_output": "",
     }
 
-    # Check if bandit is available
-    try:
-        version_check = subprocess.run(
-            [sys.executable, "-m", "bandit", "--version"],
-            capture_output=True, text=True, timeout=10,
-        )
-        if version_check.returncode != 0:
-            result["success"] = False
-            result["raw_output"] = "bandit not installed. Install with: pip install bandit"
-            return result
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    probe = probe_tool("bandit")
+    if not probe["available"]:
         result["success"] = False
-        result["raw_output"] = "bandit not found. Install with: pip install bandit"
+        result["raw_output"] = probe["message"]
         return result
 
     # Build bandit command
     cmd = [
         sys.executable, "-m", "bandit",
-        "-r",  # Recursive
         "-f", "json",  # JSON output
         "-ll" if severity_level == "medium" else "-l" if severity_level == "low" else "-lll",
-        "--exclude", "venv,node_modules,.git,__pycache__,build,dist,tests",
-        str(root),
     ]
+    if targets is None:
+        cmd += [
+            "-r",  # Recursive
+            "--exclude", "venv,node_modules,.git,__pycache__,build,dist,tests",
+            str(root),
+        ]
+    else:
+        cmd += [str(t) for t in targets]
 
     try:
         proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300,
+            cmd, capture_output=True, text=True, timeout=timeout,
         )
 
         # Bandit returns exit code 1 when it finds issues
@@ -165,7 +256,7 @@ def run_bandit(
 
     except subprocess.TimeoutExpired:
         result["success"] = False
-        result["raw_output"] = "bandit timed out after 300 seconds"
+        result["raw_output"] = f"bandit timed out after {timeout} seconds"
     except Exception as e:
         result["success"] = False
         result["raw_output"] = f"Error running bandit: {str(e)}"
@@ -240,12 +331,14 @@ def parse_report(report_path: str) -> List[Dict]:
 def run_spotbugs(
     project_path: str,
     output_file: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict:
     """Run SpotBugs SAST scanner on a Java project via Maven.
 
     Args:
         project_path: Root path of the project to scan.
         output_file: Optional path to write JSON report.
+        timeout: Seconds before the scan is abandoned.
 
     Returns:
         Dict with keys: tool, success, findings, summary, raw_output.
@@ -259,26 +352,17 @@ def run_spotbugs(
         "raw_output": "",
     }
 
-    # Check if Maven is available
-    try:
-        version_check = subprocess.run(
-            ["mvn", "--version"],
-            capture_output=True, text=True, timeout=10,
-        )
-        if version_check.returncode != 0:
-            result["success"] = False
-            result["raw_output"] = "Maven not found. Install Maven and SpotBugs plugin."
-            return result
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    probe = probe_tool("spotbugs")
+    if not probe["available"]:
         result["success"] = False
-        result["raw_output"] = "Maven not found. Install Maven and SpotBugs plugin."
+        result["raw_output"] = probe["message"]
         return result
 
     cmd = ["mvn", "spotbugs:check", "-q"]
 
     try:
         proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300, cwd=str(root),
+            cmd, capture_output=True, text=True, timeout=timeout, cwd=str(root),
         )
         raw = proc.stdout + proc.stderr
         result["raw_output"] = raw
@@ -339,7 +423,7 @@ def run_spotbugs(
 
     except subprocess.TimeoutExpired:
         result["success"] = False
-        result["raw_output"] = "SpotBugs timed out after 300 seconds"
+        result["raw_output"] = f"SpotBugs timed out after {timeout} seconds"
     except Exception as e:
         result["success"] = False
         result["raw_output"] = f"Error running SpotBugs: {str(e)}"
@@ -350,12 +434,16 @@ def run_spotbugs(
 def run_gosec(
     project_path: str,
     output_file: Optional[str] = None,
+    targets: Optional[List[str]] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict:
     """Run gosec SAST scanner on a Go project.
 
     Args:
         project_path: Root path of the project to scan.
         output_file: Optional path to write JSON report.
+        targets: Scan only these package paths (e.g. "./pkg/auth").
+        timeout: Seconds before the scan is abandoned.
 
     Returns:
         Dict with keys: tool, success, findings, summary, raw_output.
@@ -369,26 +457,17 @@ def run_gosec(
         "raw_output": "",
     }
 
-    # Check if gosec is available
-    try:
-        version_check = subprocess.run(
-            ["gosec", "--version"],
-            capture_output=True, text=True, timeout=10,
-        )
-        if version_check.returncode != 0:
-            result["success"] = False
-            result["raw_output"] = "gosec not found. Install with: go install github.com/securego/gosec/v2/cmd/gosec@latest"
-            return result
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    probe = probe_tool("gosec")
+    if not probe["available"]:
         result["success"] = False
-        result["raw_output"] = "gosec not found. Install with: go install github.com/securego/gosec/v2/cmd/gosec@latest"
+        result["raw_output"] = probe["message"]
         return result
 
-    cmd = ["gosec", "-fmt=json", "./..."]
+    cmd = ["gosec", "-fmt=json"] + (list(targets) if targets is not None else ["./..."])
 
     try:
         proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300, cwd=str(root),
+            cmd, capture_output=True, text=True, timeout=timeout, cwd=str(root),
         )
         raw = proc.stdout if proc.stdout else proc.stderr
         result["raw_output"] = raw
@@ -429,7 +508,7 @@ def run_gosec(
 
     except subprocess.TimeoutExpired:
         result["success"] = False
-        result["raw_output"] = "gosec timed out after 300 seconds"
+        result["raw_output"] = f"gosec timed out after {timeout} seconds"
     except Exception as e:
         result["success"] = False
         result["raw_output"] = f"Error running gosec: {str(e)}"
@@ -440,12 +519,14 @@ def run_gosec(
 def run_cargo_audit_sast(
     project_path: str,
     output_file: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict:
     """Run cargo clippy with security-related lints on a Rust project.
 
     Args:
         project_path: Root path of the project to scan.
         output_file: Optional path to write JSON report.
+        timeout: Seconds before the scan is abandoned.
 
     Returns:
         Dict with keys: tool, success, findings, summary, raw_output.
@@ -459,26 +540,17 @@ def run_cargo_audit_sast(
         "raw_output": "",
     }
 
-    # Check if cargo is available
-    try:
-        version_check = subprocess.run(
-            ["cargo", "--version"],
-            capture_output=True, text=True, timeout=10,
-        )
-        if version_check.returncode != 0:
-            result["success"] = False
-            result["raw_output"] = "cargo not found. Install Rust toolchain from https://rustup.rs"
-            return result
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    probe = probe_tool("cargo-clippy-security")
+    if not probe["available"]:
         result["success"] = False
-        result["raw_output"] = "cargo not found. Install Rust toolchain from https://rustup.rs"
+        result["raw_output"] = probe["message"]
         return result
 
     cmd = ["cargo", "clippy", "--message-format=json", "--", "-D", "warnings"]
 
     try:
         proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300, cwd=str(root),
+            cmd, capture_output=True, text=True, timeout=timeout, cwd=str(root),
         )
         result["raw_output"] = proc.stdout + proc.stderr
 
@@ -540,7 +612,7 @@ def run_cargo_audit_sast(
 
     except subprocess.TimeoutExpired:
         result["success"] = False
-        result["raw_output"] = "cargo clippy timed out after 300 seconds"
+        result["raw_output"] = f"cargo clippy timed out after {timeout} seconds"
     except Exception as e:
         result["success"] = False
         result["raw_output"] = f"Error running cargo clippy: {str(e)}"
@@ -551,12 +623,14 @@ def run_cargo_audit_sast(
 def run_security_code_scan(
     project_path: str,
     output_file: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict:
     """Run SecurityCodeScan via dotnet build on a C# project.
 
     Args:
         project_path: Root path of the project to scan.
         output_file: Optional path to write JSON report.
+        timeout: Seconds before the scan is abandoned.
 
     Returns:
         Dict with keys: tool, success, findings, summary, raw_output.
@@ -570,19 +644,10 @@ def run_security_code_scan(
         "raw_output": "",
     }
 
-    # Check if dotnet is available
-    try:
-        version_check = subprocess.run(
-            ["dotnet", "--version"],
-            capture_output=True, text=True, timeout=10,
-        )
-        if version_check.returncode != 0:
-            result["success"] = False
-            result["raw_output"] = "dotnet not found. Install .NET SDK from https://dotnet.microsoft.com"
-            return result
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    probe = probe_tool("security-code-scan")
+    if not probe["available"]:
         result["success"] = False
-        result["raw_output"] = "dotnet not found. Install .NET SDK from https://dotnet.microsoft.com"
+        result["raw_output"] = probe["message"]
         return result
 
     # SecurityCodeScan runs as a Roslyn analyzer during build
@@ -590,7 +655,7 @@ def run_security_code_scan(
 
     try:
         proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300, cwd=str(root),
+            cmd, capture_output=True, text=True, timeout=timeout, cwd=str(root),
         )
         raw = proc.stdout + proc.stderr
         result["raw_output"] = raw
@@ -656,7 +721,7 @@ def run_security_code_scan(
 
     except subprocess.TimeoutExpired:
         result["success"] = False
-        result["raw_output"] = "dotnet build timed out after 300 seconds"
+        result["raw_output"] = f"dotnet build timed out after {timeout} seconds"
     except Exception as e:
         result["success"] = False
         result["raw_output"] = f"Error running SecurityCodeScan: {str(e)}"
@@ -667,12 +732,16 @@ def run_security_code_scan(
 def run_eslint_security(
     project_path: str,
     output_file: Optional[str] = None,
+    targets: Optional[List[str]] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict:
     """Run eslint with security plugin on a JavaScript/TypeScript project.
 
     Args:
         project_path: Root path of the project to scan.
         output_file: Optional path to write JSON report.
+        targets: Scan only these files instead of the source tree.
+        timeout: Seconds before the scan is abandoned.
 
     Returns:
         Dict with keys: tool, success, findings, summary, raw_output.
@@ -686,19 +755,10 @@ def run_eslint_security(
         "raw_output": "",
     }
 
-    # Check if npx/eslint is available
-    try:
-        version_check = subprocess.run(
-            ["npx", "eslint", "--version"],
-            capture_output=True, text=True, timeout=30, cwd=str(root),
-        )
-        if version_check.returncode != 0:
-            result["success"] = False
-            result["raw_output"] = "eslint not found. Install with: npm install eslint eslint-plugin-security"
-            return result
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    probe = probe_tool("eslint-security", cwd=str(root))
+    if not probe["available"]:
         result["success"] = False
-        result["raw_output"] = "eslint not found. Install with: npm install eslint eslint-plugin-security"
+        result["raw_output"] = probe["message"]
         return result
 
     cmd = [
@@ -706,12 +766,15 @@ def run_eslint_security(
         "--plugin", "security",
         "--ext", ".js,.ts,.jsx,.tsx",
         "--format", "json",
-        str(root / "src") if (root / "src").is_dir() else str(root),
     ]
+    if targets is None:
+        cmd.append(str(root / "src") if (root / "src").is_dir() else str(root))
+    else:
+        cmd += [str(t) for t in targets]
 
     try:
         proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300, cwd=str(root),
+            cmd, capture_output=True, text=True, timeout=timeout, cwd=str(root),
         )
         raw = proc.stdout if proc.stdout else proc.stderr
         result["raw_output"] = raw
@@ -756,7 +819,7 @@ def run_eslint_security(
 
     except subprocess.TimeoutExpired:
         result["success"] = False
-        result["raw_output"] = "eslint-security timed out after 300 seconds"
+        result["raw_output"] = f"eslint-security timed out after {timeout} seconds"
     except Exception as e:
         result["success"] = False
         result["raw_output"] = f"Error running eslint-security: {str(e)}"
@@ -776,67 +839,64 @@ SAST_RUNNERS = {
 }
 
 
+def detect_sast_languages(project_path: str) -> List[str]:
+    """Languages in *project_path* that have a SAST runner."""
+    if detect_languages is not None:
+        return detect_languages(project_path)
+
+    # Fallback: check for common files
+    root = Path(project_path)
+    languages = []
+    if (root / "requirements.txt").exists() or (root / "pyproject.toml").exists() or (root / "setup.py").exists():
+        languages.append("python")
+    if (root / "package.json").exists():
+        languages.append("javascript")
+    if (root / "pom.xml").exists() or (root / "build.gradle").exists():
+        languages.append("java")
+    if (root / "go.mod").exists():
+        languages.append("go")
+    if (root / "Cargo.toml").exists():
+        languages.append("rust")
+    if list(root.glob("*.csproj")) or list(root.glob("*.sln")):
+        languages.append("csharp")
+    if (root / "tsconfig.json").exists():
+        languages.append("typescript")
+    return languages
+
+
 def run_sast(
     project_path: str,
     output_file: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    timeouts: Optional[Dict[str, int]] = None,
+    use_cache: bool = True,
+    cache_path: Optional[str] = None,
 ) -> Dict:
     """Run SAST scanning across all detected languages.
 
     Auto-detects languages and runs the appropriate SAST tool for each.
+    Tools run concurrently and unchanged files reuse cached findings
+    (see tools/security/sast_executor.py).
 
     Args:
         project_path: Root path of the project to scan.
         output_file: Optional path to write combined JSON report.
+        max_workers: Maximum tools run at once (default: one per tool).
+        timeouts: Per-tool timeout overrides in seconds, keyed by tool name.
+        use_cache: Reuse and update the incremental results cache.
+        cache_path: Cache file (default: .tmp/sast_cache, per project).
 
     Returns:
         Dict with results for each detected language, combined findings, and summary.
     """
-    # Detect languages
-    if detect_languages is not None:
-        languages = detect_languages(project_path)
-    else:
-        # Fallback: check for common files
-        root = Path(project_path)
-        languages = []
-        if (root / "requirements.txt").exists() or (root / "pyproject.toml").exists() or (root / "setup.py").exists():
-            languages.append("python")
-        if (root / "package.json").exists():
-            languages.append("javascript")
-        if (root / "pom.xml").exists() or (root / "build.gradle").exists():
-            languages.append("java")
-        if (root / "go.mod").exists():
-            languages.append("go")
-        if (root / "Cargo.toml").exists():
-            languages.append("rust")
-        if list(root.glob("*.csproj")) or list(root.glob("*.sln")):
-            languages.append("csharp")
-        if (root / "tsconfig.json").exists():
-            languages.append("typescript")
-
-    combined = {
-        "project_path": project_path,
-        "languages_detected": languages,
-        "results": {},
-        "all_findings": [],
-        "summary": {"total": 0, "CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0},
-        "overall_success": True,
-    }
+    from tools.security.sast_executor import SastExecutor
 
-    for lang in languages:
-        runner_fn = SAST_RUNNERS.get(lang)
-        if runner_fn:
-            lang_result = runner_fn(project_path, output_file=None)
-            combined["results"][lang] = lang_result
-            combined["all_findings"].extend(lang_result.get("findings", []))
-            if not lang_result.get("success", False):
-                combined["overall_success"] = False
-
-    # Build combined summary
-    for f in combined["all_findings"]:
-        sev = f.get("severity", "LOW").upper()
-        if sev in combined["summary"]:
-            combined["summary"][sev] += 1
-    combined["summary"]["total"] = len(combined["all_findings"])
+    languages = detect_sast_languages(project_path)
+    executor = SastExecutor(
+        max_workers=max_workers, timeouts=timeouts,
+        use_cache=use_cache, cache_path=cache_path,
+    )
+    combined = executor.run(project_path, languages)
 
     if output_file:
         report_path = Path(output_file)
@@ -897,11 +957,17 @@ def evaluate_gate(
 
 def main():
     parser = argparse.ArgumentParser(description="SAST scanning (Bandit)")
-    parser.add_argument("--project-path", help="Project path to scan")
+    parser.add_argument("--project-path", "--project-dir", dest="project_path",
+                        help="Project path to scan")
     parser.add_argument("--report", help="Path to existing bandit report to parse")
     parser.add_argument("--output", help="Write JSON report to this path")
     parser.add_argument("--gate", action="store_true", help="Evaluate security gates")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--all-languages", action="store_true",
+                        help="Scan every detected language in parallel (run_sast)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="With --all-languages: ignore and do not update the results cache")
+    parser.add_argument("--workers", type=int, help="With --all-languages: max concurrent tools")
     args = parser.parse_args()
 
     if args.report:
@@ -912,6 +978,11 @@ def main():
             "findings": findings,
             "summary": {"total": len(findings)},
         }
+    elif args.project_path and args.all_languages:
+        result = run_sast(args.project_path, output_file=args.output,
+                          max_workers=args.workers, use_cache=not args.no_cache)
+        result["tool"] = ", ".join(sorted(result.get("tools", {}))) or "none"
+        findings = result.get("all_findings", [])
     elif args.project_path:
         # Run bandit
         result = run_bandit(args.project_path, output_file=args.output)
@@ -931,7 +1002,8 @@ def main():
         print(f"  Total findings: {result.get('summary', {}).get('total', len(findings))}")
         for f in findings[:10]:
             sev = f.get("severity", "?")
-            print(f"  [{sev}] {f.get('file', '?')}:{f.get('line', '?')} - {f.get('issue_text', '')}")
+            message = f.get("issue_text") or f.get("message", "")
+            print(f"  [{sev}] {f.get('file', '?')}:{f.get('line', '?')} - {message}")
         if len(findings) > 10:
             print(f"  ... and {len(findings) - 10} more findings")
 
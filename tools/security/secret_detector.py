@@ -18,6 +18,14 @@ from typing import Dict, List, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "data" / "icdev.db"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from tools.compliance.source_scanner import (  # noqa: E402
+    ScanRule,
+    SourceScanner,
+    default_cache_path,
+)
 
 # Patterns for built-in fallback scanning when detect-secrets is not available
 BUILTIN_PATTERNS = [
@@ -73,23 +81,26 @@ BUILTIN_PATTERNS = [
     },
 ]
 
-# File extensions to skip
-SKIP_EXTENSIONS = {
-    ".pyc", ".pyo", ".so", ".dylib", ".dll", ".exe", ".bin",
-    ".jpg", ".jpeg", ".png", ".gif", ".ico", ".svg", ".bmp",
-    ".pdf", ".doc", ".docx", ".xls", ".xlsx",
-    ".zip", ".tar", ".gz", ".bz2", ".7z", ".rar",
-    ".woff", ".woff2", ".ttf", ".eot",
-    ".db", ".sqlite", ".sqlite3",
-    ".lock",
-}
-
 SKIP_DIRS = {
     "venv", "node_modules", ".git", "__pycache__", "build", "dist",
     ".eggs", ".tox", ".mypy_cache", ".pytest_cache",
 }
 
 
+def _line_bounded(pattern: str) -> str:
+    """Keep whitespace runs on one line so whole-file matching equals per-line matching."""
+    return (pattern.replace(r"\s*", r"[^\S\n]*")
+                   .replace(r"\s+", r"[^\S\n]+")
+                   .replace(r"[^'\"]", r"[^'\"\n]"))
+
+
+# BUILTIN_PATTERNS registered with the shared SourceScanner
+SECRET_SCAN_RULES = [
+    ScanRule(f"secret.{i}", _line_bounded(p["pattern"]), all_lines=True)
+    for i, p in enumerate(BUILTIN_PATTERNS)
+]
+
+
 def scan(
     project_path: str,
     output_file: Optional[str] = None,
@@ -223,61 +234,51 @@ def _run_builtin_scan(project_path: str) -> Dict:
         "raw_output": "Using built-in pattern scanner (detect-secrets not available)",
     }
 
-    compiled_patterns = [
-        (re.compile(p["pattern"], re.IGNORECASE), p["name"], p["severity"])
-        for p in BUILTIN_PATTERNS
-    ]
+    scanner = SourceScanner(ignore_dirs=SKIP_DIRS).register(SECRET_SCAN_RULES)
+    scan_result = scanner.scan(root, cache_path=default_cache_path(root, "secrets"))
 
-    files_scanned = 0
-    for file_path in _walk_files(root):
+    # Only files with a pattern hit are read again, to filter and preview lines
+    for rel_path, hits in sorted(scan_result.files.items()):
         try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            files_scanned += 1
-
-            for line_num, line in enumerate(content.splitlines(), 1):
-                for pattern, name, severity in compiled_patterns:
-                    if pattern.search(line):
-                        # Avoid false positives in comments about patterns
-                        if "example" in line.lower() or "placeholder" in line.lower():
-                            continue
-                        # Avoid matching variable declarations without values
-                        stripped = line.strip()
-                        if stripped.startswith("#") or stripped.startswith("//"):
-                            # Still flag if it looks like an actual secret in a comment
-                            if "AKIA" not in line and "BEGIN PRIVATE KEY" not in line:
-                                continue
-
-                        result["findings"].append({
-                            "file": str(file_path.relative_to(root)),
-                            "line": line_num,
-                            "type": name,
-                            "severity": severity,
-                            "match_preview": _redact_line(line.strip(), 80),
-                        })
+            lines = (root / rel_path).read_text(encoding="utf-8", errors="ignore").split("\n")
         except (IOError, UnicodeDecodeError):
             continue
+        flagged = sorted(
+            (line_num, int(rule_id.rsplit(".", 1)[1]))
+            for rule_id, line_nums in hits.items()
+            for line_num in set(line_nums)
+        )
+        for line_num, idx in flagged:
+            if line_num > len(lines):
+                continue
+            line = lines[line_num - 1]
+            # Avoid false positives in comments about patterns
+            if "example" in line.lower() or "placeholder" in line.lower():
+                continue
+            # Avoid matching variable declarations without values
+            stripped = line.strip()
+            if stripped.startswith("#") or stripped.startswith("//"):
+                # Still flag if it looks like an actual secret in a comment
+                if "AKIA" not in line and "BEGIN PRIVATE KEY" not in line:
+                    continue
+
+            result["findings"].append({
+                "file": rel_path,
+                "line": line_num,
+                "type": BUILTIN_PATTERNS[idx]["name"],
+                "severity": BUILTIN_PATTERNS[idx]["severity"],
+                "match_preview": _redact_line(stripped, 80),
+            })
 
     result["summary"] = {
         "total": len(result["findings"]),
-        "files_scanned": files_scanned,
+        "files_scanned": len(scan_result.scanned),
         "files_with_secrets": len(set(f["file"] for f in result["findings"])),
     }
 
     return result
 
 
-def _walk_files(root: Path):
-    """Walk project files, skipping binary and ignored directories."""
-    for item in root.iterdir():
-        if item.name in SKIP_DIRS:
-            continue
-        if item.is_dir():
-            yield from _walk_files(item)
-        elif item.is_file():
-            if item.suffix.lower() not in SKIP_EXTENSIONS:
-                yield item
-
-
 def _redact_line(line: str, max_len: int = 80) -> str:
     """Redact potentially sensitive values from a line for safe display."""
     # Replace anything that looks like a secret value
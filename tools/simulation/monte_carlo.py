@@ -2,9 +2,12 @@
 # CUI // SP-CTI
 """RICOAS Digital Program Twin — Monte Carlo simulation using PERT distribution.
 
-Uses Python stdlib `random` with Beta-distribution approximation to PERT.
-NO numpy, NO scipy. Supports schedule, cost, and risk dimensions with
-configurable iterations and confidence levels.
+Uses a Beta-distribution approximation to PERT. When numpy is installed,
+samples are drawn as (iterations x items) matrices, in chunks bounded by
+MAX_CHUNK_ELEMENTS, and statistics are computed vectorized; otherwise the
+stdlib `random` engine is used. NO scipy. Supports schedule, cost, and risk
+dimensions with configurable iterations, confidence levels and an optional
+seed for reproducible runs.
 
 Part of the ICDEV RICOAS Phase 20C simulation subsystem.
 """
@@ -21,6 +24,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = Path(os.environ.get("ICDEV_DB_PATH", str(BASE_DIR / "data" / "icdev.db")))
 
@@ -41,12 +51,16 @@ DEFAULT_HOURLY_RATE = 150
 HISTOGRAM_BINS = 20
 CDF_POINTS = 100
 
+# Sample-matrix cells drawn at once by the numpy engine (~16 MB of float64)
+MAX_CHUNK_ELEMENTS = 2_000_000
+ENGINES = ("auto", "numpy", "stdlib")
+
 
 # ---------------------------------------------------------------------------
 # PERT distribution
 # ---------------------------------------------------------------------------
 
-def pert_sample(optimistic, most_likely, pessimistic, lambd=4):
+def pert_sample(optimistic, most_likely, pessimistic, lambd=4, rng=None):
     """Sample from PERT distribution using Beta distribution approximation.
 
     The PERT distribution is a reparameterization of the Beta distribution
@@ -57,6 +71,7 @@ def pert_sample(optimistic, most_likely, pessimistic, lambd=4):
         most_likely: Most likely value (mode).
         pessimistic: Worst-case value.
         lambd: Shape parameter (default 4, standard PERT).
+        rng: Optional random.Random instance (default: module-level random).
 
     Returns:
         A single sample from the PERT distribution.
@@ -66,7 +81,7 @@ def pert_sample(optimistic, most_likely, pessimistic, lambd=4):
     alpha = 1 + lambd * (most_likely - optimistic) / (pessimistic - optimistic)
     beta_param = 1 + lambd * (pessimistic - most_likely) / (pessimistic - optimistic)
     # Use stdlib random.betavariate
-    x = random.betavariate(alpha, beta_param)
+    x = (rng or random).betavariate(alpha, beta_param)
     return optimistic + x * (pessimistic - optimistic)
 
 
@@ -377,62 +392,220 @@ def _get_risk_inputs(conn, project_id):
 # Monte Carlo runners
 # ---------------------------------------------------------------------------
 
-def _run_schedule_mc(inputs, iterations):
+def _run_schedule_mc(inputs, iterations, rng=None):
     """Run Monte Carlo for schedule dimension.
 
     Each iteration samples PERT for each item and sums total hours.
     """
+    rng = rng or random
     results = []
     for _ in range(iterations):
         total = 0.0
         for item in inputs:
             sampled = pert_sample(
-                item["optimistic"], item["most_likely"], item["pessimistic"]
+                item["optimistic"], item["most_likely"], item["pessimistic"], rng=rng
             )
             total += sampled
         results.append(total)
     return results
 
 
-def _run_cost_mc(inputs, iterations):
+def _run_cost_mc(inputs, iterations, rng=None):
     """Run Monte Carlo for cost dimension.
 
     Each iteration samples PERT for cost of each component and sums.
     """
+    rng = rng or random
     results = []
     for _ in range(iterations):
         total = 0.0
         for item in inputs:
             sampled = pert_sample(
-                item["optimistic"], item["most_likely"], item["pessimistic"]
+                item["optimistic"], item["most_likely"], item["pessimistic"], rng=rng
             )
             total += sampled
         results.append(total)
     return results
 
 
-def _run_risk_mc(inputs, iterations):
+def _run_risk_mc(inputs, iterations, rng=None):
     """Run Monte Carlo for risk dimension.
 
     Each iteration: for each risk event, sample bernoulli (uniform < prob),
     if triggered, add impact hours.
     """
+    rng = rng or random
     results = []
     for _ in range(iterations):
         total_impact = 0.0
         for event in inputs:
-            if random.random() < event["probability"]:
+            if rng.random() < event["probability"]:
                 total_impact += event["impact_hours"]
         results.append(total_impact)
     return results
 
 
+# ---------------------------------------------------------------------------
+# Vectorized runners (numpy)
+# ---------------------------------------------------------------------------
+
+def _chunk_rows(width, chunk_size=None):
+    """Iterations per chunk so a chunk's sample matrix stays bounded."""
+    if chunk_size:
+        return max(1, int(chunk_size))
+    return max(1, MAX_CHUNK_ELEMENTS // max(1, width))
+
+
+def _np_pert_totals(inputs, iterations, rng, chunk_size=None, lambd=4):
+    """Sum of PERT samples per iteration, drawn as Beta matrices in chunks."""
+    optimistic = np.array([i["optimistic"] for i in inputs], dtype=float)
+    most_likely = np.array([i["most_likely"] for i in inputs], dtype=float)
+    pessimistic = np.array([i["pessimistic"] for i in inputs], dtype=float)
+
+    # Degenerate items (optimistic >= pessimistic) always yield most_likely
+    fixed = optimistic >= pessimistic
+    constant = float(most_likely[fixed].sum())
+    lo = optimistic[~fixed]
+    span = pessimistic[~fixed] - lo
+    alpha = 1 + lambd * (most_likely[~fixed] - lo) / span
+    beta_param = 1 + lambd * (pessimistic[~fixed] - most_likely[~fixed]) / span
+    base = constant + float(lo.sum())
+
+    totals = np.empty(iterations, dtype=float)
+    if span.size == 0:
+        totals.fill(constant)
+        return totals
+    rows = _chunk_rows(span.size, chunk_size)
+    for start in range(0, iterations, rows):
+        n = min(rows, iterations - start)
+        samples = rng.beta(alpha, beta_param, size=(n, span.size))
+        totals[start:start + n] = base + samples @ span
+    return totals
+
+
+def _np_risk_totals(inputs, iterations, rng, chunk_size=None):
+    """Sum of triggered impacts per iteration from Bernoulli matrices in chunks."""
+    probability = np.array([e["probability"] for e in inputs], dtype=float)
+    impact = np.array([e["impact_hours"] for e in inputs], dtype=float)
+    totals = np.empty(iterations, dtype=float)
+    rows = _chunk_rows(probability.size, chunk_size)
+    for start in range(0, iterations, rows):
+        n = min(rows, iterations - start)
+        triggered = rng.random((n, probability.size)) < probability
+        totals[start:start + n] = triggered @ impact
+    return totals
+
+
+def _resolve_engine(engine):
+    """Map 'auto' to numpy when available; reject unknown/unavailable engines."""
+    if engine not in ENGINES:
+        raise ValueError(f"Invalid engine: {engine}. Must be one of {', '.join(ENGINES)}.")
+    if engine == "numpy" and not HAS_NUMPY:
+        raise ValueError("numpy engine requested but numpy is not installed.")
+    if engine == "auto":
+        return "numpy" if HAS_NUMPY else "stdlib"
+    return engine
+
+
+def simulate(dimension, inputs, iterations, seed=None, engine="auto", chunk_size=None):
+    """Draw per-iteration totals for a dimension.
+
+    Args:
+        dimension: One of 'schedule', 'cost', 'risk'.
+        inputs: Items (PERT parameters) or risk events for the dimension.
+        iterations: Number of iterations.
+        seed: Optional seed; the same seed, engine, inputs and chunk size
+            give identical results.
+        engine: 'auto' (numpy when installed), 'numpy' or 'stdlib'.
+        chunk_size: numpy engine only — iterations per sample matrix
+            (default sized from MAX_CHUNK_ELEMENTS).
+
+    Returns:
+        Tuple of (totals, engine_used); totals is a numpy array for the
+        numpy engine and a list for the stdlib engine.
+    """
+    engine = _resolve_engine(engine)
+    if engine == "numpy":
+        rng = np.random.default_rng(seed)
+        if dimension == "risk":
+            return _np_risk_totals(inputs, iterations, rng, chunk_size), engine
+        return _np_pert_totals(inputs, iterations, rng, chunk_size), engine
+
+    rng = random.Random(seed)
+    runner = {"schedule": _run_schedule_mc, "cost": _run_cost_mc,
+              "risk": _run_risk_mc}[dimension]
+    return runner(inputs, iterations, rng), engine
+
+
+def summarize_results(values, confidence_levels):
+    """Mean, std dev, min/max, percentiles, histogram and CDF of the totals.
+
+    numpy arrays are summarized vectorized (linear-interpolated quantiles
+    and a HISTOGRAM_BINS histogram whose last bin is closed, matching the
+    stdlib helpers); lists use the stdlib helpers.
+    """
+    if HAS_NUMPY and isinstance(values, np.ndarray):
+        return _np_summarize(values, confidence_levels)
+
+    values = sorted(values)
+    mean_val = _mean(values)
+    percentiles = {}
+    for p in confidence_levels:
+        percentiles[f"p{int(p * 100)}"] = round(_percentile(values, p), 2)
+    return {
+        "mean": mean_val,
+        "std_dev": _std_dev(values, mean_val),
+        "min": values[0] if values else 0.0,
+        "max": values[-1] if values else 0.0,
+        "percentiles": percentiles,
+        "histogram": _build_histogram(values, HISTOGRAM_BINS),
+        "cdf": _build_cdf(values, CDF_POINTS),
+    }
+
+
+def _np_summarize(values, confidence_levels):
+    if values.size == 0:
+        return {"mean": 0.0, "std_dev": 0.0, "min": 0.0, "max": 0.0,
+                "percentiles": {f"p{int(p * 100)}": 0.0 for p in confidence_levels},
+                "histogram": {"bins": [], "counts": [], "bin_width": 0}, "cdf": []}
+
+    cdf_probs = [i / (CDF_POINTS - 1) if CDF_POINTS > 1 else 0.5 for i in range(CDF_POINTS)]
+    quantiles = np.quantile(values, list(confidence_levels) + cdf_probs)
+    level_q = quantiles[:len(confidence_levels)]
+    cdf_q = quantiles[len(confidence_levels):]
+
+    min_val = float(values.min())
+    max_val = float(values.max())
+    if min_val == max_val:
+        histogram = {"bins": [min_val], "counts": [int(values.size)], "bin_width": 0}
+    else:
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS, range=(min_val, max_val))
+        histogram = {
+            "bins": [round(float(e), 2) for e in edges[:-1]],
+            "counts": [int(c) for c in counts],
+            "bin_width": round((max_val - min_val) / HISTOGRAM_BINS, 2),
+        }
+
+    return {
+        "mean": float(values.mean()),
+        "std_dev": float(values.std()) if values.size >= 2 else 0.0,
+        "min": min_val,
+        "max": max_val,
+        "percentiles": {f"p{int(p * 100)}": round(float(q), 2)
+                        for p, q in zip(confidence_levels, level_q)},
+        "histogram": histogram,
+        "cdf": [{"probability": round(p, 4), "value": round(float(v), 2)}
+                for p, v in zip(cdf_probs, cdf_q)],
+    }
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 def run_monte_carlo(scenario_id, dimension, iterations=DEFAULT_ITERATIONS,
-                    confidence_levels=None, db_path=None):
+                    confidence_levels=None, db_path=None, seed=None,
+                    engine="auto", chunk_size=None):
     """Execute Monte Carlo simulation for a scenario dimension.
 
     Args:
@@ -441,16 +614,20 @@ def run_monte_carlo(scenario_id, dimension, iterations=DEFAULT_ITERATIONS,
         iterations: Number of iterations (default 10000).
         confidence_levels: List of percentiles (default [0.10, 0.50, 0.80, 0.90]).
         db_path: Optional database path override.
+        seed: Optional seed for reproducible runs.
+        engine: 'auto' (numpy when installed), 'numpy' or 'stdlib'.
+        chunk_size: Iterations per sample matrix for the numpy engine.
 
     Returns:
         dict with run_id, dimension, iterations, mean, std_dev, percentiles,
-        histogram, and cdf.
+        histogram, cdf, engine and seed.
     """
     if confidence_levels is None:
         confidence_levels = list(DEFAULT_CONFIDENCE_LEVELS)
 
     if dimension not in ("schedule", "cost", "risk"):
         raise ValueError(f"Invalid dimension: {dimension}. Must be schedule, cost, or risk.")
+    engine = _resolve_engine(engine)
 
     conn = _get_connection(db_path)
     try:
@@ -467,46 +644,26 @@ def run_monte_carlo(scenario_id, dimension, iterations=DEFAULT_ITERATIONS,
         # Gather inputs
         if dimension == "schedule":
             inputs = _get_schedule_inputs(conn, project_id)
-            runner = _run_schedule_mc
         elif dimension == "cost":
             inputs = _get_cost_inputs(conn, project_id)
-            runner = _run_cost_mc
         else:  # risk
             inputs = _get_risk_inputs(conn, project_id)
-            runner = _run_risk_mc
 
         # Run simulation
         start_time = time.time()
-        raw_results = runner(inputs, iterations)
+        raw_results, engine = simulate(dimension, inputs, iterations, seed=seed,
+                                       engine=engine, chunk_size=chunk_size)
         duration_ms = int((time.time() - start_time) * 1000)
 
-        # Sort for percentile calculations
-        raw_results.sort()
-
-        # Statistics
-        mean_val = _mean(raw_results)
-        std_val = _std_dev(raw_results, mean_val)
-        min_val = raw_results[0] if raw_results else 0.0
-        max_val = raw_results[-1] if raw_results else 0.0
-
-        # Percentiles
-        percentiles = {}
-        for p in confidence_levels:
-            key = f"p{int(p * 100)}"
-            percentiles[key] = round(_percentile(raw_results, p), 2)
-
-        # Histogram and CDF
-        histogram = _build_histogram(raw_results, HISTOGRAM_BINS)
-        cdf = _build_cdf(raw_results, CDF_POINTS)
-
-        # Build summary
-        {
-            "mean": round(mean_val, 2),
-            "std_dev": round(std_val, 2),
-            "min": round(min_val, 2),
-            "max": round(max_val, 2),
-            "percentiles": percentiles,
-        }
+        # Statistics, percentiles, histogram and CDF
+        stats = summarize_results(raw_results, confidence_levels)
+        mean_val = stats["mean"]
+        std_val = stats["std_dev"]
+        min_val = stats["min"]
+        max_val = stats["max"]
+        percentiles = stats["percentiles"]
+        histogram = stats["histogram"]
+        cdf = stats["cdf"]
 
         # Persist to DB
         run_id = str(uuid4())
@@ -545,6 +702,7 @@ def run_monte_carlo(scenario_id, dimension, iterations=DEFAULT_ITERATIONS,
                    f"Monte Carlo ({dimension}) completed: {iterations} iterations",
                    {"run_id": run_id, "scenario_id": scenario_id,
                     "dimension": dimension, "iterations": iterations,
+                    "engine": engine, "seed": seed,
                     "mean": round(mean_val, 2), "duration_ms": duration_ms})
 
         return {
@@ -558,6 +716,8 @@ def run_monte_carlo(scenario_id, dimension, iterations=DEFAULT_ITERATIONS,
             "percentiles": percentiles,
             "histogram": histogram,
             "cdf": cdf,
+            "engine": engine,
+            "seed": seed,
             "duration_ms": duration_ms,
         }
     finally:
@@ -639,6 +799,11 @@ def main():
                         help=f"Number of iterations (default {DEFAULT_ITERATIONS})")
     parser.add_argument("--confidence-levels",
                         help="Comma-separated confidence levels (e.g. 0.10,0.50,0.80,0.90,0.95)")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--engine", choices=list(ENGINES), default="auto",
+                        help="Sampling engine (default auto: numpy when installed)")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Iterations per sample matrix for the numpy engine")
 
     # Query args
     parser.add_argument("--get", action="store_true", help="Get run details")
@@ -672,6 +837,9 @@ def main():
                 iterations=args.iterations,
                 confidence_levels=conf_levels,
                 db_path=db_path,
+                seed=args.seed,
+                engine=args.engine,
+                chunk_size=args.chunk_size,
             )
 
         else:
@@ -699,6 +867,7 @@ def _print_human(result):
         print(f"Monte Carlo Simulation — {result['dimension'].upper()}")
         print(f"  Run ID:     {result['run_id']}")
         print(f"  Iterations: {result['iterations']:,}")
+        print(f"  Engine:     {result.get('engine', 'stdlib')}")
         print(f"  Duration:   {result.get('duration_ms', 0)} ms")
         print()
         print(f"  Mean:    {result['mean']:,.2f}")